@@ -86,6 +86,8 @@ var hover_tween: Tween
 var last_selection_confidence: float = 0.0
 var selection_candidates: Array[Dictionary] = []
 var debug_visualization_enabled: bool = false
+var _proxy_library: SelectionProxyLibrary = SelectionProxyLibrary.new()  # baked colliders
+var _structure_bvhs: Dictionary = {}  # model name -> baked hover bounds of that model
 
 # Visual feedback system
 var visual_feedback: Node  # EducationalVisualFeedback instance
@@ -121,6 +123,7 @@ func _exit_tree() -> void:
 	# Clear all references
 	current_selected_mesh = null
 	current_hovered_mesh = null
+	_structure_bvhs.clear()
 
 	# Clean up materials dictionary
 	for mesh in original_materials.keys():
@@ -407,6 +410,31 @@ func clear_structure_cache() -> void:
 	structure_sizes.clear()
 
 
+func prepare_model(model_root: Node3D) -> void:
+	"""
+	Swap the baked selection proxies of a loaded model into its colliders
+
+	Called once per model by the scene that loads it, before bounds are cached.
+	@param model_root: The model instance under the model parent
+	"""
+	var model_name: String = SelectionProxyLibrary.model_name_of(model_root)
+	if _proxy_library.load_model(model_name) > 0:
+		var applied: int = _proxy_library.apply_to_model(model_root, model_name)
+		print("[SELECTION] Using %d baked selection proxies for %s" % [applied, model_name])
+
+	# Hover queries walk the baked structure BVH when the model has one
+	_structure_bvhs.erase(model_name)
+	var bvh: StructureBVH = StructureBVH.load_model(model_name)
+	if bvh:
+		var meshes_by_name: Dictionary = {}
+		for mesh in _get_all_meshes_recursive(model_root):
+			meshes_by_name[String(mesh.name)] = mesh
+		if bvh.bind(meshes_by_name) > 0:
+			_structure_bvhs[model_name] = bvh
+
+	_precalculate_collision_bounds()
+
+
 func dispose() -> void:
 	"""Dispose of resources and references"""
 	# Clear current selections
@@ -680,7 +708,7 @@ func _extract_mesh_from_collision(collision_result: Dictionary) -> MeshInstance3
 					# Then check normal bounds
 					if sibling != collider:
 						# Verify this mesh is related to the collision
-						var mesh_aabb: AABB = sibling.get_aabb()
+						var mesh_aabb: AABB = _proxy_library.get_aabb(sibling)
 						var local_point: Vector3 = (
 							sibling.global_transform.inverse() * collision_point
 						)
@@ -720,7 +748,7 @@ func _check_inflated_collision(mesh: MeshInstance3D, world_position: Vector3) ->
 
 	if inflation_factor > 1.0:
 		# Check inflated bounds
-		var original_aabb: AABB = mesh.get_aabb()
+		var original_aabb: AABB = _proxy_library.get_aabb(mesh)
 		var inflated_aabb: AABB = original_aabb.grow(
 			original_aabb.size.length() * (inflation_factor - 1.0) * 0.5
 		)
@@ -743,10 +771,21 @@ func _find_nearby_structures(screen_position: Vector2, radius: float) -> Array[D
 	if not brain_model:
 		return nearby_structures
 
-	var all_meshes: Array[MeshInstance3D] = _get_all_meshes_recursive(brain_model)
+	# A model's baked BVH narrows its candidates to meshes whose bounds reach the radius
+	var candidates: Array[MeshInstance3D] = []
+	for model_root in brain_model.get_children():
+		if not model_root is Node3D:
+			continue
+		var bvh: StructureBVH = _structure_bvhs.get(
+			SelectionProxyLibrary.model_name_of(model_root), null
+		)
+		if bvh:
+			candidates.append_array(bvh.query_screen(camera, screen_position, radius))
+		else:
+			candidates.append_array(_get_all_meshes_recursive(model_root))
 
 	# Check each mesh
-	for mesh in all_meshes:
+	for mesh in candidates:
 		var screen_pos: Vector2 = _get_mesh_screen_position(mesh)
 		if screen_pos.distance_to(screen_position) <= radius:
 			nearby_structures.append(
@@ -942,7 +981,7 @@ func _precalculate_collision_bounds() -> void:
 
 	for mesh in all_meshes:
 		if mesh.mesh:
-			var aabb: AABB = mesh.get_aabb()
+			var aabb: AABB = _proxy_library.get_aabb(mesh)
 			var normalized_name: String = mesh.name.to_lower().replace(" ", "_")
 
 			# Apply inflation if needed
@@ -1002,8 +1041,12 @@ func _on_anatomical_model_loaded(model_name: String, structure_count: int) -> vo
 	# Clear structure size cache for recalculation
 	structure_sizes.clear()
 
-	# Update collision bounds for new model
-	_precalculate_collision_bounds()
+	# Swap in baked selection proxies before the bounds are cached
+	var brain_model: Node = get_meta("model_parent_ref", null)
+	if brain_model and brain_model.get_node_or_null(NodePath(model_name)) is Node3D:
+		prepare_model(brain_model.get_node(NodePath(model_name)))
+	else:
+		_precalculate_collision_bounds()
 
 	# Update tolerance overrides for known professional model structures
 	_update_professional_structure_tolerances(model_name)
@@ -63,6 +63,9 @@ var brain_model_parent: Node3D = null
 ## Debug mode for medical validation
 var debug_mode: bool = true
 
+## Baked convex-hull colliders swapped in for the trimesh pick colliders
+var _proxy_library: SelectionProxyLibrary = SelectionProxyLibrary.new()
+
 
 # ===== LIFECYCLE METHODS =====
 func _ready() -> void:
@@ -177,6 +180,18 @@ func handle_hover_at_position(screen_position: Vector2) -> void:
 			structure_hovered.emit(hit_result["structure_name"], hovered_mesh)
 
 
+func prepare_model(model_root: Node3D) -> void:
+	"""
+	Swap the baked selection proxies of a loaded model into its colliders
+
+	@param model_root: The model instance under the brain model parent
+	"""
+	var model_name: String = SelectionProxyLibrary.model_name_of(model_root)
+	if _proxy_library.load_model(model_name) > 0:
+		var applied: int = _proxy_library.apply_to_model(model_root, model_name)
+		print("[MinimalSelection] Using %d baked selection proxies for %s" % [applied, model_name])
+
+
 func clear_selection() -> void:
 	"""Clear current selection and restore original materials"""
 	if selected_mesh:
@@ -0,0 +1,135 @@
+## SelectionProxyLibrary.gd
+## Baked selection colliders and bounds for anatomical structures
+##
+## Loads the proxies tools/python/selection_proxies.py bakes into
+## assets/models/proxies/<Model>_proxies.tres: a convex hull or reduced mesh
+## collider per structure plus its mesh-local AABB and bounding sphere.
+## Swapping these in for the full-resolution trimesh colliders keeps
+## multi-ray picking cheap on dense models.
+##
+## @version: 1.1
+
+class_name SelectionProxyLibrary
+extends RefCounted
+
+# === CONSTANTS ===
+const PROXY_DIR: String = "res://assets/models/proxies/"
+const PROXY_META: StringName = &"selection_proxy"  # entry applied to a mesh
+
+# === VARIABLES ===
+var _proxies: Dictionary = {}  # model name -> {normalized node name -> proxy entry}
+
+
+# === PUBLIC METHODS ===
+func load_model(model_name: String) -> int:
+	"""Load the baked proxies of a model, returning how many were found"""
+	if _proxies.has(model_name):
+		return _proxies[model_name].size()
+
+	var path: String = PROXY_DIR + model_name + "_proxies.tres"
+	if not ResourceLoader.exists(path):
+		return 0
+
+	var resource: Resource = load(path)
+	if not resource or not resource.has_meta("proxies"):
+		push_warning("[SelectionProxyLibrary] No proxies in %s" % path)
+		return 0
+
+	var entries: Dictionary = resource.get_meta("proxies")
+	var model_proxies: Dictionary = {}
+	for node_name in entries:
+		model_proxies[_normalize(node_name)] = entries[node_name]
+	_proxies[model_name] = model_proxies
+	return model_proxies.size()
+
+
+func has_proxy(mesh: MeshInstance3D) -> bool:
+	return mesh != null and mesh.has_meta(PROXY_META)
+
+
+func get_aabb(mesh: MeshInstance3D) -> AABB:
+	"""Mesh-local bounds from the bake, or the mesh's own when there is none"""
+	var entry: Dictionary = mesh.get_meta(PROXY_META, {})
+	if entry.has("aabb"):
+		return entry["aabb"]
+	return mesh.get_aabb()
+
+
+func get_bounding_sphere(mesh: MeshInstance3D) -> Dictionary:
+	"""Mesh-local bounding sphere as {"center": Vector3, "radius": float}"""
+	var entry: Dictionary = mesh.get_meta(PROXY_META, {})
+	if entry.has("center"):
+		return {"center": entry["center"], "radius": entry["radius"]}
+
+	var aabb: AABB = mesh.get_aabb()
+	return {"center": aabb.get_center(), "radius": aabb.size.length() * 0.5}
+
+
+func apply_to_model(model_root: Node, model_name: String) -> int:
+	"""Replace the collider of every structure of model_name that has a proxy
+
+	model_root is the model's instance or a parent holding it as a child named
+	model_name (how the model loaders add them). Each mesh keeps its entry, so
+	structures with the same name in two models get their own bounds.
+	"""
+	var model_proxies: Dictionary = _proxies.get(model_name, {})
+	if model_proxies.is_empty():
+		return 0
+
+	var root: Node = model_root
+	if model_root.name != model_name and model_root.has_node(NodePath(model_name)):
+		root = model_root.get_node(NodePath(model_name))
+
+	var applied: int = 0
+	var pending: Array[Node] = [root]
+	while not pending.is_empty():
+		var node: Node = pending.pop_back()
+		pending.append_array(node.get_children())
+		if node is MeshInstance3D:
+			var entry: Dictionary = model_proxies.get(_normalize(node.name), {})
+			if not entry.is_empty():
+				node.set_meta(PROXY_META, entry)
+				_apply_to_mesh(node, entry)
+				applied += 1
+	return applied
+
+
+static func model_name_of(model_root: Node) -> String:
+	"""ModelRegistry name of a loaded model instance, which the bakes are stored under"""
+	return String(model_root.name).replace("(Solid)", "")
+
+
+func clear() -> void:
+	_proxies.clear()
+
+
+# === PRIVATE METHODS ===
+func _apply_to_mesh(mesh: MeshInstance3D, entry: Dictionary) -> void:
+	"""Swap the proxy shape into the mesh's StaticBody3D, creating one if needed"""
+	var shape: Shape3D = entry.get("shape")
+	if not shape:
+		return
+
+	var body: StaticBody3D = null
+	for child in mesh.get_children():
+		if child is StaticBody3D:
+			body = child
+			break
+	if not body:
+		body = StaticBody3D.new()
+		mesh.add_child(body)
+
+	var collision_shape: CollisionShape3D = null
+	for child in body.get_children():
+		if child is CollisionShape3D:
+			collision_shape = child
+			break
+	if not collision_shape:
+		collision_shape = CollisionShape3D.new()
+		body.add_child(collision_shape)
+
+	collision_shape.shape = shape
+
+
+static func _normalize(node_name: String) -> String:
+	return node_name.validate_node_name().to_lower().replace(" ", "_")
@@ -0,0 +1,309 @@
+## StructureBVH.gd
+## Reader and queries for the structure BVHs baked by tools/python/structure_bvh.py
+##
+## Bump FORMAT_VERSION here and in structure_bvh.py with the file layout;
+## the bake refuses to run while the two differ.
+##
+## Answers "which structures are near this ray or screen point" by walking
+## the baked node arrays instead of every mesh in the model. Bounds live in
+## the model's glTF scene space; bind() ties them to the loaded meshes.
+##
+## The .bvh files are not imported resources, so exports only carry them
+## when the preset's include_filter lists *.bvh. Without them hover queries
+## fall back to the linear scan.
+##
+## @version: 1.0
+
+class_name StructureBVH
+extends RefCounted
+
+# === CONSTANTS ===
+const BVH_DIR: String = "res://assets/models/bvh/"
+const MAGIC: String = "NVBV"
+const FORMAT_VERSION: int = 1
+const HAS_TRIANGLES: int = 1
+const MIN_DIRECTION: float = 1e-12
+
+# === VARIABLES ===
+var structure_names: PackedStringArray = PackedStringArray()
+var _structure_transforms: Array[Transform3D] = []
+var _structure_bounds: PackedFloat32Array = PackedFloat32Array()
+var _node_bounds: PackedFloat32Array = PackedFloat32Array()  # min xyz, max xyz per node
+var _node_links: PackedInt32Array = PackedInt32Array()  # first child/item, item count
+var _items: PackedInt32Array = PackedInt32Array()
+var _triangle_node_bounds: PackedFloat32Array = PackedFloat32Array()
+var _triangle_node_links: PackedInt32Array = PackedInt32Array()
+var _triangles: PackedFloat32Array = PackedFloat32Array()  # 9 floats each, leaf order
+var _triangle_structures: PackedInt32Array = PackedInt32Array()
+var _meshes: Array = []  # structure index -> bound MeshInstance3D
+var _anchor: int = -1  # bound structure the bake-to-world transform comes from
+var _to_world: Transform3D = Transform3D.IDENTITY
+var _to_bake: Transform3D = Transform3D.IDENTITY
+
+
+# === PUBLIC METHODS ===
+static func load_model(model_name: String) -> StructureBVH:
+	"""The baked BVH of a model, or null when there is none"""
+	var path: String = BVH_DIR + model_name + ".bvh"
+	if not FileAccess.file_exists(path):
+		return null
+	var bvh: StructureBVH = StructureBVH.new()
+	return bvh if bvh.load_file(path) == OK else null
+
+
+func load_file(path: String) -> Error:
+	var file: FileAccess = FileAccess.open(path, FileAccess.READ)
+	if not file:
+		return FileAccess.get_open_error()
+	if file.get_buffer(4).get_string_from_ascii() != MAGIC or file.get_32() != FORMAT_VERSION:
+		push_warning("[StructureBVH] %s is not a version %d BVH" % [path, FORMAT_VERSION])
+		return ERR_FILE_UNRECOGNIZED
+
+	var flags: int = file.get_32()
+	var structure_count: int = file.get_32()
+	var node_count: int = file.get_32()
+	var triangle_node_count: int = file.get_32()
+	var triangle_count: int = file.get_32()
+	for _i in structure_count:
+		var length: int = file.get_32()
+		structure_names.append(file.get_buffer(length).get_string_from_utf8())
+		file.get_buffer((4 - length % 4) % 4)
+
+	var transforms: PackedFloat32Array = file.get_buffer(structure_count * 48).to_float32_array()
+	for i in structure_count:
+		var t: int = i * 12
+		_structure_transforms.append(
+			Transform3D(
+				Vector3(transforms[t], transforms[t + 1], transforms[t + 2]),
+				Vector3(transforms[t + 3], transforms[t + 4], transforms[t + 5]),
+				Vector3(transforms[t + 6], transforms[t + 7], transforms[t + 8]),
+				Vector3(transforms[t + 9], transforms[t + 10], transforms[t + 11])
+			)
+		)
+	_structure_bounds = file.get_buffer(structure_count * 24).to_float32_array()
+	_node_bounds = file.get_buffer(node_count * 24).to_float32_array()
+	_node_links = file.get_buffer(node_count * 8).to_int32_array()
+	_items = file.get_buffer(structure_count * 4).to_int32_array()
+	if flags & HAS_TRIANGLES:
+		_triangle_node_bounds = file.get_buffer(triangle_node_count * 24).to_float32_array()
+		_triangle_node_links = file.get_buffer(triangle_node_count * 8).to_int32_array()
+		_triangles = file.get_buffer(triangle_count * 36).to_float32_array()
+		_triangle_structures = file.get_buffer(triangle_count * 4).to_int32_array()
+
+	if _items.size() != structure_count or _triangle_structures.size() != triangle_count:
+		push_warning("[StructureBVH] %s is truncated" % path)
+		return ERR_FILE_CORRUPT
+	_meshes.resize(structure_count)
+	return OK
+
+
+func bind(meshes_by_name: Dictionary) -> int:
+	"""Match structures to loaded meshes by node name; returns how many matched"""
+	var bound: int = 0
+	_anchor = -1
+	for i in structure_names.size():
+		_meshes[i] = meshes_by_name.get(structure_names[i], null)
+		if _meshes[i]:
+			bound += 1
+			if _anchor < 0:
+				_anchor = i
+	return bound
+
+
+func get_mesh(structure: int) -> MeshInstance3D:
+	return _meshes[structure] if structure >= 0 and structure < _meshes.size() else null
+
+
+func has_triangles() -> bool:
+	return not _triangles.is_empty()
+
+
+func query_ray(origin: Vector3, direction: Vector3, max_distance: float = INF) -> Array[int]:
+	"""Structures whose bounds a world-space ray passes through, nearest entry first"""
+	_update_transform()
+	var local_origin: Vector3 = _to_bake * origin
+	var local_direction: Vector3 = _to_bake.basis * direction
+	var inverse: Vector3 = _safe_inverse(local_direction)
+	var limit: float = (
+		max_distance * local_direction.length() / maxf(direction.length(), MIN_DIRECTION)
+	)
+
+	var entries: Array = []
+	var stack: PackedInt32Array = PackedInt32Array([0])
+	while not stack.is_empty():
+		var node: int = stack[stack.size() - 1]
+		stack.resize(stack.size() - 1)
+		if _slab(_node_bounds, node, local_origin, inverse, limit) < 0.0:
+			continue
+		var first: int = _node_links[node * 2]
+		var count: int = _node_links[node * 2 + 1]
+		if count == 0:
+			stack.append(first + 1)
+			stack.append(first)
+			continue
+		for slot in range(first, first + count):
+			var structure: int = _items[slot]
+			var entry: float = _slab(_structure_bounds, structure, local_origin, inverse, limit)
+			if entry >= 0.0:
+				entries.append([entry, structure])
+
+	entries.sort_custom(func(a, b): return a[0] < b[0])
+	var structures: Array[int] = []
+	for entry in entries:
+		structures.append(entry[1])
+	return structures
+
+
+func query_screen(
+	camera: Camera3D, screen_position: Vector2, radius: float
+) -> Array[MeshInstance3D]:
+	"""
+	Bound meshes whose bounds reach within `radius` pixels of a screen point
+	A superset of the meshes whose projected center lies within the radius
+	"""
+	_update_transform()
+	var origin: Vector3 = _to_bake * camera.project_ray_origin(screen_position)
+	var direction: Vector3 = (
+		(_to_bake.basis * camera.project_ray_normal(screen_position)).normalized()
+	)
+	var scale: float = _to_bake.basis.get_scale().x
+	var half_height: float = camera.get_viewport().get_visible_rect().size.y * 0.5
+	var spread: float = 0.0
+	var base: float = 0.0
+	if camera.projection == Camera3D.PROJECTION_ORTHOGONAL:
+		base = camera.size * 0.5 * radius / half_height * scale
+	else:
+		spread = tan(deg_to_rad(camera.fov) * 0.5) * radius / half_height
+
+	# Item spheres can reach sqrt(2) node radii out, scaled by the cone slope
+	var inflate: float = sqrt(2.0 * (1.0 + spread * spread))
+	var meshes: Array[MeshInstance3D] = []
+	var stack: PackedInt32Array = PackedInt32Array([0])
+	while not stack.is_empty():
+		var node: int = stack[stack.size() - 1]
+		stack.resize(stack.size() - 1)
+		if not _cone_hits(_node_bounds, node, origin, direction, spread, base, inflate):
+			continue
+		var first: int = _node_links[node * 2]
+		var count: int = _node_links[node * 2 + 1]
+		if count == 0:
+			stack.append(first + 1)
+			stack.append(first)
+			continue
+		for slot in range(first, first + count):
+			var structure: int = _items[slot]
+			if not _meshes[structure]:
+				continue
+			if _cone_hits(_structure_bounds, structure, origin, direction, spread, base):
+				meshes.append(_meshes[structure])
+	return meshes
+
+
+func intersect_ray(origin: Vector3, direction: Vector3) -> Dictionary:
+	"""Nearest triangle hit of a world-space ray: mesh, structure, position, distance"""
+	if _triangles.is_empty():
+		return {}
+	_update_transform()
+	var local_origin: Vector3 = _to_bake * origin
+	var local_direction: Vector3 = _to_bake.basis * direction
+	var inverse: Vector3 = _safe_inverse(local_direction)
+	var nearest: float = INF
+	var hit_triangle: int = -1
+
+	var stack: PackedInt32Array = PackedInt32Array([0])
+	while not stack.is_empty():
+		var node: int = stack[stack.size() - 1]
+		stack.resize(stack.size() - 1)
+		if _slab(_triangle_node_bounds, node, local_origin, inverse, nearest) < 0.0:
+			continue
+		var first: int = _triangle_node_links[node * 2]
+		var count: int = _triangle_node_links[node * 2 + 1]
+		if count == 0:
+			stack.append(first + 1)
+			stack.append(first)
+			continue
+		for triangle in range(first, first + count):
+			var t: int = triangle * 9
+			var hit: Variant = Geometry3D.ray_intersects_triangle(
+				local_origin,
+				local_direction,
+				Vector3(_triangles[t], _triangles[t + 1], _triangles[t + 2]),
+				Vector3(_triangles[t + 3], _triangles[t + 4], _triangles[t + 5]),
+				Vector3(_triangles[t + 6], _triangles[t + 7], _triangles[t + 8])
+			)
+			if hit != null:
+				var distance: float = (
+					(hit - local_origin).dot(local_direction) / local_direction.length_squared()
+				)
+				if distance < nearest:
+					nearest = distance
+					hit_triangle = triangle
+
+	if hit_triangle < 0:
+		return {}
+	var structure: int = _triangle_structures[hit_triangle]
+	var position: Vector3 = _to_world * (local_origin + local_direction * nearest)
+	return {
+		"mesh": _meshes[structure],
+		"structure": structure,
+		"position": position,
+		"distance": origin.distance_to(position)
+	}
+
+
+# === PRIVATE METHODS ===
+func _update_transform() -> void:
+	"""Follow the model: bake space maps to world through any bound mesh"""
+	if _anchor < 0 or not is_instance_valid(_meshes[_anchor]):
+		return
+	var mesh: MeshInstance3D = _meshes[_anchor]
+	_to_world = mesh.global_transform * _structure_transforms[_anchor].affine_inverse()
+	_to_bake = _to_world.affine_inverse()
+
+
+static func _safe_inverse(direction: Vector3) -> Vector3:
+	var inverse: Vector3 = Vector3.ZERO
+	for axis in 3:
+		var component: float = direction[axis]
+		if absf(component) < MIN_DIRECTION:
+			component = MIN_DIRECTION if component >= 0.0 else -MIN_DIRECTION
+		inverse[axis] = 1.0 / component
+	return inverse
+
+
+static func _slab(
+	bounds: PackedFloat32Array, index: int, origin: Vector3, inverse: Vector3, limit: float
+) -> float:
+	"""Ray parameter where the ray enters box `index`, or -1 when it misses"""
+	var o: int = index * 6
+	var x1: float = (bounds[o] - origin.x) * inverse.x
+	var x2: float = (bounds[o + 3] - origin.x) * inverse.x
+	var y1: float = (bounds[o + 1] - origin.y) * inverse.y
+	var y2: float = (bounds[o + 4] - origin.y) * inverse.y
+	var z1: float = (bounds[o + 2] - origin.z) * inverse.z
+	var z2: float = (bounds[o + 5] - origin.z) * inverse.z
+	var near: float = maxf(maxf(minf(x1, x2), minf(y1, y2)), maxf(minf(z1, z2), 0.0))
+	var far: float = minf(minf(maxf(x1, x2), maxf(y1, y2)), minf(maxf(z1, z2), limit))
+	return near if near <= far else -1.0
+
+
+static func _cone_hits(
+	bounds: PackedFloat32Array,
+	index: int,
+	origin: Vector3,
+	direction: Vector3,
+	spread: float,
+	base: float,
+	inflate: float = 1.0
+) -> bool:
+	"""Bounding sphere of box `index`, scaled by `inflate`, against a cone around a unit ray"""
+	var o: int = index * 6
+	var low: Vector3 = Vector3(bounds[o], bounds[o + 1], bounds[o + 2])
+	var high: Vector3 = Vector3(bounds[o + 3], bounds[o + 4], bounds[o + 5])
+	var radius: float = (high - low).length() * 0.5 * inflate
+	var offset: Vector3 = (low + high) * 0.5 - origin
+	var along: float = offset.dot(direction)
+	if along < -radius:
+		return false
+	var allowed: float = radius + base + maxf(along, 0.0) * spread
+	return offset.length_squared() - along * along <= allowed * allowed
@@ -0,0 +1,134 @@
+## StartupTrace.gd
+## Shared in-memory ring buffer of autoload startup spans
+##
+## Autoloads wrap _ready and their heavy init steps in begin()/end() pairs.
+## Spans are stored in a fixed-size ring buffer so instrumentation never
+## allocates after the first frame. On the first rendered frame the buffer
+## is dumped to TRACE_FILE for tools/python/startup_trace.py to render.
+##
+## Access via: StartupTrace.begin() / StartupTrace.end(owner, step, start)
+## @version: 1.0
+
+class_name StartupTrace
+extends RefCounted
+
+# === CONSTANTS ===
+const TRACE_FILE: String = "user://startup_trace.json"
+const CAPACITY: int = 256
+const TRACE_FORMAT_VERSION: int = 1
+
+# === STATIC STATE ===
+static var _owners: PackedStringArray = PackedStringArray()
+static var _steps: PackedStringArray = PackedStringArray()
+static var _starts: PackedInt64Array = PackedInt64Array()
+static var _ends: PackedInt64Array = PackedInt64Array()
+static var _depths: PackedInt32Array = PackedInt32Array()
+static var _head: int = 0
+static var _count: int = 0
+static var _dropped: int = 0
+static var _depth: int = 0
+static var _dump_scheduled: bool = false
+
+
+# === PUBLIC API ===
+static func begin() -> int:
+	"""Open a span and return its start timestamp in microseconds"""
+	_ensure_buffer()
+	_schedule_dump()
+	_depth += 1
+	return Time.get_ticks_usec()
+
+
+static func end(owner: String, step: String, start_usec: int) -> void:
+	"""Close a span opened by begin() and append it to the ring buffer"""
+	var end_usec = Time.get_ticks_usec()
+	_depth = max(_depth - 1, 0)
+	_ensure_buffer()
+
+	_owners[_head] = owner
+	_steps[_head] = step
+	_starts[_head] = start_usec
+	_ends[_head] = end_usec
+	_depths[_head] = _depth
+
+	_head = (_head + 1) % CAPACITY
+	if _count < CAPACITY:
+		_count += 1
+	else:
+		_dropped += 1
+
+
+static func get_spans() -> Array:
+	"""Return recorded spans in chronological order"""
+	var spans: Array = []
+	var first = (_head - _count + CAPACITY) % CAPACITY
+	for i in range(_count):
+		var index = (first + i) % CAPACITY
+		spans.append(
+			{
+				"autoload": _owners[index],
+				"step": _steps[index],
+				"start_usec": _starts[index],
+				"end_usec": _ends[index],
+				"depth": _depths[index]
+			}
+		)
+	return spans
+
+
+static func dump(path: String = TRACE_FILE, first_frame_usec: int = -1) -> bool:
+	"""Write the ring buffer contents to a JSON trace file"""
+	var file = FileAccess.open(path, FileAccess.WRITE)
+	if file == null:
+		push_warning("[StartupTrace] Cannot write trace file: " + path)
+		return false
+
+	var trace = {
+		"version": TRACE_FORMAT_VERSION,
+		"capacity": CAPACITY,
+		"dropped": _dropped,
+		"first_frame_usec": first_frame_usec,
+		"spans": get_spans()
+	}
+	file.store_string(JSON.stringify(trace, "\t"))
+	file.close()
+	return true
+
+
+static func clear() -> void:
+	"""Reset the ring buffer"""
+	_head = 0
+	_count = 0
+	_dropped = 0
+	_depth = 0
+
+
+# === PRIVATE METHODS ===
+static func _ensure_buffer() -> void:
+	"""Allocate the ring buffer storage once"""
+	if _starts.size() == CAPACITY:
+		return
+	_owners.resize(CAPACITY)
+	_steps.resize(CAPACITY)
+	_starts.resize(CAPACITY)
+	_ends.resize(CAPACITY)
+	_depths.resize(CAPACITY)
+
+
+static func _schedule_dump() -> void:
+	"""Dump the trace once the first frame has been processed"""
+	if _dump_scheduled:
+		return
+	_dump_scheduled = true
+
+	if not (OS.is_debug_build() or "--startup-trace" in OS.get_cmdline_user_args()):
+		return
+
+	var tree = Engine.get_main_loop() as SceneTree
+	if tree:
+		tree.process_frame.connect(_on_first_frame, CONNECT_ONE_SHOT)
+
+
+static func _on_first_frame() -> void:
+	"""Record time to first frame and write the trace file"""
+	dump(TRACE_FILE, Time.get_ticks_usec())
@@ -14,14 +14,51 @@ This script reorganizes class members according to the GDScript style guide:
 9. Built-in virtual methods (_init, _ready, _process, etc.)
 10. Public methods
 11. Private methods (func _name)
-12. Signal callbacks
+12. Signal callbacks (func _on_*)
+13. Inner classes
+
+Each top-level member is parsed into one contiguous span: the comments and
+annotations directly above it, its statement (including multi-line values)
+and its indented body. `@export_group` / `@export_category` lines keep the
+exports that follow them. Statements the style guide has no place for stay
+attached to the member above them.
+
+Files whose members are already in order are not rewritten. Otherwise the
+spans are reordered with a stable sort, so members of the same category
+keep their relative order, and the file is written once.
 """
 
-import os
-import re
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "tools" / "python"))
+from gdscript_lexer import ANNOTATION, NAME, logical_lines, tokenize  # noqa: E402
+
+# Annotations that stand alone at the top of a script
+SCRIPT_ANNOTATIONS = {'@tool', '@icon', '@static_unload'}
+# Annotations that start a group of the exports below them
+EXPORT_GROUP_ANNOTATIONS = {'@export_group', '@export_subgroup', '@export_category'}
+BUILTIN_METHODS = {
+    '_static_init', '_init', '_enter_tree', '_ready', '_exit_tree', '_notification',
+    '_process', '_physics_process', '_input', '_unhandled_input',
+    '_unhandled_key_input', '_shortcut_input', '_gui_input', '_draw',
+}
+METHOD_CATEGORIES = {
+    'builtin_methods', 'public_methods', 'private_methods', 'signal_callbacks',
+    'inner_classes',
+}
+
+
+@dataclass
+class ClassMember:
+    """One top-level member and every line that belongs to it"""
+    category: str
+    name: str
+    line: int  # 1-based line of the member statement
+    lines: List[str] = field(default_factory=list)
+
 
 class GDScriptClassReorganizer:
     def __init__(self):
@@ -39,138 +76,169 @@ class GDScriptClassReorganizer:
             'builtin_methods',
             'public_methods',
             'private_methods',
-            'signal_callbacks'
+            'signal_callbacks',
+            'inner_classes',
         ]
-
-        # Patterns to identify different types of class members
-        self.patterns = {
-            'signal': re.compile(r'^signal\s+\w+'),
-            'enum': re.compile(r'^enum\s+\w+'),
-            'const': re.compile(r'^const\s+\w+'),
-            'export': re.compile(r'^@export'),
-            'onready': re.compile(r'^@onready\s+var'),
-            'private_var': re.compile(r'^var\s+_\w+'),
-            'public_var': re.compile(r'^var\s+[a-zA-Z]\w*'),
-            'private_func': re.compile(r'^func\s+_\w+'),
-            'public_func': re.compile(r'^func\s+[a-zA-Z]\w*'),
-            'builtin_func': re.compile(r'^func\s+_(ready|init|process|unhandled_input|physics_process|enter_tree|exit_tree)'),
-            'class_name': re.compile(r'^class_name\s+\w+'),
-            'extends': re.compile(r'^extends\s+'),
-        }
-
-    def categorize_line(self, line: str) -> str:
-        """Categorize a line of GDScript code."""
-        line = line.strip()
-
-        if not line or line.startswith('#'):
-            return 'comment'
-
-        # Check for class_name and extends
-        if self.patterns['class_name'].match(line) or self.patterns['extends'].match(line):
+        self.rank = {category: i for i, category in enumerate(self.member_order)}
+
+    def categorize_member(self, tokens, annotations: List[str]) -> Optional[str]:
+        """Category of a top-level statement, or None if the guide has no place for it"""
+        annotations = annotations + [t.text for t in tokens if t.kind == ANNOTATION]
+        words = [t.text for t in tokens if t.kind == NAME]
+        if not words:
+            if any(a in SCRIPT_ANNOTATIONS for a in annotations):
+                return 'class_name_extends'
+            if any(a in EXPORT_GROUP_ANNOTATIONS for a in annotations):
+                return 'exports'
+            return None
+        keyword = words[1] if words[0] == 'static' and len(words) > 1 else words[0]
+        name = words[words.index(keyword) + 1] if keyword != words[-1] else ''
+
+        if keyword in ('class_name', 'extends'):
             return 'class_name_extends'
-
-        # Check for signals
-        if self.patterns['signal'].match(line):
+        if keyword == 'signal':
             return 'signals'
-
-        # Check for enums
-        if self.patterns['enum'].match(line):
+        if keyword == 'enum':
             return 'enums'
-
-        # Check for constants
-        if self.patterns['const'].match(line):
+        if keyword == 'const':
             return 'constants'
+        if keyword == 'var':
+            if any(a.startswith('@export') for a in annotations):
+                return 'exports'
+            if '@onready' in annotations:
+                return 'onready_vars'
+            return 'private_vars' if name.startswith('_') else 'public_vars'
+        if keyword == 'func':
+            if name in BUILTIN_METHODS:
+                return 'builtin_methods'
+            if name.startswith('_on_'):
+                return 'signal_callbacks'
+            return 'private_methods' if name.startswith('_') else 'public_methods'
+        if keyword == 'class':
+            return 'inner_classes'
+        return None
+
+    def parse_members(self, source: str) -> List[ClassMember]:
+        """Split a script into contiguous member spans in one pass"""
+        lines = source.splitlines(keepends=True)
+        # Top-level statements by starting line index, with their last line index
+        statements = {}
+        covered = [False] * len(lines)
+        for logical in logical_lines(tokenize(source), source):
+            last = source.count('\n', 0, logical.tokens[-1].end)
+            for index in range(logical.line - 1, min(last + 1, len(lines))):
+                covered[index] = True
+            if logical.indent == 0:
+                statements[logical.line - 1] = (logical, last)
+
+        members: List[ClassMember] = []
+        pending: List[str] = []  # comments/blank lines not yet assigned
+        annotations: List[str] = []  # annotation-only lines above the next member
+        index = 0
+        while index < len(lines):
+            text = lines[index]
+            if index not in statements:
+                if covered[index] or (text.strip() and text[:1] in (' ', '\t')):
+                    # Indented code and comments: the body of the current member
+                    self._attach(members, pending, text)
+                    pending = []
+                else:
+                    pending.append(text)
+                index += 1
+                continue
+
+            logical, last = statements[index]
+            span = lines[index:last + 1]
+            index = last + 1
+            words = [t for t in logical.tokens if t.kind == NAME]
+            category = self.categorize_member(logical.tokens, annotations)
+            if not words and category is None:
+                # Annotation line for the statement below (@onready, @export)
+                annotations += [t.text for t in logical.tokens if t.kind == ANNOTATION]
+                pending += span
+                continue
+            annotations = []
+
+            # Comments directly above a member belong to it; anything
+            # separated by a blank line stays with the member before
+            split = len(pending)
+            while split > 0 and pending[split - 1].strip():
+                split -= 1
+            for previous in pending[:split]:
+                self._attach(members, [], previous)
+            leading = pending[split:]
+            pending = []
+
+            group = members[-1] if members else None
+            if category is None:
+                self._attach(members, leading, ''.join(span))
+                continue
+            if (category == 'exports' and group is not None and group.category == 'exports'
+                    and group.name.startswith('@') and words):
+                # An exported variable inside an @export_group block
+                group.lines += leading + span
+                continue
+            name = words[1].text if len(words) > 1 else logical.tokens[0].text
+            members.append(ClassMember(category, name, logical.line, leading + span))
+
+        for text in pending:
+            self._attach(members, [], text)
+        return members
+
+    def _attach(self, members: List[ClassMember], pending: List[str], text: str):
+        """Append lines to the last member (the docstring before any member)"""
+        if not members:
+            members.append(ClassMember('docstring', '', 1))
+        members[-1].lines += pending + [text]
+
+    def is_ordered(self, members: List[ClassMember]) -> bool:
+        """True when the member categories never go backwards in the guide order"""
+        ranks = [self.rank[m.category] for m in members]
+        return all(a <= b for a, b in zip(ranks, ranks[1:]))
+
+    def reorder(self, source: str, members: List[ClassMember]) -> str:
+        ordered = sorted(members, key=lambda m: self.rank[m.category])
+        position = {id(m): i for i, m in enumerate(members)}
+        pieces: List[str] = []
+        previous = None
+        for member in ordered:
+            text = ''.join(member.lines)
+            if not text.endswith('\n'):
+                text += '\n'
+            moved = previous is not None and position[id(member)] != position[id(previous)] + 1
+            if moved and previous.category != member.category:
+                # Keep categories apart; methods and classes get two blank lines
+                wanted = 2 if member.category in METHOD_CATEGORIES else 1
+                body = pieces[-1].rstrip('\n')
+                blank = len(pieces[-1]) - len(body) - 1
+                if blank < wanted:
+                    pieces[-1] = body + '\n' * (wanted + 1)
+            pieces.append(text)
+            previous = member
+        result = ''.join(pieces)
+        if not source.endswith('\n'):
+            result = result.rstrip('\n')
+        return result
 
-        # Check for exports
-        if self.patterns['export'].match(line):
-            return 'exports'
-
-        # Check for onready variables
-        if self.patterns['onready'].match(line):
-            return 'onready_vars'
-
-        # Check for variables
-        if self.patterns['private_var'].match(line):
-            return 'private_vars'
-        if self.patterns['public_var'].match(line):
-            return 'public_vars'
+    def reorganize_file(self, filepath: str) -> bool:
+        """Reorganize a single GDScript file. Returns True if the file was rewritten."""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            source = f.read()
 
-        # Check for functions
-        if self.patterns['builtin_func'].match(line):
-            return 'builtin_methods'
-        if self.patterns['private_func'].match(line):
-            return 'private_methods'
-        if self.patterns['public_func'].match(line):
-            return 'public_methods'
+        members = self.parse_members(source)
+        if self.is_ordered(members):
+            return False
 
-        return 'other'
+        new_source = self.reorder(source, members)
+        # Every non-blank line must survive the move exactly once
+        if sorted(line for line in source.splitlines() if line.strip()) != sorted(
+                line for line in new_source.splitlines() if line.strip()):
+            raise ValueError("reordering would change the file contents")
 
-    def reorganize_file(self, filepath: str) -> bool:
-        """Reorganize a single GDScript file."""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            # Group lines by category
-            categories = {cat: [] for cat in self.member_order}
-            categories['other'] = []
-            categories['comment'] = []
-
-            current_category = None
-            current_block = []
-
-            for i, line in enumerate(lines):
-                category = self.categorize_line(line)
-
-                if category != 'comment' and category != 'other':
-                    if current_category != category:
-                        # Save previous block
-                        if current_category and current_block:
-                            categories[current_category].extend(current_block)
-                        current_category = category
-                        current_block = [line]
-                    else:
-                        current_block.append(line)
-                else:
-                    # Handle comments and other lines
-                    if current_category:
-                        current_block.append(line)
-                    else:
-                        if category == 'comment':
-                            categories['comment'].append(line)
-                        else:
-                            categories['other'].append(line)
-
-            # Save final block
-            if current_category and current_block:
-                categories[current_category].extend(current_block)
-
-            # Reconstruct file in proper order
-            new_lines = []
-
-            # Add docstring/comments at the top
-            new_lines.extend(categories['comment'])
-
-            # Add class members in proper order
-            for category in self.member_order:
-                if categories[category]:
-                    if new_lines and not new_lines[-1].strip() == '':
-                        new_lines.append('\n')
-                    new_lines.extend(categories[category])
-
-            # Add any other lines at the end
-            if categories['other']:
-                new_lines.extend(categories['other'])
-
-            # Write back to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
-
-            return True
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(new_source)
+        return True
 
-        except Exception as e:
-            print(f"Error processing {filepath}: {e}")
-            return False
 
 def main():
     """Main function to process all GDScript files in the project."""
@@ -186,15 +254,20 @@ def main():
 
     print(f"Found {len(gd_files)} GDScript files to process...")
 
-    success_count = 0
+    reordered = 0
+    failed = 0
     for gd_file in gd_files:
-        print(f"Processing: {gd_file}")
-        if reorganizer.reorganize_file(str(gd_file)):
-            success_count += 1
-        else:
-            print(f"Failed to process: {gd_file}")
+        try:
+            if reorganizer.reorganize_file(str(gd_file)):
+                reordered += 1
+                print(f"Reordered: {gd_file}")
+        except Exception as e:
+            failed += 1
+            print(f"Failed to process {gd_file}: {e}")
 
-    print(f"\nCompleted! Successfully processed {success_count}/{len(gd_files)} files.")
+    unchanged = len(gd_files) - reordered - failed
+    print(f"\nCompleted! Reordered {reordered} files, {unchanged} already in order,"
+          f" {failed} failed.")
 
 if __name__ == "__main__":
     main()
@@ -7,6 +7,9 @@ This script specifically fixes the critical autoload files that are preventing
 the project from starting in Godot 4. It focuses on restoring proper function
 structure and fixing parse errors in essential services.
 
+Regenerated autoloads wrap _ready and their heavy init steps in StartupTrace
+spans. Render the dumped trace with tools/python/startup_trace.py.
+
 Usage:
     python3 fix_critical_autoloads.py
 """
@@ -28,6 +31,7 @@ extends Node
 
 # === CONSTANTS ===
 const KNOWLEDGE_BASE_PATH = "res://assets/data/anatomical_data.json"
+const TRACE_OWNER = "KB"
 
 # === VARIABLES ===
 var structures: Dictionary = {}
@@ -41,7 +45,11 @@ var load_error: String = ""
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize the knowledge database"""
+	var trace_start = StartupTrace.begin()
+	var step_start = StartupTrace.begin()
 	load_knowledge_base()
+	StartupTrace.end(TRACE_OWNER, "load_knowledge_base", step_start)
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 # === PUBLIC METHODS ===
 func load_knowledge_base() -> bool:
@@ -65,8 +73,10 @@ func load_knowledge_base() -> bool:
 	var json_text = file.get_as_text()
 	file.close()
 	
+	var parse_start = StartupTrace.begin()
 	var json = JSON.new()
 	var json_parse_result = json.parse(json_text)
+	StartupTrace.end(TRACE_OWNER, "parse_json", parse_start)
 	
 	if json_parse_result != OK:
 		load_error = "Failed to parse JSON. Error: " + str(json_parse_result)
@@ -158,6 +168,7 @@ extends Node
 
 # === CONSTANTS ===
 const KNOWLEDGE_BASE_PATH = "res://assets/data/anatomical_data.json"
+const TRACE_OWNER = "KnowledgeService"
 
 # === SIGNALS ===
 signal knowledge_loaded()
@@ -172,7 +183,11 @@ var _load_error: String = ""
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize the knowledge service"""
+	var trace_start = StartupTrace.begin()
+	var step_start = StartupTrace.begin()
 	_load_knowledge_base()
+	StartupTrace.end(TRACE_OWNER, "_load_knowledge_base", step_start)
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 # === PUBLIC METHODS ===
 func is_initialized() -> bool:
@@ -229,8 +244,10 @@ func _load_knowledge_base() -> void:
 	var json_text = file.get_as_text()
 	file.close()
 	
+	var parse_start = StartupTrace.begin()
 	var json = JSON.new()
 	var parse_result = json.parse(json_text)
+	StartupTrace.end(TRACE_OWNER, "parse_json", parse_start)
 	
 	if parse_result != OK:
 		_load_error = "JSON parse error: " + str(parse_result)
@@ -239,7 +256,9 @@ func _load_knowledge_base() -> void:
 		return
 	
 	var data = json.get_data()
+	var process_start = StartupTrace.begin()
 	_process_knowledge_data(data)
+	StartupTrace.end(TRACE_OWNER, "_process_knowledge_data", process_start)
 
 func _process_knowledge_data(data: Dictionary) -> void:
 	"""Process loaded knowledge data"""
@@ -310,6 +329,9 @@ extends Node
 ## Provides analytics and insights for anatomical learning
 ## @version: 1.0
 
+# === CONSTANTS ===
+const TRACE_OWNER = "StructureAnalysisManager"
+
 # === VARIABLES ===
 var _analysis_data: Dictionary = {}
 var _is_initialized: bool = false
@@ -317,7 +339,9 @@ var _is_initialized: bool = false
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize the analysis manager"""
+	var trace_start = StartupTrace.begin()
 	_initialize_analysis_system()
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 # === PUBLIC METHODS ===
 func analyze_structure(structure_id: String) -> Dictionary:
@@ -337,7 +361,9 @@ func get_learning_insights(structure_id: String) -> Array:
 func _initialize_analysis_system() -> void:
 	"""Initialize the analysis system"""
 	print("[StructureAnalysisManager] Initializing analysis system...")
+	var step_start = StartupTrace.begin()
 	_load_configuration()
+	StartupTrace.end(TRACE_OWNER, "_load_configuration", step_start)
 	_is_initialized = true
 	print("[StructureAnalysisManager] Analysis system ready")
 
@@ -379,6 +405,7 @@ extends Node
 
 # === CONSTANTS ===
 const DEFAULT_MODEL = "gemini-1.5-flash"
+const TRACE_OWNER = "AIAssistant"
 
 # === SIGNALS ===
 signal response_received(response: String)
@@ -392,7 +419,9 @@ var _provider_registry: AIProviderRegistry
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize AI assistant service"""
+	var trace_start = StartupTrace.begin()
 	_initialize_service()
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 # === PUBLIC METHODS ===
 func is_available() -> bool:
@@ -419,7 +448,9 @@ func set_provider(provider_name: String) -> bool:
 func _initialize_service() -> void:
 	"""Initialize the AI service"""
 	print("[AIAssistant] Initializing AI assistant service...")
+	var step_start = StartupTrace.begin()
 	_provider_registry = AIProviderRegistry.new()
+	StartupTrace.end(TRACE_OWNER, "create_provider_registry", step_start)
 	_is_initialized = true
 	print("[AIAssistant] AI assistant service ready")
 '''
@@ -441,6 +472,7 @@ extends Node
 
 # === CONSTANTS ===
 const API_BASE_URL = "https://generativelanguage.googleapis.com"
+const TRACE_OWNER = "GeminiAI"
 
 # === SIGNALS ===
 signal response_ready(response: String)
@@ -453,7 +485,9 @@ var _is_configured: bool = false
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize Gemini service"""
+	var trace_start = StartupTrace.begin()
 	_load_configuration()
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 # === PUBLIC METHODS ===
 func configure_api_key(api_key: String) -> void:
@@ -507,6 +541,9 @@ enum ThemeMode {
 	MINIMAL    # Professional/clinical style
 }
 
+# === CONSTANTS ===
+const TRACE_OWNER = "UIThemeManager"
+
 # === SIGNALS ===
 signal theme_changed(new_theme: ThemeMode)
 
@@ -517,7 +554,9 @@ var _is_initialized: bool = false
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize theme manager"""
+	var trace_start = StartupTrace.begin()
 	_initialize_themes()
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 # === PUBLIC METHODS ===
 func set_theme_mode(mode: ThemeMode) -> void:
@@ -544,7 +583,9 @@ func is_minimal_mode() -> bool:
 func _initialize_themes() -> void:
 	"""Initialize the theme system"""
 	print("[UIThemeManager] Initializing theme system...")
+	var step_start = StartupTrace.begin()
 	_apply_theme()
+	StartupTrace.end(TRACE_OWNER, "_apply_theme", step_start)
 	_is_initialized = true
 	print("[UIThemeManager] Theme system ready")
 
@@ -13,9 +13,18 @@ Features:
 - Creates automatic backup before fixing
 - Fixes onready var -> @onready
 - Fixes export(...) -> @export
-- Fixes signal connections/disconnections/emissions
-- Fixes variable name conflicts
+- Fixes signal connections/disconnections/emissions: Godot 3 target/method
+  strings, binds arrays and flags become Callables (tools/python/signal_rewrite.py)
+- Applies the Godot 4 API renames from tools/python/data/godot4_renames.csv
+  (Spatial -> Node3D, .instance() -> .instantiate(), ...) in one token scan
+- Fixes variable name conflicts: redeclared locals are renamed with all their
+  references using a per-function scope tree (tools/python/scope_resolver.py);
+  files without repeated names are skipped using the project symbol index
 - Fixes indentation issues
+- Caches repeated $Path/get_node() lookups in typed @onready members when
+  the owning scenes confirm the path (tools/python/onready_cache.py)
+- Adds static type annotations that can be inferred with high confidence
+  (tools/python/static_typing.py)
 - Preserves educational context and medical terminology
 """
 
@@ -25,7 +34,45 @@ import shutil
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'tools' / 'python'))
+
+# Each stage imports its own tool from tools/python. A stage whose tool
+# cannot be imported is listed here with the reason and leaves files alone.
+DISABLED_STAGES: Dict[str, str] = {}
+
+try:
+    from symbol_index import SymbolIndex, relative_script_path
+except ImportError as e:
+    SymbolIndex = None
+    DISABLED_STAGES['symbol index (typing, node lookups, renames)'] = str(e)
+try:
+    from static_typing import ProjectTypes, StaticTypingMigrator
+except ImportError as e:
+    StaticTypingMigrator = None
+    DISABLED_STAGES['static typing'] = str(e)
+try:
+    from onready_cache import NodeLookupCacher
+except ImportError as e:
+    NodeLookupCacher = None
+    DISABLED_STAGES['node lookup caching'] = str(e)
+try:
+    from api_rename import open_matcher
+except ImportError as e:
+    open_matcher = None
+    DISABLED_STAGES['API renames'] = str(e)
+try:
+    from signal_rewrite import CONNECTION_CALLS, EMIT_CALLS, rewrite_signal_calls
+except ImportError as e:
+    rewrite_signal_calls = None
+    CONNECTION_CALLS = EMIT_CALLS = set()
+    DISABLED_STAGES['signal connections/emissions'] = str(e)
+try:
+    from scope_resolver import resolve_conflicts
+except ImportError as e:
+    resolve_conflicts = None
+    DISABLED_STAGES['variable conflicts'] = str(e)
 
 class GodotSyntaxFixer:
     def __init__(self, project_root: str):
@@ -47,6 +94,15 @@ class GodotSyntaxFixer:
             r'syntax_fix_backup_.*',
         ]
         
+        # Shared symbol index and typing stage (opened lazily by fix_all_files)
+        self.symbol_index = None
+        self.typing_migrator = None
+        self.lookup_cacher = None
+        self.rename_matcher = None
+        
+        # Signal calls the rewriter could not convert: (file, report)
+        self.signal_reviews = []
+        
     def create_backup(self) -> bool:
         """Create a complete backup of the project before making changes"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -139,66 +195,32 @@ class GodotSyntaxFixer:
         
         return '\n'.join(lines), fixes
     
-    def fix_signal_connections(self, content: str) -> Tuple[str, int]:
-        """Fix old signal connection syntax"""
-        fixes = 0
-        
-        # Fix .connect("signal_name", ...) -> signal_name.connect(...)
-        pattern = r'(\w+)\.connect\s*\(\s*["\']([^"\']+)["\']\s*,\s*([^)]+)\)'
-        def replace_connect(match):
-            nonlocal fixes
-            fixes += 1
-            object_name = match.group(1)
-            signal_name = match.group(2)
-            callback = match.group(3)
-            return f'{object_name}.{signal_name}.connect({callback})'
-        
-        content = re.sub(pattern, replace_connect, content)
-        
-        # Fix .disconnect("signal_name", ...) -> signal_name.disconnect(...)
-        pattern = r'(\w+)\.disconnect\s*\(\s*["\']([^"\']+)["\']\s*,\s*([^)]+)\)'
-        def replace_disconnect(match):
-            nonlocal fixes
-            fixes += 1
-            object_name = match.group(1)
-            signal_name = match.group(2)
-            callback = match.group(3)
-            return f'{object_name}.{signal_name}.disconnect({callback})'
-        
-        content = re.sub(pattern, replace_disconnect, content)
-        
-        # Fix .is_connected("signal_name", ...) -> signal_name.is_connected(...)
-        pattern = r'(\w+)\.is_connected\s*\(\s*["\']([^"\']+)["\']\s*,\s*([^)]+)\)'
-        def replace_is_connected(match):
-            nonlocal fixes
-            fixes += 1
-            object_name = match.group(1)
-            signal_name = match.group(2)
-            callback = match.group(3)
-            return f'{object_name}.{signal_name}.is_connected({callback})'
-        
-        content = re.sub(pattern, replace_is_connected, content)
-        
-        return content, fixes
+    def fix_signal_connections(self, content: str,
+                               file_path: Optional[Path] = None) -> Tuple[str, int]:
+        """Fix connect("sig", target, "method", binds, flags) -> sig.connect(Callable)
+        
+        Also converts disconnect() and is_connected(). Arguments are split with
+        the token-based parser in tools/python/signal_rewrite.py, so nested
+        calls and binds arrays survive; unsafe calls are left for review.
+        """
+        return self._rewrite_signals(content, file_path, CONNECTION_CALLS)
     
-    def fix_emit_signal(self, content: str) -> Tuple[str, int]:
+    def fix_emit_signal(self, content: str,
+                        file_path: Optional[Path] = None) -> Tuple[str, int]:
         """Fix emit_signal("name", ...) -> signal_name.emit(...)"""
+        return self._rewrite_signals(content, file_path, EMIT_CALLS)
+    
+    def _rewrite_signals(self, content: str, file_path: Optional[Path],
+                         kinds: Set[str]) -> Tuple[str, int]:
+        if rewrite_signal_calls is None:
+            return content, 0
+        content, reports = rewrite_signal_calls(content, kinds)
         fixes = 0
-        
-        # Pattern for emit_signal("signal_name", args...)
-        pattern = r'emit_signal\s*\(\s*["\']([^"\']+)["\']\s*,?\s*([^)]*)\)'
-        
-        def replace_emit(match):
-            nonlocal fixes
-            fixes += 1
-            signal_name = match.group(1)
-            args = match.group(2).strip()
-            if args:
-                return f'{signal_name}.emit({args})'
+        for report in reports:
+            if report.problem is None:
+                fixes += 1
             else:
-                return f'{signal_name}.emit()'
-        
-        content = re.sub(pattern, replace_emit, content)
+                self.signal_reviews.append((file_path, report))
         return content, fixes
     
     def fix_tool_syntax(self, content: str) -> Tuple[str, int]:
@@ -231,35 +253,52 @@ class GodotSyntaxFixer:
         content = re.sub(pattern, replace_yield, content)
         return content, fixes
     
-    def fix_variable_conflicts(self, content: str) -> Tuple[str, int]:
-        """Fix variable name conflicts like duplicate 'err' variables"""
-        fixes = 0
-        lines = content.split('\n')
-        
-        # Track variable names in current scope
-        declared_vars = set()
-        
-        for i, line in enumerate(lines):
-            # Look for variable declarations
-            var_match = re.search(r'^\s*var\s+(\w+)', line)
-            if var_match:
-                var_name = var_match.group(1)
-                if var_name in declared_vars:
-                    # Rename the variable
-                    new_name = f'{var_name}_2'
-                    counter = 2
-                    while new_name in declared_vars:
-                        counter += 1
-                        new_name = f'{var_name}_{counter}'
-                    
-                    # Replace in this line
-                    lines[i] = line.replace(f'var {var_name}', f'var {new_name}')
-                    declared_vars.add(new_name)
-                    fixes += 1
-                else:
-                    declared_vars.add(var_name)
-        
-        return '\n'.join(lines), fixes
+    def fix_api_renames(self, content: str) -> Tuple[str, int]:
+        """Rename Godot 3 API identifiers: Spatial -> Node3D, rand_range -> randf_range
+        
+        Uses the shared rename table; strings and comments are left alone.
+        """
+        if self.rename_matcher is None:
+            return content, 0
+        return self.rename_matcher.fix(content)
+    
+    def fix_variable_conflicts(self, content: str,
+                               repeated: Optional[Set[str]] = None) -> Tuple[str, int]:
+        """Fix variable name conflicts like a second 'var err' in a nested block
+        
+        Only locals that redeclare a name visible in their scope are renamed,
+        together with all their references (tools/python/scope_resolver.py).
+        `repeated` is the set of names the symbol index saw declared more than
+        once in this file; an empty set means there is nothing to rename.
+        """
+        if resolve_conflicts is None or (repeated is not None and not repeated):
+            return content, 0
+        content, conflicts = resolve_conflicts(content)
+        return content, sum(1 for c in conflicts if c.new_name is not None)
+    
+    def fix_node_lookups(self, content: str, file_path: Path) -> Tuple[str, int]:
+        """Hoist repeated node lookups: $UI/Label.text -> label.text
+        
+        Only paths that exist in every scene using the script are hoisted;
+        the new @onready members are typed from those scenes.
+        """
+        if self.lookup_cacher is None:
+            return content, 0
+        try:
+            relative = relative_script_path(self.project_root, file_path)
+        except ValueError:
+            return content, 0
+        return self.lookup_cacher.fix(content, relative)
+    
+    def fix_static_types(self, content: str, file_path: Path) -> Tuple[str, int]:
+        """Annotate untyped declarations: var x = 0 -> var x: int = 0
+        
+        Runs last, on Godot 4 syntax. Only high-confidence inferences are
+        applied; ambiguous declarations are left untouched.
+        """
+        if self.typing_migrator is None:
+            return content, 0
+        return self.typing_migrator.fix(content, str(file_path))
     
     def fix_indentation_issues(self, content: str) -> Tuple[str, int]:
         """Fix common indentation issues that cause parse errors"""
@@ -294,6 +333,16 @@ class GodotSyntaxFixer:
         
         return '\n'.join(lines), fixes
     
+    def repeated_variables(self, file_path: Path) -> Optional[Set[str]]:
+        """Repeated variable names from the symbol index (None without an index)"""
+        if self.symbol_index is None:
+            return None
+        try:
+            relative = relative_script_path(self.project_root, file_path)
+        except ValueError:
+            return None
+        return self.symbol_index.repeated_variables(relative)
+    
     def fix_file(self, file_path: Path) -> Dict:
         """Fix a single GDScript file"""
         if not file_path.suffix == '.gd':
@@ -323,16 +372,26 @@ class GodotSyntaxFixer:
             content, fixes = self.fix_export_syntax(content)
             total_fixes += fixes
             
-            content, fixes = self.fix_signal_connections(content)
+            content, fixes = self.fix_signal_connections(content, file_path)
             total_fixes += fixes
             
-            content, fixes = self.fix_emit_signal(content)
+            content, fixes = self.fix_emit_signal(content, file_path)
             total_fixes += fixes
             
             content, fixes = self.fix_yield_syntax(content)
             total_fixes += fixes
             
-            content, fixes = self.fix_variable_conflicts(content)
+            content, fixes = self.fix_api_renames(content)
+            total_fixes += fixes
+            
+            content, fixes = self.fix_variable_conflicts(
+                content, self.repeated_variables(file_path))
+            total_fixes += fixes
+            
+            content, fixes = self.fix_node_lookups(content, file_path)
+            total_fixes += fixes
+            
+            content, fixes = self.fix_static_types(content, file_path)
             total_fixes += fixes
             
             # Write back if changes were made
@@ -359,6 +418,24 @@ class GodotSyntaxFixer:
         fixed_files = 0
         total_fixes = 0
         
+        for stage, reason in DISABLED_STAGES.items():
+            print(f"⚠️  Stage disabled, {stage}: {reason}")
+        
+        if SymbolIndex is not None and (self.project_root / 'project.godot').exists():
+            self.symbol_index = SymbolIndex(self.project_root)
+            stats = self.symbol_index.update()
+            print(f"🔄 Symbol index: {stats.parsed} of {stats.scanned} scripts re-parsed")
+            if StaticTypingMigrator is not None:
+                self.typing_migrator = StaticTypingMigrator(
+                    ProjectTypes.from_index(self.symbol_index))
+            if NodeLookupCacher is not None:
+                self.lookup_cacher = NodeLookupCacher(self.project_root, self.symbol_index)
+            if open_matcher is not None:
+                self.rename_matcher, dropped = open_matcher(
+                    self.project_root, index=self.symbol_index)
+                for rename in dropped:
+                    print(f"⏭️  Rename {rename.old} skipped: defined by the project")
+        
         # Walk through all .gd files
         for gd_file in self.project_root.rglob('*.gd'):
             total_files += 1
@@ -381,6 +458,13 @@ class GodotSyntaxFixer:
         print(f"   Files fixed: {fixed_files}")
         print(f"   Total fixes applied: {total_fixes}")
         print(f"   Errors: {len(self.errors)}")
+        print(f"   Signal calls left for review: {len(self.signal_reviews)}")
+        
+        if self.signal_reviews:
+            print(f"\n⚠️  Signal calls to convert by hand:")
+            for file_path, report in self.signal_reviews:
+                relative_path = file_path.relative_to(self.project_root)
+                print(f"   {relative_path}:{report.line} {report.call}: {report.problem}")
         
         if self.errors:
             print(f"\n❌ Files with errors:")
@@ -1,24 +1,31 @@
 #!/usr/bin/env python3
-"""Fix ModularInfoPanel loading issue by ensuring proper dependency loading order."""
+"""Fix ModularInfoPanel loading issue by ensuring proper dependency loading order.
+
+The preloads to insert are computed from the project's dependency graph
+(tools/python/dependency_graph.py): every base class of a preloaded script is
+preloaded before it, so the fix follows the inheritance chain as it is today
+instead of a hard-coded list.
+"""
 
-import re
 import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "tools" / "python"))
+from dependency_graph import DependencyGraph  # noqa: E402
 
-# Read the node_3d.gd file
 file_path = "scenes/main/node_3d.gd"
 if not os.path.exists(file_path):
     print(f"Error: {file_path} not found!")
     exit(1)
 
-with open(file_path, 'r') as f:
-    content = f.read()
-
-# Find the line with "# New UI Component System" 
-pattern = r'(# New UI Component System\n)'
-replacement = r'# New UI Component System - Load base classes first to ensure proper dependency resolution\nconst BaseUIComponent = preload("res://ui/components/core/BaseUIComponent.gd")\nconst ResponsiveComponent = preload("res://ui/components/core/ResponsiveComponent.gd")\n'
+graph = DependencyGraph.open(Path.cwd())
+fixes = graph.preload_fixes(file_path)
+if not fixes:
+    print("✅ Preload order in node_3d.gd already matches the dependency graph.")
+    exit(0)
 
-# Replace the pattern
-new_content = re.sub(pattern, replacement, content)
+_, new_content = graph.apply_preload_fixes(file_path)
 
 # Save the file
 with open(file_path, 'w') as f:
@@ -26,8 +33,11 @@ with open(file_path, 'w') as f:
 
 print("✅ Fixed ModularInfoPanel loading issue!")
 print("The dependency chain is now properly loaded:")
-print("  1. BaseUIComponent")
-print("  2. ResponsiveComponent") 
-print("  3. UIComponentFactory")
-print("  4. ModularInfoPanel (extends ResponsiveComponent)")
+step = 1
+for line, target, bases in fixes:
+    for base in bases:
+        print(f"  {step}. {Path(base).stem}")
+        step += 1
+    print(f"  {step}. {Path(target).stem} (line {line})")
+    step += 1
 print("\nYou can now run your project without the parser error.")
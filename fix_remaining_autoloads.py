@@ -5,6 +5,9 @@ Fix Remaining Autoload Issues
 
 This script fixes the remaining autoload files that have parse errors
 preventing the NeuroVis project from starting properly in Godot 4.
+
+Like fix_critical_autoloads.py, the generated _ready functions record
+StartupTrace spans for tools/python/startup_trace.py.
 """
 
 import os
@@ -27,6 +30,7 @@ signal accessibility_changed(feature: String, enabled: bool)
 const SETTINGS_FILE = "user://accessibility_settings.cfg"
 const MIN_FONT_SIZE = 12
 const MAX_FONT_SIZE = 32
+const TRACE_OWNER = "AccessibilityManager"
 
 # === VARIABLES ===
 var _config: ConfigFile
@@ -38,10 +42,16 @@ var _motion_reduced: bool = false
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize accessibility manager"""
+	var trace_start = StartupTrace.begin()
 	_config = ConfigFile.new()
+	var step_start = StartupTrace.begin()
 	_load_settings()
+	StartupTrace.end(TRACE_OWNER, "_load_settings", step_start)
+	step_start = StartupTrace.begin()
 	_apply_accessibility_features()
+	StartupTrace.end(TRACE_OWNER, "_apply_accessibility_features", step_start)
 	print("[AccessibilityManager] Accessibility system ready")
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 # === PUBLIC METHODS ===
 func set_font_size(size: int) -> void:
@@ -134,6 +144,7 @@ signal layer_switched(layer_name: String)
 
 # === CONSTANTS ===
 const DEFAULT_MODELS = ["Half_Brain", "Internal_Structures", "Brainstem"]
+const TRACE_OWNER = "ModelSwitcherGlobal"
 
 # === VARIABLES ===
 var _model_registry: Dictionary = {}
@@ -143,8 +154,10 @@ var _current_layer: String = "default"
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize model visibility manager"""
+	var trace_start = StartupTrace.begin()
 	_initialize_model_registry()
 	print("[ModelVisibilityManager] Model visibility system ready")
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 # === PUBLIC METHODS ===
 func register_model(model_name: String, model_node: Node3D) -> void:
@@ -231,6 +244,7 @@ signal command_executed(command: String, result: String)
 
 # === CONSTANTS ===
 const MAX_LOG_ENTRIES = 100
+const TRACE_OWNER = "DebugCmd"
 
 # === VARIABLES ===
 var _command_registry: Dictionary = {}
@@ -240,8 +254,12 @@ var _is_console_visible: bool = false
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize debug commands system"""
+	var trace_start = StartupTrace.begin()
+	var step_start = StartupTrace.begin()
 	_register_default_commands()
+	StartupTrace.end(TRACE_OWNER, "_register_default_commands", step_start)
 	print("[DebugCmd] Debug commands system ready")
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
 
 func _input(event: InputEvent) -> void:
 	"""Handle debug console input"""
@@ -404,37 +422,82 @@ def fix_feature_flags():
 
 ## Educational Feature Flags System
 ## Manages feature toggles for educational platform development
-## @version: 1.0
+##
+## Reads go through an immutable snapshot that is republished after every
+## change, so hot-path is_enabled() checks never touch the dictionary being
+## mutated. Writes mark the config dirty and are flushed to disk once per
+## idle frame (or on exit) instead of once per toggled flag.
+## @version: 1.1
+
+# === SIGNALS ===
+signal features_changed(changed: Dictionary)
 
 # === CONSTANTS ===
 const FEATURES_FILE = "user://feature_flags.cfg"
+const TRACE_OWNER = "FeatureFlags"
 
 # === VARIABLES ===
 var _features: Dictionary = {}
+var _snapshot: Dictionary = {}
 var _config: ConfigFile
+var _dirty: bool = false
+var _flush_scheduled: bool = false
 
 # === LIFECYCLE ===
 func _ready() -> void:
 	"""Initialize feature flags system"""
+	var trace_start = StartupTrace.begin()
 	_config = ConfigFile.new()
 	_load_default_features()
+	var step_start = StartupTrace.begin()
 	_load_feature_config()
+	StartupTrace.end(TRACE_OWNER, "_load_feature_config", step_start)
+	_publish_snapshot()
 	print("[FeatureFlags] Feature flags system ready")
+	StartupTrace.end(TRACE_OWNER, "_ready", trace_start)
+
+func _notification(what: int) -> void:
+	"""Flush pending changes before the application quits"""
+	if what == NOTIFICATION_WM_CLOSE_REQUEST or what == NOTIFICATION_PREDELETE:
+		flush()
 
 # === PUBLIC METHODS ===
 func is_enabled(feature_name: String) -> bool:
 	"""Check if educational feature is enabled"""
-	return _features.get(feature_name, false)
+	return _snapshot.get(feature_name, false)
 
 func enable_feature(feature_name: String, enabled: bool = true) -> void:
 	"""Enable/disable educational feature"""
-	_features[feature_name] = enabled
-	_save_feature_config()
+	apply_profile({feature_name: enabled})
 	print("[FeatureFlags] Feature " + feature_name + " set to: " + str(enabled))
 
+func apply_profile(profile: Dictionary) -> void:
+	"""Set many educational features at once with a single deferred save"""
+	var changed: Dictionary = {}
+	for feature_name in profile:
+		var enabled: bool = profile[feature_name]
+		if _features.get(feature_name) != enabled:
+			_features[feature_name] = enabled
+			changed[feature_name] = enabled
+
+	if changed.is_empty():
+		return
+
+	_publish_snapshot()
+	_mark_dirty()
+	features_changed.emit(changed)
+
 func get_all_features() -> Dictionary:
-	"""Get all educational feature flags"""
-	return _features.duplicate()
+	"""Get all educational feature flags (read-only snapshot)"""
+	return _snapshot
+
+func flush() -> void:
+	"""Write pending feature changes to disk now"""
+	_flush_scheduled = false
+	if not _dirty or _config == null:
+		return
+	_dirty = false
+	_save_feature_config()
 
 # === PRIVATE METHODS ===
 func _load_default_features() -> void:
@@ -455,6 +518,19 @@ func _load_feature_config() -> void:
 		for feature in _features.keys():
 			_features[feature] = _config.get_value("features", feature, _features[feature])
 
+func _publish_snapshot() -> void:
+	"""Replace the read-only snapshot used by is_enabled()"""
+	var snapshot = _features.duplicate()
+	snapshot.make_read_only()
+	_snapshot = snapshot
+
+func _mark_dirty() -> void:
+	"""Coalesce saves into one write at the end of the current frame"""
+	_dirty = true
+	if not _flush_scheduled:
+		_flush_scheduled = true
+		flush.call_deferred()
+
 func _save_feature_config() -> void:
 	"""Save feature configuration to file"""
 	for feature in _features.keys():
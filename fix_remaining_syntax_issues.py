@@ -2,8 +2,15 @@
 """Fix remaining syntax issues in NeuroVis GDScript files."""
 
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "tools" / "python"))
+try:
+    from symbol_index import SymbolIndex, relative_script_path
+except ImportError:  # tools/python not available, fall back to per-file view
+    SymbolIndex = None
+
 def fix_indentation_and_structure(content):
     """Fix severe indentation and structural issues."""
     lines = content.split('\n')
@@ -148,8 +155,13 @@ def fix_indentation_and_structure(content):
 
     return '\n'.join(fixed_lines)
 
-def fix_orphaned_variables(content):
-    """Fix orphaned variable references from commented code."""
+def fix_orphaned_variables(content, declared=None):
+    """Fix orphaned variable references from commented code.
+
+    `declared` holds the member names the symbol index still sees in this
+    script and its base scripts; those are not orphaned even if one
+    declaration of the same name was commented out.
+    """
     lines = content.split('\n')
     fixed_lines = []
 
@@ -164,6 +176,9 @@ def fix_orphaned_variables(content):
             if var_match:
                 orphaned_vars.add(var_match.group(1))
 
+    if declared:
+        orphaned_vars -= declared
+
     # Second pass: fix references to orphaned variables
     for line in lines:
         if '# FIXED: Orphaned code' in line:
@@ -220,7 +235,16 @@ def fix_specific_file_issues(filepath, content):
 
     return content
 
-def process_file(filepath):
+def declared_members(index, filepath):
+    """Member names of a script and its base scripts from the symbol index."""
+    if index is None:
+        return None
+    try:
+        return index.member_names(relative_script_path(index.root, filepath))
+    except ValueError:
+        return None
+
+def process_file(filepath, index=None):
     """Process a single file."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -230,7 +254,7 @@ def process_file(filepath):
 
         # Apply general fixes
         content = fix_indentation_and_structure(content)
-        content = fix_orphaned_variables(content)
+        content = fix_orphaned_variables(content, declared_members(index, filepath))
 
         # Apply file-specific fixes
         content = fix_specific_file_issues(filepath, content)
@@ -261,13 +285,17 @@ def main():
     ]
 
     fixed_count = 0
+    index = None
+    if SymbolIndex is not None and (project_root / "project.godot").exists():
+        index = SymbolIndex(project_root)
+        index.update()
 
     print("Fixing priority files with syntax issues...")
     for file_path in priority_files:
         full_path = project_root / file_path
         if full_path.exists():
             print(f"Processing: {file_path}")
-            if process_file(full_path):
+            if process_file(full_path, index):
                 fixed_count += 1
                 print(f"  ✓ Fixed")
             else:
@@ -288,7 +316,7 @@ def main():
                      'return panel' in content and 'var panel' not in content)):
 
                     print(f"Processing: {relative_path}")
-                    if process_file(gd_file):
+                    if process_file(gd_file, index):
                         fixed_count += 1
                         print(f"  ✓ Fixed")
 
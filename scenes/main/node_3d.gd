@@ -65,6 +65,7 @@ var comparative_panel: Control
 var loading_progress: Control
 var visual_feedback: Node
 var _selected_structure: String = ""
+var _selection_prepared_models: Array = []
 
 
 # ===== LIFECYCLE METHODS =====
@@ -463,7 +464,7 @@ func _load_models_basic() -> void:
 				print("[Models] Loaded: " + instance.name)
 
 	if loaded_models.size() > 0:
-		models_loaded.emit(loaded_models)
+		_on_models_loaded(loaded_models)
 
 
 func _finalize_initialization(start_time: int) -> void:
@@ -651,6 +652,9 @@ func _on_models_loaded(model_names: Array) -> void:
 
 	print("[Models] Successfully loaded models: ", model_names)
 
+	# Baked selection proxies replace the trimesh pick colliders
+	_prepare_models_for_selection(model_names)
+
 	# Ensure at least one model is visible
 	var model_switcher = get_node_or_null("/root/ModelSwitcherGlobal")
 	if model_names.size() > 0 and model_switcher:
@@ -671,6 +675,19 @@ func _on_models_loaded(model_names: Array) -> void:
 	models_loaded.emit(model_names)
 
 
+func _prepare_models_for_selection(model_names: Array) -> void:
+	"""Hand each newly loaded model to the selection manager once"""
+	if not selection_manager or not selection_manager.has_method("prepare_model"):
+		return
+
+	for loaded_name in model_names:
+		var model_name: String = String(loaded_name)
+		var model_root = brain_model_parent.get_node_or_null(NodePath(model_name))
+		if model_root is Node3D and not model_name in _selection_prepared_models:
+			_selection_prepared_models.append(model_name)
+			selection_manager.prepare_model(model_root)
+
+
 func _on_model_load_failed(model_path: String, error: String) -> void:
 	"""Handle model loading failure"""
 	push_error("[Model] Failed to load %s: %s" % [model_path, error])
@@ -12,6 +12,8 @@ echo ""
 PROJECT_NAME="NeuroVis"
 PROJECT_PATH="/Users/gagelaporta/1NeuroPro/NeuroVisProject/1/(4)NeuroVis copy"
 BUILD_PATH="$PROJECT_PATH/builds"
+# Release exports are made from a copy of the project with debug output stripped
+RELEASE_SOURCE_PATH="$BUILD_PATH/release_src"
 GODOT_PATH="/Applications/Godot.app/Contents/MacOS/Godot"
 VERSION="1.0.0"
 BUILD_DATE=$(date +%Y%m%d)
@@ -36,7 +38,7 @@ build_platform() {
     
     echo "📦 Building for $platform..."
     
-    "$GODOT_PATH" --headless --path "$PROJECT_PATH" \
+    "$GODOT_PATH" --headless --path "$RELEASE_SOURCE_PATH" \
         --export-release "$export_preset" "$output_path"
     
     if [ $? -eq 0 ]; then
@@ -47,6 +49,21 @@ build_platform() {
     fi
 }
 
+# Function to write the release copy of the project
+strip_release_sources() {
+    echo "✂️  Stripping debug output from scripts..."
+    
+    # Line numbers are preserved; removed lines are listed in
+    # $BUILD_PATH/release_strip_map.json for reading crash reports
+    python3 "$PROJECT_PATH/tools/python/release_strip.py" \
+        --project "$PROJECT_PATH" --output "$RELEASE_SOURCE_PATH"
+    
+    if [ $? -ne 0 ]; then
+        echo "❌ Release strip failed!"
+        return 1
+    fi
+}
+
 # Function to create macOS DMG
 create_macos_dmg() {
     echo "💿 Creating macOS DMG..."
@@ -190,6 +207,19 @@ main() {
         exit 1
     fi
     
+    # Baked structure BVHs are raw files that only ship when included explicitly
+    if ! grep -q '^include_filter=".*\*\.bvh' "$PROJECT_PATH/export_presets.cfg"; then
+        echo "⚠️  Warning: no export preset has *.bvh in include_filter"
+        echo "Add *.bvh to each preset's resource filters so hover queries use the baked BVHs."
+    fi
+    
+    # Export from the stripped copy of the project
+    case "$1" in
+        "windows"|"macos"|"linux"|"all")
+            strip_release_sources
+            ;;
+    esac
+    
     # Build for each platform
     case "$1" in
         "windows")
@@ -47,21 +47,21 @@ while IFS= read -r -d '' file; do
 done < <(find . -name "*.gd" -not -path "./.git/*" -print0 2>/dev/null)
 echo ""
 
-# Check Scene file errors
-echo -e "${BLUE}2. Checking Scene Files...${NC}"
-scene_count=0
-while IFS= read -r -d '' file; do
-    scene_count=$((scene_count + 1))
-    echo -ne "\rChecking scene file $scene_count: $(basename "$file")"
-    
-    error_output=$(/Applications/Godot.app/Contents/MacOS/Godot --headless --check-only "$file" 2>&1)
-    exit_code=$?
-    
-    if [ $exit_code -ne 0 ]; then
-        error_details=$(echo "$error_output" | head -1)
-        add_error "scene" "$file" "$error_details"
-    fi
-done < <(find . -name "*.tscn" -not -path "./.git/*" -print0 2>/dev/null)
+# Check Scene file errors (parsed in Python, no Godot run per scene)
+echo -e "${BLUE}2. Checking Scene and Resource Files...${NC}"
+scene_output=$(python3 tools/python/scene_validate.py 2>&1)
+current_file=""
+while IFS= read -r line; do
+    case "$line" in
+        res://*)
+            current_file="$line"
+            ;;
+        *"❌"*)
+            add_error "scene" "$current_file" "$(echo "$line" | sed 's/^ *❌ *//')"
+            ;;
+    esac
+done <<< "$scene_output"
+echo "$scene_output" | grep -E "^ +(Scenes|Resources|Time):"
 echo ""
 
 # Generate error report
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Godot 3 -> 4 API Renames for NeuroVis
+=====================================
+
+Applies the identifier renames of the Godot 4 migration from a data table
+(data/godot4_renames.csv) instead of one regex per rename:
+
+    Spatial                 ->  Node3D
+    rand_range(             ->  randf_range(
+    .instance(              ->  .instantiate(
+    OS.get_ticks_msec(      ->  Time.get_ticks_msec(
+    .rect_min_size          ->  .custom_minimum_size
+
+Every pattern is tokenized with gdscript_lexer and all of them are compiled
+into one trie keyed by token text. A file is tokenized once and the trie is
+walked from each identifier, so the cost is one linear scan per file however
+many rows the table has. Strings and comments are never touched.
+
+Matching rules:
+
+- a pattern starting with a name never matches after `.` (`foo.Spatial`
+  is someone else's member), nor right after var/const/func/class/signal
+- a pattern starting with `.` only matches member access
+- a class rename (one CamelCase name) only matches where a type can stand:
+  after extends, `:`, `->`, as, is or `Array[`, before `.` (`Area.new()`,
+  `File.READ`) and before `(` (`PoolStringArray()`, `Transform(basis, o)`);
+  `{Area = 1}` or a local `Area` value is left alone
+- the longest pattern wins (`OS.get_ticks_msec(` over a plain `OS` row)
+- names declared in the file itself (members, locals, parameters, enum
+  values) and project class_names, autoloads and script functions with the
+  same name are never renamed; the conflicting rows are reported
+
+Table rows are `godot3,godot4,note`; lines starting with `#` are comments.
+A JSON list of {"godot3", "godot4", "note"} objects is accepted as well.
+GodotSyntaxFixer runs this stage as part of its Godot 4 migration.
+
+Usage:
+    python3 tools/python/api_rename.py                     # report only
+    python3 tools/python/api_rename.py --diff ui/
+    python3 tools/python/api_rename.py --write
+    python3 tools/python/api_rename.py --table my_renames.csv --list
+"""
+
+import argparse
+import csv
+import difflib
+import json
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from gdscript_lexer import NAME, OP, Token, code_tokens, tokenize
+from godot_project import find_project_root, iter_project_files, read_autoloads
+from symbol_index import SymbolIndex
+
+DEFAULT_TABLE = Path(__file__).resolve().parent / "data" / "godot4_renames.csv"
+
+DECLARATION_KEYWORDS = {"var", "const", "func", "class", "class_name", "signal", "enum"}
+# Tokens after which a name is a type
+TYPE_PREFIXES = {"extends", ":", "->", "as", "is"}
+_END = object()  # trie key holding the rename that ends at a node
+
+
+@dataclass(frozen=True)
+class Rename:
+    old: str
+    new: str
+    note: str = ""
+    line: int = 0  # row in the table file
+
+    @property
+    def pattern(self) -> Tuple[str, ...]:
+        return tuple(t.text for t in tokenize(self.old))
+
+    @property
+    def identifier(self) -> str:
+        """The name a project definition could collide with (the first one)"""
+        return next(t for t in self.pattern if t[0].isalpha() or t[0] == "_")
+
+    @property
+    def is_class(self) -> bool:
+        """A class rename: one CamelCase name (not a CONSTANT)"""
+        pattern = self.pattern
+        return (
+            len(pattern) == 1
+            and pattern[0][0].isupper()
+            and any(c.islower() for c in pattern[0])
+        )
+
+
+@dataclass
+class RenameHit:
+    line: int
+    old: str
+    new: str
+    note: str
+
+
+def _check_pattern(text: str, where: str) -> None:
+    tokens = tokenize(text)
+    if not tokens or any(t.kind not in (NAME, OP) for t in tokens):
+        raise ValueError(f"{where}: {text!r} is not a name/operator pattern")
+
+
+def load_table(path: Path = DEFAULT_TABLE) -> List[Rename]:
+    """Read and validate a rename table (.csv or .json)"""
+    rows: List[Tuple[int, Dict[str, str]]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".json":
+            rows = list(enumerate(json.load(f), 1))
+        else:
+            lines = [(n, line) for n, line in enumerate(f, 1)]
+            data = [(n, line) for n, line in lines if not line.startswith("#")]
+            reader = csv.DictReader(line for _, line in data)
+            rows = [(data[i + 1][0], row) for i, row in enumerate(reader)]
+
+    renames: List[Rename] = []
+    seen: Dict[Tuple[str, ...], Rename] = {}
+    for number, row in rows:
+        where = f"{path.name}:{number}"
+        old = (row.get("godot3") or "").strip()
+        new = (row.get("godot4") or "").strip()
+        if not old or not new:
+            raise ValueError(f"{where}: both godot3 and godot4 are required")
+        if old == new:
+            raise ValueError(f"{where}: {old!r} renames to itself")
+        _check_pattern(old, where)
+        _check_pattern(new, where)
+        if old.count("(") - old.count(")") != new.count("(") - new.count(")"):
+            raise ValueError(f"{where}: {old!r} and {new!r} leave brackets unbalanced")
+        rename = Rename(old, new, (row.get("note") or "").strip(), number)
+        previous = seen.get(rename.pattern)
+        if previous is not None:
+            raise ValueError(
+                f"{where}: {old!r} is already renamed on line {previous.line}"
+            )
+        seen[rename.pattern] = rename
+        renames.append(rename)
+    return renames
+
+
+def type_position(code: List[Token], i: int) -> bool:
+    """True when code[i] can hold a class name: a type, static access or call"""
+    prev = code[i - 1].text if i > 0 else None
+    after = code[i + 1].text if i + 1 < len(code) else None
+    if prev in TYPE_PREFIXES or after in (".", "("):
+        return True
+    return prev == "[" and i > 1 and code[i - 2].text == "Array"
+
+
+def declared_names(tokens: List[Token]) -> Set[str]:
+    """Names a script declares itself: members, locals, parameters, enum values"""
+    names: Set[str] = set()
+    depth = 0
+    in_params = False
+    enum_depth: Optional[int] = None
+    for i, token in enumerate(tokens):
+        text = token.text
+        prev = tokens[i - 1].text if i > 0 else None
+        if token.kind == OP and text in "([{":
+            depth += 1
+            if prev is not None and i > 1 and tokens[i - 2].text == "func":
+                in_params = True
+        elif token.kind == OP and text in ")]}":
+            depth -= 1
+            in_params = in_params and depth > 0
+            if enum_depth is not None and depth < enum_depth:
+                enum_depth = None
+        if token.kind != NAME:
+            continue
+        if prev in DECLARATION_KEYWORDS or prev == "for":
+            names.add(text)
+        elif in_params and prev in ("(", ","):
+            names.add(text)
+        elif enum_depth is not None and prev in ("{", ","):
+            names.add(text)
+        if text == "enum":
+            enum_depth = depth + 1
+    return names
+
+
+class RenameMatcher:
+    """All renames of a table compiled into one trie over token texts"""
+
+    def __init__(self, renames: Iterable[Rename]):
+        self.renames = list(renames)
+        self.trie: Dict = {}
+        for rename in self.renames:
+            node = self.trie
+            for text in rename.pattern:
+                node = node.setdefault(text, {})
+            node[_END] = rename
+
+    def without(self, names: Set[str]) -> "RenameMatcher":
+        """A matcher without the renames whose identifier is in `names`"""
+        return RenameMatcher(r for r in self.renames if r.identifier not in names)
+
+    def scan(
+        self, code: List[Token], skip: Set[str] = frozenset()
+    ) -> List[Tuple[int, int, Rename]]:
+        """(first, last, rename) for the longest non-overlapping matches
+
+        `code` are the tokens of a file without comments and newlines;
+        matches starting with a name in `skip` are ignored.
+        """
+        matches = []
+        i = 0
+        count = len(code)
+        while i < count:
+            token = code[i]
+            node = self.trie.get(token.text) if token.kind in (NAME, OP) else None
+            if node is None or token.text in skip:
+                i += 1
+                continue
+            prev = code[i - 1].text if i > 0 else None
+            if token.kind == NAME and (prev == "." or prev in DECLARATION_KEYWORDS):
+                i += 1
+                continue
+            best = None
+            j = i
+            while node is not None:
+                if _END in node:
+                    best = (j, node[_END])
+                j += 1
+                node = node.get(code[j].text) if j < count else None
+            if best is None:
+                i += 1
+                continue
+            last, rename = best
+            if rename.is_class and not type_position(code, i):
+                i += 1
+                continue
+            matches.append((i, last, rename))
+            i = last + 1
+        return matches
+
+    def apply(self, source: str) -> Tuple[str, List[RenameHit]]:
+        code = list(code_tokens(tokenize(source)))
+        matches = self.scan(code, declared_names(code))
+        pieces = []
+        hits = []
+        pos = 0
+        for first, last, rename in matches:
+            start, end = code[first].start, code[last].end
+            pieces.append(source[pos:start])
+            pieces.append(rename.new)
+            pos = end
+            hits.append(
+                RenameHit(code[first].line, rename.old, rename.new, rename.note)
+            )
+        pieces.append(source[pos:])
+        return "".join(pieces), hits
+
+    def fix(self, content: str) -> Tuple[str, int]:
+        """GodotSyntaxFixer entry point: (new content, renames applied)"""
+        content, hits = self.apply(content)
+        return content, len(hits)
+
+
+def project_names(index: SymbolIndex, root: Path) -> Set[str]:
+    """class_names, inner classes, autoloads and script functions of the project"""
+    names = set(read_autoloads(root))
+    query = (
+        "SELECT class_name FROM files WHERE class_name IS NOT NULL"
+        " UNION SELECT name FROM symbols WHERE kind IN ('class', 'func')"
+    )
+    names.update(row[0] for row in index.db.execute(query))
+    return names
+
+
+def open_matcher(
+    root: Optional[Path] = None,
+    table: Path = DEFAULT_TABLE,
+    index: Optional[SymbolIndex] = None,
+) -> Tuple[RenameMatcher, List[Rename]]:
+    """Matcher for a project: the table minus renames that collide with it"""
+    matcher = RenameMatcher(load_table(table))
+    if root is None:
+        return matcher, []
+    names = project_names(index or SymbolIndex.open(root), root)
+    dropped = [r for r in matcher.renames if r.identifier in names]
+    return matcher.without(names), dropped
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Apply Godot 3 -> 4 API renames")
+    parser.add_argument("paths", nargs="*", type=Path, help="files or folders")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--table",
+        type=Path,
+        default=DEFAULT_TABLE,
+        help="rename table, .csv or .json (default: data/godot4_renames.csv)",
+    )
+    parser.add_argument("--diff", action="store_true", help="print a unified diff")
+    parser.add_argument("--write", action="store_true", help="rewrite the files")
+    parser.add_argument("--list", action="store_true", help="print the table")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    try:
+        matcher, dropped = open_matcher(root, args.table)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.list:
+        for rename in matcher.renames:
+            note = f"  ({rename.note})" if rename.note else ""
+            print(f"{rename.old:40} -> {rename.new}{note}")
+        return 0
+
+    files: List[Path] = []
+    for path in args.paths or [root]:
+        path = path if path.is_absolute() else Path.cwd() / path
+        files.extend([path] if path.is_file() else iter_project_files(path, ".gd"))
+
+    print("🔁 Godot 4 API renames")
+    print("=" * 60)
+    for rename in dropped:
+        print(f"⏭️  {rename.old}: `{rename.identifier}` is defined by the project")
+
+    totals: Counter = Counter()
+    notes: Dict[str, str] = {}
+    changed = 0
+    for path in files:
+        relative = path.resolve().relative_to(root.resolve()).as_posix()
+        source = path.read_text(encoding="utf-8", errors="replace")
+        fixed, hits = matcher.apply(source)
+        for hit in hits:
+            totals[(hit.old, hit.new)] += 1
+            print(f"   {relative}:{hit.line} {hit.old} -> {hit.new}")
+            if hit.note:
+                notes[hit.old] = hit.note
+        if fixed == source:
+            continue
+        changed += 1
+        if args.diff:
+            diff = difflib.unified_diff(
+                source.splitlines(),
+                fixed.splitlines(),
+                f"a/{relative}",
+                f"b/{relative}",
+                lineterm="",
+            )
+            print("\n".join(diff))
+        if args.write:
+            path.write_text(fixed, encoding="utf-8")
+
+    for old, note in sorted(notes.items()):
+        print(f"⚠️  {old}: {note}")
+
+    elapsed = time.perf_counter() - started
+    print("\n📊 Summary")
+    print(f"   Table rows:         {len(matcher.renames)} ({len(dropped)} dropped)")
+    print(f"   Files scanned:      {len(files)} ({elapsed:.2f} s)")
+    print(f"   Renames applied:    {sum(totals.values())}")
+    for (old, new), count in totals.most_common(5):
+        print(f"      {count:5d}  {old} -> {new}")
+    action = "Rewrote" if args.write else "Would rewrite"
+    print(f"   {action} {changed} files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
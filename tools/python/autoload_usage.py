@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+"""
+Autoload Usage Analyzer for NeuroVis
+====================================
+
+Every autoload in project.godot is instantiated, and runs its _ready, before
+the main scene shows its first frame. This tool builds a reference graph
+from every .gd and .tscn file to every autoload name and works out which
+autoloads are actually needed at boot:
+
+- boot:    referenced from code that runs before the first frame (the main
+           scene's scripts and their _init/_ready/_enter_tree call trees,
+           scripts they instantiate, and other boot autoloads)
+- pinned:  defines _process/_input/_notification style callbacks, so it must
+           stay in the tree from the start
+- lazy:    only reached from panels, handlers and tools that run later
+- unused:  no references outside its own script
+
+Lazy and unused autoloads can be created on first use instead. With
+--write-accessor the tool generates core/services/LazyServices.gd, which
+registers a ServiceLocator factory per lazy autoload; --apply additionally
+removes them from [autoload] and rewrites their call sites to the accessor.
+
+Usage:
+    python3 tools/python/autoload_usage.py
+    python3 tools/python/autoload_usage.py --trace startup_trace.json
+    python3 tools/python/autoload_usage.py --write-accessor
+    python3 tools/python/autoload_usage.py --apply
+
+Verify the effect on time to first frame with tools/python/startup_trace.py.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from gdscript_lexer import NAME, STRING, string_value
+from gdscript_outline import Outline, parse_file
+from godot_project import (
+    ext_resources,
+    find_project_root,
+    from_res_path,
+    iter_project_files,
+    read_autoloads,
+    read_main_scene,
+    read_uid_map,
+    to_res_path,
+)
+
+ACCESSOR_PATH = "core/services/LazyServices.gd"
+ACCESSOR_CLASS = "LazyServices"
+
+# Callbacks that run during the boot frame
+BOOT_CALLBACKS = {"_init", "_ready", "_enter_tree", "_static_init"}
+# Callbacks that require the node to live in the tree from the start
+PINNING_CALLBACKS = {
+    "_process",
+    "_physics_process",
+    "_input",
+    "_unhandled_input",
+    "_unhandled_key_input",
+    "_shortcut_input",
+    "_notification",
+}
+# Folders and file prefixes whose references never run in the shipped app
+DEV_ONLY_DIRS = ("tests/", "tools/", "scenes/debug/", "specs/", "docs/")
+DEV_ONLY_PREFIXES = ("test_", "run_", "fix_", "enable_", "disable_", "add_autoloads")
+
+NODE_LOOKUP_CALLS = {"get_node", "get_node_or_null", "has_node"}
+DECLARATION_KEYWORDS = {"var", "const", "func", "signal", "class_name", "class", "enum"}
+
+
+@dataclass
+class Reference:
+    file: str
+    line: int
+    function: Optional[str]
+    kind: str  # identifier | node_path | string | scene
+    boot: bool = False
+
+
+@dataclass
+class AutoloadUsage:
+    name: str
+    res_path: str
+    status: str = "lazy"
+    pinned_by: List[str] = field(default_factory=list)
+    references: List[Reference] = field(default_factory=list)
+
+    def refs(self, *, boot: Optional[bool] = None, dev: Optional[bool] = None):
+        result = []
+        for ref in self.references:
+            if boot is not None and ref.boot != boot:
+                continue
+            if dev is not None and is_dev_only(ref.file) != dev:
+                continue
+            result.append(ref)
+        return result
+
+
+def is_dev_only(relative: str) -> bool:
+    """References from tests, tools and one-off root scripts never ship"""
+    if relative.startswith(DEV_ONLY_DIRS):
+        return True
+    return "/" not in relative and relative.startswith(DEV_ONLY_PREFIXES)
+
+
+def accessor_name(autoload: str) -> str:
+    """GeminiAI -> gemini_ai, KB -> kb, ModelSwitcherGlobal -> model_switcher_global"""
+    snake = re.sub(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", autoload)
+    return snake.lower()
+
+
+class AutoloadUsageAnalyzer:
+    def __init__(self, project_root: Path):
+        self.root = project_root
+        self.autoloads = read_autoloads(project_root)
+        self.main_scene = read_main_scene(project_root)
+        self.uids = read_uid_map(project_root)
+        self.outlines: Dict[str, Outline] = {}
+        self.scenes: Dict[str, str] = {}
+        self.class_names: Dict[str, str] = {}
+        self.usage: Dict[str, AutoloadUsage] = {
+            name: AutoloadUsage(name, path) for name, path in self.autoloads.items()
+        }
+
+    # === INDEXING ===
+    def load(self) -> None:
+        """Outline every script and read every scene once"""
+        for path in iter_project_files(self.root, ".gd", ".tscn"):
+            res_path = to_res_path(self.root, path)
+            if path.suffix == ".gd":
+                outline = parse_file(path, self.root)
+                self.outlines[res_path] = outline
+                if outline.class_name:
+                    self.class_names[outline.class_name] = res_path
+            else:
+                self.scenes[res_path] = path.read_text(
+                    encoding="utf-8", errors="replace"
+                )
+
+    def _resolve(self, attributes: Dict[str, str]) -> Optional[str]:
+        """res:// path of an ext_resource, preferring its uid like Godot does"""
+        uid = attributes.get("uid")
+        if uid and uid in self.uids:
+            return self.uids[uid]
+        return attributes.get("path")
+
+    # === REFERENCE GRAPH ===
+    def collect_references(self) -> None:
+        """Record every identifier, node path and string reference to an autoload"""
+        for res_path, outline in self.outlines.items():
+            relative = outline.path
+            function_at = self._function_lookup(outline)
+            own_autoloads = {n for n, p in self.autoloads.items() if p == res_path}
+            tokens = outline.tokens
+            for i, token in enumerate(tokens):
+                name = None
+                kind = None
+                if token.kind == NAME and token.text in self.usage:
+                    prev = tokens[i - 1].text if i > 0 else ""
+                    if prev == "." or prev in DECLARATION_KEYWORDS:
+                        continue
+                    name, kind = token.text, "identifier"
+                elif token.kind == STRING:
+                    name, kind = self._string_reference(string_value(token))
+                if name is None or name in own_autoloads:
+                    continue
+                self.usage[name].references.append(
+                    Reference(relative, token.line, function_at(token.line), kind)
+                )
+
+        for res_path, text in self.scenes.items():
+            relative = res_path[len("res://") :]
+            for name in self.usage:
+                for match in re.finditer(
+                    r'NodePath\("/root/%s(?:/[^"]*)?"\)' % name, text
+                ):
+                    line = text.count("\n", 0, match.start()) + 1
+                    self.usage[name].references.append(
+                        Reference(relative, line, None, "scene")
+                    )
+
+    def _string_reference(self, value: str):
+        if value.startswith("/root/"):
+            head = value[len("/root/") :].split("/", 1)[0]
+            if head in self.usage:
+                return head, "node_path"
+        elif value in self.usage:
+            return value, "string"
+        return None, None
+
+    @staticmethod
+    def _function_lookup(outline: Outline):
+        spans = [(f.line, f.end_line, f.name) for f in outline.functions]
+
+        def lookup(line: int) -> Optional[str]:
+            found = None
+            for start, end, name in spans:
+                if start <= line <= end:
+                    found = name
+            return found
+
+        return lookup
+
+    # === BOOT REACHABILITY ===
+    def compute_boot_set(self) -> Set[str]:
+        """Scripts whose boot-time code runs before the first frame"""
+        executed: Set[str] = set()
+        scene_queue: List[str] = [self.main_scene] if self.main_scene else []
+        script_queue: List[str] = []
+        seen_scenes: Set[str] = set()
+
+        for name, usage in self.usage.items():
+            outline = self.outlines.get(usage.res_path)
+            if outline is None:
+                continue
+            usage.pinned_by = sorted(
+                f.name
+                for f in outline.functions
+                if f.owner is None and f.name in PINNING_CALLBACKS
+            )
+            if usage.pinned_by:
+                usage.status = "pinned"
+                script_queue.append(usage.res_path)
+
+        while scene_queue or script_queue:
+            while scene_queue:
+                scene = scene_queue.pop()
+                if scene in seen_scenes or scene not in self.scenes:
+                    continue
+                seen_scenes.add(scene)
+                for attributes in ext_resources(self.scenes[scene]):
+                    target = self._resolve(attributes)
+                    if not target:
+                        continue
+                    if target.endswith((".tscn", ".scn")):
+                        scene_queue.append(target)
+                    elif target.endswith(".gd"):
+                        script_queue.append(target)
+
+            while script_queue:
+                script = script_queue.pop()
+                if script in executed or script not in self.outlines:
+                    continue
+                executed.add(script)
+                outline = self.outlines[script]
+                boot_functions = self._boot_functions(outline)
+                self._mark_boot_references(outline, boot_functions)
+                for target in self._instantiated_targets(outline, boot_functions):
+                    if target.endswith((".tscn", ".scn")):
+                        scene_queue.append(target)
+                    else:
+                        script_queue.append(target)
+
+                for name, usage in self.usage.items():
+                    if usage.status != "boot" and usage.refs(boot=True):
+                        usage.status = "boot"
+                        script_queue.append(usage.res_path)
+        return executed
+
+    @staticmethod
+    def _boot_functions(outline: Outline) -> Set[str]:
+        """Boot callbacks plus every script function they transitively call"""
+        functions = outline.functions_by_name()
+        pending = [name for name in BOOT_CALLBACKS if name in functions]
+        reached: Set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in reached:
+                continue
+            reached.add(name)
+            for callee in outline.calls(functions[name]):
+                if callee in functions and callee not in reached:
+                    pending.append(callee)
+        return reached
+
+    def _mark_boot_references(self, outline: Outline, boot_functions: Set[str]) -> None:
+        for usage in self.usage.values():
+            for ref in usage.references:
+                if ref.file != outline.path:
+                    continue
+                # Class-level initializers run on instantiation, like _init
+                if ref.function is None or ref.function in boot_functions:
+                    ref.boot = True
+
+    def _instantiated_targets(
+        self, outline: Outline, boot_functions: Set[str]
+    ) -> Set[str]:
+        """Scripts and scenes created by `.new()`/`.instantiate()` at boot"""
+        constants: Dict[str, str] = {}
+        for member in outline.members:
+            if member.kind == "const" and member.value and member.value[:1] == '"':
+                constants[member.name] = member.value.strip('"')
+
+        lines = outline.lines
+        indexes = set(range(len(lines)))
+        for func in outline.functions:
+            if func.name not in boot_functions:
+                indexes.difference_update(range(func.first_index, func.last_index + 1))
+
+        loaded: Dict[str, str] = {}
+        targets: Set[str] = set()
+        for index in sorted(indexes):
+            tokens = lines[index].tokens
+            for i, token in enumerate(tokens):
+                # NAME = load("path") / preload(CONST_PATH), at class level or local
+                if token.text in ("load", "preload") and i + 3 < len(tokens):
+                    path = self._load_argument(tokens[i + 2], constants)
+                    if path and tokens[i + 1].text == "(" and tokens[i + 3].text == ")":
+                        if i >= 2 and tokens[i - 1].text == "=":
+                            loaded[tokens[i - 2].text] = path
+                        elif i >= 4 and tokens[i - 1].text == ":=":
+                            loaded[tokens[i - 2].text] = path
+
+                if token.text not in ("new", "instantiate") or i < 2:
+                    continue
+                if tokens[i - 1].text != ".":
+                    continue
+                receiver = tokens[i - 2]
+                target = None
+                if receiver.kind == NAME:
+                    target = loaded.get(receiver.text) or self.class_names.get(
+                        receiver.text
+                    )
+                elif receiver.text == ")" and i >= 5:
+                    target = self._load_argument(tokens[i - 3], constants)
+                if target:
+                    targets.add(target)
+        return targets
+
+    @staticmethod
+    def _load_argument(token, constants: Dict[str, str]) -> Optional[str]:
+        """Path passed to load()/preload() as a literal or a string constant"""
+        if token.kind == STRING:
+            return string_value(token)
+        if token.kind == NAME:
+            return constants.get(token.text)
+        return None
+
+    # === REPORT ===
+    def analyze(self) -> Dict[str, AutoloadUsage]:
+        self.load()
+        self.collect_references()
+        self.compute_boot_set()
+        for usage in self.usage.values():
+            if usage.status in ("boot", "pinned"):
+                continue
+            usage.status = "lazy" if usage.refs(dev=False) else "unused"
+        return self.usage
+
+    def lazy_candidates(self) -> List[AutoloadUsage]:
+        return [u for u in self.usage.values() if u.status in ("lazy", "unused")]
+
+
+def load_ready_times(trace_path: Path) -> Dict[str, float]:
+    """_ready durations (ms) per autoload from a StartupTrace dump"""
+    with open(trace_path, "r", encoding="utf-8") as f:
+        trace = json.load(f)
+    times = {}
+    for span in trace.get("spans", []):
+        if span.get("step") == "_ready":
+            times[span["autoload"]] = (span["end_usec"] - span["start_usec"]) / 1000.0
+    return times
+
+
+def print_report(
+    usage: Dict[str, AutoloadUsage], ready_times: Dict[str, float]
+) -> None:
+    icons = {"boot": "🟢", "pinned": "📌", "lazy": "💤", "unused": "⚪"}
+    print("📊 Autoload usage")
+    print("=" * 60)
+    for item in usage.values():
+        boot = item.refs(boot=True)
+        runtime = item.refs(boot=False, dev=False)
+        dev = item.refs(dev=True)
+        counts = f"boot={len(boot):<3} runtime={len(runtime):<3} dev={len(dev)}"
+        print(f"{icons[item.status]} {item.name:<26} {item.status:<7} {counts}")
+        if item.pinned_by:
+            print(f"     pinned by {', '.join(item.pinned_by)}")
+        for ref in boot[:3]:
+            print(f"     boot: {ref.file}:{ref.line} ({ref.function or 'class body'})")
+        if item.status == "lazy":
+            files = sorted({ref.file for ref in runtime})
+            for relative in files[:5]:
+                print(f"     used by: {relative}")
+            if len(files) > 5:
+                print(f"     ... and {len(files) - 5} more files")
+
+    candidates = [u for u in usage.values() if u.status in ("lazy", "unused")]
+    print()
+    if not candidates:
+        print("✅ Every autoload is needed at boot")
+        return
+    print(f"💡 {len(candidates)} autoloads can be created on first use:")
+    total = 0.0
+    for item in candidates:
+        ms = ready_times.get(item.name)
+        suffix = f" (_ready {ms:.2f} ms)" if ms is not None else ""
+        total += ms or 0.0
+        print(
+            f"   {item.name} -> {ACCESSOR_CLASS}.{accessor_name(item.name)}(){suffix}"
+        )
+    if ready_times:
+        print(f"   Estimated boot time saved: {total:.2f} ms")
+
+
+# === GENERATION ===
+def render_accessor(candidates: List[AutoloadUsage]) -> str:
+    """GDScript source of the generated lazy accessor"""
+    entries = ",\n".join(f'\t"{u.name}": "{u.res_path}"' for u in candidates)
+    accessors = "\n\n\n".join(
+        f"static func {accessor_name(u.name)}() -> Node:\n"
+        f'\t"""Lazily created replacement for the {u.name} autoload"""\n'
+        f'\treturn get_service("{u.name}")'
+        for u in candidates
+    )
+    return f'''## {ACCESSOR_CLASS}.gd
+## On-demand access to services that used to be autoloads
+##
+## GENERATED by tools/python/autoload_usage.py - do not edit by hand.
+## Each service is registered as a ServiceLocator factory and created on
+## first use, then added to the tree as /root/<Name> so existing node-path
+## lookups keep working once it exists.
+## @version: 1.0
+
+class_name {ACCESSOR_CLASS}
+extends RefCounted
+
+# === CONSTANTS ===
+const LAZY_SERVICES: Dictionary = {{
+{entries}
+}}
+
+# === STATIC STATE ===
+static var _locator: ServiceLocator
+
+
+# === PUBLIC API ===
+static func locator() -> ServiceLocator:
+\t"""ServiceLocator holding the lazy service factories"""
+\tif _locator == null:
+\t\t_locator = ServiceLocator.new()
+\t\t_locator.name = "LazyServiceLocator"
+\t\tfor service_name in LAZY_SERVICES:
+\t\t\t_locator.register_factory(service_name, _create_service.bind(service_name))
+\treturn _locator
+
+
+static func get_service(service_name: String) -> Node:
+\t"""Get a lazy service, creating it on first use"""
+\tvar tree = Engine.get_main_loop() as SceneTree
+\tif tree and tree.root.has_node(service_name):
+\t\treturn tree.root.get_node(service_name)
+\treturn locator().get_service(service_name)
+
+
+static func has_service(service_name: String) -> bool:
+\t"""Check if a service can be provided"""
+\treturn LAZY_SERVICES.has(service_name)
+
+
+{accessors}
+
+
+# === PRIVATE METHODS ===
+static func _create_service(service_name: String) -> Node:
+\t"""Instantiate a former autoload and attach it to the root"""
+\tvar resource = load(LAZY_SERVICES[service_name])
+\tif resource == null:
+\t\tpush_error("[{ACCESSOR_CLASS}] Cannot load service: " + service_name)
+\t\treturn null
+
+\tvar instance: Node = resource.instantiate() if resource is PackedScene else resource.new()
+\tinstance.name = service_name
+
+\tvar tree = Engine.get_main_loop() as SceneTree
+\tif tree:
+\t\t# The root is still adding its children during the boot frame
+\t\tif Engine.get_process_frames() == 0:
+\t\t\ttree.root.add_child.call_deferred(instance)
+\t\telse:
+\t\t\ttree.root.add_child(instance)
+\treturn instance
+'''
+
+
+def write_accessor(root: Path, candidates: List[AutoloadUsage]) -> Path:
+    path = root / ACCESSOR_PATH
+    path.write_text(render_accessor(candidates), encoding="utf-8")
+    return path
+
+
+def remove_autoloads(root: Path, names: Set[str]) -> int:
+    """Drop autoload entries from project.godot, keeping everything else verbatim"""
+    project = root / "project.godot"
+    lines = project.read_text(encoding="utf-8").splitlines(keepends=True)
+    section = ""
+    kept = []
+    removed = 0
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("[") and stripped.endswith("]"):
+            section = stripped[1:-1]
+        key = stripped.split("=", 1)[0]
+        if section == "autoload" and "=" in stripped and key in names:
+            removed += 1
+            continue
+        kept.append(line)
+    project.write_text("".join(kept), encoding="utf-8")
+    return removed
+
+
+def rewrite_call_sites(
+    analyzer: AutoloadUsageAnalyzer, names: Set[str]
+) -> Dict[str, List[str]]:
+    """Point identifier and /root/ lookups at the accessor; return manual follow-ups"""
+    manual: Dict[str, List[str]] = defaultdict(list)
+    for res_path, outline in analyzer.outlines.items():
+        if outline.path == ACCESSOR_PATH:
+            continue
+        declared = {m.name for m in outline.members}
+        for func in outline.functions:
+            declared.update(p.name for p in func.params)
+        edits = []
+        tokens = outline.tokens
+        for i, token in enumerate(tokens):
+            if (
+                token.kind == NAME
+                and token.text in names
+                and token.text not in declared
+            ):
+                prev = tokens[i - 1].text if i > 0 else ""
+                if prev == "." or prev in DECLARATION_KEYWORDS:
+                    continue
+                replacement = f"{ACCESSOR_CLASS}.{accessor_name(token.text)}()"
+                edits.append((token.start, token.end, replacement))
+            elif token.kind == STRING:
+                name, kind = analyzer._string_reference(string_value(token))
+                if name not in names:
+                    continue
+                value = string_value(token)
+                is_lookup = (
+                    i >= 2
+                    and tokens[i - 1].text == "("
+                    and tokens[i - 2].text in NODE_LOOKUP_CALLS
+                    and i + 1 < len(tokens)
+                    and tokens[i + 1].text == ")"
+                    and value == "/root/" + name
+                    and (i < 3 or tokens[i - 3].text != ".")
+                )
+                if is_lookup:
+                    call = tokens[i - 2].text
+                    if call == "has_node":
+                        replacement = f'{ACCESSOR_CLASS}.has_service("{name}")'
+                    else:
+                        replacement = f"{ACCESSOR_CLASS}.{accessor_name(name)}()"
+                    edits.append((tokens[i - 2].start, tokens[i + 1].end, replacement))
+                else:
+                    manual[outline.path].append(f"line {token.line}: {token.text}")
+
+        if edits:
+            source = outline.source
+            for start, end, replacement in sorted(edits, reverse=True):
+                source = source[:start] + replacement + source[end:]
+            path = from_res_path(analyzer.root, res_path)
+            path.write_text(source, encoding="utf-8")
+    return manual
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Find autoloads that can be created lazily"
+    )
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--trace", type=Path, help="StartupTrace dump for _ready timings"
+    )
+    parser.add_argument("--json", type=Path, help="write the full report as JSON")
+    parser.add_argument(
+        "--write-accessor", action="store_true", help=f"generate {ACCESSOR_PATH}"
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="generate the accessor, remove lazy autoloads and rewrite call sites",
+    )
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    analyzer = AutoloadUsageAnalyzer(root)
+    usage = analyzer.analyze()
+    ready_times = load_ready_times(args.trace) if args.trace else {}
+    print_report(usage, ready_times)
+
+    if args.json:
+        report = {
+            name: {
+                "status": item.status,
+                "script": item.res_path,
+                "pinned_by": item.pinned_by,
+                "references": [ref.__dict__ for ref in item.references],
+            }
+            for name, item in usage.items()
+        }
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    candidates = analyzer.lazy_candidates()
+    if not candidates or not (args.write_accessor or args.apply):
+        return 0
+
+    path = write_accessor(root, candidates)
+    print(f"\n✅ Generated {path.relative_to(root)}")
+    if not args.apply:
+        return 0
+
+    names = {u.name for u in candidates}
+    removed = remove_autoloads(root, names)
+    print(f"✅ Removed {removed} autoload entries from project.godot")
+    manual = rewrite_call_sites(analyzer, names)
+    for relative, sites in sorted(manual.items()):
+        print(f"⚠️  Review {relative}:")
+        for site in sites:
+            print(f"     {site}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
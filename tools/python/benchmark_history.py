@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Benchmark History and Regression Check for NeuroVis
+===================================================
+
+BenchmarkRunner.gd writes one flat benchmark-results.json per run and the
+next run overwrites it. This tool appends every results file to a JSON Lines
+store, with its meta_* fields (platform, Godot version, timestamp) and the
+commit. Then it checks the latest run of each platform against a rolling
+baseline of that platform's earlier runs.
+
+Every numeric field is a metric, meta_total_duration_ms included. Timing
+metrics (*_ms) are compared on a log scale, so a change reads as a ratio and
+the long right tail of timings does not dominate. Count metrics
+(memory_objects_created, rendering_total_models_loaded) are only reported
+when they change, because a different count means a different workload.
+
+For each timing metric:
+
+- baseline: the last --window runs of the platform before the run checked
+- test: one-sided Welch t-test when the checked commit has several runs,
+  otherwise a t prediction interval for a single new observation. The
+  baseline spread is floored at 2%, so runs quantized to whole milliseconds
+  with identical values do not make every difference significant.
+- regression: p below --alpha and at least --min-change slower than the
+  baseline median. Both are needed: a significant 1% change is noise for
+  a benchmark, and a large change inside the run-to-run spread is not yet
+  confirmed.
+
+With fewer than --min-runs baseline runs a metric is reported but never
+fails. The exit code is 1 when any regression is confirmed, so CI fails.
+--summary writes the same table as Markdown for a pull request comment.
+
+The store is append-only and ingesting the same results file twice is a
+no-op (runs are keyed by a hash of the file).
+
+Usage:
+    python3 tools/python/benchmark_history.py benchmark-results.json
+    python3 tools/python/benchmark_history.py benchmark-results.json --commit $GITHUB_SHA \\
+        --store benchmark-history/history.jsonl --summary performance-summary.md
+    python3 tools/python/benchmark_history.py --platform macOS        # check only
+    python3 tools/python/benchmark_history.py --history rendering_avg_model_load_ms
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import statistics
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from godot_project import cache_path, find_project_root
+
+STORE_NAME = "benchmark_history.jsonl"
+TIMING_SUFFIX = "_ms"
+DEFAULT_WINDOW = 20
+DEFAULT_MIN_RUNS = 5
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_CHANGE = 0.10
+NOISE_FLOOR = math.log1p(0.02)  # smallest spread assumed, in log units
+
+
+@dataclass
+class Run:
+    key: str  # sha256 of the results file
+    platform: str
+    commit: Optional[str]
+    timestamp: str
+    ingested: str
+    metrics: Dict[str, float]
+    meta: Dict[str, object]
+
+
+@dataclass
+class Check:
+    metric: str
+    baseline: Optional[float]  # median of the baseline runs
+    current: float  # geometric mean of the checked runs (counts: last value)
+    runs: int  # baseline runs
+    samples: int  # checked runs
+    change: Optional[float]  # relative change, +0.12 = 12% slower
+    p_value: Optional[float]
+    status: str  # regression | improvement | noise | changed | new | few-runs
+
+
+# === Student t distribution ===
+
+
+def _beta_fraction(a: float, b: float, x: float) -> float:
+    """Continued fraction of the incomplete beta function (modified Lentz)"""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return result
+
+
+def _incomplete_beta(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta I_x(a, b)"""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = (
+        math.lgamma(a + b)
+        - math.lgamma(a)
+        - math.lgamma(b)
+        + a * math.log(x)
+        + b * math.log1p(-x)
+    )
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _beta_fraction(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _beta_fraction(b, a, 1.0 - x) / b
+
+
+def t_sf(t: float, df: float) -> float:
+    """P(T > t) for Student's t with `df` degrees of freedom"""
+    tail = 0.5 * _incomplete_beta(df / 2.0, 0.5, df / (df + t * t))
+    return tail if t > 0 else 1.0 - tail
+
+
+def slower_p_value(baseline: List[float], current: List[float]) -> float:
+    """One-sided p-value that `current` is larger than `baseline` (log values)"""
+    n = len(baseline)
+    spread = max(statistics.stdev(baseline), NOISE_FLOOR)
+    if len(current) == 1:
+        # prediction interval for one new observation
+        t = (current[0] - statistics.fmean(baseline)) / (spread * math.sqrt(1 + 1 / n))
+        return t_sf(t, n - 1)
+    m = len(current)
+    current_spread = max(statistics.stdev(current), NOISE_FLOOR)
+    a, b = spread**2 / n, current_spread**2 / m
+    t = (statistics.fmean(current) - statistics.fmean(baseline)) / math.sqrt(a + b)
+    df = (a + b) ** 2 / (a**2 / (n - 1) + b**2 / (m - 1))
+    return t_sf(t, df)
+
+
+# === Store ===
+
+
+def _numeric(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def parse_results(data: dict, key: str, commit: Optional[str]) -> Run:
+    """A run from one BenchmarkRunner results file"""
+    metrics = {k: float(v) for k, v in data.items() if _numeric(v)}
+    meta = {k: v for k, v in data.items() if k.startswith("meta_") and not _numeric(v)}
+    version = meta.get("meta_godot_version")
+    if isinstance(version, dict):
+        meta["meta_godot_version"] = version.get("string", "")
+    return Run(
+        key,
+        str(data.get("meta_platform", "Unknown")),
+        commit,
+        str(data.get("meta_timestamp", "")),
+        datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        metrics,
+        meta,
+    )
+
+
+class BenchmarkStore:
+    """Append-only JSON Lines file of benchmark runs, oldest first"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.runs: List[Run] = []
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    self.runs.append(Run(**json.loads(line)))
+
+    def ingest(self, results: Path, commit: Optional[str]) -> Tuple[Run, bool]:
+        """Append a results file; False when the same file was stored before"""
+        raw = results.read_bytes()
+        key = hashlib.sha256(raw).hexdigest()
+        for run in self.runs:
+            if run.key == key:
+                return run, False
+        run = parse_results(json.loads(raw.decode("utf-8")), key, commit)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run.__dict__, sort_keys=True) + "\n")
+        self.runs.append(run)
+        return run, True
+
+    def platforms(self) -> List[str]:
+        return sorted({run.platform for run in self.runs})
+
+    def split(self, platform: str, window: int) -> Tuple[List[Run], List[Run]]:
+        """(baseline runs, checked runs): the checked runs share the latest commit"""
+        runs = [run for run in self.runs if run.platform == platform]
+        if not runs:
+            return [], []
+        last = runs[-1]
+        checked = [last]
+        if last.commit:
+            checked = []
+            for run in reversed(runs):
+                if run.commit != last.commit:
+                    break
+                checked.insert(0, run)
+        baseline = runs[: len(runs) - len(checked)]
+        return baseline[-window:], checked
+
+
+# === Checks ===
+
+
+def check_metric(
+    metric: str,
+    baseline: List[Run],
+    checked: List[Run],
+    min_runs: int,
+    alpha: float,
+    min_change: float,
+) -> Optional[Check]:
+    history = [run.metrics[metric] for run in baseline if metric in run.metrics]
+    values = [run.metrics[metric] for run in checked if metric in run.metrics]
+    if not values:
+        return None
+    if not metric.endswith(TIMING_SUFFIX):
+        previous = history[-1] if history else None
+        status = (
+            "new"
+            if previous is None
+            else ("changed" if previous != values[-1] else "same")
+        )
+        return Check(
+            metric, previous, values[-1], len(history), len(values), None, None, status
+        )
+
+    positive = all(v > 0 for v in history + values)
+    transform = math.log if positive else (lambda v: v)
+    current = (
+        math.exp(statistics.fmean(math.log(v) for v in values))
+        if positive
+        else statistics.fmean(values)
+    )
+    if not history:
+        return Check(metric, None, current, 0, len(values), None, None, "new")
+    median = statistics.median(history)
+    change = (current - median) / median if median else None
+    if len(history) < min_runs:
+        return Check(
+            metric, median, current, len(history), len(values), change, None, "few-runs"
+        )
+
+    logs = [transform(v) for v in history]
+    current_logs = [transform(v) for v in values]
+    p_slower = slower_p_value(logs, current_logs)
+    p_faster = slower_p_value([-v for v in logs], [-v for v in current_logs])
+    status = "noise"
+    p_value = min(p_slower, p_faster)
+    if change is not None and p_slower < alpha and change >= min_change:
+        status, p_value = "regression", p_slower
+    elif (
+        change is not None
+        and p_faster < alpha
+        and -change >= min_change / (1 + min_change)
+    ):
+        status, p_value = "improvement", p_faster
+    return Check(
+        metric, median, current, len(history), len(values), change, p_value, status
+    )
+
+
+def check_platform(
+    store: BenchmarkStore,
+    platform: str,
+    window: int,
+    min_runs: int,
+    alpha: float,
+    min_change: float,
+) -> Tuple[List[Check], List[Run], List[Run]]:
+    baseline, checked = store.split(platform, window)
+    metrics = sorted({m for run in checked for m in run.metrics})
+    checks = []
+    for metric in metrics:
+        result = check_metric(metric, baseline, checked, min_runs, alpha, min_change)
+        if result is not None and result.status != "same":
+            checks.append(result)
+    return checks, baseline, checked
+
+
+# === Report ===
+
+STATUS_ICONS = {
+    "regression": "❌",
+    "improvement": "✅",
+    "noise": "➖",
+    "changed": "⚠️ ",
+    "new": "🆕",
+    "few-runs": "⏳",
+}
+
+
+def _format_value(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if value == 0 or abs(value) >= 100:
+        return f"{value:.0f}"
+    if abs(value) >= 1:
+        return f"{value:.2f}"
+    return f"{value:.3g}"
+
+
+def _row(check: Check) -> List[str]:
+    change = f"{check.change:+.1%}" if check.change is not None else "-"
+    p_value = f"{check.p_value:.3g}" if check.p_value is not None else "-"
+    return [
+        check.metric,
+        f"{_format_value(check.baseline)} (n={check.runs})",
+        f"{_format_value(check.current)} (n={check.samples})",
+        change,
+        p_value,
+        f"{STATUS_ICONS[check.status]} {check.status}",
+    ]
+
+
+HEADER = ["metric", "baseline median", "current", "change", "p", "status"]
+
+
+def print_table(platform: str, checks: List[Check], checked: List[Run]) -> None:
+    commit = checked[-1].commit if checked else None
+    print(f"\n{platform}" + (f" @ {commit[:12]}" if commit else ""))
+    rows = [HEADER] + [_row(c) for c in checks]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(HEADER))]
+    for row in rows:
+        print("  " + "  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)))
+
+
+def markdown_table(platform: str, checks: List[Check]) -> str:
+    lines = [f"### {platform}", "", "| " + " | ".join(HEADER) + " |"]
+    lines.append("|" + "---|" * len(HEADER))
+    for check in checks:
+        lines.append("| " + " | ".join(_row(check)) + " |")
+    return "\n".join(lines)
+
+
+def print_history(store: BenchmarkStore, metric: str) -> None:
+    for run in store.runs:
+        if metric in run.metrics:
+            commit = (run.commit or "-")[:12]
+            print(
+                f"   {run.timestamp or run.ingested:<20} {run.platform:<10}"
+                f" {commit:<12} {_format_value(run.metrics[metric])}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Store BenchmarkRunner results and flag statistical regressions"
+    )
+    parser.add_argument(
+        "results", nargs="*", type=Path, help="benchmark-results.json files to add"
+    )
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        help=f"history file (default: .godot/neurovis_tools/{STORE_NAME})",
+    )
+    parser.add_argument(
+        "--commit",
+        default=os.environ.get("GITHUB_SHA"),
+        help="commit of the added results (default: $GITHUB_SHA)",
+    )
+    parser.add_argument("--platform", help="check only this meta_platform")
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=DEFAULT_WINDOW,
+        help=f"baseline runs per platform (default: {DEFAULT_WINDOW})",
+    )
+    parser.add_argument(
+        "--min-runs",
+        type=int,
+        default=DEFAULT_MIN_RUNS,
+        help=f"baseline runs needed to fail (default: {DEFAULT_MIN_RUNS})",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=DEFAULT_ALPHA,
+        help=f"significance level (default: {DEFAULT_ALPHA})",
+    )
+    parser.add_argument(
+        "--min-change",
+        type=float,
+        default=DEFAULT_MIN_CHANGE,
+        help=f"smallest slowdown that fails, 0.1 = 10%% (default: {DEFAULT_MIN_CHANGE})",
+    )
+    parser.add_argument("--summary", type=Path, help="write the tables as Markdown")
+    parser.add_argument("--history", metavar="METRIC", help="list a metric's values")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    store = BenchmarkStore(args.store or cache_path(root, STORE_NAME))
+    print("📈 Benchmark History")
+    print("=" * 60)
+    for results in args.results:
+        try:
+            run, added = store.ingest(results, args.commit)
+        except (OSError, ValueError) as e:
+            print(f"❌ {results}: {e}", file=sys.stderr)
+            return 1
+        state = "added" if added else "already stored"
+        print(f"   {results}: {run.platform} run {state} ({len(store.runs)} runs)")
+
+    if args.history:
+        print_history(store, args.history)
+        return 0
+
+    platforms = [args.platform] if args.platform else store.platforms()
+    if not store.runs:
+        print("   No runs stored yet")
+        return 0
+    regressions = 0
+    summary = ["## 📈 Benchmark regression check", ""]
+    for platform in platforms:
+        checks, baseline, checked = check_platform(
+            store, platform, args.window, args.min_runs, args.alpha, args.min_change
+        )
+        if not checked:
+            print(f"\n{platform}: no runs")
+            continue
+        print_table(platform, checks, checked)
+        regressions += sum(1 for c in checks if c.status == "regression")
+        summary += [markdown_table(platform, checks), ""]
+
+    print()
+    if regressions:
+        print(f"❌ {regressions} confirmed regressions")
+    else:
+        print("✅ No confirmed regressions")
+    if args.summary:
+        verdict = (
+            f"❌ {regressions} confirmed regressions"
+            if regressions
+            else "✅ No confirmed regressions"
+        )
+        summary.append(verdict)
+        args.summary.write_text("\n".join(summary) + "\n", encoding="utf-8")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
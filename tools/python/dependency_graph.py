@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Script Dependency Graph for NeuroVis
+====================================
+
+Builds the load-time dependency graph of every GDScript in the project from
+the symbol index (tools/python/symbol_index.py):
+
+- extends:  `extends "res://..."` or `extends SomeClassName`
+- preload:  `preload("res://...")`, resolved while the script is parsed
+- class:    use of another script's global `class_name`
+- load:     `load("res://...")`, resolved at run time (soft edge)
+
+extends, preload and class edges are hard: the target has to compile before
+the script that uses it. The tool reports missing preload/load/extends
+targets, cycles among hard edges (an inheritance cycle is always an error)
+and a topological load order with dependencies first.
+
+Because the graph is read from the incrementally updated symbol index, only
+changed scripts are re-parsed and re-analysis takes milliseconds.
+
+--fix-preloads computes dependency-order fixes for one script: every script
+a preloaded class inherits from is preloaded before it, in load order. This
+replaces hand-written insertions such as the one fix_panel_loading.py used to
+carry for ModularInfoPanel.
+
+Usage:
+    python3 tools/python/dependency_graph.py
+    python3 tools/python/dependency_graph.py --order
+    python3 tools/python/dependency_graph.py --deps ui/components/panels/ModularInfoPanel.gd
+    python3 tools/python/dependency_graph.py --fix-preloads scenes/main/node_3d.gd
+    python3 tools/python/dependency_graph.py --fix-preloads scenes/main/node_3d.gd --write
+"""
+
+import argparse
+import difflib
+import json
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from gdscript_lexer import STRING, string_value
+from gdscript_outline import parse_file
+from godot_project import find_project_root
+from symbol_index import SymbolIndex
+
+HARD_KINDS = ("extends", "preload", "class")
+SOFT_KINDS = ("load",)
+
+
+@dataclass(frozen=True)
+class Edge:
+    source: str  # project-relative script path
+    target: str  # project-relative path of the dependency
+    kind: str  # extends | preload | class | load
+    line: int
+
+
+@dataclass(frozen=True)
+class MissingTarget:
+    source: str
+    target: str  # res:// path as written
+    kind: str
+    line: int
+
+
+class DependencyGraph:
+    """preload/load/extends/class_name graph over the project's scripts"""
+
+    def __init__(self, index: SymbolIndex):
+        self.index = index
+        self.root = index.root
+        self.nodes: Set[str] = set()
+        self.edges: List[Edge] = []
+        self.missing: List[MissingTarget] = []
+        # preload/load edges to scenes, resources, textures and other non-scripts
+        self.resources: Dict[str, List[Edge]] = defaultdict(list)
+        self._out: Dict[str, List[Edge]] = defaultdict(list)
+        self.build()
+
+    @classmethod
+    def open(cls, project_root: Optional[Path] = None) -> "DependencyGraph":
+        """Update the symbol index and build the graph"""
+        return cls(SymbolIndex.open(project_root))
+
+    def _resolve(self, source: str, path: str) -> Optional[str]:
+        """Project-relative path of a load target (None for user:// and such)"""
+        if path.startswith("res://"):
+            return path[len("res://") :]
+        if "://" in path or path.startswith("uid:"):
+            return None
+        return (Path(source).parent / path).as_posix()
+
+    def build(self) -> None:
+        db = self.index.db
+        classes: Dict[str, str] = {}
+        extends: Dict[str, Tuple[str, int]] = {}
+        for path, class_name, base in db.execute(
+            "SELECT path, class_name, extends FROM files ORDER BY path"
+        ):
+            self.nodes.add(path)
+            if class_name:
+                classes.setdefault(class_name, path)
+            if base:
+                extends[path] = (base, 1)
+
+        edges: Dict[Tuple[str, str], Edge] = {}
+        self.resources = defaultdict(list)
+
+        def add(source: str, target: str, kind: str, line: int) -> None:
+            if source == target:
+                return
+            key = (source, target)
+            current = edges.get(key)
+            # Keep the strongest reason for an edge: extends > preload > class > load
+            order = ("extends", "preload", "class", "load")
+            if current is None or order.index(kind) < order.index(current.kind):
+                edges[key] = Edge(source, target, kind, line)
+
+        type_lines: Dict[Tuple[str, str], int] = {}
+        for source, name, line in db.execute(
+            "SELECT f.path, r.name, r.line FROM refs r"
+            " JOIN files f ON f.id = r.file_id WHERE r.kind='type'"
+        ):
+            type_lines[(source, name)] = line
+
+        for source, (base, line) in extends.items():
+            line = type_lines.get((source, base), line)
+            if base in classes:
+                add(source, classes[base], "extends", line)
+            elif base.startswith("res://") or base.endswith(".gd"):
+                target = self._resolve(source, base)
+                if target in self.nodes:
+                    add(source, target, "extends", line)
+                else:
+                    self.missing.append(MissingTarget(source, base, "extends", line))
+
+        for source, kind, name, line in db.execute(
+            "SELECT f.path, r.kind, r.name, r.line FROM refs r"
+            " JOIN files f ON f.id = r.file_id"
+            " WHERE r.kind IN ('preload', 'load', 'type') ORDER BY f.path, r.line"
+        ):
+            if kind == "type":
+                if name in classes:
+                    add(source, classes[name], "class", line)
+                continue
+            target = self._resolve(source, name)
+            if target is None:
+                continue
+            if not (self.root / target).exists():
+                self.missing.append(MissingTarget(source, name, kind, line))
+            elif target.endswith(".gd"):
+                add(source, target, kind, line)
+            else:
+                self.resources[source].append(Edge(source, target, kind, line))
+
+        self.edges = sorted(edges.values(), key=lambda e: (e.source, e.line))
+        self._out = defaultdict(list)
+        for edge in self.edges:
+            self._out[edge.source].append(edge)
+
+    def dependencies(self, path: str, kinds=HARD_KINDS) -> List[Edge]:
+        return [e for e in self._out.get(path, []) if e.kind in kinds]
+
+    def closure(self, path: str, kinds=HARD_KINDS) -> Set[str]:
+        """Every script `path` transitively depends on through `kinds` edges"""
+        seen: Set[str] = set()
+        stack = [path]
+        while stack:
+            for edge in self.dependencies(stack.pop(), kinds):
+                if edge.target not in seen:
+                    seen.add(edge.target)
+                    stack.append(edge.target)
+        seen.discard(path)
+        return seen
+
+    def cycles(self, kinds=HARD_KINDS) -> List[List[str]]:
+        """Strongly connected components with more than one script (Tarjan)"""
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for start in sorted(self.nodes):
+            if start in index_of:
+                continue
+            # Iterative Tarjan: (node, iterator over its dependencies)
+            work = [(start, iter(self.dependencies(start, kinds)))]
+            index_of[start] = lowlink[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, edges = work[-1]
+                advanced = False
+                for edge in edges:
+                    target = edge.target
+                    if target not in self.nodes:
+                        continue
+                    if target not in index_of:
+                        index_of[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.dependencies(target, kinds))))
+                        advanced = True
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[target])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        components.append(sorted(component))
+        return sorted(components)
+
+    def load_order(self, kinds=HARD_KINDS) -> List[str]:
+        """Scripts with dependencies first; members of a cycle stay adjacent"""
+        component_of: Dict[str, int] = {}
+        groups: List[List[str]] = [c for c in self.cycles(kinds)]
+        for number, component in enumerate(groups):
+            for member in component:
+                component_of[member] = number
+        for node in sorted(self.nodes):
+            if node not in component_of:
+                component_of[node] = len(groups)
+                groups.append([node])
+
+        pending: Dict[int, Set[int]] = {n: set() for n in range(len(groups))}
+        users: Dict[int, Set[int]] = defaultdict(set)
+        for edge in self.edges:
+            if edge.kind not in kinds or edge.target not in component_of:
+                continue
+            source = component_of[edge.source]
+            target = component_of[edge.target]
+            if source != target:
+                pending[source].add(target)
+                users[target].add(source)
+
+        ready = sorted((groups[n][0], n) for n, deps in pending.items() if not deps)
+        order: List[str] = []
+        while ready:
+            _, number = ready.pop(0)
+            order.extend(groups[number])
+            for user in sorted(users[number]):
+                pending[user].discard(number)
+                if not pending[user]:
+                    ready.append((groups[user][0], user))
+            ready.sort()
+        return order
+
+    def inheritance_cycles(self) -> List[List[str]]:
+        return self.cycles(("extends",))
+
+    # === PRELOAD ORDER FIXES ===
+
+    def preload_fixes(self, path: str) -> List[Tuple[int, str, List[str]]]:
+        """Base scripts each class-level preload of `path` needs loaded first
+
+        Returns (line, preloaded target, missing bases in load order) for every
+        `const X = preload(...)` whose inheritance chain is not already
+        preloaded on an earlier line of the same script.
+        """
+        outline = parse_file(self.root / path, self.root)
+        position = {name: i for i, name in enumerate(self.load_order())}
+        preloaded: Set[str] = set()
+        fixes = []
+        for member in outline.members:
+            if member.kind != "const" or member.owner is not None:
+                continue
+            target = _preload_target(outline.lines[member.index].tokens)
+            if target is None:
+                continue
+            relative = self._resolve(path, target)
+            bases = self.closure(relative, ("extends",)) - preloaded - {path}
+            if bases:
+                ordered = sorted(bases, key=lambda p: position.get(p, len(position)))
+                fixes.append((member.line, relative, ordered))
+                preloaded.update(bases)
+            preloaded.add(relative)
+        return fixes
+
+    def apply_preload_fixes(self, path: str) -> Tuple[str, str]:
+        """Original and fixed source of `path` with base preloads inserted"""
+        source = (self.root / path).read_text(encoding="utf-8")
+        lines = source.split("\n")
+        classes = dict(
+            self.index.db.execute("SELECT path, class_name FROM files").fetchall()
+        )
+        for line, _target, bases in reversed(self.preload_fixes(path)):
+            text = lines[line - 1]
+            indent = text[: len(text) - len(text.lstrip())]
+            inserted = [
+                f"{indent}const {classes.get(base) or _const_name(base)}"
+                f' = preload("res://{base}")'
+                for base in bases
+            ]
+            lines[line - 1 : line - 1] = inserted
+        return source, "\n".join(lines)
+
+
+def _preload_target(tokens) -> Optional[str]:
+    for i, token in enumerate(tokens[:-2]):
+        if token.text == "preload" and tokens[i + 1].text == "(":
+            if tokens[i + 2].kind == STRING:
+                return string_value(tokens[i + 2])
+    return None
+
+
+def _const_name(path: str) -> str:
+    stem = Path(path).stem
+    return "".join(part[:1].upper() + part[1:] for part in stem.split("_")) + "Script"
+
+
+def print_report(graph: DependencyGraph, elapsed: float) -> int:
+    hard = sum(1 for e in graph.edges if e.kind in HARD_KINDS)
+    print("🔗 Script Dependency Graph")
+    print("=" * 60)
+    print(
+        f"   {len(graph.nodes)} scripts, {hard} hard edges,"
+        f" {len(graph.edges) - hard} runtime loads ({elapsed * 1000:.1f} ms)"
+    )
+
+    errors = 0
+    inheritance = graph.inheritance_cycles()
+    for cycle in inheritance:
+        errors += 1
+        print(f"❌ Inheritance cycle: {' -> '.join(cycle + cycle[:1])}")
+    inherited = {frozenset(c) for c in inheritance}
+    for cycle in graph.cycles():
+        if frozenset(cycle) in inherited:
+            continue
+        print(f"⚠️  Preload/class cycle ({len(cycle)} scripts):")
+        for member in cycle:
+            kinds = sorted(
+                {e.kind for e in graph.dependencies(member) if e.target in cycle}
+            )
+            print(f"     {member}  [{', '.join(kinds)}]")
+
+    for item in graph.missing:
+        if item.kind in ("preload", "extends"):
+            errors += 1
+            print(f"❌ {item.source}:{item.line} {item.kind} of missing {item.target}")
+        else:
+            print(f"⚠️  {item.source}:{item.line} load of missing {item.target}")
+
+    if not errors:
+        print("✅ No inheritance cycles or missing parse-time dependencies")
+    return 1 if errors else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Check preload/extends/class_name dependencies"
+    )
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument("--order", action="store_true", help="print the load order")
+    parser.add_argument("--deps", metavar="SCRIPT", help="dependencies of a script")
+    parser.add_argument(
+        "--fix-preloads",
+        metavar="SCRIPT",
+        help="preload base classes before the scripts that inherit them",
+    )
+    parser.add_argument(
+        "--write", action="store_true", help="write --fix-preloads changes to disk"
+    )
+    parser.add_argument("--json", type=Path, help="write edges and findings as JSON")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    graph = DependencyGraph.open(root)
+    elapsed = time.perf_counter() - started
+
+    if args.fix_preloads:
+        path = args.fix_preloads.removeprefix("res://")
+        original, fixed = graph.apply_preload_fixes(path)
+        if original == fixed:
+            print(f"✅ {path}: preload order already satisfies the graph")
+            return 0
+        diff = difflib.unified_diff(
+            original.split("\n"),
+            fixed.split("\n"),
+            f"a/{path}",
+            f"b/{path}",
+            lineterm="",
+        )
+        print("\n".join(diff))
+        if args.write:
+            (root / path).write_text(fixed, encoding="utf-8")
+            print(f"✅ Updated {path}")
+        return 0
+
+    if args.deps:
+        path = args.deps.removeprefix("res://")
+        for edge in graph.dependencies(path, HARD_KINDS + SOFT_KINDS):
+            print(f"   {edge.kind:<8} {edge.target}  (line {edge.line})")
+        print(f"   {len(graph.closure(path))} scripts must compile first")
+        return 0
+
+    if args.order:
+        for number, path in enumerate(graph.load_order(), 1):
+            print(f"{number:4d}  {path}")
+        return 0
+
+    status = print_report(graph, elapsed)
+    if args.json:
+        report = {
+            "edges": [e.__dict__ for e in graph.edges],
+            "missing": [m.__dict__ for m in graph.missing],
+            "cycles": graph.cycles(),
+            "inheritance_cycles": graph.inheritance_cycles(),
+            "load_order": graph.load_order(),
+        }
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+GDScript Lexer for NeuroVis Tooling
+===================================
+
+A small, dependency-free GDScript 4 tokenizer shared by the Python tools in
+this directory. It runs one compiled regular expression over the source, so
+the cost is a single linear scan per file no matter how many rules a tool
+applies to the resulting tokens.
+
+Newlines inside brackets and after a backslash are not emitted, which lets
+tools work on logical lines the same way the GDScript parser does.
+
+Usage:
+    from gdscript_lexer import tokenize, logical_lines
+
+    for line in logical_lines(tokenize(source)):
+        print(line.indent, [t.text for t in line.tokens])
+"""
+
+import re
+from typing import Iterator, List, NamedTuple, Optional
+
+NAME = "NAME"
+NUMBER = "NUMBER"
+STRING = "STRING"
+ANNOTATION = "ANNOTATION"
+COMMENT = "COMMENT"
+OP = "OP"
+NEWLINE = "NEWLINE"
+ERROR = "ERROR"
+
+TAB_WIDTH = 4
+
+OPENING_BRACKETS = "([{"
+CLOSING_BRACKETS = ")]}"
+
+# fmt: off
+_OPERATORS = [
+    "**=", "<<=", ">>=", "...", "->", ":=", "==", "!=", "<=", ">=", "&&", "||",
+    "<<", ">>", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=", "**", "..",
+]
+_OPERATOR_PATTERN = (
+    "|".join(re.escape(op) for op in _OPERATORS) + r"|[-+*/%<>=!&|^~.,:;()\[\]{}$@?]"
+)
+
+_TOKEN_PATTERN = re.compile("|".join([
+    r"(?P<WS>[ \t\r\f]+)",
+    r"(?P<CONT>\\\r?\n)",
+    r"(?P<NEWLINE>\n)",
+    r"(?P<COMMENT>#[^\n]*)",
+    r'(?P<STRING>[&^]?r?(?:"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\''
+    r'|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'))',
+    r'(?P<BADSTRING>[&^]?r?["\'][^\n]*)',
+    r"(?P<NUMBER>0[xX][0-9a-fA-F_]+|0[bB][01_]+"
+    r"|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?)",
+    r"(?P<ANNOTATION>@[A-Za-z_]\w*)",
+    r"(?P<NAME>[^\W\d]\w*)",
+    r"(?P<OP>" + _OPERATOR_PATTERN + ")",
+    r"(?P<ERROR>.)",
+]))
+# fmt: on
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "'": "'", "\\": "\\", "0": "\0"}
+
+
+class Token(NamedTuple):
+    """A single lexical token with its position in the source"""
+
+    kind: str
+    text: str
+    line: int  # 1-based physical line of the first character
+    col: int  # 0-based column (in characters) on that line
+    start: int  # absolute offset of the first character
+    end: int  # absolute offset one past the last character
+
+
+class LogicalLine(NamedTuple):
+    """Tokens of one statement, with the indentation of its first line"""
+
+    indent: int
+    tokens: List[Token]
+    comments: List[Token]
+    line: int
+    end_line: int
+
+    @property
+    def first(self) -> Optional[Token]:
+        return self.tokens[0] if self.tokens else None
+
+    def texts(self) -> List[str]:
+        return [t.text for t in self.tokens]
+
+
+def tokenize(source: str) -> List[Token]:
+    """Tokenize GDScript source in a single pass"""
+    tokens: List[Token] = []
+    append = tokens.append
+    depth = 0
+    line = 1
+    line_start = 0
+    pos = 0
+    length = len(source)
+    match = _TOKEN_PATTERN.match
+
+    while pos < length:
+        m = match(source, pos)
+        kind = m.lastgroup
+        text = m.group()
+        end = m.end()
+
+        if kind == "WS":
+            pass
+        elif kind == "CONT":
+            line += 1
+            line_start = end
+        elif kind == "NEWLINE":
+            if depth == 0:
+                append(Token(NEWLINE, text, line, pos - line_start, pos, end))
+            line += 1
+            line_start = end
+        else:
+            if kind == "BADSTRING":
+                kind = STRING
+            elif kind == "OP":
+                if text in OPENING_BRACKETS:
+                    depth += 1
+                elif text in CLOSING_BRACKETS and depth > 0:
+                    depth -= 1
+            append(Token(kind, text, line, pos - line_start, pos, end))
+            newlines = text.count("\n")
+            if newlines:
+                line += newlines
+                line_start = pos + text.rindex("\n") + 1
+        pos = end
+
+    return tokens
+
+
+def indent_width(prefix: str) -> int:
+    """Width of an indentation prefix, counting tabs as TAB_WIDTH columns"""
+    width = 0
+    for ch in prefix:
+        width += TAB_WIDTH if ch == "\t" else 1
+    return width
+
+
+def logical_lines(
+    tokens: List[Token], source: Optional[str] = None
+) -> List[LogicalLine]:
+    """Group tokens into statements separated by top-level newlines
+
+    When ``source`` is given the indentation is measured from the real line
+    prefix (tabs count as TAB_WIDTH); otherwise the token column is used.
+    """
+    lines: List[LogicalLine] = []
+    current: List[Token] = []
+    comments: List[Token] = []
+
+    def flush():
+        if current:
+            first = current[0]
+            if source is not None:
+                indent = indent_width(source[first.start - first.col : first.start])
+            else:
+                indent = first.col
+            lines.append(
+                LogicalLine(
+                    indent, list(current), list(comments), first.line, current[-1].line
+                )
+            )
+        current.clear()
+        comments.clear()
+
+    for token in tokens:
+        if token.kind == NEWLINE:
+            flush()
+        elif token.kind == COMMENT:
+            comments.append(token)
+        else:
+            current.append(token)
+    flush()
+    return lines
+
+
+def code_tokens(tokens: List[Token]) -> Iterator[Token]:
+    """Tokens without comments and newlines"""
+    return (t for t in tokens if t.kind not in (COMMENT, NEWLINE))
+
+
+def string_value(token: Token) -> str:
+    """Decode the value of a STRING token (StringName/NodePath prefixes stripped)"""
+    text = token.text.lstrip("&^")
+    raw = text.startswith("r")
+    if raw:
+        text = text[1:]
+    if text[:3] in ('"""', "'''") and len(text) >= 6 and text.endswith(text[:3]):
+        body = text[3:-3]
+    elif len(text) >= 2 and text[-1] == text[0]:
+        body = text[1:-1]
+    else:
+        body = text[1:]
+    if raw or "\\" not in body:
+        return body
+
+    out = []
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if ch == "\\" and i + 1 < len(body):
+            out.append(_ESCAPES.get(body[i + 1], body[i + 1]))
+            i += 2
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def line_offsets(source: str) -> List[int]:
+    """Absolute offset of the start of every physical line (index 0 is line 1)"""
+    offsets = [0]
+    find = source.find
+    pos = find("\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = find("\n", pos + 1)
+    return offsets
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+GDScript Outline Parser for NeuroVis Tooling
+============================================
+
+Builds a structural outline of a GDScript file on top of gdscript_lexer:
+class_name/extends, inner classes, signals, member variables, constants,
+enums and functions with their logical-line spans and call sites.
+
+The parser is deliberately tolerant. Large parts of the tree were damaged
+by earlier automated fixes, so a misplaced line never raises; it is simply
+attributed to the innermost open block by indentation.
+
+Usage:
+    from gdscript_outline import parse_outline
+
+    outline = parse_outline(source, "core/systems/DebugCommands.gd")
+    for func in outline.functions:
+        print(func.name, func.line, sorted(outline.calls(func)))
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from gdscript_lexer import (
+    ANNOTATION,
+    NAME,
+    OP,
+    STRING,
+    LogicalLine,
+    Token,
+    logical_lines,
+    string_value,
+    tokenize,
+)
+
+MEMBER_KEYWORDS = {"var", "const", "enum", "signal"}
+
+# Callbacks the engine invokes on its own; they are entry points, not dead code
+ENGINE_CALLBACKS = {
+    "_init",
+    "_ready",
+    "_enter_tree",
+    "_exit_tree",
+    "_process",
+    "_physics_process",
+    "_input",
+    "_unhandled_input",
+    "_unhandled_key_input",
+    "_shortcut_input",
+    "_gui_input",
+    "_notification",
+    "_draw",
+    "_to_string",
+    "_get",
+    "_set",
+    "_get_property_list",
+    "_static_init",
+}
+
+
+@dataclass
+class Param:
+    name: str
+    type: Optional[str] = None
+    default: Optional[str] = None
+
+
+@dataclass
+class Function:
+    name: str
+    line: int
+    end_line: int
+    indent: int
+    first_index: int  # index of the `func` logical line
+    last_index: int  # index of the last logical line of the body
+    is_static: bool = False
+    params: List[Param] = field(default_factory=list)
+    return_type: Optional[str] = None
+    owner: Optional[str] = None  # inner class name, None for the script class
+    annotations: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Member:
+    kind: str  # var | const | enum | signal
+    name: str
+    line: int
+    indent: int
+    index: int  # logical line index
+    type: Optional[str] = None
+    value: Optional[str] = None
+    owner: Optional[str] = None
+    annotations: List[str] = field(default_factory=list)
+
+
+@dataclass
+class InnerClass:
+    name: str
+    line: int
+    indent: int
+    extends: Optional[str] = None
+
+
+@dataclass
+class Outline:
+    path: Optional[str]
+    source: str
+    tokens: List[Token]
+    lines: List[LogicalLine]
+    class_name: Optional[str] = None
+    extends: Optional[str] = None
+    is_tool: bool = False
+    inner_classes: List[InnerClass] = field(default_factory=list)
+    functions: List[Function] = field(default_factory=list)
+    members: List[Member] = field(default_factory=list)
+
+    @property
+    def signals(self) -> List[Member]:
+        return [m for m in self.members if m.kind == "signal"]
+
+    def function(self, name: str, owner: Optional[str] = None) -> Optional[Function]:
+        for func in self.functions:
+            if func.name == name and func.owner == owner:
+                return func
+        return None
+
+    def functions_by_name(self) -> Dict[str, Function]:
+        """Script-level functions keyed by name (last definition wins, like Godot)"""
+        return {f.name: f for f in self.functions if f.owner is None}
+
+    def body_lines(self, func: Function) -> List[LogicalLine]:
+        """Logical lines of a function body (excluding the signature line)"""
+        return self.lines[func.first_index + 1 : func.last_index + 1]
+
+    def function_tokens(self, func: Function) -> List[Token]:
+        """All code tokens of a function, signature included"""
+        tokens: List[Token] = []
+        for line in self.lines[func.first_index : func.last_index + 1]:
+            tokens.extend(line.tokens)
+        return tokens
+
+    def calls(self, func: Function) -> Set[str]:
+        """Names called on self from a function: bare `foo()` and `self.foo()`"""
+        return {t.text for t in call_sites(self.function_tokens(func))}
+
+
+def call_sites(tokens: List[Token]) -> List[Token]:
+    """NAME tokens that are direct calls on the current object"""
+    sites = []
+    for i, token in enumerate(tokens):
+        if token.kind != NAME or i + 1 >= len(tokens) or tokens[i + 1].text != "(":
+            continue
+        prev = tokens[i - 1] if i > 0 else None
+        if prev is not None and prev.text == ".":
+            before = tokens[i - 2] if i > 1 else None
+            if before is None or before.text != "self":
+                continue
+        elif prev is not None and prev.text == "func":
+            continue
+        sites.append(token)
+    return sites
+
+
+def matching_bracket(tokens: List[Token], open_index: int) -> int:
+    """Index of the bracket closing tokens[open_index] (len(tokens) if unclosed)"""
+    depth = 0
+    for i in range(open_index, len(tokens)):
+        text = tokens[i].text
+        if tokens[i].kind != OP:
+            continue
+        if text in "([{":
+            depth += 1
+        elif text in ")]}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(tokens)
+
+
+def _split_annotations(tokens: List[Token]) -> Tuple[List[str], int]:
+    """Return leading annotation texts and the index of the first other token"""
+    annotations = []
+    i = 0
+    while i < len(tokens) and tokens[i].kind == ANNOTATION:
+        start = i
+        i += 1
+        if i < len(tokens) and tokens[i].text == "(":
+            depth = 0
+            while i < len(tokens):
+                if tokens[i].text == "(":
+                    depth += 1
+                elif tokens[i].text == ")":
+                    depth -= 1
+                    if depth == 0:
+                        i += 1
+                        break
+                i += 1
+        annotations.append(" ".join(t.text for t in tokens[start:i]))
+    return annotations, i
+
+
+def join_tokens(tokens: List[Token]) -> str:
+    """Re-join tokens with single spaces where the source had whitespace"""
+    out = []
+    prev = None
+    for token in tokens:
+        if prev is not None and token.start > prev.end:
+            out.append(" ")
+        out.append(token.text)
+        prev = token
+    return "".join(out)
+
+
+def _find_top_level(tokens: List[Token], start: int, texts: Set[str]) -> int:
+    """Index of the first token in `texts` outside brackets, or -1"""
+    depth = 0
+    for i in range(start, len(tokens)):
+        text = tokens[i].text
+        if tokens[i].kind == OP:
+            if text in "([{":
+                depth += 1
+            elif text in ")]}":
+                depth -= 1
+        if depth == 0 and text in texts and tokens[i].kind == OP:
+            return i
+    return -1
+
+
+def _parse_params(tokens: List[Token]) -> List[Param]:
+    """Parse the tokens between the parentheses of a function signature"""
+    params: List[Param] = []
+    depth = 0
+    current: List[Token] = []
+    for token in tokens + [None]:
+        if token is None or (depth == 0 and token.text == ","):
+            if current and current[0].kind == NAME:
+                param = Param(current[0].text)
+                colon = _find_top_level(current, 1, {":", ":=", "="})
+                if colon != -1 and current[colon].text == ":":
+                    eq = _find_top_level(current, colon + 1, {"="})
+                    type_tokens = current[colon + 1 : eq if eq != -1 else len(current)]
+                    param.type = join_tokens(type_tokens) or None
+                    if eq != -1:
+                        param.default = join_tokens(current[eq + 1 :])
+                elif colon != -1:
+                    param.default = join_tokens(current[colon + 1 :])
+                    if current[colon].text == ":=":
+                        param.type = ":="
+                params.append(param)
+            current = []
+            continue
+        if token.text in "([{":
+            depth += 1
+        elif token.text in ")]}":
+            depth -= 1
+        current.append(token)
+    return params
+
+
+def _parse_declaration(
+    kind: str, tokens: List[Token]
+) -> (Optional[str], Optional[str]):
+    """Type annotation and initializer text of a var/const declaration"""
+    if kind not in ("var", "const") or len(tokens) < 3:
+        return None, None
+    op = _find_top_level(tokens, 2, {":", ":=", "="})
+    if op == -1:
+        return None, None
+    if tokens[op].text == ":=":
+        return ":=", join_tokens(tokens[op + 1 :]) or None
+    if tokens[op].text == "=":
+        return None, join_tokens(tokens[op + 1 :]) or None
+    eq = _find_top_level(tokens, op + 1, {"=", ":"})
+    end = eq if eq != -1 else len(tokens)
+    type_text = join_tokens(tokens[op + 1 : end]) or None
+    value = (
+        join_tokens(tokens[eq + 1 :]) if eq != -1 and tokens[eq].text == "=" else None
+    )
+    return type_text, value
+
+
+def parse_outline(source: str, path: Optional[str] = None) -> Outline:
+    """Build the outline of one GDScript file"""
+    tokens = tokenize(source)
+    lines = logical_lines(tokens, source)
+    outline = Outline(path, source, tokens, lines)
+
+    class_stack: List[InnerClass] = []
+    current: Optional[Function] = None
+    pending_annotations: List[str] = []
+
+    def close_function(last_index: int):
+        current.last_index = max(last_index, current.first_index)
+        current.end_line = lines[current.last_index].end_line
+
+    for index, line in enumerate(lines):
+        if current is not None:
+            if line.indent > current.indent:
+                continue
+            close_function(index - 1)
+            current = None
+
+        while class_stack and line.indent <= class_stack[-1].indent:
+            class_stack.pop()
+        owner = class_stack[-1].name if class_stack else None
+
+        annotations, start = _split_annotations(line.tokens)
+        if start >= len(line.tokens):
+            if "@tool" in annotations:
+                outline.is_tool = True
+            pending_annotations.extend(annotations)
+            continue
+        annotations = pending_annotations + annotations
+        pending_annotations = []
+        if "@tool" in annotations:
+            outline.is_tool = True
+
+        body = line.tokens[start:]
+        keyword = body[0].text
+        is_static = False
+        if keyword == "static" and len(body) > 1:
+            is_static = True
+            body = body[1:]
+            keyword = body[0].text
+
+        if keyword == "class_name" and len(body) > 1 and owner is None:
+            outline.class_name = body[1].text
+            if len(body) > 3 and body[2].text == "extends":
+                outline.extends = _extends_target(body[3:])
+        elif keyword == "extends" and len(body) > 1:
+            if owner is None:
+                outline.extends = _extends_target(body[1:])
+            elif class_stack:
+                class_stack[-1].extends = _extends_target(body[1:])
+        elif keyword == "class" and len(body) > 1 and body[1].kind == NAME:
+            inner = InnerClass(body[1].text, line.line, line.indent)
+            if len(body) > 3 and body[2].text == "extends":
+                inner.extends = _extends_target(body[3:])
+            outline.inner_classes.append(inner)
+            class_stack.append(inner)
+        elif keyword == "func" and len(body) > 1 and body[1].kind == NAME:
+            func = Function(
+                name=body[1].text,
+                line=line.line,
+                end_line=line.end_line,
+                indent=line.indent,
+                first_index=index,
+                last_index=index,
+                is_static=is_static,
+                owner=owner,
+                annotations=annotations,
+            )
+            if len(body) > 2 and body[2].text == "(":
+                close = matching_bracket(body, 2)
+                func.params = _parse_params(body[3:close])
+                if close + 1 < len(body) and body[close + 1].text == "->":
+                    colon = _find_top_level(body, close + 2, {":"})
+                    end = colon if colon != -1 else len(body)
+                    func.return_type = join_tokens(body[close + 2 : end]) or None
+            outline.functions.append(func)
+            current = func
+        elif keyword in MEMBER_KEYWORDS and len(body) > 1:
+            name_token = body[1]
+            if keyword == "enum" and name_token.text == "{":
+                name = ""
+            else:
+                name = name_token.text
+            type_text, value = _parse_declaration(keyword, body)
+            outline.members.append(
+                Member(
+                    kind=keyword,
+                    name=name,
+                    line=line.line,
+                    indent=line.indent,
+                    index=index,
+                    type=type_text,
+                    value=value,
+                    owner=owner,
+                    annotations=annotations,
+                )
+            )
+
+    if current is not None:
+        close_function(len(lines) - 1)
+    return outline
+
+
+def _extends_target(tokens: List[Token]) -> Optional[str]:
+    """Class name or script path an `extends` clause refers to"""
+    if not tokens:
+        return None
+    if tokens[0].kind == STRING:
+        return string_value(tokens[0])
+    names = []
+    for token in tokens:
+        if token.kind == NAME or token.text == ".":
+            names.append(token.text)
+        else:
+            break
+    return "".join(names) or None
+
+
+def parse_file(path: Path, root: Optional[Path] = None) -> Outline:
+    """Read and outline a file; `root` makes the stored path project-relative"""
+    source = path.read_text(encoding="utf-8", errors="replace")
+    shown = path.relative_to(root).as_posix() if root else str(path)
+    return parse_outline(source, shown)
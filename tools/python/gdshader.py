@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Godot Shading Language Reader for NeuroVis Tooling
+==================================================
+
+Tokenizes .gdshader/.gdshaderinc source with the Token type of
+gdscript_lexer.py, so helpers such as gdscript_outline.matching_bracket and
+join_tokens work on shader tokens unchanged. Comments are kept as COMMENT
+tokens and preprocessor lines (#define, #include) as PREPROCESSOR tokens;
+every token carries its source offsets, so tools can rewrite a file by
+splicing text without disturbing its formatting.
+
+parse_shader() reads the top-level declarations: shader_type, render_mode,
+uniforms (with type, hints, default and declaration span) and function
+bodies.
+
+Usage:
+    from gdshader import parse_shader
+
+    shader = parse_shader(path.read_text())
+    for uniform in shader.uniforms.values():
+        print(uniform.type, uniform.name, uniform.default)
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from gdscript_lexer import COMMENT, NAME, NUMBER, OP, Token  # noqa: F401 (re-exported)
+from gdscript_outline import matching_bracket
+
+PREPROCESSOR = "PREPROCESSOR"
+
+# fmt: off
+_OPERATORS = [
+    "<<=", ">>=", "==", "!=", "<=", ">=", "&&", "||", "<<", ">>", "++", "--",
+    "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=",
+]
+_TOKEN_PATTERN = re.compile("|".join([
+    r"(?P<WS>\s+)",
+    r"(?P<COMMENT>//[^\n]*|/\*[\s\S]*?(?:\*/|$))",
+    r"(?P<PREPROCESSOR>\#(?:[^\n\\]|\\\n|\\)*)",
+    r'(?P<STRING>"(?:[^"\\\n]|\\.)*"?)',
+    r"(?P<NUMBER>0[xX][0-9a-fA-F]+[uU]?"
+    r"|(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?[fFuU]?)",
+    r"(?P<NAME>[A-Za-z_]\w*)",
+    r"(?P<OP>" + "|".join(re.escape(op) for op in _OPERATORS)
+    + r"|[-+*/%<>=!&|^~?:;,.(){}\[\]])",
+    r"(?P<ERROR>.)",
+]))
+# fmt: on
+
+QUALIFIERS = {"lowp", "mediump", "highp", "flat", "smooth"}
+UNIFORM_SCOPES = {"global", "instance"}
+
+
+@dataclass
+class Uniform:
+    name: str
+    type: str
+    line: int
+    start: int  # offset of the declaration (its scope keyword or `uniform`)
+    end: int  # offset one past the closing `;`
+    scope: str = ""  # "" (per material), "global" or "instance"
+    hints: str = ""
+    default: Optional[str] = None  # default value as written
+
+
+@dataclass
+class ShaderFunction:
+    name: str
+    line: int
+    body_start: int  # token index of `{`
+    body_end: int  # token index of `}`
+
+
+@dataclass
+class Shader:
+    source: str
+    tokens: List[Token]
+    shader_type: Optional[str] = None
+    render_modes: List[str] = field(default_factory=list)
+    uniforms: Dict[str, Uniform] = field(default_factory=dict)
+    functions: Dict[str, ShaderFunction] = field(default_factory=dict)
+
+    @property
+    def code(self) -> List[Token]:
+        """Tokens without comments"""
+        return [t for t in self.tokens if t.kind != COMMENT]
+
+    def function_at(self, token_index: int) -> Optional[str]:
+        """Name of the function whose body contains tokens[token_index]"""
+        for function in self.functions.values():
+            if function.body_start < token_index < function.body_end:
+                return function.name
+        return None
+
+
+def tokenize(source: str) -> List[Token]:
+    """Tokenize shader source in a single pass (comments included)"""
+    tokens: List[Token] = []
+    line = 1
+    line_start = 0
+    pos = 0
+    match = _TOKEN_PATTERN.match
+    while pos < len(source):
+        m = match(source, pos)
+        kind = m.lastgroup
+        text = m.group()
+        if kind != "WS":
+            tokens.append(Token(kind, text, line, pos - line_start, pos, m.end()))
+        newlines = text.count("\n")
+        if newlines:
+            line += newlines
+            line_start = pos + text.rindex("\n") + 1
+        pos = m.end()
+    return tokens
+
+
+def _statement_end(tokens: List[Token], start: int) -> int:
+    """Index of the `;` ending the top-level statement at `start`"""
+    i = start
+    while i < len(tokens) and tokens[i].text != ";":
+        if tokens[i].text in "([{" and tokens[i].kind == OP:
+            i = matching_bracket(tokens, i)
+        i += 1
+    return min(i, len(tokens) - 1)
+
+
+def _uniform(source: str, tokens: List[Token], start: int) -> Optional[Uniform]:
+    """Parse `[global|instance] uniform [qualifier] type name [: hints] [= value];`"""
+    end = _statement_end(tokens, start)
+    i = start
+    scope = ""
+    if tokens[i].text in UNIFORM_SCOPES:
+        scope = tokens[i].text
+        i += 1
+    i += 1  # `uniform`
+    while i < end and tokens[i].text in QUALIFIERS:
+        i += 1
+    if i + 1 >= end or tokens[i].kind != NAME or tokens[i + 1].kind != NAME:
+        return None
+    uniform = Uniform(
+        tokens[i + 1].text,
+        tokens[i].text,
+        tokens[start].line,
+        tokens[start].start,
+        tokens[end].end,
+        scope,
+    )
+    i += 2
+    if i < end and tokens[i].text == "[":
+        i = matching_bracket(tokens, i) + 1
+    assign = next((j for j in range(i, end) if tokens[j].text == "="), end)
+    if i < end and tokens[i].text == ":":
+        uniform.hints = source[tokens[i + 1].start : tokens[assign - 1].end]
+    if assign < end:
+        uniform.default = source[tokens[assign + 1].start : tokens[end - 1].end]
+    return uniform
+
+
+def parse_shader(source: str) -> Shader:
+    """Top-level declarations of a shader"""
+    tokens = tokenize(source)
+    shader = Shader(source, tokens)
+    code = [i for i, t in enumerate(tokens) if t.kind not in (COMMENT, PREPROCESSOR)]
+    position = 0
+    while position < len(code):
+        i = code[position]
+        token = tokens[i]
+        text = token.text
+        if text == "shader_type" and i + 1 < len(tokens):
+            shader.shader_type = tokens[i + 1].text
+        elif text == "render_mode":
+            end = _statement_end(tokens, i)
+            shader.render_modes += [
+                t.text for t in tokens[i + 1 : end] if t.kind == NAME
+            ]
+        elif text == "uniform" or (
+            text in UNIFORM_SCOPES
+            and i + 1 < len(tokens)
+            and tokens[i + 1].text == "uniform"
+        ):
+            uniform = _uniform(source, tokens, i)
+            if uniform is not None:
+                shader.uniforms[uniform.name] = uniform
+        elif (
+            token.kind == NAME
+            and i + 2 < len(tokens)
+            and tokens[i + 1].kind == NAME
+            and tokens[i + 2].text == "("
+        ):
+            close = matching_bracket(tokens, i + 2)
+            if close + 1 < len(tokens) and tokens[close + 1].text == "{":
+                body_end = matching_bracket(tokens, close + 1)
+                name = tokens[i + 1].text
+                shader.functions[name] = ShaderFunction(
+                    name, tokens[i + 1].line, close + 1, body_end
+                )
+                while position < len(code) and code[position] <= body_end:
+                    position += 1
+                continue
+        if text in ("shader_type", "render_mode", "uniform", "const", "varying") or (
+            text in UNIFORM_SCOPES
+        ):
+            end = _statement_end(tokens, i)
+            while position < len(code) and code[position] <= end:
+                position += 1
+            continue
+        if text == "struct" or (text == "{" and token.kind == OP):
+            brace = (
+                i
+                if text == "{"
+                else next(
+                    (j for j in range(i, len(tokens)) if tokens[j].text == "{"), i
+                )
+            )
+            end = matching_bracket(tokens, brace)
+            while position < len(code) and code[position] <= end:
+                position += 1
+            continue
+        position += 1
+    return shader
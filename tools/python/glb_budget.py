@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+GLB Mesh Budget Analyzer for NeuroVis
+=====================================
+
+Explains where model load time goes (BenchmarkRunner measures about 200 ms
+per brain model) without starting Godot. For every structure of the
+ModelRegistry models and of their generated _lodN variants it reports:
+
+- vertex, triangle, material and texture counts
+- the world-space bounding box
+- the share of byte-identical vertices (removable by welding)
+- wasted index width (32-bit indices for fewer than 65,536 vertices),
+  vertices no triangle uses and attributes no material reads
+
+The file is memory-mapped and read through zero-copy NumPy views (see
+gltf_io.py), so even the full models are analyzed in well under a second.
+
+Each file is checked against the budget of its LOD level from the [budget]
+section of assets/models/lod/<Model>_lod.cfg; the exit code is 1 when any
+model is over budget, so CI fails. Model names and .glb files given on the
+command line are checked the same way: a file named like a model or one of
+its LOD files (<Model>_lod1.glb) gets that level's budget. Models and files
+that are not there are reported and skipped.
+
+Usage:
+    python3 tools/python/glb_budget.py
+    python3 tools/python/glb_budget.py --verbose
+    python3 tools/python/glb_budget.py Brainstem
+    python3 tools/python/glb_budget.py path/to/Half_Brain_lod1.glb
+    python3 tools/python/glb_budget.py --json glb-budget-report.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from godot_project import find_project_root
+from gltf_io import GLB, TRIANGLES, Primitive, world_matrices
+from model_assets import LodBudget, LodLevel, ModelAsset, registry_models
+
+TEXTURE_SLOTS = ("baseColorTexture", "metallicRoughnessTexture")
+MATERIAL_TEXTURE_SLOTS = ("normalTexture", "occlusionTexture", "emissiveTexture")
+UINT16_VERTEX_LIMIT = 0xFFFF
+
+
+@dataclass
+class StructureStats:
+    name: str
+    vertices: int = 0
+    triangles: int = 0
+    materials: int = 0
+    textures: int = 0
+    duplicate_vertices: int = 0
+    bounds_min: List[float] = field(default_factory=list)
+    bounds_max: List[float] = field(default_factory=list)
+    issues: List[str] = field(default_factory=list)
+
+    @property
+    def duplicate_ratio(self) -> float:
+        return self.duplicate_vertices / self.vertices if self.vertices else 0.0
+
+
+@dataclass
+class ModelStats:
+    path: str
+    file_bytes: int
+    buffer_bytes: int
+    image_bytes: int
+    materials: int
+    textures: int
+    structures: List[StructureStats] = field(default_factory=list)
+    level: Optional[str] = None
+    violations: List[str] = field(default_factory=list)
+
+    @property
+    def vertices(self) -> int:
+        return sum(s.vertices for s in self.structures)
+
+    @property
+    def triangles(self) -> int:
+        return sum(s.triangles for s in self.structures)
+
+    @property
+    def duplicate_ratio(self) -> float:
+        vertices = self.vertices
+        duplicates = sum(s.duplicate_vertices for s in self.structures)
+        return duplicates / vertices if vertices else 0.0
+
+
+def material_textures(document: dict, material: Optional[int]) -> Dict[int, int]:
+    """Images a material samples, mapped to the TEXCOORD set each one reads"""
+    if material is None:
+        return {}
+    entry = document.get("materials", [])[material]
+    slots = [entry.get(slot) for slot in MATERIAL_TEXTURE_SLOTS]
+    pbr = entry.get("pbrMetallicRoughness", {})
+    slots += [pbr.get(slot) for slot in TEXTURE_SLOTS]
+    textures = document.get("textures", [])
+    images: Dict[int, int] = {}
+    for slot in slots:
+        if slot is None or slot.get("index") is None:
+            continue
+        texture = textures[slot["index"]]
+        source = texture.get("source")
+        for extension in texture.get("extensions", {}).values():
+            source = extension.get("source", source)
+        if source is not None:
+            images[source] = slot.get("texCoord", 0)
+    return images
+
+
+def duplicate_vertices(glb: GLB, primitive: Primitive) -> int:
+    """Vertices whose every attribute equals an earlier vertex"""
+    count = glb.vertex_count(primitive)
+    if count < 2:
+        return 0
+    columns = []
+    for semantic in sorted(primitive.attributes):
+        array = np.ascontiguousarray(glb.accessor(primitive.attributes[semantic]))
+        columns.append(array.reshape(count, -1).view(np.uint8))
+    rows = np.ascontiguousarray(np.hstack(columns))
+    keys = rows.view(np.dtype((np.void, rows.shape[1]))).reshape(-1)
+    return count - len(np.unique(keys))
+
+
+def unused_attributes(
+    primitive: Primitive, texcoords: Set[int], material: dict, skinned: bool
+) -> List[str]:
+    """Vertex attributes the primitive's material and skinning never read"""
+    unused = []
+    for semantic in primitive.attributes:
+        kind, _, number = semantic.partition("_")
+        if kind == "TEXCOORD" and number.isdigit() and int(number) not in texcoords:
+            unused.append(semantic)
+        elif semantic == "TANGENT" and "normalTexture" not in material:
+            unused.append(semantic)
+        elif kind in ("JOINTS", "WEIGHTS") and not skinned:
+            unused.append(semantic)
+    return unused
+
+
+def analyze(path: Path) -> ModelStats:
+    glb = GLB.open(path)
+    document = glb.document
+    matrices = world_matrices(document)
+    image_bytes = sum(
+        document["bufferViews"][image["bufferView"]]["byteLength"]
+        for image in document.get("images", [])
+        if "bufferView" in image
+    )
+    stats = ModelStats(
+        str(path),
+        path.stat().st_size,
+        glb.size,
+        image_bytes,
+        len(document.get("materials", [])),
+        len(document.get("images", [])),
+    )
+
+    primitives: Dict[int, List[Primitive]] = {}
+    for primitive in glb.primitives():
+        primitives.setdefault(primitive.mesh, []).append(primitive)
+    nodes = document.get("nodes", [])
+    mesh_nodes: List[Tuple[str, int, np.ndarray, bool]] = [
+        (
+            node.get("name") or f"node_{index}",
+            node["mesh"],
+            matrices.get(index, np.eye(4)),
+            "skin" in node,
+        )
+        for index, node in enumerate(nodes)
+        if "mesh" in node
+    ]
+    instanced = {mesh for _, mesh, _, _ in mesh_nodes}
+    names = glb.mesh_names()
+    mesh_nodes += [
+        (names[mesh], mesh, np.eye(4), False)
+        for mesh in primitives
+        if mesh not in instanced
+    ]
+
+    for name, mesh, matrix, skinned in mesh_nodes:
+        structure = StructureStats(name)
+        materials: Set[Optional[int]] = set()
+        images: Set[int] = set()
+        corners = []
+        for primitive in primitives.get(mesh, []):
+            count = glb.vertex_count(primitive)
+            structure.vertices += count
+            materials.add(primitive.material)
+            textures = material_textures(document, primitive.material)
+            images.update(textures)
+            material = (
+                document["materials"][primitive.material]
+                if primitive.material is not None
+                else {}
+            )
+            label = f"primitive {primitive.index}" if len(primitives[mesh]) > 1 else ""
+            where = f"{label}: " if label else ""
+
+            triangles = glb.triangles(primitive)
+            if triangles is None:
+                structure.issues.append(
+                    f"{where}mode {primitive.mode} is not TRIANGLES"
+                )
+            else:
+                structure.triangles += len(triangles)
+                used = len(np.unique(triangles)) if len(triangles) else 0
+                if used < count:
+                    structure.issues.append(f"{where}{count - used:,} vertices unused")
+            if primitive.indices is not None and primitive.mode == TRIANGLES:
+                index_type = document["accessors"][primitive.indices]["componentType"]
+                if index_type == 5125 and count <= UINT16_VERTEX_LIMIT:
+                    structure.issues.append(
+                        f"{where}32-bit indices for {count:,} vertices"
+                    )
+            unused = unused_attributes(
+                primitive, set(textures.values()), material, skinned
+            )
+            if unused:
+                structure.issues.append(f"{where}unused {', '.join(unused)}")
+            structure.duplicate_vertices += duplicate_vertices(glb, primitive)
+
+            if count:
+                positions = glb.float_accessor(primitive.attributes["POSITION"])
+                low, high = positions.min(axis=0), positions.max(axis=0)
+                box = np.array(np.meshgrid(*zip(low, high))).T.reshape(-1, 3)
+                corners.append(box @ matrix[:3, :3].T + matrix[:3, 3])
+        structure.materials = len(materials)
+        structure.textures = len(images)
+        if corners:
+            points = np.concatenate(corners)
+            structure.bounds_min = points.min(axis=0).round(4).tolist()
+            structure.bounds_max = points.max(axis=0).round(4).tolist()
+        stats.structures.append(structure)
+    return stats
+
+
+def check_budget(stats: ModelStats, budget: LodBudget) -> List[str]:
+    """Budget lines the model exceeds"""
+    measured = {
+        "triangles": stats.triangles,
+        "vertices": stats.vertices,
+        "materials": stats.materials,
+        "textures": stats.textures,
+    }
+    violations = []
+    for key, value in measured.items():
+        limit = getattr(budget, key)
+        if limit is not None and value > limit:
+            violations.append(f"{key} {value:,} > {limit:,}")
+    ratio = stats.duplicate_ratio
+    if budget.duplicate_ratio is not None and ratio > budget.duplicate_ratio:
+        violations.append(
+            f"duplicate vertices {ratio:.1%} > {budget.duplicate_ratio:.1%}"
+        )
+    return violations
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size} B"
+
+
+def _print_model(stats: ModelStats, verbose: bool) -> None:
+    print(
+        f"\n{Path(stats.path).name}  ({_format_size(stats.file_bytes)},"
+        f" images {_format_size(stats.image_bytes)})"
+        + (f"  [{stats.level}]" if stats.level else "")
+    )
+    print(
+        f"   {'structure':<32} {'verts':>9} {'tris':>9} {'mats':>4} {'tex':>4}"
+        f" {'dup':>6}  size"
+    )
+    for structure in stats.structures if verbose else []:
+        extent = np.subtract(structure.bounds_max, structure.bounds_min)
+        size = " x ".join(f"{value:.3g}" for value in extent) if len(extent) else "-"
+        print(
+            f"   {structure.name[:32]:<32} {structure.vertices:>9,} {structure.triangles:>9,}"
+            f" {structure.materials:>4} {structure.textures:>4}"
+            f" {structure.duplicate_ratio:>6.1%}  {size}"
+        )
+        for issue in structure.issues:
+            print(f"      ⚠️  {issue}")
+    print(
+        f"   {'total (' + str(len(stats.structures)) + ' structures)':<32}"
+        f" {stats.vertices:>9,} {stats.triangles:>9,} {stats.materials:>4}"
+        f" {stats.textures:>4} {stats.duplicate_ratio:>6.1%}"
+    )
+    issues = sum(len(s.issues) for s in stats.structures)
+    if issues and not verbose:
+        print(f"   ⚠️  {issues} structure issues (--verbose to list)")
+    for violation in stats.violations:
+        print(f"   ❌ over budget: {violation}")
+
+
+def file_level(models: List[ModelAsset], path: Path) -> Optional[LodLevel]:
+    """Budget level of a .glb named like a registry model or one of its LOD files"""
+    for model in models:
+        if path.stem in (model.name, model.path.stem):
+            return next((lv for lv in model.lod_levels if lv.reduction >= 1.0), None)
+        for level in model.lod_levels:
+            if path.stem == f"{model.name}{level.suffix}":
+                return level
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Report and budget-check the meshes of the brain model GLBs"
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        type=Path,
+        help="model names or .glb files (default: all models)",
+    )
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="list every structure")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    # (file, budget level) pairs: each model and its generated LOD variants
+    targets: List[Tuple[Path, Optional[LodLevel]]] = []
+    missing = []
+    models = registry_models(root)
+    selected: List[ModelAsset] = [] if args.files else models
+    for name in args.files:
+        model = next((m for m in models if str(name) in (m.name, m.path.name)), None)
+        if model is not None:
+            selected.append(model)
+        elif not name.exists():
+            missing.append(str(name))
+        else:
+            targets.append((name, file_level(models, name)))
+    for model in selected:
+        if not model.path.exists():
+            missing.append(model.res_path)
+            continue
+        for level in model.lod_levels or [None]:
+            path = model.path if level is None or level.reduction >= 1.0 else None
+            path = path or model.lod_path(level)
+            if path.exists():
+                targets.append((path, level))
+
+    print("📦 GLB mesh budgets")
+    print("=" * 60)
+    reports = []
+    for path, level in targets:
+        stats = analyze(path)
+        if level is not None:
+            stats.level = level.suffix
+            stats.violations = check_budget(stats, level.budget)
+        reports.append(stats)
+        _print_model(stats, args.verbose)
+    for res_path in missing:
+        print(f"\n⚠️  {res_path} not found, skipped")
+
+    if args.json:
+        data = [
+            dict(
+                asdict(stats),
+                vertices=stats.vertices,
+                triangles=stats.triangles,
+                duplicate_ratio=stats.duplicate_ratio,
+            )
+            for stats in reports
+        ]
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    over = [stats for stats in reports if stats.violations]
+    print("\n📊 Summary")
+    print(f"   Files analyzed:     {len(reports)}")
+    print(f"   Models missing:     {len(missing)}")
+    print(f"   Over budget:        {len(over)}")
+    print(f"   Time:               {time.perf_counter() - started:.2f} s")
+    if over:
+        print(
+            "❌ Mesh budgets exceeded: decimate, weld or raise the [budget] in the lod cfg"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
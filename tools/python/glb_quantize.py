@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+GLB Attribute Quantization and Compaction for NeuroVis
+======================================================
+
+ModelRegistry.gd and EnhancedModelLoader.gd load the brain models with
+full-precision float attributes and 32-bit indices, and BenchmarkRunner
+records about 200 ms per model. This tool rewrites the models and their
+LOD files with KHR_mesh_quantization:
+
+- POSITION becomes normalized 16-bit. All primitives of a mesh share one
+  frame (center and uniform scale), which moves into the transform of the
+  nodes using the mesh
+- NORMAL and TANGENT become normalized 8-bit, or 16-bit when 8 bits miss
+  the angle tolerance
+- TEXCOORD sets inside [0, 1] become normalized unsigned 16-bit
+- attributes no glTF material reads (see glb_budget.unused_attributes)
+  are dropped, except TEXCOORD_0 and TANGENT, which the brain_tissue,
+  cross_section and structure_highlight shaders read at run time; --keep
+  adds more
+- byte-identical vertices are merged after quantization and unused
+  vertices removed, keeping the first-use order mesh_optimize.py produces
+- indices become 16-bit when the vertex count allows
+
+glTF has no octahedral normal format, so normals are stored as 3-component
+snorm; Godot's importer octahedral-encodes them with its vertex compression
+anyway. Every structure is checked before it is written: the largest
+position error relative to the structure's bounding diagonal and the
+largest normal angle error must stay within --tolerance and
+--normal-tolerance, otherwise that attribute keeps its float format.
+
+Positions are not quantized for meshes whose nodes have children or a skin,
+or whose primitives have morph targets, since the node transform cannot
+absorb the frame there. Attributes that are already quantized are left
+alone, so running the tool again is a no-op.
+
+The report lists per structure the vertices, attribute bytes and errors,
+and per file the size, GPU buffer bytes and the time this reader takes to
+decode every attribute as float, before and after. Re-bake the selection
+proxies and structure BVHs after quantizing, because mesh-local coordinates
+change.
+
+Usage:
+    python3 tools/python/glb_quantize.py                  # all models and LOD files
+    python3 tools/python/glb_quantize.py Brainstem --dry-run
+    python3 tools/python/glb_quantize.py --tolerance 5e-5 --keep TEXCOORD_1
+    python3 tools/python/glb_quantize.py --json quantize_report.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from glb_budget import material_textures, unused_attributes
+from godot_project import find_project_root
+from gltf_io import GLB, GLBWriter, TRIANGLES, Primitive, node_matrix
+from model_assets import model_files
+
+EXTENSION = "KHR_mesh_quantization"
+# Largest position error, relative to the structure's bounding diagonal
+DEFAULT_TOLERANCE = 1e-4
+# Largest normal/tangent error in degrees
+DEFAULT_NORMAL_TOLERANCE = 1.0
+# Largest texture coordinate error: half a texel of a 4096 px texture
+UV_TOLERANCE = 0.5 / 4096
+DECODE_REPEATS = 3
+UINT16_VERTEX_LIMIT = 0xFFFF
+# Read by the runtime shaders even though no glTF material samples them
+RUNTIME_ATTRIBUTES = ("TEXCOORD_0", "TANGENT")
+FLOAT = np.dtype("<f4")
+
+
+@dataclass
+class StructureReport:
+    name: str
+    vertices_before: int = 0
+    vertices_after: int = 0
+    bytes_before: int = 0  # vertex and index data
+    bytes_after: int = 0
+    position_error: float = 0.0  # relative to the bounding diagonal
+    normal_error: float = 0.0  # degrees
+    formats: Dict[str, str] = field(default_factory=dict)
+    dropped: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    quantized: bool = False  # some attribute now needs KHR_mesh_quantization
+    changed: bool = False
+
+
+@dataclass
+class FileReport:
+    path: str
+    size_before: int
+    size_after: int = 0
+    gpu_bytes_before: int = 0
+    gpu_bytes_after: int = 0
+    decode_ms_before: float = 0.0
+    decode_ms_after: float = 0.0
+    written: Optional[str] = None
+    structures: List[StructureReport] = field(default_factory=list)
+
+
+def snorm(values: np.ndarray, dtype) -> np.ndarray:
+    limit = np.iinfo(dtype).max
+    return np.round(np.clip(values, -1.0, 1.0) * limit).astype(dtype)
+
+
+def unorm(values: np.ndarray, dtype) -> np.ndarray:
+    limit = np.iinfo(dtype).max
+    return np.round(np.clip(values, 0.0, 1.0) * limit).astype(dtype)
+
+
+def decoded(values: np.ndarray) -> np.ndarray:
+    """Float value of normalized integers"""
+    return np.maximum(values.astype(np.float64) / np.iinfo(values.dtype).max, -1.0)
+
+
+def angle_error(directions: np.ndarray, encoded: np.ndarray) -> float:
+    """Largest angle in degrees between unit directions and their encoding"""
+    if not len(directions):
+        return 0.0
+    restored = decoded(encoded)[:, :3]
+    restored /= np.maximum(np.linalg.norm(restored, axis=1), 1e-30)[:, None]
+    cosines = np.einsum("ij,ij->i", directions, restored)
+    return float(np.degrees(np.arccos(np.clip(cosines, -1.0, 1.0))).max())
+
+
+def quantize_directions(
+    values: np.ndarray, tolerance: float
+) -> Tuple[Optional[np.ndarray], float]:
+    """8-bit, else 16-bit snorm unit vectors (w kept as the sign); None when both miss"""
+    values = values.astype(np.float64)
+    unit = (
+        values[:, :3]
+        / np.maximum(np.linalg.norm(values[:, :3], axis=1), 1e-30)[:, None]
+    )
+    error = 0.0
+    for dtype in (np.int8, np.int16):
+        encoded = snorm(unit, dtype)
+        if values.shape[1] == 4:
+            sign = np.where(values[:, 3] < 0, -1.0, 1.0)[:, None]
+            encoded = np.hstack([encoded, snorm(sign, dtype)])
+        error = angle_error(unit, encoded)
+        if error <= tolerance:
+            return encoded, error
+    return None, error
+
+
+def mesh_frame(glb: GLB, primitives: List[Primitive]) -> Tuple[np.ndarray, float]:
+    """Center and uniform half extent of all positions of a mesh"""
+    positions = np.concatenate(
+        [glb.float_accessor(p.attributes["POSITION"]) for p in primitives]
+    ).astype(np.float64)
+    low, high = positions.min(axis=0), positions.max(axis=0)
+    return (low + high) * 0.5, float((high - low).max() * 0.5) or 1.0
+
+
+def _frame_blocker(document: dict, mesh: int, primitives: List[Primitive]) -> str:
+    """Why a mesh's positions cannot be quantized, or "" when they can"""
+    nodes = [node for node in document.get("nodes", []) if node.get("mesh") == mesh]
+    entries = document["meshes"][mesh]["primitives"]
+    if not nodes:
+        return "no node uses the mesh"
+    if any(node.get("children") or "skin" in node for node in nodes):
+        return "node has children or a skin"
+    if len(entries) != len(primitives):
+        return "mesh has non-triangle primitives"
+    if any(entries[p.index].get("targets") for p in primitives):
+        return "morph targets"
+    return ""
+
+
+def _apply_frame(node: dict, center: np.ndarray, scale: float) -> None:
+    """Fold position dequantization (scale, then offset) into a node's transform"""
+    matrix = node_matrix(node)
+    if "matrix" in node:
+        frame = np.eye(4)
+        frame[:3, :3] *= scale
+        frame[:3, 3] = center
+        node["matrix"] = (matrix @ frame).T.reshape(-1).tolist()
+        return
+    node["translation"] = (matrix @ np.append(center, 1.0))[:3].tolist()
+    node["scale"] = (np.array(node.get("scale", (1.0, 1.0, 1.0))) * scale).tolist()
+
+
+def _row_keys(attributes: Dict[str, np.ndarray], count: int) -> np.ndarray:
+    columns = [
+        np.ascontiguousarray(attributes[semantic]).reshape(count, -1).view(np.uint8)
+        for semantic in sorted(attributes)
+    ]
+    rows = np.ascontiguousarray(np.hstack(columns))
+    return rows.view(np.dtype((np.void, rows.shape[1]))).reshape(-1)
+
+
+def weld(
+    attributes: Dict[str, np.ndarray], triangles: np.ndarray
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Merge identical vertices and drop unused ones, in order of first use"""
+    count = len(next(iter(attributes.values())))
+    flat = triangles.reshape(-1)
+    first = np.full(count, len(flat), dtype=np.int64)
+    np.minimum.at(first, flat, np.arange(len(flat)))
+    used = np.flatnonzero(first < len(flat))
+    used = used[np.argsort(first[used], kind="stable")]
+    _, representative, inverse = np.unique(
+        _row_keys(attributes, count)[used], return_index=True, return_inverse=True
+    )
+    keep = np.sort(representative)
+    rank = np.empty(len(representative), dtype=np.int64)
+    rank[np.argsort(representative)] = np.arange(len(representative))
+    remap = np.zeros(count, dtype=np.int64)
+    remap[used] = rank[inverse.reshape(-1)]
+    welded = {semantic: array[used[keep]] for semantic, array in attributes.items()}
+    return welded, remap[triangles]
+
+
+def _attribute_bytes(arrays) -> int:
+    """Bytes of vertex attributes with 4-byte aligned elements"""
+    total = 0
+    for array in arrays:
+        element = array.dtype.itemsize * (array.shape[1] if array.ndim > 1 else 1)
+        total += len(array) * (element + (-element % 4))
+    return total
+
+
+def quantize_mesh(
+    glb: GLB,
+    writer: GLBWriter,
+    mesh: int,
+    primitives: List[Primitive],
+    options: argparse.Namespace,
+) -> StructureReport:
+    """Rewrite the primitives of one mesh in `writer`"""
+    document = glb.document
+    report = StructureReport(primitives[0].name)
+    skinned = any(
+        node.get("mesh") == mesh and "skin" in node
+        for node in document.get("nodes", [])
+    )
+    accessors = document["accessors"]
+    quantize_positions = all(
+        accessors[p.attributes["POSITION"]]["componentType"] == 5126 for p in primitives
+    )
+    blocker = _frame_blocker(document, mesh, primitives)
+    if quantize_positions and blocker:
+        report.notes.append(f"positions kept: {blocker}")
+        quantize_positions = False
+    center, scale = mesh_frame(glb, primitives)
+    diagonal = 2.0 * scale * np.sqrt(3.0)
+    if quantize_positions:
+        # Check the whole mesh first: every primitive shares the node frame
+        for primitive in primitives:
+            positions = glb.float_accessor(primitive.attributes["POSITION"])
+            restored = decoded(snorm((positions - center) / scale, np.int16))
+            error = np.linalg.norm(restored * scale + center - positions, axis=1).max()
+            report.position_error = max(report.position_error, float(error) / diagonal)
+        if report.position_error > options.tolerance:
+            report.notes.append(
+                f"positions kept: error {report.position_error:.1e} over tolerance"
+            )
+            quantize_positions = False
+            report.position_error = 0.0
+
+    report.quantized = report.changed = quantize_positions
+    for primitive in primitives:
+        triangles = glb.triangles(primitive)
+        attributes = writer.source_attributes(primitive)
+        normalized = writer.source_normalized(primitive)
+        count = len(attributes["POSITION"])
+        report.vertices_before += count
+        index_bytes = (
+            accessors[primitive.indices]["count"]
+            * glb.accessor(primitive.indices).dtype.itemsize
+            if primitive.indices is not None
+            else 0
+        )
+        report.bytes_before += _attribute_bytes(attributes.values()) + index_bytes
+        if triangles is None or not len(triangles):
+            report.vertices_after += count
+            report.bytes_after += _attribute_bytes(attributes.values()) + index_bytes
+            continue
+
+        material = (
+            document["materials"][primitive.material]
+            if primitive.material is not None
+            else {}
+        )
+        texcoords = set(material_textures(document, primitive.material).values())
+        source = dict(attributes)
+        for semantic in unused_attributes(primitive, texcoords, material, skinned):
+            if semantic not in options.keep and semantic not in RUNTIME_ATTRIBUTES:
+                attributes.pop(semantic)
+                if semantic not in report.dropped:
+                    report.dropped.append(semantic)
+
+        if quantize_positions:
+            positions = glb.float_accessor(primitive.attributes["POSITION"])
+            attributes["POSITION"] = snorm((positions - center) / scale, np.int16)
+            normalized.add("POSITION")
+        for semantic in ("NORMAL", "TANGENT"):
+            if semantic not in attributes or attributes[semantic].dtype != FLOAT:
+                continue
+            encoded, error = quantize_directions(
+                attributes[semantic], options.normal_tolerance
+            )
+            report.normal_error = max(report.normal_error, error)
+            if encoded is None:
+                report.notes.append(f"{semantic} kept: error {error:.2f} deg")
+                continue
+            attributes[semantic] = encoded
+            normalized.add(semantic)
+        for semantic in list(attributes):
+            values = attributes[semantic]
+            if not semantic.startswith("TEXCOORD_") or values.dtype != FLOAT:
+                continue
+            if len(values) and (values.min() < 0.0 or values.max() > 1.0):
+                report.notes.append(f"{semantic} kept: outside [0, 1]")
+                continue
+            encoded = unorm(values, np.uint16)
+            if len(values) and np.abs(decoded(encoded) - values).max() > UV_TOLERANCE:
+                continue
+            attributes[semantic] = encoded
+            normalized.add(semantic)
+
+        welded, indices = weld(attributes, np.asarray(triangles, dtype=np.int64))
+        vertex_count = len(welded["POSITION"])
+        index_type = np.uint16 if vertex_count <= UINT16_VERTEX_LIMIT else np.uint32
+        indices = indices.astype(index_type)
+        report.vertices_after += vertex_count
+        report.bytes_after += _attribute_bytes(welded.values()) + indices.nbytes
+        for semantic, array in welded.items():
+            report.formats.setdefault(semantic, f"{array.dtype.name}x{array.shape[-1]}")
+        converted = [s for s in welded if welded[s].dtype != source[s].dtype]
+        report.quantized |= bool(converted)
+        if (
+            converted
+            or len(welded) < len(source)
+            or vertex_count < count
+            or index_bytes != indices.nbytes
+            or quantize_positions
+        ):
+            report.changed = True
+            writer.set_primitive(primitive, welded, indices, normalized & set(welded))
+
+    if quantize_positions:
+        for node in writer.document.get("nodes", []):
+            if node.get("mesh") == mesh:
+                _apply_frame(node, center, scale)
+        report.formats["POSITION"] += " (node frame)"
+    return report
+
+
+def decode_seconds(path: Path) -> float:
+    """Fastest of a few full decodes of every attribute and index buffer as float"""
+    best = float("inf")
+    for _ in range(DECODE_REPEATS):
+        started = time.perf_counter()
+        glb = GLB.open(path)
+        for primitive in glb.primitives():
+            for index in primitive.attributes.values():
+                glb.float_accessor(index)
+            glb.triangles(primitive)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _gpu_bytes(glb: GLB) -> int:
+    total = 0
+    for primitive in glb.primitives():
+        total += _attribute_bytes(
+            glb.accessor(index) for index in primitive.attributes.values()
+        )
+        if primitive.indices is not None:
+            total += glb.accessor(primitive.indices).nbytes
+    return total
+
+
+def quantize_file(path: Path, output: Path, options: argparse.Namespace) -> FileReport:
+    """Quantize every triangle mesh of a GLB; written only when one changed"""
+    glb = GLB.open(path)
+    report = FileReport(str(path), glb.size, glb.size, _gpu_bytes(glb))
+    report.gpu_bytes_after = report.gpu_bytes_before
+    report.decode_ms_before = report.decode_ms_after = decode_seconds(path) * 1000
+    writer = GLBWriter(glb)
+    meshes: Dict[int, List[Primitive]] = {}
+    for primitive in glb.primitives():
+        if primitive.mode == TRIANGLES and "POSITION" in primitive.attributes:
+            meshes.setdefault(primitive.mesh, []).append(primitive)
+    for mesh, primitives in meshes.items():
+        report.structures.append(quantize_mesh(glb, writer, mesh, primitives, options))
+    if not any(structure.changed for structure in report.structures):
+        return report
+
+    if any(structure.quantized for structure in report.structures):
+        writer.require_extension(EXTENSION)
+    data = writer.to_bytes()
+    report.size_after = len(data)
+    if not options.dry_run:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(data)
+        report.written = str(output)
+        compact = GLB.open(output)
+        report.gpu_bytes_after = _gpu_bytes(compact)
+        report.decode_ms_after = decode_seconds(output) * 1000
+    else:
+        report.gpu_bytes_after = report.gpu_bytes_before - sum(
+            s.bytes_before - s.bytes_after for s in report.structures
+        )
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Quantize and compact the vertex data of the brain model GLBs"
+    )
+    parser.add_argument("models", nargs="*", help="model names or .glb files")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="output folder (default: rewrite in place)"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"largest position error per structure, relative to its bounding"
+        f" diagonal (default: {DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--normal-tolerance",
+        type=float,
+        default=DEFAULT_NORMAL_TOLERANCE,
+        help=f"largest normal/tangent error in degrees (default: {DEFAULT_NORMAL_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--keep",
+        action="append",
+        default=[],
+        metavar="ATTRIBUTE",
+        help="also keep this attribute when no material reads it (e.g. TEXCOORD_1)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="list every structure")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    files = model_files(root, args.models)
+
+    print("🗜️  GLB attribute quantization")
+    print("=" * 60)
+    reports: Dict[str, FileReport] = {}
+    missing = 0
+    started = time.perf_counter()
+    for label, path in files:
+        if not path.exists():
+            missing += 1
+            print(f"\n⚠️  {label}: {path} not found, skipped")
+            continue
+        output = args.output / path.name if args.output else path
+        report = quantize_file(path, output, args)
+        reports[label] = report
+        print(f"\n{label}  ({path.name})")
+        print(
+            f"   File:      {report.size_before / 1024:>9.0f} KB ->"
+            f" {report.size_after / 1024:.0f} KB"
+        )
+        print(
+            f"   GPU data:  {report.gpu_bytes_before / 1024:>9.0f} KB ->"
+            f" {report.gpu_bytes_after / 1024:.0f} KB"
+        )
+        print(
+            f"   Decode:    {report.decode_ms_before:>9.1f} ms -> {report.decode_ms_after:.1f} ms"
+        )
+        for structure in report.structures:
+            if not args.verbose and not structure.notes:
+                continue
+            print(
+                f"      {structure.name:<36} {structure.vertices_before:>8,} ->"
+                f" {structure.vertices_after:>8,} vertices,"
+                f" error {structure.position_error:.1e} / {structure.normal_error:.2f} deg"
+            )
+            if args.verbose:
+                formats = ", ".join(
+                    f"{k} {v}" for k, v in sorted(structure.formats.items())
+                )
+                print(f"         {formats}")
+                if structure.dropped:
+                    print(
+                        f"         dropped {', '.join(sorted(set(structure.dropped)))}"
+                    )
+            for note in structure.notes:
+                print(f"         {note}")
+        if report.written:
+            print(f"   -> {report.written}")
+
+    if args.json:
+        data = {label: asdict(report) for label, report in reports.items()}
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    before = sum(report.size_before for report in reports.values())
+    after = sum(report.size_after for report in reports.values())
+    print("\n📊 Summary")
+    print(f"   Files processed:    {len(reports)} of {len(files)}")
+    print(f"   Files missing:      {missing}")
+    if before:
+        print(
+            f"   Total size:         {before / 1024:.0f} KB -> {after / 1024:.0f} KB"
+            f" ({after / before:.0%})"
+        )
+    print(f"   Time:               {time.perf_counter() - started:.2f} s")
+    return 1 if missing and args.models else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Binary glTF (.glb) Reader and Writer for NeuroVis Model Tools
+=============================================================
+
+Shared GLB access for the mesh tools in this directory. The file is
+memory-mapped and every accessor comes back as a NumPy view into the
+mapping, so reading the index and position buffers of a full brain model
+copies nothing until a tool actually changes them.
+
+GLBWriter writes a document back with some primitives replaced. The binary
+chunk is repacked from scratch: accessors nothing references any more are
+dropped, every remaining accessor gets its own tightly packed buffer view
+(vertex attributes padded to 4-byte strides as the spec requires) and
+embedded images are copied unchanged.
+
+Draco and meshopt compressed files are rejected: their accessors have no
+plain buffer data to map.
+
+Usage:
+    from gltf_io import GLB, GLBWriter
+
+    glb = GLB.open(path)
+    for primitive in glb.primitives():
+        positions = glb.accessor(primitive.attributes["POSITION"])
+        triangles = glb.triangles(primitive)
+"""
+
+import copy
+import json
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+TRIANGLES = 4
+
+COMPONENT_TYPES = {
+    5120: np.dtype("<i1"),
+    5121: np.dtype("<u1"),
+    5122: np.dtype("<i2"),
+    5123: np.dtype("<u2"),
+    5125: np.dtype("<u4"),
+    5126: np.dtype("<f4"),
+}
+COMPONENT_CODES = {dtype: code for code, dtype in COMPONENT_TYPES.items()}
+TYPE_WIDTHS = {
+    "SCALAR": 1,
+    "VEC2": 2,
+    "VEC3": 3,
+    "VEC4": 4,
+    "MAT2": 4,
+    "MAT3": 9,
+    "MAT4": 16,
+}
+WIDTH_TYPES = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4", 16: "MAT4"}
+# Divisors that map normalized integers back to [-1, 1] / [0, 1]
+NORMALIZED_SCALE = {
+    np.dtype("<i1"): 127.0,
+    np.dtype("<u1"): 255.0,
+    np.dtype("<i2"): 32767.0,
+    np.dtype("<u2"): 65535.0,
+}
+UNSUPPORTED_EXTENSIONS = {"KHR_draco_mesh_compression", "EXT_meshopt_compression"}
+
+
+@dataclass
+class Primitive:
+    mesh: int
+    index: int  # position in the mesh's primitive list
+    name: str  # structure name: the node using the mesh, else the mesh name
+    attributes: Dict[str, int]  # semantic -> accessor index
+    indices: Optional[int]
+    material: Optional[int]
+    mode: int
+
+
+class GLB:
+    """A parsed .glb file whose buffers stay memory-mapped"""
+
+    def __init__(self, path: Path, document: dict, binary: memoryview):
+        self.path = path
+        self.document = document
+        self.binary = binary
+        self.size = len(binary)
+
+    @classmethod
+    def open(cls, path: Path) -> "GLB":
+        path = Path(path)
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < 20:
+            raise ValueError(f"{path}: too short for a GLB file")
+        magic, version, length = struct.unpack_from("<III", data, 0)
+        if magic != GLB_MAGIC or version != 2:
+            raise ValueError(f"{path}: not a glTF 2.0 binary file")
+        document = None
+        binary = memoryview(b"")
+        offset = 12
+        while offset + 8 <= min(length, len(data)):
+            chunk_length, chunk_type = struct.unpack_from("<II", data, offset)
+            start = offset + 8
+            if chunk_type == CHUNK_JSON:
+                document = json.loads(bytes(data[start : start + chunk_length]))
+            elif chunk_type == CHUNK_BIN and not binary:
+                binary = memoryview(data)[start : start + chunk_length]
+            offset = start + chunk_length
+        if document is None:
+            raise ValueError(f"{path}: no JSON chunk")
+        required = set(document.get("extensionsRequired", []))
+        if required & UNSUPPORTED_EXTENSIONS:
+            names = ", ".join(sorted(required & UNSUPPORTED_EXTENSIONS))
+            raise ValueError(f"{path}: compressed meshes are not supported ({names})")
+        return cls(path, document, binary)
+
+    def accessor(self, index: int) -> np.ndarray:
+        """Accessor data as (count,) or (count, width); a read-only view when possible"""
+        accessor = self.document["accessors"][index]
+        dtype = COMPONENT_TYPES[accessor["componentType"]]
+        width = TYPE_WIDTHS[accessor["type"]]
+        count = accessor["count"]
+        shape = (count,) if width == 1 else (count, width)
+        if "bufferView" in accessor:
+            view = self.document["bufferViews"][accessor["bufferView"]]
+            if view.get("buffer", 0) != 0:
+                raise ValueError(f"{self.path}: external buffers are not supported")
+            start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+            stride = view.get("byteStride") or dtype.itemsize * width
+            strides = (stride,) if width == 1 else (stride, dtype.itemsize)
+            array = np.ndarray(shape, dtype, self.binary, start, strides)
+        else:
+            array = np.zeros(shape, dtype)
+        sparse = accessor.get("sparse")
+        if sparse:
+            array = array.copy()
+            positions = self._sparse_part(sparse["indices"], sparse["count"], 1)
+            values = self._sparse_part(sparse["values"], sparse["count"], width, dtype)
+            array[positions] = values.reshape((-1,) + shape[1:])
+        return array
+
+    def _sparse_part(
+        self, part: dict, count: int, width: int, dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
+        view = self.document["bufferViews"][part["bufferView"]]
+        dtype = dtype or COMPONENT_TYPES[part["componentType"]]
+        start = view.get("byteOffset", 0) + part.get("byteOffset", 0)
+        return np.frombuffer(self.binary, dtype, count * width, start)
+
+    def float_accessor(self, index: int) -> np.ndarray:
+        """Accessor data as float32, undoing integer normalization"""
+        array = self.accessor(index)
+        if self.document["accessors"][index].get("normalized"):
+            scale = NORMALIZED_SCALE[array.dtype]
+            return np.maximum(array.astype(np.float32) / scale, -1.0)
+        return array.astype(np.float32, copy=False)
+
+    def buffer_view(self, index: int) -> memoryview:
+        view = self.document["bufferViews"][index]
+        start = view.get("byteOffset", 0)
+        return self.binary[start : start + view["byteLength"]]
+
+    def mesh_names(self) -> Dict[int, str]:
+        """Structure name of every mesh: its first node's name, else the mesh name"""
+        names: Dict[int, str] = {}
+        for node in self.document.get("nodes", []):
+            if "mesh" in node and node.get("name"):
+                names.setdefault(node["mesh"], node["name"])
+        for index, mesh in enumerate(self.document.get("meshes", [])):
+            names.setdefault(index, mesh.get("name") or f"mesh_{index}")
+        return names
+
+    def primitives(self) -> Iterator[Primitive]:
+        names = self.mesh_names()
+        for mesh_index, mesh in enumerate(self.document.get("meshes", [])):
+            for index, entry in enumerate(mesh.get("primitives", [])):
+                yield Primitive(
+                    mesh_index,
+                    index,
+                    names[mesh_index],
+                    dict(entry.get("attributes", {})),
+                    entry.get("indices"),
+                    entry.get("material"),
+                    entry.get("mode", TRIANGLES),
+                )
+
+    def vertex_count(self, primitive: Primitive) -> int:
+        position = primitive.attributes.get("POSITION")
+        if position is None:
+            return 0
+        return self.document["accessors"][position]["count"]
+
+    def triangles(self, primitive: Primitive) -> Optional[np.ndarray]:
+        """(n, 3) vertex indices of a triangle-list primitive, None for other modes"""
+        if primitive.mode != TRIANGLES:
+            return None
+        if primitive.indices is None:
+            count = self.vertex_count(primitive) // 3 * 3
+            return np.arange(count, dtype=np.uint32).reshape(-1, 3)
+        indices = self.accessor(primitive.indices)
+        return indices[: len(indices) // 3 * 3].reshape(-1, 3)
+
+    def mesh_geometry(self) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Float positions and int64 triangles of every mesh, primitives merged"""
+        meshes: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for primitive in self.primitives():
+            triangles = self.triangles(primitive)
+            if triangles is None or "POSITION" not in primitive.attributes:
+                continue
+            positions = self.float_accessor(primitive.attributes["POSITION"])
+            triangles = np.asarray(triangles, dtype=np.int64)
+            previous = meshes.get(primitive.mesh)
+            if previous is not None:
+                triangles = triangles + len(previous[0])
+                positions = np.concatenate([previous[0], positions])
+                triangles = np.concatenate([previous[1], triangles])
+            meshes[primitive.mesh] = (positions, triangles)
+        return meshes
+
+
+def node_matrix(node: dict) -> np.ndarray:
+    """Local 4x4 transform of a node, from its matrix or its TRS properties"""
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    rotation = np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation * np.array(node.get("scale", (1.0, 1.0, 1.0)))
+    matrix[:3, 3] = node.get("translation", (0.0, 0.0, 0.0))
+    return matrix
+
+
+def world_matrices(document: dict) -> Dict[int, np.ndarray]:
+    """World transform of every node reachable from a root node"""
+    nodes = document.get("nodes", [])
+    children = {child for node in nodes for child in node.get("children", [])}
+    matrices: Dict[int, np.ndarray] = {}
+    stack = [(index, np.eye(4)) for index in range(len(nodes)) if index not in children]
+    while stack:
+        index, parent = stack.pop()
+        if index in matrices:
+            continue
+        matrices[index] = parent @ node_matrix(nodes[index])
+        stack.extend(
+            (child, matrices[index]) for child in nodes[index].get("children", [])
+        )
+    return matrices
+
+
+class GLBWriter:
+    """Writes a GLB document with replaced primitives, repacking the binary chunk"""
+
+    def __init__(self, source: GLB):
+        self.source = source
+        self.document = copy.deepcopy(source.document)
+        self.arrays: Dict[int, np.ndarray] = {}  # accessors added by the writer
+
+    def add_accessor(
+        self, array: np.ndarray, normalized: bool = False, bounds: bool = False
+    ) -> int:
+        """Append an accessor for `array`; returns its index"""
+        array = np.asarray(array)
+        dtype = array.dtype.newbyteorder("<")
+        if dtype not in COMPONENT_CODES:
+            raise ValueError(f"unsupported accessor dtype {array.dtype}")
+        width = 1 if array.ndim == 1 else array.shape[1]
+        accessor = {
+            "componentType": COMPONENT_CODES[dtype],
+            "count": len(array),
+            "type": WIDTH_TYPES[width],
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if bounds and len(array):
+            axis_min = array.min(axis=0).reshape(-1)
+            axis_max = array.max(axis=0).reshape(-1)
+            accessor["min"] = axis_min.tolist()
+            accessor["max"] = axis_max.tolist()
+        accessors = self.document.setdefault("accessors", [])
+        accessors.append(accessor)
+        self.arrays[len(accessors) - 1] = array.astype(dtype, copy=False)
+        return len(accessors) - 1
+
+    def set_primitive(
+        self,
+        primitive: Primitive,
+        attributes: Dict[str, np.ndarray],
+        indices: Optional[np.ndarray],
+        normalized: Set[str] = frozenset(),
+    ) -> None:
+        """Replace the vertex and index data of a primitive (morph targets are dropped)"""
+        entry = self.document["meshes"][primitive.mesh]["primitives"][primitive.index]
+        entry["attributes"] = {
+            semantic: self.add_accessor(
+                array, semantic in normalized, bounds=semantic == "POSITION"
+            )
+            for semantic, array in attributes.items()
+        }
+        if indices is None:
+            entry.pop("indices", None)
+        else:
+            entry["indices"] = self.add_accessor(np.asarray(indices).reshape(-1))
+        entry.pop("targets", None)
+
+    def source_attributes(self, primitive: Primitive) -> Dict[str, np.ndarray]:
+        """Vertex attributes of a source primitive, as stored"""
+        return {
+            semantic: self.source.accessor(index)
+            for semantic, index in primitive.attributes.items()
+        }
+
+    def source_normalized(self, primitive: Primitive) -> Set[str]:
+        accessors = self.source.document["accessors"]
+        return {
+            semantic
+            for semantic, index in primitive.attributes.items()
+            if accessors[index].get("normalized")
+        }
+
+    def require_extension(self, name: str) -> None:
+        for key in ("extensionsUsed", "extensionsRequired"):
+            names = self.document.setdefault(key, [])
+            if name not in names:
+                names.append(name)
+
+    @staticmethod
+    def _accessor_targets(document: dict) -> Dict[int, Optional[int]]:
+        """Every referenced accessor with the buffer view target it needs"""
+        targets: Dict[int, Optional[int]] = {}
+        for mesh in document.get("meshes", []):
+            for entry in mesh.get("primitives", []):
+                for index in entry.get("attributes", {}).values():
+                    targets[index] = ARRAY_BUFFER
+                for target in entry.get("targets", []):
+                    for index in target.values():
+                        targets[index] = ARRAY_BUFFER
+                if "indices" in entry:
+                    targets[entry["indices"]] = ELEMENT_ARRAY_BUFFER
+        for skin in document.get("skins", []):
+            if "inverseBindMatrices" in skin:
+                targets.setdefault(skin["inverseBindMatrices"], None)
+        for animation in document.get("animations", []):
+            for sampler in animation.get("samplers", []):
+                targets.setdefault(sampler["input"], None)
+                targets.setdefault(sampler["output"], None)
+        return targets
+
+    def _accessor_data(self, index: int) -> np.ndarray:
+        if index in self.arrays:
+            return self.arrays[index]
+        return self.source.accessor(index)
+
+    def to_bytes(self) -> bytes:
+        document = copy.deepcopy(self.document)
+        blob = bytearray()
+        views: List[dict] = []
+
+        def append(data: bytes, view: dict) -> int:
+            blob.extend(b"\0" * (-len(blob) % 4))
+            view.update(buffer=0, byteOffset=len(blob), byteLength=len(data))
+            blob.extend(data)
+            views.append(view)
+            return len(views) - 1
+
+        targets = self._accessor_targets(document)
+        remap: Dict[int, int] = {}
+        accessors: List[dict] = []
+        for old in sorted(targets):
+            accessor = {
+                key: value
+                for key, value in document["accessors"][old].items()
+                if key not in ("bufferView", "byteOffset", "sparse")
+            }
+            data = np.ascontiguousarray(self._accessor_data(old))
+            rows = data.reshape(len(data), -1).view(np.uint8)
+            view: dict = {}
+            if targets[old] is not None:
+                view["target"] = targets[old]
+            element = rows.shape[1] if len(data) else 0
+            if targets[old] == ARRAY_BUFFER and element % 4:
+                # Vertex attribute elements must start on 4-byte boundaries
+                stride = element + (-element % 4)
+                padded = np.zeros((len(rows), stride), np.uint8)
+                padded[:, :element] = rows
+                rows = padded
+                view["byteStride"] = stride
+            accessor["bufferView"] = append(rows.tobytes(), view)
+            remap[old] = len(accessors)
+            accessors.append(accessor)
+
+        for image in document.get("images", []):
+            if "bufferView" in image:
+                data = bytes(self.source.buffer_view(image["bufferView"]))
+                image["bufferView"] = append(data, {})
+
+        for mesh in document.get("meshes", []):
+            for entry in mesh.get("primitives", []):
+                attributes = entry.get("attributes", {})
+                for semantic in attributes:
+                    attributes[semantic] = remap[attributes[semantic]]
+                for target in entry.get("targets", []):
+                    for semantic in target:
+                        target[semantic] = remap[target[semantic]]
+                if "indices" in entry:
+                    entry["indices"] = remap[entry["indices"]]
+        for skin in document.get("skins", []):
+            if "inverseBindMatrices" in skin:
+                skin["inverseBindMatrices"] = remap[skin["inverseBindMatrices"]]
+        for animation in document.get("animations", []):
+            for sampler in animation.get("samplers", []):
+                sampler["input"] = remap[sampler["input"]]
+                sampler["output"] = remap[sampler["output"]]
+
+        document["accessors"] = accessors
+        document["bufferViews"] = views
+        document["buffers"] = [{"byteLength": len(blob)}] if blob else []
+        if not accessors:
+            document.pop("accessors")
+        if not views:
+            document.pop("bufferViews")
+
+        text = json.dumps(document, separators=(",", ":")).encode("utf-8")
+        text += b" " * (-len(text) % 4)
+        blob.extend(b"\0" * (-len(blob) % 4))
+        length = 12 + 8 + len(text) + (8 + len(blob) if blob else 0)
+        out = bytearray(struct.pack("<III", GLB_MAGIC, 2, length))
+        out += struct.pack("<II", len(text), CHUNK_JSON) + text
+        if blob:
+            out += struct.pack("<II", len(blob), CHUNK_BIN) + blob
+        return bytes(out)
+
+    def write(self, path: Path) -> int:
+        """Write the GLB file; returns its size in bytes"""
+        data = self.to_bytes()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(data)
+        return len(data)
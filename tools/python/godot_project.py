@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Godot Project Helpers for NeuroVis Tooling
+==========================================
+
+Shared helpers for the Python tools in this directory: locating the project
+root, reading project.godot (autoloads, main scene) and other ConfigFile
+.cfg files, walking project files with the same ignore rules as the syntax
+fixers, and converting between res:// paths and files on disk.
+
+Usage:
+    from godot_project import find_project_root, read_autoloads
+
+    root = find_project_root()
+    for name, res_path in read_autoloads(root).items():
+        print(name, res_path)
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+PROJECT_FILE = "project.godot"
+# Tool caches live next to Godot's own import cache, which is never committed
+CACHE_DIR = ".godot/neurovis_tools"
+
+# Directories never scanned (mirrors GodotSyntaxFixer.ignore_dirs)
+IGNORE_DIRS = {
+    ".godot",
+    ".git",
+    ".import",
+    ".vscode",
+    "node_modules",
+    "exports",
+    "builds",
+    "temp_syntax_check",
+    "backup",
+    "godot-mcp",
+    "__pycache__",
+}
+IGNORE_DIR_PREFIXES = ("syntax_fix_backup_", "backups_", "backup_")
+
+_SECTION_RE = re.compile(r"^\[([^\]]+)\]\s*$")
+_KEY_RE = re.compile(r"^([A-Za-z0-9_/.\-]+)\s*=\s*(.*)$")
+_EXT_RESOURCE_RE = re.compile(r"^\[ext_resource\b([^\]]*)\]", re.MULTILINE)
+_ATTRIBUTE_RE = re.compile(r'(\w+)="([^"]*)"')
+
+
+def find_project_root(start: Optional[Path] = None) -> Path:
+    """Walk up from `start` (default: this file) to the directory with project.godot"""
+    path = (start or Path(__file__)).resolve()
+    if path.is_file():
+        path = path.parent
+    for candidate in [path, *path.parents]:
+        if (candidate / PROJECT_FILE).exists():
+            return candidate
+    raise FileNotFoundError(f"No {PROJECT_FILE} found above {path}")
+
+
+def cache_path(root: Path, name: str) -> Path:
+    """Path of a tool cache file under CACHE_DIR, creating the directory"""
+    directory = root / CACHE_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / name
+
+
+def unquote(value: str) -> str:
+    """Strip surrounding double quotes from a Godot config value"""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def read_project_settings(root: Path) -> Dict[str, Dict[str, str]]:
+    """Parse project.godot into {section: {key: raw_value}}"""
+    return read_config(root / PROJECT_FILE)
+
+
+def read_config(path: Path) -> Dict[str, Dict[str, str]]:
+    """Parse a Godot ConfigFile (project.godot, *.cfg) into {section: {key: raw_value}}"""
+    settings: Dict[str, Dict[str, str]] = {"": {}}
+    section = ""
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith(";"):
+                continue
+            match = _SECTION_RE.match(line)
+            if match:
+                section = match.group(1)
+                settings.setdefault(section, {})
+                continue
+            match = _KEY_RE.match(line)
+            if match:
+                settings[section][match.group(1)] = match.group(2)
+    return settings
+
+
+def read_autoloads(root: Path) -> Dict[str, str]:
+    """Autoload names mapped to their res:// script or scene paths, in boot order"""
+    section = read_project_settings(root).get("autoload", {})
+    return {name: unquote(value).lstrip("*") for name, value in section.items()}
+
+
+def read_main_scene(root: Path) -> Optional[str]:
+    """res:// path of run/main_scene"""
+    value = read_project_settings(root).get("application", {}).get("run/main_scene")
+    return unquote(value) if value else None
+
+
+def is_ignored(relative: Path) -> bool:
+    """True when a project-relative path lives under an ignored directory"""
+    for part in relative.parts[:-1]:
+        if part in IGNORE_DIRS or part.startswith(IGNORE_DIR_PREFIXES):
+            return True
+    return False
+
+
+def iter_project_files(root: Path, *suffixes: str) -> Iterator[Path]:
+    """Yield project files with the given suffixes, skipping ignored directories"""
+    wanted = set(suffixes)
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = sorted(directory.iterdir())
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name in IGNORE_DIRS or entry.name.startswith(
+                    IGNORE_DIR_PREFIXES
+                ):
+                    continue
+                stack.append(entry)
+            elif not wanted or entry.suffix in wanted:
+                yield entry
+
+
+def to_res_path(root: Path, path: Path) -> str:
+    """Convert a file on disk to its res:// path"""
+    return "res://" + path.resolve().relative_to(root.resolve()).as_posix()
+
+
+def from_res_path(root: Path, res_path: str) -> Optional[Path]:
+    """Convert a res:// path to a file on disk (None for user:// and other schemes)"""
+    if not res_path.startswith("res://"):
+        return None
+    return root / res_path[len("res://") :]
+
+
+def uid_owners(root: Path) -> Dict[str, List[str]]:
+    """Every uid:// id with the res:// paths claiming it (.uid sidecars, resource headers)"""
+    owners: Dict[str, List[str]] = {}
+    for path in iter_project_files(root, ".uid", ".tscn", ".tres"):
+        try:
+            if path.suffix == ".uid":
+                uid = path.read_text(encoding="utf-8").strip()
+                if uid.startswith("uid://"):
+                    owners.setdefault(uid, []).append(
+                        to_res_path(root, path.with_suffix(""))
+                    )
+            else:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    header = f.readline()
+                match = re.search(r'\buid="(uid://[^"]+)"', header)
+                if match:
+                    owners.setdefault(match.group(1), []).append(
+                        to_res_path(root, path)
+                    )
+        except OSError:
+            continue
+    return owners
+
+
+def read_uid_map(root: Path) -> Dict[str, str]:
+    """Map uid:// ids to res:// paths from .uid sidecars and resource headers"""
+    return {uid: paths[-1] for uid, paths in uid_owners(root).items()}
+
+
+def ext_resources(text: str) -> Iterator[Dict[str, str]]:
+    """Attributes of every [ext_resource] header in a .tscn/.tres file"""
+    for match in _EXT_RESOURCE_RE.finditer(text):
+        yield dict(_ATTRIBUTE_RE.findall(match.group(1)))
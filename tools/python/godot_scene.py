@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Godot Scene Reader for NeuroVis Tooling
+=======================================
+
+Parses text scenes (.tscn) and resources (.tres) into their ext_resource,
+sub_resource, node, connection and resource sections, and resolves node
+paths the way the engine does at runtime, including paths that reach into
+instanced scenes. Lines the engine would reject (unknown sections, stray
+text, duplicate ids, values left open at the end of the file) are recorded
+in Scene.errors instead of raising, so one pass serves both reading and
+validation.
+
+Property values are kept as the raw text from the file (multi-line arrays,
+dictionaries and strings are joined), so tools can compare or rewrite them
+without a full Variant parser.
+
+Usage:
+    from godot_scene import SceneLibrary
+
+    library = SceneLibrary(root)
+    for scene, node in library.script_owners("res://scenes/main/node_3d.gd"):
+        target = library.resolve(scene, node.path, "UI_Layer/ObjectNameLabel")
+        print(scene.path, node.path, target and library.node_type(target))
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from godot_project import iter_project_files, to_res_path, unquote
+
+_HEADER_RE = re.compile(r"^\[(\w+)(\s.*)?\]\s*$")
+_HEADER_ATTRIBUTE_RE = re.compile(
+    r'(\w+)=("(?:[^"\\]|\\.)*"|\w+\([^)]*\)|\[[^\]]*\]|[^\s\]]+)'
+)
+_PROPERTY_RE = re.compile(r"^([A-Za-z0-9_/:.\-]+)\s*=\s*(.*)$")
+_RESOURCE_REF_RE = re.compile(r'^(?:Ext|Sub)Resource\(\s*"?([^")\s]+)"?\s*\)$')
+
+
+@dataclass
+class ExtResource:
+    id: str
+    type: str
+    path: str
+    uid: Optional[str] = None
+    line: int = 0
+
+
+@dataclass
+class SubResource:
+    id: str
+    type: str
+    line: int = 0
+    properties: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SceneNode:
+    name: str
+    line: int
+    type: Optional[str] = None
+    parent: Optional[str] = None  # None for the scene root
+    instance: Optional[str] = None  # ext_resource id of an instanced scene
+    groups: List[str] = field(default_factory=list)
+    properties: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def path(self) -> str:
+        """Path relative to the scene root ("." for the root itself)"""
+        if self.parent is None:
+            return "."
+        if self.parent == ".":
+            return self.name
+        return f"{self.parent}/{self.name}"
+
+    @property
+    def script(self) -> Optional[str]:
+        """ext_resource id of the attached script"""
+        return resource_id(self.properties.get("script", ""))
+
+    @property
+    def unique(self) -> bool:
+        return self.properties.get("unique_name_in_owner") == "true"
+
+    @property
+    def override(self) -> bool:
+        """Only sets properties of a node that an instanced scene creates"""
+        return self.type is None and self.instance is None and self.parent is not None
+
+
+@dataclass
+class Scene:
+    path: str  # res:// path, or the file name for scenes read from text
+    kind: str = ""  # "gd_scene" or "gd_resource", from the file header
+    type: Optional[str] = None  # resource class of a .tres
+    uid: Optional[str] = None
+    format: Optional[int] = None
+    load_steps: Optional[int] = None
+    ext_resources: Dict[str, ExtResource] = field(default_factory=dict)
+    sub_resources: Dict[str, SubResource] = field(default_factory=dict)
+    nodes: List[SceneNode] = field(default_factory=list)
+    connections: List[Dict[str, str]] = field(default_factory=list)
+    properties: Dict[str, str] = field(default_factory=dict)  # [resource] of a .tres
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # (line, message)
+    _by_path: Dict[str, SceneNode] = field(default_factory=dict, repr=False)
+
+    @property
+    def root(self) -> Optional[SceneNode]:
+        return self.nodes[0] if self.nodes else None
+
+    def node(self, path: str) -> Optional[SceneNode]:
+        if len(self._by_path) != len(self.nodes):
+            self._by_path = {n.path: n for n in self.nodes}
+        return self._by_path.get(path)
+
+    def instance_path(self, node: SceneNode) -> Optional[str]:
+        """res:// path of the scene a node instances"""
+        resource = self.ext_resources.get(node.instance or "")
+        return resource.path if resource else None
+
+    def script_path(self, node: SceneNode) -> Optional[str]:
+        """res:// path of the script attached to a node"""
+        resource = self.ext_resources.get(node.script or "")
+        return resource.path if resource else None
+
+
+def resource_id(value: str) -> Optional[str]:
+    """Id inside ExtResource("1_abc") / SubResource("x"), or None"""
+    match = _RESOURCE_REF_RE.match(value.strip())
+    return match.group(1) if match else None
+
+
+def _value_complete(text: str) -> bool:
+    """True when a property value has balanced brackets and closed strings"""
+    depth = 0
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+    return not in_string and depth <= 0
+
+
+def _parse_groups(value: str) -> List[str]:
+    return re.findall(r'"((?:[^"\\]|\\.)*)"', value)
+
+
+def parse_scene(text: str, path: str = "") -> Scene:
+    """Parse the text of a .tscn or .tres file"""
+    scene = Scene(path)
+    section: Optional[object] = None
+    pending: Optional[Tuple[str, List[str], int]] = None
+
+    def store(key: str, value: str, number: int):
+        if isinstance(section, (SceneNode, SubResource)):
+            section.properties[key] = value
+        elif section is scene:
+            scene.properties[key] = value
+        else:
+            scene.errors.append((number, f"property '{key}' outside a section"))
+
+    for number, raw in enumerate(text.splitlines(), 1):
+        if pending is not None:
+            key, parts, start = pending
+            parts.append(raw)
+            value = "\n".join(parts)
+            if _value_complete(value):
+                store(key, value, start)
+                pending = None
+            continue
+
+        line = raw.strip()
+        if not line or line.startswith(";"):
+            continue
+        header = _HEADER_RE.match(line)
+        if header:
+            tag = header.group(1)
+            attrs = {
+                k: v for k, v in _HEADER_ATTRIBUTE_RE.findall(header.group(2) or "")
+            }
+            plain = {k: unquote(v) for k, v in attrs.items()}
+            section = None
+            if tag in ("gd_scene", "gd_resource"):
+                if scene.kind or scene.nodes or scene.ext_resources:
+                    scene.errors.append((number, f"[{tag}] is not the first section"))
+                scene.kind = tag
+                scene.type = plain.get("type")
+                scene.uid = plain.get("uid")
+                if plain.get("format", "").isdigit():
+                    scene.format = int(plain["format"])
+                if plain.get("load_steps", "").isdigit():
+                    scene.load_steps = int(plain["load_steps"])
+            elif tag == "ext_resource":
+                resource = ExtResource(
+                    plain.get("id", ""),
+                    plain.get("type", ""),
+                    plain.get("path", ""),
+                    plain.get("uid"),
+                    number,
+                )
+                if resource.id in scene.ext_resources:
+                    scene.errors.append(
+                        (number, f"duplicate ext_resource id '{resource.id}'")
+                    )
+                scene.ext_resources[resource.id] = resource
+            elif tag == "sub_resource":
+                section = SubResource(
+                    plain.get("id", ""), plain.get("type", ""), number
+                )
+                if section.id in scene.sub_resources:
+                    scene.errors.append(
+                        (number, f"duplicate sub_resource id '{section.id}'")
+                    )
+                scene.sub_resources[section.id] = section
+            elif tag == "node":
+                section = SceneNode(
+                    name=plain.get("name", ""),
+                    line=number,
+                    type=plain.get("type"),
+                    parent=plain.get("parent"),
+                    instance=resource_id(attrs.get("instance", "")),
+                    groups=_parse_groups(attrs.get("groups", "")),
+                )
+                scene.nodes.append(section)
+            elif tag == "connection":
+                scene.connections.append(dict(plain, line=str(number)))
+            elif tag == "resource":
+                section = scene
+            elif tag != "editable":
+                scene.errors.append((number, f"unknown section [{tag}]"))
+            continue
+
+        match = _PROPERTY_RE.match(line)
+        if match:
+            key, value = match.groups()
+            if _value_complete(value):
+                store(key, value, number)
+            else:
+                pending = (key, [value], number)
+        else:
+            scene.errors.append((number, f"cannot parse: {line[:60]}"))
+    if pending is not None:
+        scene.errors.append((pending[2], f"value of '{pending[0]}' is never closed"))
+    return scene
+
+
+def read_scene(path: Path, root: Optional[Path] = None) -> Scene:
+    """Read and parse a .tscn/.tres file; `root` makes the stored path a res:// path"""
+    text = path.read_text(encoding="utf-8", errors="replace")
+    return parse_scene(text, to_res_path(root, path) if root else str(path))
+
+
+# A node as seen from every scene it belongs to: the outer scene first, then
+# the scenes it instances. `Inst/Child` in a scene and `Child` in the
+# instanced scene are the same runtime node.
+Location = List[Tuple[Scene, str]]
+
+
+def _join(parent: str, name: str) -> str:
+    return name if parent == "." else f"{parent}/{name}"
+
+
+class SceneLibrary:
+    """Parsed project scenes, loaded on demand and cached by res:// path"""
+
+    def __init__(self, project_root: Path):
+        self.root = project_root
+        self._scenes: Dict[str, Optional[Scene]] = {}
+        self._script_owners: Optional[Dict[str, List[Tuple[Scene, SceneNode]]]] = None
+
+    def scene(self, res_path: str) -> Optional[Scene]:
+        if res_path not in self._scenes:
+            scene = None
+            if res_path.startswith("res://") and res_path.endswith(".tscn"):
+                path = self.root / res_path[len("res://") :]
+                try:
+                    scene = read_scene(path, self.root)
+                except (OSError, ValueError):
+                    scene = None
+            self._scenes[res_path] = scene
+        return self._scenes[res_path]
+
+    def scenes(self) -> List[Scene]:
+        """Every scene in the project"""
+        found = []
+        for path in iter_project_files(self.root, ".tscn"):
+            scene = self.scene(to_res_path(self.root, path))
+            if scene is not None:
+                found.append(scene)
+        return found
+
+    def script_owners(self, script_res_path: str) -> List[Tuple[Scene, SceneNode]]:
+        """(scene, node) pairs for every node the script is attached to"""
+        if self._script_owners is None:
+            self._script_owners = {}
+            for scene in self.scenes():
+                for node in scene.nodes:
+                    script = scene.script_path(node)
+                    if script:
+                        self._script_owners.setdefault(script, []).append((scene, node))
+        return self._script_owners.get(script_res_path, [])
+
+    def _expand(self, location: Location) -> Location:
+        """Add the instanced scenes of the nodes at `location`"""
+        expanded = list(location)
+        for scene, path in location:
+            node = scene.node(path)
+            inner_path = scene.instance_path(node) if node else None
+            inner = self.scene(inner_path) if inner_path else None
+            if inner is not None and inner.root is not None:
+                if all(s is not inner for s, _ in expanded):
+                    expanded.extend(self._expand([(inner, ".")]))
+        return expanded
+
+    def resolve(
+        self, scene: Scene, from_path: str, node_path: str
+    ) -> Optional[Location]:
+        """Location of `node_path` relative to the node at `from_path`
+
+        Supports child paths and `%UniqueName` segments. Paths that leave the
+        scene (`..`, absolute `/root/...`) cannot be checked and give None.
+        """
+        if scene.node(from_path) is None:
+            return None
+        if node_path in ("", "."):
+            return self._expand([(scene, from_path)])
+        if node_path.startswith("/") or ":" in node_path:
+            return None
+
+        location = self._expand([(scene, from_path)])
+        for segment in node_path.split("/"):
+            if segment in ("", "."):
+                continue
+            if segment == "..":
+                return None
+            if segment.startswith("%"):
+                location = self._unique(location, segment[1:])
+            else:
+                location = [
+                    (s, _join(p, segment))
+                    for s, p in location
+                    if s.node(_join(p, segment)) is not None
+                ]
+            if not location:
+                return None
+            location = self._expand(location)
+        return location
+
+    def _unique(self, location: Location, name: str) -> Location:
+        """Nodes marked unique_name_in_owner in the scenes owning `location`"""
+        found: Location = []
+        for scene, _ in location:
+            for node in scene.nodes:
+                if node.unique and node.name == name:
+                    found.append((scene, node.path))
+        return found
+
+    @staticmethod
+    def node_type(location: Location) -> Optional[str]:
+        """Engine class of a resolved node (instanced scenes give their root type)"""
+        for scene, path in location:
+            node = scene.node(path)
+            if node is not None and node.type:
+                return node.type
+        return None
+
+    @staticmethod
+    def node_scripts(location: Location) -> List[str]:
+        """res:// paths of scripts attached to a resolved node, outermost first"""
+        scripts = []
+        for scene, path in location:
+            node = scene.node(path)
+            script = scene.script_path(node) if node else None
+            if script:
+                scripts.append(script)
+        return scripts
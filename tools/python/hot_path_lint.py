@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Hot-Path Performance Lint for NeuroVis
+======================================
+
+Finds work that runs every frame or every input event. Starting from
+_process, _physics_process, _input, _unhandled_input and _gui_input, it
+follows calls on `self` through the script and its base scripts and flags
+these patterns in every reachable function:
+
+- node lookups:      get_node(), get_node_or_null(), $Path, %Unique
+- tree searches:     find_child(), find_children(), get_nodes_in_group(),
+                     get_children() and functions that call themselves
+- allocations:       X.new(), instantiate(), duplicate(), load(), and
+                     non-empty array/dictionary literals
+- string building:   "a" + b, "%s" % x and str() concatenation
+- logging:           print(), prints(), print_debug(), printerr(), push_warning()
+- signal emits:      x.emit() and emit_signal()
+
+Severity depends on the pattern and on the callback: per-frame callbacks
+weigh more than input callbacks, and anything inside a for/while loop is
+raised one level. Each finding carries the call path from its callback.
+
+Every file gets a budget score (high = 5, medium = 2, low = 1 points).
+Files over --budget fail the check, which is how the pre-commit
+`performance-checks` hook and the lint workflow use it. A finding can be
+accepted with a `# perf: ignore` comment on its line.
+
+Usage:
+    python3 tools/python/hot_path_lint.py                      # whole project
+    python3 tools/python/hot_path_lint.py core/visualization/LODSystemEnhanced.gd
+    python3 tools/python/hot_path_lint.py --budget 20 --json perf.json
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from gdscript_lexer import NAME, OP, STRING, Token, string_value
+from gdscript_outline import Function, Outline, call_sites, parse_file
+from godot_project import find_project_root, iter_project_files
+from symbol_index import SymbolIndex
+
+FRAME_CALLBACKS = ("_process", "_physics_process")
+INPUT_CALLBACKS = ("_input", "_unhandled_input", "_gui_input")
+
+SEVERITIES = ("low", "medium", "high")
+POINTS = {"low": 1, "medium": 2, "high": 5}
+DEFAULT_BUDGET = 25
+IGNORE_MARKER = "perf: ignore"
+
+NODE_LOOKUPS = {"get_node", "get_node_or_null"}
+TREE_SEARCHES = {"find_child", "find_children", "get_nodes_in_group", "get_children"}
+ALLOCATING_CALLS = {"instantiate", "duplicate"}
+LOG_CALLS = {"print", "prints", "printt", "print_debug", "printerr", "push_warning"}
+# Keywords after which `[` / `{` opens a literal rather than a subscript
+LITERAL_CONTEXT = {"return", "in", "and", "or", "not", "await"}
+
+# rule -> (severity in a per-frame callback, message)
+RULES = {
+    "node-lookup": ("high", "node lookup; cache it in an @onready var"),
+    "tree-search": ("high", "scene tree search"),
+    "recursion": ("high", "recursive function in a hot path"),
+    "allocation": ("medium", "allocates a new object"),
+    "resource-load": ("high", "loads a resource"),
+    "collection-literal": ("low", "allocates an array/dictionary"),
+    "string-build": ("low", "builds a string"),
+    "print": ("medium", "prints to the console"),
+    "signal-emit": ("low", "emits a signal"),
+}
+
+
+@dataclass
+class Finding:
+    file: str
+    line: int
+    function: str
+    rule: str
+    severity: str
+    message: str
+    path: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FileReport:
+    file: str
+    findings: List[Finding] = field(default_factory=list)
+
+    @property
+    def score(self) -> int:
+        return sum(POINTS[f.severity] for f in self.findings)
+
+    def counts(self) -> Counter:
+        return Counter(f.severity for f in self.findings)
+
+
+def _shift(severity: str, levels: int) -> str:
+    index = SEVERITIES.index(severity) + levels
+    return SEVERITIES[max(0, min(index, len(SEVERITIES) - 1))]
+
+
+def _is_string_literal(token: Optional[Token]) -> bool:
+    return token is not None and token.kind == STRING and token.text[:1] in "\"'"
+
+
+def _node_path(tokens: List[Token], start: int) -> str:
+    """Text of a $Path/To/Node shorthand starting at tokens[start]"""
+    parts = [tokens[start].text]
+    end = tokens[start].end
+    for token in tokens[start + 1 :]:
+        if token.start != end or not (token.kind == NAME or token.text == "/"):
+            break
+        parts.append(token.text)
+        end = token.end
+    return "".join(parts)
+
+
+def line_findings(tokens: List[Token], func_name: str) -> List[Tuple[str, str]]:
+    """(rule, detail) pairs for the patterns on one logical line"""
+    found: List[Tuple[str, str]] = []
+    for i, token in enumerate(tokens):
+        prev = tokens[i - 1] if i > 0 else None
+        after = tokens[i + 1] if i + 1 < len(tokens) else None
+        is_call = after is not None and after.text == "("
+        text = token.text
+
+        if token.kind == OP and text in ("$", "%") and after is not None:
+            unique = text == "%" and (prev is None or prev.kind == OP)
+            if text == "$" or unique:
+                if after.kind in (NAME, STRING):
+                    found.append(("node-lookup", text + _node_path(tokens, i + 1)))
+            if text == "%" and _is_string_literal(prev):
+                found.append(("string-build", "format string"))
+            continue
+        if token.kind == OP and text == "+":
+            if _is_string_literal(prev) or _is_string_literal(after):
+                found.append(("string-build", "string concatenation"))
+            continue
+        if token.kind == OP and text in "[{":
+            if prev is not None and prev.text not in LITERAL_CONTEXT:
+                if prev.kind != OP or prev.text in (")", "]", "}"):
+                    continue
+            close = "]" if text == "[" else "}"
+            if after is not None and after.text != close:
+                found.append(("collection-literal", "array" if text == "[" else "dict"))
+            continue
+        if token.kind != NAME or not is_call:
+            continue
+
+        dotted = prev is not None and prev.text == "."
+        if text in NODE_LOOKUPS:
+            argument = tokens[i + 2] if i + 2 < len(tokens) else None
+            shown = string_value(argument) if _is_string_literal(argument) else "..."
+            found.append(("node-lookup", f"{text}({shown})"))
+        elif text in TREE_SEARCHES:
+            found.append(("tree-search", f"{text}()"))
+        elif text == "new" and dotted:
+            found.append(("allocation", f"{tokens[i - 2].text}.new()"))
+        elif text in ALLOCATING_CALLS and dotted:
+            found.append(("allocation", f"{text}()"))
+        elif text == "load" and not dotted:
+            found.append(("resource-load", "load()"))
+        elif text in LOG_CALLS and not dotted:
+            found.append(("print", f"{text}()"))
+        elif text == "emit" and dotted:
+            found.append(("signal-emit", f"{tokens[i - 2].text}.emit()"))
+        elif text == "emit_signal" and not dotted:
+            found.append(("signal-emit", "emit_signal()"))
+        elif text == "str" and not dotted and after is not None:
+            if prev is not None and prev.text == "+":
+                found.append(("string-build", "str() concatenation"))
+        elif text == func_name and not dotted:
+            found.append(("recursion", f"{text}() calls itself"))
+    return found
+
+
+class HotPathLinter:
+    """Runs the hot-path rules over scripts, following calls through base scripts"""
+
+    def __init__(self, project_root: Path, index: Optional[SymbolIndex] = None):
+        self.root = project_root
+        self.index = index or SymbolIndex.open(project_root)
+        self._outlines: Dict[str, Optional[Outline]] = {}
+
+    def _outline(self, relative: str) -> Optional[Outline]:
+        if relative not in self._outlines:
+            path = self.root / relative
+            try:
+                self._outlines[relative] = parse_file(path, self.root)
+            except (OSError, ValueError):
+                self._outlines[relative] = None
+        return self._outlines[relative]
+
+    def _chain(self, relative: str) -> List[Outline]:
+        """The script and the project scripts it extends, nearest first"""
+        chain = []
+        for path in self.index.extends_chain(relative) or [relative]:
+            outline = self._outline(path) if path.endswith(".gd") else None
+            if outline is not None:
+                chain.append(outline)
+        return chain
+
+    def lint(self, relative: str) -> FileReport:
+        report = FileReport(relative)
+        chain = self._chain(relative)
+        if not chain:
+            return report
+
+        functions: Dict[str, Tuple[Outline, Function]] = {}
+        for outline in reversed(chain):
+            for func in outline.functions:
+                if func.owner is None:
+                    functions[func.name] = (outline, func)
+
+        # Breadth-first from every callback gives the shortest call path;
+        # per-frame callbacks go first so they own shared helpers
+        paths: Dict[str, Tuple[List[str], bool]] = {}
+        queue = deque()
+        for name in FRAME_CALLBACKS + INPUT_CALLBACKS:
+            if name in functions:
+                paths[name] = ([name], name in FRAME_CALLBACKS)
+                queue.append(name)
+        while queue:
+            name = queue.popleft()
+            outline, func = functions[name]
+            for callee in sorted(
+                {t.text for t in call_sites(outline.function_tokens(func))}
+            ):
+                if callee in functions and callee not in paths:
+                    paths[callee] = (paths[name][0] + [callee], paths[name][1])
+                    queue.append(callee)
+
+        for name, (path, per_frame) in paths.items():
+            outline, func = functions[name]
+            if outline.path != relative:
+                # Inherited helpers are reported against their own file
+                shown_file = outline.path
+            else:
+                shown_file = relative
+            for line, in_loop in _body_with_loops(outline, func):
+                if any(IGNORE_MARKER in c.text for c in line.comments):
+                    continue
+                for rule, detail in line_findings(line.tokens, func.name):
+                    base, message = RULES[rule]
+                    severity = _shift(base, (0 if per_frame else -1) + int(in_loop))
+                    report.findings.append(
+                        Finding(
+                            file=shown_file,
+                            line=line.line,
+                            function=func.name,
+                            rule=rule,
+                            severity=severity,
+                            message=f"{detail}: {message}"
+                            + (" inside a loop" if in_loop else ""),
+                            path=path,
+                        )
+                    )
+        report.findings.sort(key=lambda f: (f.file, f.line))
+        return report
+
+
+def _body_with_loops(outline: Outline, func: Function):
+    """Yield (logical line, inside a for/while loop) for a function body"""
+    loops: List[int] = []
+    for line in outline.body_lines(func):
+        while loops and line.indent <= loops[-1]:
+            loops.pop()
+        yield line, bool(loops)
+        first = line.first
+        if first is not None and first.text in ("for", "while"):
+            loops.append(line.indent)
+
+
+def print_report(reports: List[FileReport], budget: int, verbose: bool) -> int:
+    over = [r for r in reports if r.score > budget]
+    with_findings = [r for r in reports if r.findings]
+    print("🔥 Hot-Path Performance Lint")
+    print("=" * 60)
+    for report in sorted(with_findings, key=lambda r: -r.score):
+        counts = report.counts()
+        flag = "❌" if report.score > budget else "⚠️ "
+        print(
+            f"{flag} {report.file}: {report.score} points"
+            f" (high {counts['high']}, medium {counts['medium']}, low {counts['low']})"
+        )
+        for finding in report.findings:
+            if not verbose and finding.severity == "low":
+                continue
+            trace = " -> ".join(finding.path)
+            print(
+                f"     {finding.file}:{finding.line} [{finding.severity}]"
+                f" {finding.message}"
+            )
+            print(f"       via {trace}")
+
+    total = Counter()
+    for report in reports:
+        total.update(report.counts())
+    print("\n📊 Summary")
+    print(f"   Files checked:        {len(reports)}")
+    print(f"   Files with findings:  {len(with_findings)}")
+    print(f"   Files over budget:    {len(over)} (budget {budget} points)")
+    print(
+        f"   Findings:             high {total['high']}, medium {total['medium']},"
+        f" low {total['low']}"
+    )
+    return 1 if over else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Lint per-frame GDScript code paths")
+    parser.add_argument("files", nargs="*", type=Path, help="scripts (default: all)")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=DEFAULT_BUDGET,
+        help=f"points allowed per file (default: {DEFAULT_BUDGET})",
+    )
+    parser.add_argument("--json", type=Path, help="write findings as JSON")
+    parser.add_argument(
+        "--verbose", action="store_true", help="also list low severity findings"
+    )
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    if args.files:
+        paths = [p if p.is_absolute() else Path.cwd() / p for p in args.files]
+    else:
+        paths = list(iter_project_files(root, ".gd"))
+    linter = HotPathLinter(root)
+    reports = []
+    for path in paths:
+        if path.suffix != ".gd" or not path.exists():
+            continue
+        relative = path.resolve().relative_to(root.resolve()).as_posix()
+        reports.append(linter.lint(relative))
+
+    status = print_report(reports, args.budget, args.verbose)
+    if args.json:
+        data = {
+            report.file: {
+                "score": report.score,
+                "over_budget": report.score > args.budget,
+                "findings": [asdict(f) for f in report.findings],
+            }
+            for report in reports
+            if report.findings
+        }
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Offline LOD Mesh Decimation for NeuroVis
+========================================
+
+Builds the LOD variants declared in assets/models/lod/<Model>_lod.cfg for
+the .glb models ModelRegistry.gd loads, so LODSystemEnhanced can switch to
+real reduced meshes instead of simplifying them at run time.
+
+Every triangle primitive of every structure is simplified on its own with
+quadric error metrics (Garland-Heckbert) using half-edge collapses: a
+vertex is merged into a neighbour and never moved, so normals, UVs and all
+other attributes stay exact and the output is a subset of the input
+vertices. Each pass is vectorized with NumPy:
+
+- quadrics of all faces are summed per welded position in one bincount
+- the cost of every allowed collapse is evaluated at once
+- every edge that is the cheapest around both of its vertices collapses in
+  the same pass (these never share a vertex), cheapest third only
+- collapses that would flip a triangle are undone before they are applied
+
+Boundaries are kept: vertices with several copies at one position (UV seams,
+hard edges) never move, open borders only collapse along the border and
+carry extra penalty planes, so structures still meet their neighbours.
+
+A level is reduced from the previous one, with the quadrics carried over,
+and written as <Model><suffix>.glb next to the cfg. Levels with a
+reduction of 1.0 are the source model and are not written. Morph targets of
+reduced primitives are dropped.
+
+Usage:
+    python3 tools/python/mesh_decimate.py                  # all ModelRegistry models
+    python3 tools/python/mesh_decimate.py Brainstem --verbose
+    python3 tools/python/mesh_decimate.py path/to/model.glb --levels 0.5,0.2
+    python3 tools/python/mesh_decimate.py --dry-run --json lod_report.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from godot_project import find_project_root
+from gltf_io import GLB, GLBWriter, Primitive
+from model_assets import LOD_DIR, LodLevel, ModelAsset, registry_models
+
+# Weight of the planes that hold open borders in place
+BORDER_WEIGHT = 10.0
+# Smallest cosine between a triangle's normal before and after a collapse
+FLIP_COS = 0.25
+# Share of the cheapest candidate edges that may collapse in one pass
+CHEAPEST_FRACTION = 1 / 3
+MAX_PASSES = 500
+# Selections per pass when most of the chosen collapses would flip triangles
+RETRIES = 4
+
+
+def face_planes(
+    positions: np.ndarray, triangles: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Unit normals, plane offsets and doubled areas of triangles"""
+    p0, p1, p2 = (positions[triangles[:, k]] for k in range(3))
+    normals = np.cross(p1 - p0, p2 - p0)
+    areas = np.linalg.norm(normals, axis=1)
+    normals /= np.maximum(areas, 1e-30)[:, None]
+    offsets = -np.einsum("ij,ij->i", normals, p0)
+    return normals, offsets, areas
+
+
+def plane_quadrics(
+    normals: np.ndarray, offsets: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    """Quadrics of planes as rows of (a00 a01 a02 a11 a12 a22 b0 b1 b2 c)"""
+    nx, ny, nz = normals.T
+    quadrics = np.stack(
+        [
+            nx * nx,
+            nx * ny,
+            nx * nz,
+            ny * ny,
+            ny * nz,
+            nz * nz,
+            nx * offsets,
+            ny * offsets,
+            nz * offsets,
+            offsets * offsets,
+        ],
+        axis=1,
+    )
+    return quadrics * weights[:, None]
+
+
+def quadric_error(quadrics: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Sum of squared plane distances of each point under its quadric"""
+    q = quadrics.T
+    x, y, z = points.T
+    return (
+        q[0] * x * x
+        + q[3] * y * y
+        + q[5] * z * z
+        + 2 * (q[1] * x * y + q[2] * x * z + q[4] * y * z)
+        + 2 * (q[6] * x + q[7] * y + q[8] * z)
+        + q[9]
+    )
+
+
+def accumulate(ids: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Sum rows of `values` per id (a vectorized np.add.at)"""
+    return np.stack(
+        [np.bincount(ids, values[:, j], size) for j in range(values.shape[1])], axis=1
+    )
+
+
+def weld(positions: np.ndarray) -> np.ndarray:
+    """Id per vertex shared by all vertices at exactly the same position"""
+    _, ids = np.unique(positions, axis=0, return_inverse=True)
+    return ids.reshape(-1)
+
+
+def unique_triangles(triangles: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Drop repeated triangles (same three vertices), keeping the first"""
+    ordered = np.sort(triangles, axis=1)
+    if vertex_count < 1 << 21:
+        keys = (ordered[:, 0] << 42) | (ordered[:, 1] << 21) | ordered[:, 2]
+        _, first = np.unique(keys, return_index=True)
+    else:
+        _, first = np.unique(ordered, axis=0, return_index=True)
+    return triangles[np.sort(first)]
+
+
+class Simplifier:
+    """Quadric-error half-edge collapse of one indexed triangle mesh"""
+
+    def __init__(self, positions: np.ndarray, triangles: np.ndarray):
+        self.positions = np.asarray(positions, dtype=np.float64)
+        self.triangles = np.asarray(triangles, dtype=np.int64)
+        self.welded = weld(self.positions)
+        copies = np.bincount(self.welded)
+        # Seam and hard-edge vertices never move
+        self.locked = copies[self.welded] > 1
+        self.quadrics = self._initial_quadrics()
+        self.error = 0.0  # largest quadric error of an applied collapse
+
+    def _welded_edges(self, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Half-edges (u, v) per triangle corner and the face count of their edge"""
+        u = triangles.reshape(-1)
+        v = triangles[:, [1, 2, 0]].reshape(-1)
+        a, b = self.welded[u], self.welded[v]
+        keys = np.minimum(a, b) * (self.welded.max() + 1) + np.maximum(a, b)
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        return np.stack([u, v], axis=1), counts[inverse.reshape(-1)]
+
+    def _initial_quadrics(self) -> np.ndarray:
+        triangles = self.triangles
+        size = int(self.welded.max()) + 1 if len(self.welded) else 0
+        normals, offsets, _ = face_planes(self.positions, triangles)
+        face = plane_quadrics(normals, offsets, np.ones(len(triangles)))
+        quadrics = accumulate(
+            self.welded[triangles].reshape(-1), np.repeat(face, 3, axis=0), size
+        )
+        # Open borders: a plane through the edge, perpendicular to its face
+        edges, counts = self._welded_edges(triangles)
+        border = np.flatnonzero(counts == 1)
+        if len(border):
+            p0 = self.positions[edges[border, 0]]
+            p1 = self.positions[edges[border, 1]]
+            planes = np.cross(p1 - p0, normals[border // 3])
+            planes /= np.maximum(np.linalg.norm(planes, axis=1), 1e-30)[:, None]
+            border_offsets = -np.einsum("ij,ij->i", planes, p0)
+            penalty = plane_quadrics(
+                planes, border_offsets, np.full(len(border), BORDER_WEIGHT)
+            )
+            ends = self.welded[edges[border]].reshape(-1)
+            quadrics += accumulate(ends, np.repeat(penalty, 2, axis=0), size)
+        return quadrics
+
+    def _candidates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Allowed collapses u -> v and their costs"""
+        edges, counts = self._welded_edges(self.triangles)
+        on_border = counts == 1
+        # Border edges have only one half-edge; add the other direction
+        edges = np.concatenate([edges, edges[on_border][:, ::-1]])
+        on_border = np.concatenate([on_border, np.ones(on_border.sum(), bool)])
+        counts = np.concatenate([counts, np.ones(len(edges) - len(counts), int)])
+
+        vertex_count = len(self.positions)
+        border_vertex = np.zeros(vertex_count, bool)
+        border_vertex[edges[on_border].reshape(-1)] = True
+        stuck = self.locked.copy()
+        stuck[edges[counts > 2].reshape(-1)] = True  # non-manifold edges
+
+        u, v = edges[:, 0], edges[:, 1]
+        allowed = ~stuck[u] & (~border_vertex[u] | on_border)
+        u, v = u[allowed], v[allowed]
+        merged = self.quadrics[self.welded[u]] + self.quadrics[self.welded[v]]
+        cost = np.maximum(quadric_error(merged, self.positions[v]), 0.0)
+        return np.stack([u, v], axis=1), cost
+
+    def _select(
+        self, collapses: np.ndarray, cost: np.ndarray, budget: int
+    ) -> np.ndarray:
+        """Cheapest collapses that are each the best around both of their vertices"""
+        order = np.argsort(cost, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        best = np.full(len(self.positions), len(order))
+        np.minimum.at(best, collapses[:, 0], rank)
+        np.minimum.at(best, collapses[:, 1], rank)
+        limit = max(1, int(len(order) * CHEAPEST_FRACTION))
+        chosen = (best[collapses[:, 0]] == rank) & (best[collapses[:, 1]] == rank)
+        chosen &= rank < limit
+        picked = np.flatnonzero(chosen)
+        return picked[np.argsort(rank[picked])][:budget]
+
+    def _flipped(self, remap: np.ndarray) -> np.ndarray:
+        """Moved vertices of triangles whose normal would flip"""
+        triangles = self.triangles
+        moved = (remap[triangles] != triangles).any(axis=1)
+        before = triangles[moved]
+        after = remap[before]
+        welded = self.welded[after]
+        alive = (
+            (welded[:, 0] != welded[:, 1])
+            & (welded[:, 1] != welded[:, 2])
+            & (welded[:, 2] != welded[:, 0])
+        )
+        before, after = before[alive], after[alive]
+        p = self.positions
+        old = np.cross(
+            p[before[:, 1]] - p[before[:, 0]], p[before[:, 2]] - p[before[:, 0]]
+        )
+        new = np.cross(p[after[:, 1]] - p[after[:, 0]], p[after[:, 2]] - p[after[:, 0]])
+        dot = np.einsum("ij,ij->i", old, new)
+        limit = FLIP_COS * np.linalg.norm(old, axis=1) * np.linalg.norm(new, axis=1)
+        bad = before[dot <= limit].reshape(-1)
+        return np.unique(bad[remap[bad] != bad])
+
+    def reduce_to(self, target: int) -> np.ndarray:
+        """Collapse edges until at most `target` triangles remain (or nothing can go)"""
+        for _ in range(MAX_PASSES):
+            count = len(self.triangles)
+            if count <= target:
+                break
+            collapses, cost = self._candidates()
+            if not len(collapses):
+                break
+            budget = max(1, (count - target) // 2)
+            ranked = cost.copy()
+            for _ in range(RETRIES):
+                picked = self._select(collapses, ranked, budget)
+                remap = np.arange(len(self.positions))
+                remap[collapses[picked, 0]] = collapses[picked, 1]
+                while True:
+                    flipped = self._flipped(remap)
+                    if not len(flipped):
+                        break
+                    remap[flipped] = flipped
+                kept = remap[collapses[picked, 0]] != collapses[picked, 0]
+                applied = picked[kept]
+                if len(applied) * 2 >= len(picked):
+                    break
+                # Mostly flips: let the next cheapest edges have a go
+                ranked[picked[~kept]] = np.inf
+            if not len(applied):
+                break
+            u, v = collapses[applied, 0], collapses[applied, 1]
+            np.add.at(self.quadrics, self.welded[v], self.quadrics[self.welded[u]])
+            self.error = max(self.error, float(cost[applied].max()))
+
+            triangles = remap[self.triangles]
+            welded = self.welded[triangles]
+            alive = (
+                (welded[:, 0] != welded[:, 1])
+                & (welded[:, 1] != welded[:, 2])
+                & (welded[:, 2] != welded[:, 0])
+            )
+            self.triangles = unique_triangles(triangles[alive], len(self.positions))
+        return self.triangles
+
+
+@dataclass
+class StructureReport:
+    name: str
+    source_triangles: int
+    triangles: int
+    vertices: int
+    locked: int  # seam and hard-edge vertices kept in place
+
+
+@dataclass
+class LevelReport:
+    suffix: str
+    reduction: float
+    source_triangles: int
+    triangles: int
+    vertices: int
+    error: float  # sqrt of the largest quadric error, relative to the model size
+    bytes: int
+    seconds: float
+    output: Optional[str] = None
+    structures: List[StructureReport] = field(default_factory=list)
+
+    @property
+    def achieved(self) -> float:
+        return self.triangles / self.source_triangles if self.source_triangles else 1.0
+
+
+def compact(
+    attributes: Dict[str, np.ndarray], triangles: np.ndarray
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Keep only the vertices `triangles` uses; returns new attributes and indices"""
+    used = np.unique(triangles)
+    remap = np.zeros(int(used.max()) + 1 if len(used) else 0, np.int64)
+    remap[used] = np.arange(len(used))
+    index_type = np.uint16 if len(used) <= 0xFFFF else np.uint32
+    compacted = {semantic: array[used] for semantic, array in attributes.items()}
+    return compacted, remap[triangles].astype(index_type)
+
+
+def decimate_model(
+    path: Path, levels: List[LodLevel], output_for, dry_run: bool = False
+) -> List[LevelReport]:
+    """Write one reduced GLB per level below 1.0; returns a report per level"""
+    glb = GLB.open(path)
+    primitives: List[Tuple[Primitive, np.ndarray]] = []
+    for primitive in glb.primitives():
+        triangles = glb.triangles(primitive)
+        if triangles is not None and "POSITION" in primitive.attributes:
+            primitives.append((primitive, triangles))
+    source_triangles = sum(len(triangles) for _, triangles in primitives)
+    positions = [glb.float_accessor(p.attributes["POSITION"]) for p, _ in primitives]
+    extent = 1.0
+    if positions:
+        stacked = np.concatenate(positions)
+        extent = float(np.linalg.norm(stacked.max(axis=0) - stacked.min(axis=0))) or 1.0
+
+    simplifiers: Dict[Tuple[int, int], Simplifier] = {}
+    reports: List[LevelReport] = []
+    for level in sorted(levels, key=lambda level: -level.reduction):
+        started = time.perf_counter()
+        report = LevelReport(
+            level.suffix, level.reduction, source_triangles, 0, 0, 0.0, 0, 0.0
+        )
+        writer = GLBWriter(glb)
+        for (primitive, triangles), vertices in zip(primitives, positions):
+            key = (primitive.mesh, primitive.index)
+            if level.reduction >= 1.0:
+                reduced = np.asarray(triangles, dtype=np.int64)
+                locked = 0
+            else:
+                if key not in simplifiers:
+                    simplifiers[key] = Simplifier(vertices, triangles)
+                simplifier = simplifiers[key]
+                target = max(1, round(len(triangles) * level.reduction))
+                reduced = simplifier.reduce_to(target)
+                locked = int(simplifier.locked.sum())
+                report.error = max(report.error, np.sqrt(simplifier.error) / extent)
+                attributes, indices = compact(
+                    writer.source_attributes(primitive), reduced
+                )
+                writer.set_primitive(
+                    primitive, attributes, indices, writer.source_normalized(primitive)
+                )
+            used = len(np.unique(reduced))
+            report.triangles += len(reduced)
+            report.vertices += used
+            report.structures.append(
+                StructureReport(
+                    primitive.name, len(triangles), len(reduced), used, locked
+                )
+            )
+        if level.reduction < 1.0:
+            output = output_for(level)
+            if dry_run:
+                report.bytes = len(writer.to_bytes())
+            else:
+                report.bytes = writer.write(output)
+                report.output = str(output)
+        else:
+            report.bytes = path.stat().st_size
+        report.seconds = time.perf_counter() - started
+        reports.append(report)
+    return reports
+
+
+def _parse_levels(text: str) -> List[LodLevel]:
+    reductions = [float(value) for value in text.split(",") if value.strip()]
+    if not reductions or any(not 0.0 < value <= 1.0 for value in reductions):
+        raise argparse.ArgumentTypeError("reductions must be in (0, 1]")
+    return [
+        LodLevel(index, f"_lod{index}", value, 0.0)
+        for index, value in enumerate(sorted(reductions, reverse=True))
+    ]
+
+
+def _select_models(root: Path, names: List[str]) -> List[ModelAsset]:
+    models = registry_models(root)
+    if not names:
+        return models
+    selected = []
+    for name in names:
+        match = next((m for m in models if name in (m.name, m.path.name)), None)
+        if match is None:
+            path = Path(name).resolve()
+            match = ModelAsset(
+                path.stem.replace("(Solid)", ""), "", path, root / LOD_DIR, []
+            )
+        selected.append(match)
+    return selected
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate LOD variants of the brain models from their _lod.cfg files"
+    )
+    parser.add_argument("models", nargs="*", help="model names or .glb files")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--levels",
+        type=_parse_levels,
+        help="comma-separated reductions instead of the cfg levels (e.g. 0.5,0.25)",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="output folder (default: cfg folder)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="list every structure")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    models = _select_models(root, args.models)
+
+    print("🧠 LOD mesh decimation")
+    print("=" * 60)
+    results = {}
+    missing = 0
+    started = time.perf_counter()
+    for model in models:
+        levels = args.levels or model.lod_levels
+        if not model.path.exists():
+            missing += 1
+            print(f"\n⚠️  {model.name}: {model.path} not found, skipped")
+            continue
+        if not levels:
+            print(f"\n⚠️  {model.name}: no _lod.cfg and no --levels, skipped")
+            continue
+        output_dir = args.output or model.lod_dir
+        reports = decimate_model(
+            model.path,
+            levels,
+            lambda level: output_dir / f"{model.name}{level.suffix}.glb",
+            args.dry_run,
+        )
+        results[model.name] = reports
+        print(f"\n{model.name}  ({model.path.name})")
+        print(
+            f"   {'level':<7} {'target':>7} {'triangles':>10} {'kept':>7}"
+            f" {'vertices':>9} {'error':>7} {'size':>9} {'time':>7}"
+        )
+        for report in reports:
+            print(
+                f"   {report.suffix:<7} {report.reduction:>7.0%} {report.triangles:>10,}"
+                f" {report.achieved:>7.1%} {report.vertices:>9,} {report.error:>7.2%}"
+                f" {report.bytes / 1024:>7.0f}KB {report.seconds:>6.2f}s"
+            )
+            if args.verbose:
+                for structure in report.structures:
+                    print(
+                        f"      {structure.name:<36} {structure.source_triangles:>8,}"
+                        f" -> {structure.triangles:>8,}  ({structure.locked} locked)"
+                    )
+
+    if args.json:
+        data = {
+            name: [dict(asdict(report), achieved=report.achieved) for report in reports]
+            for name, reports in results.items()
+        }
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    short = [
+        (name, report)
+        for name, reports in results.items()
+        for report in reports
+        if report.achieved > report.reduction * 1.1
+    ]
+    print("\n📊 Summary")
+    print(f"   Models processed:   {len(results)} of {len(models)}")
+    print(f"   Models missing:     {missing}")
+    print(f"   Levels short of target (>10% over): {len(short)}")
+    for name, report in short:
+        print(f"      {name}{report.suffix}: {report.achieved:.1%} kept")
+    print(f"   Time:               {time.perf_counter() - started:.2f} s")
+    return 1 if missing and args.models else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+GLB Index and Vertex Order Optimization for NeuroVis
+====================================================
+
+The brain models come straight from DCC exports, whose triangle order
+ignores the GPU's post-transform vertex cache: the same vertex is shaded
+several times per frame, at every LOD level LODSystemEnhanced switches
+between. This tool reorders every triangle primitive of the ModelRegistry
+models and their generated _lodN files in three steps:
+
+1. Vertex cache: Forsyth's linear-speed greedy ordering. Vertices are
+   scored by their position in a modelled LRU cache and by how many of
+   their triangles are left, and the best triangle touching the cache is
+   emitted next. Dead ends resume from recently used vertices.
+2. Overdraw: the cache-ordered sequence is cut into clusters wherever the
+   cache restarts or the running ACMR of the cluster is already good
+   (Sander, Nehab and Barczak 2007), and clusters are sorted so the ones
+   facing away from the mesh center are drawn first. Cutting only where
+   the cache is cold keeps the cache gains.
+3. Vertex fetch: vertices are renumbered in order of first use, so the
+   vertex buffer is read front to back. Unused vertices move to the end.
+
+The geometry does not change; only index order and vertex order do. The
+report gives, per structure, ACMR (vertex shader runs per triangle, 0.5 at
+best, 3.0 at worst) and ATVR (shader runs per vertex, 1.0 at best) of a
+16-entry FIFO cache before and after. Primitives that improve by less than
+1% are left as they are, so running the tool again is a no-op.
+
+Files are rewritten in place unless --output is given. Run it after
+mesh_decimate.py, which writes the _lodN files in source order.
+
+Usage:
+    python3 tools/python/mesh_optimize.py                  # all models and LOD files
+    python3 tools/python/mesh_optimize.py Brainstem --dry-run
+    python3 tools/python/mesh_optimize.py path/to/model.glb --output /tmp/optimized
+    python3 tools/python/mesh_optimize.py --json optimize_report.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from godot_project import find_project_root
+from gltf_io import GLB, GLBWriter, Primitive
+from model_assets import model_files
+
+# Forsyth's scoring: LRU cache size and score shape
+CACHE_SIZE = 32
+DECAY_POWER = 1.5
+LAST_TRIANGLE_SCORE = 0.75
+VALENCE_BOOST_SCALE = 2.0
+VALENCE_BOOST_POWER = 0.5
+MAX_VALENCE = 64
+# FIFO cache used for ACMR/ATVR and for the overdraw cluster cuts
+FIFO_SIZE = 16
+# Clusters end once their ACMR is within this factor of the whole run's
+OVERDRAW_THRESHOLD = 1.05
+# Smallest relative ACMR gain worth rewriting a primitive for
+MIN_GAIN = 0.01
+
+CACHE_SCORES = [LAST_TRIANGLE_SCORE] * 3 + [
+    (1.0 - (position - 3) / (CACHE_SIZE - 3)) ** DECAY_POWER
+    for position in range(3, CACHE_SIZE)
+]
+VALENCE_SCORES = [0.0] + [
+    VALENCE_BOOST_SCALE * valence**-VALENCE_BOOST_POWER
+    for valence in range(1, MAX_VALENCE + 1)
+]
+
+
+def fifo_misses(triangles: np.ndarray, vertex_count: int, starts=()) -> np.ndarray:
+    """Cache misses of every triangle in a FIFO cache, emptied at each start"""
+    stamps = [-FIFO_SIZE - 1] * vertex_count
+    restart = set(starts)
+    clock = 0
+    misses = []
+    for index, corners in enumerate(triangles.tolist()):
+        if index in restart:
+            clock += FIFO_SIZE + 1
+        missed = 0
+        for vertex in corners:
+            if clock - stamps[vertex] > FIFO_SIZE:
+                stamps[vertex] = clock
+                clock += 1
+                missed += 1
+        misses.append(missed)
+    return np.array(misses, dtype=np.int64)
+
+
+def cache_stats(triangles: np.ndarray, vertex_count: int) -> Tuple[float, float]:
+    """ACMR and ATVR of an index order"""
+    if not len(triangles):
+        return 0.0, 0.0
+    misses = int(fifo_misses(triangles, vertex_count).sum())
+    used = len(np.unique(triangles))
+    return misses / len(triangles), misses / used
+
+
+def vertex_cache_order(triangles: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Forsyth's greedy triangle order; returns triangle indices"""
+    corners = triangles.tolist()
+    flat = triangles.reshape(-1).astype(np.int64)
+    remaining = np.bincount(flat, minlength=vertex_count).tolist()
+    faces = np.argsort(flat, kind="stable") // 3
+    ends = np.cumsum(remaining).tolist()
+    adjacency = [
+        faces[end - count : end].tolist() for end, count in zip(ends, remaining)
+    ]
+    scores = [VALENCE_SCORES[min(count, MAX_VALENCE)] for count in remaining]
+
+    emitted = bytearray(len(corners))
+    order: List[int] = []
+    cache: List[int] = []
+    dead_ends: List[int] = []
+    cursor = 0
+    best = -1
+    while len(order) < len(corners):
+        if best < 0:
+            # Dead end: resume next to a recently used vertex, else in input order
+            while dead_ends and best < 0:
+                vertex = dead_ends.pop()
+                if adjacency[vertex]:
+                    best = adjacency[vertex][0]
+            while best < 0:
+                if not emitted[cursor]:
+                    best = cursor
+                cursor += 1
+
+        emitted[best] = 1
+        order.append(best)
+        triangle = corners[best]
+        for vertex in triangle:
+            adjacency[vertex].remove(best)
+            remaining[vertex] -= 1
+            dead_ends.append(vertex)
+        grown = triangle + [v for v in cache if v not in triangle]
+        cache = grown[:CACHE_SIZE]
+        for vertex in grown[CACHE_SIZE:]:
+            scores[vertex] = VALENCE_SCORES[min(remaining[vertex], MAX_VALENCE)]
+        for position, vertex in enumerate(cache):
+            count = remaining[vertex]
+            scores[vertex] = (
+                CACHE_SCORES[position] + VALENCE_SCORES[min(count, MAX_VALENCE)]
+                if count
+                else -1.0
+            )
+
+        best, best_score = -1, -1.0
+        for vertex in cache:
+            for face in adjacency[vertex]:
+                a, b, c = corners[face]
+                score = scores[a] + scores[b] + scores[c]
+                if score > best_score:
+                    best, best_score = face, score
+    return np.array(order, dtype=np.int64)
+
+
+def cluster_starts(triangles: np.ndarray, vertex_count: int) -> List[int]:
+    """First triangle of every overdraw cluster of a cache-optimized order"""
+    misses = fifo_misses(triangles, vertex_count)
+    hard = [0] + [int(i) for i in np.flatnonzero(misses[1:] == 3) + 1]
+    # ACMR of every run between cache restarts, each starting cold
+    cold = fifo_misses(triangles, vertex_count, hard)
+    starts: List[int] = []
+    for start, end in zip(hard, hard[1:] + [len(triangles)]):
+        threshold = OVERDRAW_THRESHOLD * cold[start:end].mean()
+        starts.append(start)
+        stamps: Dict[int, int] = {}
+        clock = missed = count = 0
+        for index, corners in enumerate(triangles[start:end].tolist()):
+            for vertex in corners:
+                if clock - stamps.get(vertex, -FIFO_SIZE - 1) > FIFO_SIZE:
+                    stamps[vertex] = clock
+                    clock += 1
+                    missed += 1
+            count += 1
+            if missed / count <= threshold and start + index + 1 < end:
+                starts.append(start + index + 1)
+                stamps.clear()
+                missed = count = 0
+    return starts
+
+
+def overdraw_order(positions: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Clusters of a cache-optimized order, outward-facing ones first"""
+    if len(triangles) < 2:
+        return np.arange(len(triangles))
+    starts = np.array(cluster_starts(triangles, len(positions)))
+    corners = positions[triangles].astype(np.float64)
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = np.linalg.norm(normals, axis=1)
+    centroids = corners.mean(axis=1)
+    total = areas.sum()
+    center = (
+        (centroids * areas[:, None]).sum(axis=0) / total
+        if total > 0
+        else centroids.mean(axis=0)
+    )
+
+    area_sums = np.add.reduceat(areas, starts)
+    cluster_centers = (
+        np.add.reduceat(centroids * areas[:, None], starts)
+        / np.maximum(area_sums, 1e-30)[:, None]
+    )
+    cluster_normals = np.add.reduceat(normals, starts)
+    cluster_normals /= np.maximum(np.linalg.norm(cluster_normals, axis=1), 1e-30)[
+        :, None
+    ]
+    facing = np.einsum("ij,ij->i", cluster_centers - center, cluster_normals)
+    ranks = np.lexsort((np.arange(len(starts)), -facing))
+    lengths = np.diff(np.append(starts, len(triangles)))[ranks]
+    offsets = np.repeat(starts[ranks] - (np.cumsum(lengths) - lengths), lengths)
+    return np.arange(len(triangles)) + offsets
+
+
+def vertex_fetch_order(triangles: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Old vertex index of every new vertex, in order of first use"""
+    first = np.full(vertex_count, triangles.size, dtype=np.int64)
+    flat = triangles.reshape(-1)
+    np.minimum.at(first, flat, np.arange(len(flat)))
+    return np.argsort(first, kind="stable")
+
+
+def optimize_triangles(
+    positions: np.ndarray, triangles: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Optimized triangles and the vertex order they index into"""
+    triangles = np.asarray(triangles, dtype=np.int64)
+    vertex_count = len(positions)
+    triangles = triangles[vertex_cache_order(triangles, vertex_count)]
+    triangles = triangles[overdraw_order(positions, triangles)]
+    order = vertex_fetch_order(triangles, vertex_count)
+    remap = np.empty(vertex_count, dtype=np.int64)
+    remap[order] = np.arange(vertex_count)
+    return remap[triangles], order
+
+
+@dataclass
+class StructureReport:
+    name: str
+    triangles: int
+    acmr_before: float
+    acmr_after: float
+    atvr_before: float
+    atvr_after: float
+    vertex_reorder: bool  # False when the vertex buffer is shared and kept
+    changed: bool
+
+
+@dataclass
+class FileReport:
+    path: str
+    bytes: int
+    seconds: float
+    written: Optional[str] = None
+    structures: List[StructureReport] = field(default_factory=list)
+
+    def mean(self, key: str) -> float:
+        """Triangle-weighted mean of a StructureReport metric"""
+        triangles = sum(s.triangles for s in self.structures)
+        if not triangles:
+            return 0.0
+        return sum(getattr(s, key) * s.triangles for s in self.structures) / triangles
+
+
+def _shared_accessors(document: dict) -> Counter:
+    uses: Counter = Counter()
+    for mesh in document.get("meshes", []):
+        for entry in mesh.get("primitives", []):
+            uses.update(entry.get("attributes", {}).values())
+            for target in entry.get("targets", []):
+                uses.update(target.values())
+    return uses
+
+
+def optimize_primitive(
+    glb: GLB, writer: GLBWriter, primitive: Primitive, uses: Counter
+) -> Optional[StructureReport]:
+    """Reorder one primitive in `writer`; None when it has no triangles"""
+    triangles = glb.triangles(primitive)
+    if (
+        triangles is None
+        or "POSITION" not in primitive.attributes
+        or not len(triangles)
+    ):
+        return None
+    positions = glb.float_accessor(primitive.attributes["POSITION"])
+    vertex_count = len(positions)
+    acmr_before, atvr_before = cache_stats(triangles, vertex_count)
+    optimized, order = optimize_triangles(positions, triangles)
+    acmr_after, atvr_after = cache_stats(optimized, vertex_count)
+
+    entry = writer.document["meshes"][primitive.mesh]["primitives"][primitive.index]
+    accessors = list(primitive.attributes.values()) + [
+        index for target in entry.get("targets", []) for index in target.values()
+    ]
+    exclusive = all(uses[index] == 1 for index in accessors)
+    report = StructureReport(
+        primitive.name,
+        len(triangles),
+        acmr_before,
+        acmr_after,
+        atvr_before,
+        atvr_after,
+        exclusive,
+        acmr_after < acmr_before * (1.0 - MIN_GAIN),
+    )
+    if not report.changed:
+        report.acmr_after, report.atvr_after = acmr_before, atvr_before
+        return report
+
+    index_type = np.uint16 if vertex_count <= 0xFFFF else np.uint32
+    if primitive.indices is not None:
+        index_type = glb.accessor(primitive.indices).dtype
+    if not exclusive:
+        # Another primitive reads these vertices: only the index order changes
+        entry["indices"] = writer.add_accessor(
+            order[optimized].reshape(-1).astype(index_type)
+        )
+        return report
+
+    targets = entry.get("targets", [])
+    attributes = {
+        semantic: array[order]
+        for semantic, array in writer.source_attributes(primitive).items()
+    }
+    writer.set_primitive(
+        primitive,
+        attributes,
+        optimized.astype(index_type),
+        writer.source_normalized(primitive),
+    )
+    if targets:
+        entry["targets"] = [
+            {
+                semantic: writer.add_accessor(
+                    glb.accessor(index)[order], bounds=semantic == "POSITION"
+                )
+                for semantic, index in target.items()
+            }
+            for target in targets
+        ]
+    return report
+
+
+def optimize_file(path: Path, output: Path, dry_run: bool = False) -> FileReport:
+    """Optimize every triangle primitive of a GLB; written only when one improved"""
+    started = time.perf_counter()
+    glb = GLB.open(path)
+    writer = GLBWriter(glb)
+    uses = _shared_accessors(glb.document)
+    report = FileReport(str(path), glb.size, 0.0)
+    for primitive in glb.primitives():
+        structure = optimize_primitive(glb, writer, primitive, uses)
+        if structure is not None:
+            report.structures.append(structure)
+    if any(structure.changed for structure in report.structures):
+        data = writer.to_bytes()
+        report.bytes = len(data)
+        if not dry_run:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_bytes(data)
+            report.written = str(output)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Reorder GLB index and vertex buffers for the vertex cache and overdraw"
+    )
+    parser.add_argument("models", nargs="*", help="model names or .glb files")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="output folder (default: rewrite in place)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    files = model_files(root, args.models)
+
+    print("🔺 GLB vertex cache and overdraw optimization")
+    print("=" * 60)
+    reports: Dict[str, FileReport] = {}
+    missing = 0
+    started = time.perf_counter()
+    for label, path in files:
+        if not path.exists():
+            missing += 1
+            print(f"\n⚠️  {label}: {path} not found, skipped")
+            continue
+        output = args.output / path.name if args.output else path
+        report = optimize_file(path, output, args.dry_run)
+        reports[label] = report
+        print(f"\n{label}  ({path.name}, {report.seconds:.2f} s)")
+        print(f"   {'structure':<36} {'triangles':>10} {'ACMR':>13} {'ATVR':>13}")
+        for structure in report.structures:
+            note = "" if structure.changed else "  kept"
+            if structure.changed and not structure.vertex_reorder:
+                note = "  (shared vertices, indices only)"
+            print(
+                f"   {structure.name:<36} {structure.triangles:>10,}"
+                f" {structure.acmr_before:>5.3f} -> {structure.acmr_after:<5.3f}"
+                f" {structure.atvr_before:>5.3f} -> {structure.atvr_after:<5.3f}{note}"
+            )
+        if report.written:
+            print(f"   -> {report.written}")
+
+    if args.json:
+        data = {
+            label: dict(
+                asdict(report),
+                acmr_before=report.mean("acmr_before"),
+                acmr_after=report.mean("acmr_after"),
+            )
+            for label, report in reports.items()
+        }
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    improved = [
+        label
+        for label, report in reports.items()
+        if any(structure.changed for structure in report.structures)
+    ]
+    print("\n📊 Summary")
+    print(f"   Files processed:    {len(reports)} of {len(files)}")
+    print(f"   Files missing:      {missing}")
+    print(f"   Files improved:     {len(improved)}")
+    for label, report in reports.items():
+        print(
+            f"      {label:<30} ACMR {report.mean('acmr_before'):.3f} ->"
+            f" {report.mean('acmr_after'):.3f}"
+        )
+    print(f"   Time:               {time.perf_counter() - started:.2f} s")
+    return 1 if missing and args.models else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Brain Model Assets for NeuroVis Tooling
+=======================================
+
+Where the mesh tools find their inputs: the .glb models ModelRegistry.gd
+loads at startup and the LOD levels in assets/models/lod/<Model>_lod.cfg
+(written by tools/scripts/generate_lod_models.gd). Generated LOD variants
+live next to the cfg files as <Model><suffix>.glb.
+
+The optional [budget] section of a cfg holds the full-detail limits
+(triangles, vertices, materials, textures, duplicate_vertex_ratio); each
+level gets the triangle and vertex limits scaled by its reduction.
+
+Model names follow ModelRegistry: the file name without ".glb" and
+"(Solid)", so "Brainstem(Solid).glb" is the "Brainstem" model.
+
+Usage:
+    from model_assets import registry_models
+
+    for model in registry_models(root):
+        print(model.name, model.path, [level.reduction for level in model.lod_levels])
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from gdscript_lexer import STRING, string_value, tokenize
+from godot_project import from_res_path, read_config, unquote
+
+REGISTRY_SCRIPT = "core/models/ModelRegistry.gd"
+LOD_DIR = "assets/models/lod"
+
+
+@dataclass
+class LodBudget:
+    """Limits for one LOD file; None means unchecked"""
+
+    triangles: Optional[int] = None
+    vertices: Optional[int] = None
+    materials: Optional[int] = None
+    textures: Optional[int] = None
+    duplicate_ratio: Optional[float] = None  # share of byte-identical vertices
+
+
+@dataclass
+class LodLevel:
+    index: int
+    suffix: str
+    reduction: float  # fraction of the full-detail triangles kept
+    distance: float
+    budget: LodBudget = field(default_factory=LodBudget)
+
+
+@dataclass
+class ModelAsset:
+    name: str
+    res_path: str
+    path: Path
+    lod_dir: Path
+    lod_levels: List[LodLevel] = field(default_factory=list)
+
+    def lod_path(self, level: LodLevel) -> Path:
+        return self.lod_dir / f"{self.name}{level.suffix}.glb"
+
+
+def model_name(res_path: str) -> str:
+    """ModelRegistry's name for a model path"""
+    return res_path.rsplit("/", 1)[-1].replace(".glb", "").replace("(Solid)", "")
+
+
+def _number(values: Dict[str, str], key: str, kind=int):
+    return kind(values[key]) if key in values else None
+
+
+def level_budget(
+    budget: Dict[str, str], level: Dict[str, str], reduction: float
+) -> LodBudget:
+    """Budget of one level: the [budget] section with triangle and vertex limits
+    scaled by the level's reduction, unless the level sets max_triangles or
+    max_vertices itself"""
+    scaled = {}
+    for key in ("triangles", "vertices"):
+        limit = _number(level, f"max_{key}")
+        if limit is None and key in budget:
+            limit = round(int(budget[key]) * reduction)
+        scaled[key] = limit
+    return LodBudget(
+        scaled["triangles"],
+        scaled["vertices"],
+        _number(budget, "materials"),
+        _number(budget, "textures"),
+        _number(budget, "duplicate_vertex_ratio", float),
+    )
+
+
+def read_lod_levels(root: Path, name: str) -> List[LodLevel]:
+    """LOD levels of a model from its _lod.cfg, most detailed first"""
+    path = root / LOD_DIR / f"{name}_lod.cfg"
+    if not path.exists():
+        return []
+    config = read_config(path)
+    budget = config.get("budget", {})
+    levels = []
+    for section, values in config.items():
+        if not section.startswith("level_") or not section[6:].isdigit():
+            continue
+        reduction = float(values.get("reduction", "1.0"))
+        levels.append(
+            LodLevel(
+                int(section[6:]),
+                unquote(values.get("suffix", f'"_lod{section[6:]}"')),
+                reduction,
+                float(values.get("distance", "0.0")),
+                level_budget(budget, values, reduction),
+            )
+        )
+    return sorted(levels, key=lambda level: level.index)
+
+
+def registry_models(root: Path) -> List[ModelAsset]:
+    """Models listed in ModelRegistry.gd, in load order, with their LOD levels"""
+    script = root / REGISTRY_SCRIPT
+    if not script.exists():
+        return []
+    source = script.read_text(encoding="utf-8", errors="replace")
+    models: List[ModelAsset] = []
+    seen = set()
+    for token in tokenize(source):
+        if token.kind != STRING:
+            continue
+        value = string_value(token)
+        if not value.startswith("res://") or not value.endswith(".glb"):
+            continue
+        if value in seen:
+            continue
+        seen.add(value)
+        name = model_name(value)
+        models.append(
+            ModelAsset(
+                name,
+                value,
+                from_res_path(root, value),
+                root / LOD_DIR,
+                read_lod_levels(root, name),
+            )
+        )
+    return models
+
+
+def model_files(root: Path, names: List[str]) -> List[Tuple[str, Path]]:
+    """
+    Source .glb of the named models (default: all ModelRegistry models) and
+    their existing LOD files, labelled by model name plus LOD suffix. Names
+    that are not registry models are taken as .glb paths.
+    """
+    models = registry_models(root)
+    selected: List[ModelAsset] = []
+    for name in names or [model.name for model in models]:
+        match = next((m for m in models if name in (m.name, m.path.name)), None)
+        if match is None:
+            path = Path(name).resolve()
+            match = ModelAsset(
+                path.stem.replace("(Solid)", ""), "", path, root / LOD_DIR, []
+            )
+        selected.append(match)
+    files = []
+    for model in selected:
+        files.append((model.name, model.path))
+        for level in model.lod_levels:
+            if level.reduction < 1.0 and model.lod_path(level).exists():
+                files.append((f"{model.name}{level.suffix}", model.lod_path(level)))
+    return files
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detector for NeuroVis
+====================================
+
+Finds parallel variants of scripts (node_3d.gd / node_3d_updated.gd, the
+BrainStructureSelectionManager family, copied fix_*.py scripts) and of
+functions, and lists the variants that nothing references and can be
+deleted.
+
+Every file (and, with --functions, every GDScript function) is reduced to
+the set of k-token shingles of its code tokens; comments and whitespace do
+not count. Each set gets a MinHash signature built with one-permutation
+hashing (one hash per shingle, spread over the signature slots), so the
+cost is linear in the size of the tree. Signatures are split into LSH bands:
+only units that share a whole band are compared, so the number of
+comparisons stays close to the number of true near-duplicates instead of
+growing with the square of the file count. Candidate pairs are then checked
+with the exact Jaccard similarity of their shingle sets.
+
+Files in a duplicate group are joined with their references:
+
+- preload/load/extends/class_name uses (tools/python/dependency_graph.py)
+- ext_resource paths and uid:// ids in .tscn/.tres files
+- autoloads and the main scene in project.godot
+- paths named in .py/.sh/.yaml/.toml files, and Python imports
+- entry points: scripts extending SceneTree/EditorScript and tests/ scripts
+
+The most referenced file of a group is kept; unreferenced variants are
+listed as safe to delete, referenced ones as variants to merge first.
+
+Usage:
+    python3 tools/python/near_duplicates.py
+    python3 tools/python/near_duplicates.py --threshold 0.7 --functions
+    python3 tools/python/near_duplicates.py --json duplicates.json
+"""
+
+import argparse
+import bisect
+import io
+import json
+import re
+import sys
+import time
+import tokenize as py_tokenize
+import zlib
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dependency_graph import DependencyGraph
+from gdscript_lexer import COMMENT, NEWLINE, code_tokens, tokenize
+from gdscript_outline import parse_outline
+from godot_project import (
+    ext_resources,
+    find_project_root,
+    iter_project_files,
+    read_autoloads,
+    read_main_scene,
+    read_uid_map,
+)
+
+SHINGLE_SIZE = 5
+SIGNATURE_SIZE = 128
+DEFAULT_THRESHOLD = 0.8
+MIN_FILE_TOKENS = 50
+MIN_FUNCTION_TOKENS = 60
+SCRIPT_SUFFIXES = (".gd", ".py")
+# Tool and CI files whose text can keep a script alive by naming it
+TOOL_REFERENCE_SUFFIXES = (".py", ".sh", ".yaml", ".yml", ".toml", ".cfg")
+# Scripts run directly with `godot --script`
+ENTRY_POINT_BASES = {"SceneTree", "EditorScript", "MainLoop"}
+# Directories whose scripts are discovered by a runner, not referenced
+ENTRY_POINT_DIRS = {"tests"}
+ENTRY_POINT = "(entry point)"
+_MASK = (1 << 64) - 1
+_EMPTY = _MASK
+
+
+@dataclass
+class Unit:
+    """A file or function reduced to its shingle set"""
+
+    path: str  # project-relative
+    name: str  # function name, "" for whole files
+    line: int
+    tokens: int
+    shingles: Set[int] = field(repr=False, default_factory=set)
+    signature: List[int] = field(repr=False, default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return f"{self.path}:{self.line} {self.name}()" if self.name else self.path
+
+
+@dataclass
+class Variant:
+    path: str
+    similarity: float  # to the kept file
+    references: int
+    referenced_by: List[str]
+
+    @property
+    def safe_to_delete(self) -> bool:
+        return self.references == 0
+
+
+@dataclass
+class DuplicateGroup:
+    keep: str
+    keep_references: int
+    variants: List[Variant]
+
+
+def _mix(value: int) -> int:
+    """splitmix64 finalizer: spreads shingle hashes over all 64 bits"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def shingle_set(texts: List[str], size: int = SHINGLE_SIZE) -> Set[int]:
+    """64-bit hashes of every `size`-token window"""
+    ids = [zlib.crc32(text.encode("utf-8")) for text in texts]
+    shingles = set()
+    for i in range(len(ids) - size + 1):
+        value = 0
+        for token_id in ids[i : i + size]:
+            value = (value * 1_000_003 + token_id) & _MASK
+        shingles.add(_mix(value))
+    return shingles
+
+
+def minhash(shingles: Iterable[int], size: int = SIGNATURE_SIZE) -> List[int]:
+    """One-permutation MinHash: the low bits pick a slot, the rest compete in it"""
+    signature = [_EMPTY] * size
+    for value in shingles:
+        slot = value % size
+        rest = value // size
+        if rest < signature[slot]:
+            signature[slot] = rest
+    # Densify: an empty slot borrows the next filled one (rotation), so that
+    # two sets agree on it with the same probability as on any other slot
+    filled = [i for i, v in enumerate(signature) if v != _EMPTY]
+    if filled and len(filled) < size:
+        for i in range(size):
+            if signature[i] == _EMPTY:
+                nearest = filled[bisect.bisect_right(filled, i) % len(filled)]
+                offset = (nearest - i) % size
+                signature[i] = (signature[nearest] + offset * 0x9E3779B9) & _MASK
+    return signature
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def band_rows(threshold: float) -> int:
+    """Rows per LSH band for a similarity threshold
+
+    Pairs become candidates around similarity (1/bands)^(1/rows); the widest
+    bands that keep this 0.1 below the threshold give few false candidates
+    while still catching pairs just above it.
+    """
+    rows = 1
+    for candidate in (2, 4, 8, 16, 32):
+        bands = SIGNATURE_SIZE // candidate
+        if (1 / bands) ** (1 / candidate) <= threshold - 0.1:
+            rows = candidate
+    return rows
+
+
+def candidate_pairs(units: List[Unit], rows: int) -> Set[Tuple[int, int]]:
+    """Pairs of units that share at least one LSH band of `rows` slots"""
+    bands = SIGNATURE_SIZE // rows
+    pairs: Set[Tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+        for index, unit in enumerate(units):
+            key = tuple(unit.signature[band * rows : (band + 1) * rows])
+            buckets[key].append(index)
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1 :]:
+                    pairs.add((first, second))
+    return pairs
+
+
+def python_token_texts(source: str) -> List[str]:
+    """Code token texts of a Python file (comments and layout dropped)"""
+    skipped = {
+        py_tokenize.COMMENT,
+        py_tokenize.NL,
+        py_tokenize.NEWLINE,
+        py_tokenize.INDENT,
+        py_tokenize.DEDENT,
+        py_tokenize.ENDMARKER,
+    }
+    texts = []
+    try:
+        for token in py_tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type not in skipped:
+                texts.append(token.string)
+    except (py_tokenize.TokenError, IndentationError, SyntaxError):
+        pass  # keep what was read before the broken part
+    return texts
+
+
+def file_units(root: Path, functions: bool) -> List[Unit]:
+    units = []
+    for path in iter_project_files(root, *SCRIPT_SUFFIXES):
+        relative = path.relative_to(root).as_posix()
+        source = path.read_text(encoding="utf-8", errors="replace")
+        if path.suffix == ".py":
+            texts = python_token_texts(source)
+        else:
+            texts = [t.text for t in code_tokens(tokenize(source))]
+        if len(texts) >= MIN_FILE_TOKENS:
+            units.append(Unit(relative, "", 1, len(texts), shingle_set(texts)))
+        if functions and path.suffix == ".gd":
+            outline = parse_outline(source, relative)
+            for func in outline.functions:
+                # Without `func name`, so renamed copies still match
+                tokens = outline.function_tokens(func)[2:]
+                texts = [t.text for t in tokens if t.kind not in (COMMENT, NEWLINE)]
+                if len(texts) >= MIN_FUNCTION_TOKENS:
+                    units.append(
+                        Unit(
+                            relative,
+                            func.name,
+                            func.line,
+                            len(texts),
+                            shingle_set(texts),
+                        )
+                    )
+    for unit in units:
+        unit.signature = minhash(unit.shingles)
+    return units
+
+
+def similar_pairs(
+    units: List[Unit], threshold: float
+) -> Tuple[List[Tuple[int, int, float]], int]:
+    """Verified pairs above the threshold, and the number of candidates checked"""
+    candidates = candidate_pairs(units, band_rows(threshold))
+    pairs = []
+    for first, second in candidates:
+        a, b = units[first], units[second]
+        if a.path == b.path:
+            continue  # functions of the same file
+        similarity = jaccard(a.shingles, b.shingles)
+        if similarity >= threshold:
+            pairs.append((first, second, similarity))
+    return pairs, len(candidates)
+
+
+def clusters(count: int, pairs: List[Tuple[int, int, float]]) -> List[List[int]]:
+    """Connected components of the similarity graph (union-find)"""
+    parent = list(range(count))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    involved = set()
+    for first, second, _ in pairs:
+        parent[find(first)] = find(second)
+        involved.update((first, second))
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in involved:
+        groups[find(i)].append(i)
+    return [sorted(members) for members in groups.values()]
+
+
+class ReferenceCounter:
+    """Which files refer to a project file, by every route Godot loads it"""
+
+    def __init__(self, root: Path, graph: Optional[DependencyGraph] = None):
+        self.root = root
+        self.referrers: Dict[str, Set[str]] = defaultdict(set)
+        self._tool_texts: Optional[Dict[str, str]] = None
+        graph = graph or DependencyGraph.open(root)
+        for edge in graph.edges:
+            self.referrers[edge.target].add(edge.source)
+        for path, base in graph.index.db.execute("SELECT path, extends FROM files"):
+            in_runner_dir = ENTRY_POINT_DIRS & set(Path(path).parts[:-1])
+            if base in ENTRY_POINT_BASES or in_runner_dir:
+                self.referrers[path].add(ENTRY_POINT)
+        uids = read_uid_map(root)
+        for path in iter_project_files(root, ".tscn", ".tres"):
+            relative = path.relative_to(root).as_posix()
+            text = path.read_text(encoding="utf-8", errors="replace")
+            for attributes in ext_resources(text):
+                target = attributes.get("path") or uids.get(attributes.get("uid", ""))
+                if target and target.startswith("res://"):
+                    self.referrers[target[len("res://") :]].add(relative)
+        for target in list(read_autoloads(root).values()) + [read_main_scene(root)]:
+            if target and target.startswith("res://"):
+                self.referrers[target[len("res://") :]].add("project.godot")
+
+    def _texts(self) -> Dict[str, str]:
+        if self._tool_texts is None:
+            self._tool_texts = {
+                path.relative_to(self.root).as_posix(): path.read_text(
+                    encoding="utf-8", errors="replace"
+                )
+                for path in iter_project_files(self.root, *TOOL_REFERENCE_SUFFIXES)
+            }
+        return self._tool_texts
+
+    def referred_by(self, path: str) -> List[str]:
+        found = set(self.referrers.get(path, ()))
+        patterns = [re.compile(rf"(?:^|[\s\"'/]){re.escape(Path(path).name)}\b")]
+        if path.endswith(".py"):
+            module = re.escape(Path(path).stem)
+            patterns.append(
+                re.compile(
+                    rf"^\s*(?:from\s+{module}\s+import|import\s+{module}\b)",
+                    re.MULTILINE,
+                )
+            )
+        for other, text in self._texts().items():
+            if other != path and any(p.search(text) for p in patterns):
+                found.add(other)
+        found.discard(path)
+        return sorted(found)
+
+
+def duplicate_groups(
+    units: List[Unit],
+    pairs: List[Tuple[int, int, float]],
+    references: ReferenceCounter,
+) -> List[DuplicateGroup]:
+    """Whole-file groups with the file to keep and its variants"""
+    file_pairs = [(a, b, s) for a, b, s in pairs if not units[a].name]
+    groups = []
+    for members in clusters(len(units), file_pairs):
+        referred = {i: references.referred_by(units[i].path) for i in members}
+        # Keep the most referenced file; on a tie, the shorter (less suffixed) name
+        keep = max(
+            members,
+            key=lambda i: (len(referred[i]), -len(units[i].path), units[i].path),
+        )
+        variants = [
+            Variant(
+                units[i].path,
+                round(jaccard(units[i].shingles, units[keep].shingles), 3),
+                len(referred[i]),
+                referred[i],
+            )
+            for i in members
+            if i != keep
+        ]
+        variants.sort(key=lambda v: (-v.similarity, v.path))
+        groups.append(DuplicateGroup(units[keep].path, len(referred[keep]), variants))
+    groups.sort(key=lambda g: g.keep)
+    return groups
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate scripts and functions with MinHash/LSH"
+    )
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"minimum Jaccard similarity (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--functions", action="store_true", help="also compare GDScript functions"
+    )
+    parser.add_argument("--json", type=Path, help="write the groups as JSON")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    units = file_units(root, args.functions)
+    pairs, checked = similar_pairs(units, args.threshold)
+    references = ReferenceCounter(root)
+    groups = duplicate_groups(units, pairs, references)
+    elapsed = time.perf_counter() - started
+
+    print("🧬 Near-duplicate scripts")
+    print("=" * 60)
+    deletable = []
+    for group in groups:
+        print(f"\n📄 {group.keep}  (keep, {group.keep_references} references)")
+        for variant in group.variants:
+            if variant.safe_to_delete:
+                deletable.append(variant.path)
+                status = "🗑️  unreferenced"
+            else:
+                shown = ", ".join(variant.referenced_by[:3])
+                more = len(variant.referenced_by) - 3
+                shown += f" +{more}" if more > 0 else ""
+                status = f"🔗 {variant.references} references: {shown}"
+            print(f"   {variant.similarity:5.0%}  {variant.path}  {status}")
+
+    function_pairs = [(a, b, s) for a, b, s in pairs if units[a].name]
+    if function_pairs:
+        print("\n🔁 Near-duplicate functions")
+        for first, second, similarity in sorted(function_pairs, key=lambda p: -p[2]):
+            print(f"   {similarity:5.0%}  {units[first].label}")
+            print(f"          {units[second].label}")
+
+    if args.json:
+        data = {
+            "threshold": args.threshold,
+            "groups": [asdict(g) for g in groups],
+            "functions": [
+                {
+                    "similarity": round(s, 3),
+                    "a": units[a].label,
+                    "b": units[b].label,
+                }
+                for a, b, s in function_pairs
+            ],
+            "safe_to_delete": deletable,
+        }
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    print("\n📊 Summary")
+    print(f"   Units hashed:       {len(units)} ({elapsed:.2f} s)")
+    all_pairs = len(units) * (len(units) - 1) // 2
+    print(f"   Pairs compared:     {checked} of {all_pairs}")
+    print(f"   Duplicate groups:   {len(groups)}")
+    print(f"   Near-dup functions: {len(function_pairs)}")
+    print(f"   Safe to delete:     {len(deletable)}")
+    for path in deletable:
+        print(f"      {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Node Lookup Caching for NeuroVis
+================================
+
+`$UI/StatusLabel` and `get_node("UI/StatusLabel")` walk the scene tree every
+time they run. This refactoring stage finds node paths a script looks up
+more than once, or at all from a per-frame/input callback, and hoists each
+one into a typed @onready member:
+
+    func _process(delta):                  @onready var status_label: Label = $UI/StatusLabel
+        $UI/StatusLabel.text = fps    ->   ...
+                                           func _process(delta):
+                                               status_label.text = fps
+
+A path is only hoisted when it is stable. It must exist under the script's
+node in every scene the script (or a script extending it) is attached to,
+and the script must not free, move or create that node: a node the script
+names itself (`node.name = "Panel"` before add_child) may not exist yet when
+@onready members are set. The member type is the node type from those
+scenes. Lookups that already have an @onready member reuse it.
+
+Lookups in _init/_enter_tree run before @onready members are set and static
+functions have no instance, so those are never touched. Paths looked up
+only from _ready and the functions it calls are left alone too: that code
+runs once, so a member saves nothing.
+
+Every rewrite is reported with its call sites; skipped paths are listed
+with --verbose. GodotSyntaxFixer runs this stage as part of its Godot 4
+migration.
+
+Usage:
+    python3 tools/python/onready_cache.py                  # report only
+    python3 tools/python/onready_cache.py --diff           # dry run with a diff
+    python3 tools/python/onready_cache.py --write          # apply it
+    python3 tools/python/onready_cache.py --min-uses 3 --write ui/panels/
+"""
+
+import argparse
+import difflib
+import re
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from gdscript_lexer import NAME, OP, STRING, Token, line_offsets, string_value
+from gdscript_outline import Function, Outline, parse_outline
+from godot_project import find_project_root, iter_project_files
+from godot_scene import SceneLibrary
+from hot_path_lint import FRAME_CALLBACKS, INPUT_CALLBACKS
+from symbol_index import SymbolIndex
+
+DEFAULT_MIN_USES = 2
+SECTION_HEADER = "# === NODE REFERENCES ==="
+
+NODE_LOOKUPS = {"get_node", "get_node_or_null"}
+# Called before @onready members are assigned
+EARLY_CALLBACKS = {"_init", "_enter_tree", "_static_init"}
+# Run once after @onready members are assigned
+INIT_CALLBACKS = ["_ready"]
+# Calls on a looked-up node that make its path unstable
+FREEING_CALLS = {"queue_free", "free", "reparent", "replace_by"}
+DETACHING_CALLS = {"remove_child", "move_child"}
+# Common Node/CanvasItem/Node3D/Control members a new member must not shadow
+ENGINE_MEMBERS = {
+    "name",
+    "owner",
+    "position",
+    "rotation",
+    "scale",
+    "transform",
+    "basis",
+    "visible",
+    "size",
+    "text",
+    "modulate",
+    "material",
+    "mesh",
+    "theme",
+    "environment",
+    "process_mode",
+    "tooltip_text",
+    "global_position",
+    "global_transform",
+}
+
+_SIMPLE_PATH_RE = re.compile(r"%?[A-Za-z_]\w*(?:/[A-Za-z_]\w*)*")
+
+
+@dataclass
+class LookupSite:
+    function: str
+    line: int
+    start: int  # source offsets of the whole lookup expression
+    end: int
+    hot: bool = False
+    or_null: bool = False  # get_node_or_null(): a missing node is not an error
+
+
+@dataclass
+class NodeCache:
+    """One node path of a script: hoisted into a member, or skipped"""
+
+    file: str
+    node_path: str
+    sites: List[LookupSite] = field(default_factory=list)
+    member: Optional[str] = None
+    type: Optional[str] = None
+    reused: bool = False  # an @onready member already caches the path
+    skipped: Optional[str] = None
+
+    @property
+    def expression(self) -> str:
+        escaped = self.node_path.replace("\\", "\\\\").replace('"', '\\"')
+        if self.sites and all(s.or_null for s in self.sites):
+            # Keep the null-tolerant lookup the call sites were written for
+            return f'get_node_or_null("{escaped}")'
+        if _SIMPLE_PATH_RE.fullmatch(self.node_path):
+            prefix = "" if self.node_path.startswith("%") else "$"
+            return prefix + self.node_path
+        return f'get_node("{escaped}")'
+
+    @property
+    def declaration(self) -> str:
+        annotation = f": {self.type}" if self.type else ""
+        return f"@onready var {self.member}{annotation} = {self.expression}"
+
+
+def normalize_path(path: str) -> str:
+    """Canonical form of a node path literal ("./A//B" -> "A/B")"""
+    parts = [p for p in path.split("/") if p not in ("", ".")]
+    prefix = "/" if path.startswith("/") else ""
+    return prefix + "/".join(parts)
+
+
+def _shorthand(tokens: List[Token], start: int) -> Tuple[Optional[str], int]:
+    """Node path of a `$...` / `%...` shorthand at tokens[start] and its last index"""
+    first = tokens[start + 1] if start + 1 < len(tokens) else None
+    if first is None or first.start != tokens[start].end:
+        return None, start
+    if first.kind == STRING:
+        return string_value(first), start + 1
+    parts = ["%"] if tokens[start].text == "%" else []
+    end = tokens[start].end
+    last = start
+    for i in range(start + 1, len(tokens)):
+        token = tokens[i]
+        if token.start != end or not (token.kind == NAME or token.text in ("/", "%")):
+            break
+        parts.append(token.text)
+        end = token.end
+        last = i
+    if last == start or parts[-1] in ("/", "%"):
+        return None, start
+    return "".join(parts), last
+
+
+def lookups(tokens: List[Token]) -> List[Tuple[str, int, int]]:
+    """(node path, first index, last index) of every lookup on the current node
+
+    Covers `$Path`, `$"Path"`, `%Unique`, `get_node("Path")`,
+    `get_node_or_null("Path")` and the `self.` forms of the calls. Lookups
+    with a non-literal argument or on another object are ignored.
+    """
+    found = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        prev = tokens[i - 1] if i > 0 else None
+        if token.kind == OP and token.text in ("$", "%"):
+            # `%` after a value is the modulo / format operator
+            operator = token.text == "%" and (
+                prev is not None and (prev.kind != OP or prev.text in ")]}")
+            )
+            path, last = (None, i) if operator else _shorthand(tokens, i)
+            if path is not None:
+                found.append((path, i, last))
+                i = last
+        elif token.kind == NAME and token.text in NODE_LOOKUPS:
+            call = tokens[i + 1 : i + 4]
+            literal = (
+                len(call) == 3
+                and call[0].text == "("
+                and call[1].kind == STRING
+                and not call[1].text.startswith("&")
+                and call[2].text == ")"
+            )
+            dotted = prev is not None and prev.text == "."
+            if literal and (not dotted or (i >= 2 and tokens[i - 2].text == "self")):
+                found.append((string_value(call[1]), i - 2 if dotted else i, i + 3))
+                i += 3
+        i += 1
+    return found
+
+
+def _reachable(outline: Outline, callbacks: List[str]) -> Set[str]:
+    """Script functions reachable from the given callbacks"""
+    functions = outline.functions_by_name()
+    queue = deque(n for n in callbacks if n in functions)
+    seen = set(queue)
+    while queue:
+        func = functions[queue.popleft()]
+        for callee in outline.calls(func):
+            if callee in functions and callee not in seen:
+                seen.add(callee)
+                queue.append(callee)
+    return seen
+
+
+def _hot_functions(outline: Outline) -> Set[str]:
+    """Script functions reachable from per-frame and input callbacks"""
+    return _reachable(outline, FRAME_CALLBACKS + INPUT_CALLBACKS)
+
+
+def _created_names(tokens: List[Token]) -> Set[str]:
+    """Node names the script gives nodes it creates (`x.name = "A"`, `set_name("A")`)"""
+    names = set()
+    for i, token in enumerate(tokens[:-2]):
+        if token.text == "name" and i > 0 and tokens[i - 1].text == ".":
+            assigned = tokens[i + 1].text == "=" and tokens[i + 2].kind == STRING
+        elif token.text == "set_name":
+            assigned = tokens[i + 1].text == "(" and tokens[i + 2].kind == STRING
+        else:
+            continue
+        if assigned:
+            names.add(string_value(tokens[i + 2]))
+    return names
+
+
+def _local_names(outline: Outline, func: Function) -> Set[str]:
+    names = {p.name for p in func.params}
+    for line in outline.body_lines(func):
+        tokens = line.tokens
+        for i, token in enumerate(tokens[:-1]):
+            if token.text in ("var", "const", "for") and tokens[i + 1].kind == NAME:
+                names.add(tokens[i + 1].text)
+    return names
+
+
+def _is_unstable(tokens: List[Token], first: int, last: int) -> bool:
+    """True when a lookup is freed, moved or detached right where it is used"""
+    after = tokens[last + 1 : last + 3]
+    if len(after) == 2 and after[0].text == "." and after[1].text in FREEING_CALLS:
+        return True
+    before = tokens[max(first - 2, 0) : first]
+    return (
+        len(before) == 2 and before[0].text in DETACHING_CALLS and before[1].text == "("
+    )
+
+
+def cached_members(outline: Outline) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Node paths already cached by script-level @onready members: (name, type)"""
+    cached = {}
+    for member in outline.members:
+        if member.kind != "var" or member.owner is not None:
+            continue
+        if "@onready" not in member.annotations:
+            continue
+        tokens = outline.lines[member.index].tokens
+        for i, token in enumerate(tokens):
+            if token.kind == OP and token.text in ("=", ":="):
+                found = lookups(tokens[i + 1 :])
+                if len(found) == 1 and found[0][1:] == (0, len(tokens) - i - 2):
+                    path = normalize_path(found[0][0])
+                    type_text = member.type if member.type != ":=" else None
+                    cached.setdefault(path, (member.name, type_text))
+                break
+    return cached
+
+
+def member_name(node_path: str, taken: Set[str]) -> str:
+    """snake_case member name for a node path that collides with nothing taken"""
+    segments = [re.sub(r"\W", "_", s.lstrip("%")) for s in node_path.split("/")]
+    words = [_snake(s) for s in segments if s]
+    base = words[-1] if words else "node"
+    if base[0].isdigit():
+        base = "node_" + base
+    candidates = [base]
+    if len(words) > 1:
+        candidates.append(f"{words[-2]}_{base}")
+    candidates.extend([f"_{base}", f"{base}_node"])
+    for candidate in candidates:
+        if candidate not in taken and candidate not in ENGINE_MEMBERS:
+            return candidate
+    counter = 2
+    while f"{base}_node_{counter}" in taken:
+        counter += 1
+    return f"{base}_node_{counter}"
+
+
+def _snake(name: str) -> str:
+    name = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1_\2", name)
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+    return re.sub(r"_+", "_", name).strip("_").lower() or "node"
+
+
+class NodeLookupCacher:
+    """Plans and applies @onready caching of repeated node lookups"""
+
+    def __init__(
+        self,
+        project_root: Path,
+        index: Optional[SymbolIndex] = None,
+        library: Optional[SceneLibrary] = None,
+        min_uses: int = DEFAULT_MIN_USES,
+    ):
+        self.root = project_root
+        self.index = index or SymbolIndex.open(project_root)
+        self.library = library or SceneLibrary(project_root)
+        self.min_uses = min_uses
+
+    def _owners(self, relative: str):
+        """(scene, node) pairs running this script, directly or via a subclass"""
+        owners = []
+        pending = [relative]
+        seen = set()
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            owners.extend(self.library.script_owners("res://" + path))
+            pending.extend(self.index.subclasses(path))
+        return owners, seen
+
+    def plan(self, source: str, relative: str) -> List[NodeCache]:
+        outline = parse_outline(source, relative)
+        hot = _hot_functions(outline)
+        init = _reachable(outline, INIT_CALLBACKS) - hot
+        created = _created_names(outline.tokens)
+        sites: Dict[str, List[LookupSite]] = {}
+        unstable: Set[str] = set()
+        shadowed: Dict[str, Set[str]] = {}
+
+        for func in outline.functions:
+            if func.owner is not None or func.is_static:
+                continue
+            locals_ = _local_names(outline, func)
+            for line in outline.body_lines(func):
+                tokens = line.tokens
+                for raw, first, last in lookups(tokens):
+                    path = normalize_path(raw)
+                    if _is_unstable(tokens, first, last):
+                        unstable.add(path)
+                    if func.name in EARLY_CALLBACKS:
+                        continue
+                    site = LookupSite(
+                        func.name,
+                        tokens[first].line,
+                        tokens[first].start,
+                        tokens[last].end,
+                        func.name in hot,
+                        tokens[first].kind == NAME
+                        and tokens[last - 3].text == "get_node_or_null",
+                    )
+                    sites.setdefault(path, []).append(site)
+                    shadowed.setdefault(path, set()).update(locals_)
+
+        cached = cached_members(outline)
+        owners, family = self._owners(relative)
+        taken = {t.text for t in outline.tokens if t.kind == NAME}
+        for path in family:
+            taken |= self.index.member_names(path)
+
+        plans = []
+        for path, uses in sorted(sites.items(), key=lambda kv: kv[1][0].start):
+            cache = NodeCache(relative, path, uses)
+            plans.append(cache)
+            if path in cached:
+                cache.member, cache.type = cached[path]
+                cache.reused = True
+                if cache.member in shadowed[path]:
+                    cache.skipped = f"a local variable shadows `{cache.member}`"
+                continue
+            if len(uses) < self.min_uses and not any(s.hot for s in uses):
+                cache.skipped = "looked up once, outside hot paths"
+            elif all(s.function in init for s in uses):
+                cache.skipped = "only looked up during initialization"
+            elif path.startswith("/") or ".." in path.split("/") or ":" in path:
+                cache.skipped = "path leaves the script's subtree"
+            elif path in unstable:
+                cache.skipped = "the script frees or moves this node"
+            elif created & set(path.lstrip("%").split("/")):
+                cache.skipped = "the script creates a node on this path"
+            elif not owners:
+                cache.skipped = "script is not attached to any scene"
+            else:
+                types = set()
+                for scene, node in owners:
+                    location = self.library.resolve(scene, node.path, path)
+                    if location is None:
+                        cache.skipped = f"not found in {scene.path}"
+                        break
+                    types.add(self.library.node_type(location))
+                if cache.skipped is None:
+                    cache.type = types.pop() if len(types) == 1 else None
+                    cache.member = member_name(path, taken)
+                    taken.add(cache.member)
+        return plans
+
+    @staticmethod
+    def accepted(plans: List[NodeCache]) -> List[NodeCache]:
+        return [p for p in plans if p.skipped is None]
+
+    def apply(self, source: str, plans: List[NodeCache]) -> str:
+        plans = self.accepted(plans)
+        if not plans:
+            return source
+        edits: List[Tuple[int, int, str]] = []
+        for cache in plans:
+            for site in cache.sites:
+                edits.append((site.start, site.end, cache.member))
+
+        declarations = [p.declaration for p in plans if not p.reused]
+        if declarations:
+            offset, text = _insertion(parse_outline(source), declarations)
+            if offset > len(source):
+                offset, text = len(source), "\n" + text
+            edits.append((offset, offset, text))
+
+        for start, end, text in sorted(edits, key=lambda e: e[0], reverse=True):
+            source = source[:start] + text + source[end:]
+        return source
+
+    def fix(self, content: str, path: str = "") -> Tuple[str, int]:
+        """GodotSyntaxFixer entry point: (new content, rewritten lookups)"""
+        plans = self.accepted(self.plan(content, path))
+        return self.apply(content, plans), sum(len(p.sites) for p in plans)
+
+
+def _insertion(outline: Outline, declarations: List[str]) -> Tuple[int, str]:
+    """Offset and text for new @onready members
+
+    New members go after the last existing script-level @onready member, or
+    under a NODE REFERENCES header after the last member (or extends line)
+    that precedes the first function.
+    """
+    offsets = line_offsets(outline.source)
+    script_members = [m for m in outline.members if m.owner is None]
+    onready = [m for m in script_members if "@onready" in m.annotations]
+    if onready:
+        last = max(outline.lines[m.index].end_line for m in onready)
+        text = "".join(d + "\n" for d in declarations)
+    else:
+        first_func = min(
+            (f.line for f in outline.functions if f.owner is None), default=None
+        )
+        candidates = [
+            outline.lines[m.index].end_line
+            for m in script_members
+            if first_func is None or m.line < first_func
+        ]
+        for line in outline.lines:
+            if line.indent == 0 and line.first is not None:
+                if line.first.text in ("extends", "class_name") or (
+                    line.first.text == "@tool"
+                ):
+                    candidates.append(line.end_line)
+        last = max(candidates, default=0)
+        text = "\n" + SECTION_HEADER + "\n" + "".join(d + "\n" for d in declarations)
+    if last >= len(offsets):
+        return len(outline.source) + 1, text
+    return offsets[last], text
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Cache repeated node lookups in typed @onready members"
+    )
+    parser.add_argument("paths", nargs="*", type=Path, help="files or folders")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--min-uses",
+        type=int,
+        default=DEFAULT_MIN_USES,
+        help="lookups of a path needed outside hot paths"
+        f" (default: {DEFAULT_MIN_USES})",
+    )
+    parser.add_argument("--diff", action="store_true", help="print a unified diff")
+    parser.add_argument("--write", action="store_true", help="rewrite the files")
+    parser.add_argument(
+        "--verbose", action="store_true", help="also list skipped node paths"
+    )
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    cacher = NodeLookupCacher(root, min_uses=args.min_uses)
+
+    files: List[Path] = []
+    for path in args.paths or [root]:
+        path = path if path.is_absolute() else Path.cwd() / path
+        files.extend([path] if path.is_file() else iter_project_files(path, ".gd"))
+
+    hoisted = reused = sites = skipped = changed = 0
+    print("📌 Node lookup caching")
+    print("=" * 60)
+    for path in files:
+        relative = path.resolve().relative_to(root.resolve()).as_posix()
+        source = path.read_text(encoding="utf-8", errors="replace")
+        plans = cacher.plan(source, relative)
+        for cache in plans:
+            lines = ", ".join(str(s.line) for s in cache.sites)
+            if cache.skipped:
+                skipped += 1
+                if args.verbose:
+                    print(
+                        f"⏭️  {relative}: {cache.node_path} ({lines}):"
+                        f" {cache.skipped}"
+                    )
+                continue
+            sites += len(cache.sites)
+            if cache.reused:
+                reused += 1
+                target = f"existing {cache.member}"
+            else:
+                hoisted += 1
+                target = cache.declaration
+            print(f"✅ {relative}: {cache.node_path} -> {target}")
+            print(f"     {len(cache.sites)} lookups on lines {lines}")
+        fixed = cacher.apply(source, plans)
+        if fixed == source:
+            continue
+        changed += 1
+        if args.diff:
+            diff = difflib.unified_diff(
+                source.splitlines(),
+                fixed.splitlines(),
+                f"a/{relative}",
+                f"b/{relative}",
+                lineterm="",
+            )
+            print("\n".join(diff))
+        if args.write:
+            path.write_text(fixed, encoding="utf-8")
+
+    elapsed = time.perf_counter() - started
+    print("\n📊 Summary")
+    print(f"   Files scanned:      {len(files)} ({elapsed:.2f} s)")
+    print(f"   New members:        {hoisted}")
+    print(f"   Reused members:     {reused}")
+    print(f"   Lookups replaced:   {sites}")
+    print(f"   Paths skipped:      {skipped}")
+    action = "Rewrote" if args.write else "Would rewrite"
+    print(f"   {action} {changed} files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
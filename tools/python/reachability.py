@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Resource Reachability Check for NeuroVis
+========================================
+
+Finds scripts, scenes and resources that nothing in the running game can
+reach. Godot still imports, caches and exports them, so they cost editor
+start-up, tool scans and package size for nothing.
+
+The walk starts from project.godot (main scene, autoloads, every res:// or
+uid:// value such as the icon or enabled plugins) and from the export
+presets (export_files and include_filter). From there it follows:
+
+- ext_resource paths and uid:// ids in .tscn/.tres files
+- res:// and uid:// strings and relative file names in scripts, shaders and
+  config files (preload, load, ResourceLoader calls, plugin.cfg, #include)
+- class_name and extends uses between scripts (from the symbol index)
+- strings naming a directory ("res://assets/models/"): everything under it
+  is kept, since the file name is built at run time
+
+uid:// ids resolve through the .uid sidecars and resource headers. A file
+keeps its .uid and .import sidecars alive; they are never reported alone.
+
+The references of each file are cached with its size and mtime in
+.godot/neurovis_tools/, so a re-run only reads the files that changed and
+the walk itself takes milliseconds. With --baseline the check fails only
+for files that became unreachable since the baseline was written, which
+makes it cheap enough for a pre-commit hook.
+
+Usage:
+    python3 tools/python/reachability.py
+    python3 tools/python/reachability.py --why res://ui/panels/InfoPanel.tscn
+    python3 tools/python/reachability.py --baseline tools/python/data/unreachable_baseline.json
+    python3 tools/python/reachability.py --baseline ... --update-baseline
+"""
+
+import argparse
+import fnmatch
+import json
+import posixpath
+import re
+import sys
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from gdscript_lexer import STRING, string_value, tokenize
+from godot_project import (
+    PROJECT_FILE,
+    cache_path,
+    find_project_root,
+    iter_project_files,
+    read_autoloads,
+    read_main_scene,
+)
+from symbol_index import SymbolIndex
+
+CACHE_NAME = "reachability.json"
+CACHE_VERSION = 1
+EXPORT_PRESETS = "export_presets.cfg"
+
+# Files Godot imports or loads; only these can be reported as unreachable
+# fmt: off
+RESOURCE_SUFFIXES = {
+    ".gd", ".tscn", ".scn", ".tres", ".res", ".gdshader", ".gdshaderinc",
+    ".glb", ".gltf", ".obj", ".fbx", ".blend", ".dae",
+    ".png", ".jpg", ".jpeg", ".webp", ".svg", ".bmp", ".tga", ".exr", ".hdr",
+    ".ogg", ".wav", ".mp3", ".ttf", ".otf", ".woff", ".woff2", ".fnt",
+    ".json", ".csv", ".cfg",
+}
+# fmt: on
+# Files whose text is scanned for references
+TEXT_SUFFIXES = {".tscn", ".tres", ".gdshader", ".gdshaderinc", ".cfg", ".json"}
+SIDECAR_SUFFIXES = (".uid", ".import")
+
+_RESOURCE_STRING_RE = re.compile(r'"((?:res|uid)://[^"]*)"')
+_RELATIVE_STRING_RE = re.compile(r'"([^":/][^":]*\.[A-Za-z0-9]+)"')
+_UID_HEADER_RE = re.compile(r'^\[gd_(?:scene|resource)\b[^\]]*\buid="(uid://[^"]+)"')
+
+
+@dataclass
+class FileRefs:
+    """What one file refers to, as written (resolved during the walk)"""
+
+    mtime: int
+    size: int
+    refs: List[str]
+    uid: Optional[str] = None  # the file's own uid, from a sidecar or header
+
+
+def extract_refs(path: Path, text: str) -> Tuple[List[str], Optional[str]]:
+    """Reference strings of one file, and the uid it declares"""
+    if path.suffix == ".uid":
+        uid = text.strip()
+        return [], uid if uid.startswith("uid://") else None
+    refs: List[str] = []
+    if path.suffix == ".gd":
+        for token in tokenize(text):
+            if token.kind == STRING:
+                value = string_value(token)
+                if "://" in value or "." in value:
+                    refs.append(value)
+        return refs, None
+    refs = _RESOURCE_STRING_RE.findall(text) + _RELATIVE_STRING_RE.findall(text)
+    header = _UID_HEADER_RE.match(text)
+    return refs, header.group(1) if header else None
+
+
+class ReachabilityGraph:
+    """Reference graph of the project files, with an incremental cache"""
+
+    def __init__(self, root: Path, use_cache: bool = True):
+        self.root = root
+        self.files: Dict[str, FileRefs] = {}
+        self.sizes: Dict[str, int] = {}
+        self.reparsed = 0
+        self.cache_file = cache_path(root, CACHE_NAME) if use_cache else None
+        self._scan()
+        self.uids = {
+            refs.uid: self._owner(path) for path, refs in self.files.items() if refs.uid
+        }
+        self.directories = self._directories()
+
+    @staticmethod
+    def _owner(path: str) -> str:
+        """The resource a sidecar belongs to (the path itself otherwise)"""
+        for suffix in SIDECAR_SUFFIXES:
+            if path.endswith(suffix):
+                return path[: -len(suffix)]
+        return path
+
+    def _load_cache(self) -> Dict[str, FileRefs]:
+        if self.cache_file is None or not self.cache_file.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return {path: FileRefs(**entry) for path, entry in data["files"].items()}
+
+    def _save_cache(self) -> None:
+        if self.cache_file is None:
+            return
+        data = {
+            "version": CACHE_VERSION,
+            "files": {path: refs.__dict__ for path, refs in self.files.items()},
+        }
+        self.cache_file.write_text(json.dumps(data), encoding="utf-8")
+
+    def _scan(self) -> None:
+        cached = self._load_cache()
+        ignored = {
+            p.parent.relative_to(self.root).as_posix()
+            for p in iter_project_files(self.root)
+            if p.name == ".gdignore" and p.parent != self.root
+        }
+        scanned = (".gd", PROJECT_FILE, ".uid", *TEXT_SUFFIXES)
+        for path in iter_project_files(self.root):
+            relative = path.relative_to(self.root).as_posix()
+            if any(relative.startswith(d + "/") for d in ignored):
+                continue
+            stat = path.stat()
+            owner_suffix = Path(self._owner(relative)).suffix
+            if owner_suffix in RESOURCE_SUFFIXES:
+                self.sizes[relative] = stat.st_size
+            if path.suffix not in scanned and path.name not in scanned:
+                continue
+            entry = cached.get(relative)
+            if entry is None or (entry.mtime, entry.size) != (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                text = path.read_text(encoding="utf-8", errors="replace")
+                refs, uid = extract_refs(path, text)
+                entry = FileRefs(stat.st_mtime_ns, stat.st_size, refs, uid)
+                self.reparsed += 1
+            self.files[relative] = entry
+        self._save_cache()
+
+    def _directories(self) -> Dict[str, List[str]]:
+        """Files under every directory, for strings that name a directory"""
+        directories: Dict[str, List[str]] = defaultdict(list)
+        for path in self.sizes:
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                directories["/".join(parts[:depth])].append(path)
+        return directories
+
+    def resolve(self, source: str, ref: str) -> List[str]:
+        """Project files a reference string from `source` points at"""
+        if ref.startswith("uid://"):
+            target = self.uids.get(ref)
+            return [target] if target else []
+        if ref.startswith("res://"):
+            target = ref[len("res://") :].split("::", 1)[0]
+        elif "://" in ref:
+            return []
+        else:
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(source), ref))
+        if target.endswith("/"):
+            return list(self.directories.get(target.rstrip("/"), []))
+        if target in self.sizes or target in self.files:
+            return [target]
+        if target in self.directories:
+            return list(self.directories[target])
+        return []
+
+    def roots(self) -> List[Tuple[str, str]]:
+        """(file, reason) pairs the game starts from"""
+        roots = [(PROJECT_FILE, "project settings")]
+        main_scene = read_main_scene(self.root)
+        if main_scene:
+            roots += [(t, "main scene") for t in self.resolve(PROJECT_FILE, main_scene)]
+        for name, target in read_autoloads(self.root).items():
+            roots += [
+                (t, f"autoload {name}") for t in self.resolve(PROJECT_FILE, target)
+            ]
+        roots += [(t, "export preset") for t in self._export_roots()]
+        return roots
+
+    def _export_roots(self) -> List[str]:
+        presets = self.root / EXPORT_PRESETS
+        if not presets.exists():
+            return []
+        found = []
+        patterns: List[str] = []
+        for line in presets.read_text(encoding="utf-8", errors="replace").splitlines():
+            key, _, value = line.partition("=")
+            key = key.strip()
+            if key == "export_files":
+                for ref in _RESOURCE_STRING_RE.findall(value):
+                    found += self.resolve(EXPORT_PRESETS, ref)
+            elif key == "include_filter":
+                value = value.strip().strip('"')
+                patterns += [p.strip() for p in value.split(",") if p.strip()]
+        for path in self.sizes:
+            if any(
+                fnmatch.fnmatch(path, p) or fnmatch.fnmatch(Path(path).name, p)
+                for p in patterns
+            ):
+                found.append(path)
+        return found
+
+    def class_edges(self) -> Dict[str, Set[str]]:
+        """script -> scripts whose class_name it uses or extends"""
+        edges: Dict[str, Set[str]] = defaultdict(set)
+        index = SymbolIndex.open(self.root)
+        classes = dict(
+            index.db.execute(
+                "SELECT class_name, path FROM files WHERE class_name IS NOT NULL"
+            )
+        )
+        for source, name in index.db.execute(
+            "SELECT f.path, r.name FROM refs r JOIN files f ON f.id = r.file_id"
+            " WHERE r.kind='type'"
+        ):
+            if name in classes:
+                edges[source].add(classes[name])
+        for source, base in index.db.execute("SELECT path, extends FROM files"):
+            if base in classes:
+                edges[source].add(classes[base])
+        return edges
+
+    def walk(self) -> Dict[str, Tuple[Optional[str], str]]:
+        """Reachable files mapped to (referring file, reason) for --why"""
+        classes = self.class_edges()
+        reached: Dict[str, Tuple[Optional[str], str]] = {}
+        queue: deque = deque()
+        for path, reason in self.roots():
+            if path not in reached:
+                reached[path] = (None, reason)
+                queue.append(path)
+        while queue:
+            source = queue.popleft()
+            entry = self.files.get(source)
+            targets: List[Tuple[str, str]] = []
+            if entry is not None:
+                for ref in entry.refs:
+                    targets += [(t, ref) for t in self.resolve(source, ref)]
+            targets += [(t, "class_name") for t in classes.get(source, ())]
+            for suffix in SIDECAR_SUFFIXES:
+                if source + suffix in self.files or source + suffix in self.sizes:
+                    targets.append((source + suffix, "sidecar"))
+            for target, reason in targets:
+                if target not in reached and target != source:
+                    reached[target] = (source, reason)
+                    queue.append(target)
+        return reached
+
+    def unreachable(
+        self, reached: Dict[str, Tuple[Optional[str], str]]
+    ) -> Dict[str, int]:
+        """Unreachable resources with their size, sidecars included"""
+        dead: Dict[str, int] = {}
+        for path, size in self.sizes.items():
+            owner = self._owner(path)
+            if owner in reached or Path(owner).suffix not in RESOURCE_SUFFIXES:
+                continue
+            dead[owner] = dead.get(owner, 0) + size
+        return dict(sorted(dead.items()))
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size} B"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="List project files nothing can reach from project.godot"
+    )
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument("--why", metavar="PATH", help="show how a file is reached")
+    parser.add_argument("--json", type=Path, help="write unreachable files as JSON")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="known unreachable files; fail only for files not listed there",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="rewrite the --baseline file"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="re-read every file")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    graph = ReachabilityGraph(root, use_cache=not args.no_cache)
+    reached = graph.walk()
+    if args.baseline:
+        # The baseline lists dead files; it is not one itself
+        baseline = args.baseline.resolve()
+        if baseline.is_relative_to(root.resolve()):
+            relative = baseline.relative_to(root.resolve()).as_posix()
+            reached.setdefault(relative, (None, "baseline"))
+    dead = graph.unreachable(reached)
+    elapsed = time.perf_counter() - started
+
+    if args.why:
+        path = args.why.removeprefix("res://")
+        if path not in reached:
+            print(f"❌ {path} is not reachable")
+            return 1
+        chain = []
+        while path is not None:
+            source, reason = reached[path]
+            chain.append(f"{path}  ({reason})")
+            path = source
+        for depth, step in enumerate(reversed(chain)):
+            print(f"{'   ' * depth}{step}")
+        return 0
+
+    if args.json:
+        data = {"unreachable": dead, "total_size": sum(dead.values())}
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    if args.baseline and args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(sorted(dead), indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"✅ Baseline written: {len(dead)} unreachable files")
+        return 0
+
+    known: Set[str] = set()
+    if args.baseline and args.baseline.exists():
+        known = set(json.loads(args.baseline.read_text(encoding="utf-8")))
+    new = [path for path in dead if path not in known]
+
+    print("🕸️  Resource reachability")
+    print("=" * 60)
+    by_suffix: Dict[str, List[str]] = defaultdict(list)
+    for path in new if args.baseline else dead:
+        by_suffix[Path(path).suffix].append(path)
+    for suffix, paths in sorted(by_suffix.items()):
+        size = sum(dead[p] for p in paths)
+        print(f"\n{suffix or '(none)'}: {len(paths)} files, {_format_size(size)}")
+        for path in paths:
+            print(f"   {path}  ({_format_size(dead[path])})")
+
+    print("\n📊 Summary")
+    print(f"   Resources:          {len(graph.sizes)} files ({graph.reparsed} re-read)")
+    print(f"   Reachable:          {len(reached)}")
+    print(
+        f"   Unreachable:        {len(dead)} files, {_format_size(sum(dead.values()))}"
+    )
+    if args.baseline:
+        print(f"   New since baseline: {len(new)}")
+    print(f"   Time:               {elapsed:.2f} s")
+    if args.baseline and new:
+        print("❌ Newly unreachable files: reference them or delete them")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
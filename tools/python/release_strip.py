@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Release Stripping Pass for NeuroVis
+===================================
+
+Writes a copy of the project for release exports with debug output removed
+from every script:
+
+- print(), print_debug(), prints(), printt() and print_rich() statements
+- DebugCmd.<method>(...) statements (the debug console autoload)
+- the bodies of `if FeatureFlags.is_enabled("debug_mode"):` and
+  `if OS.is_debug_build():` blocks; both are false in a release build, so
+  the guard becomes `false` and an `else` branch still runs
+
+Removed statements become `pass` and their continuation lines become blank,
+so every script keeps its line count and a line number from a release crash
+report points at the same line in the source tree. The removed spans are
+recorded in a JSON map next to the output directory.
+
+A debug call is kept when its arguments might change state (an assignment,
+await, or a call such as pop_back() or emit()). push_error(), push_warning()
+and printerr() are never removed.
+
+Non-script files are copied unchanged; files that did not change since the
+previous run are not copied again.
+
+Usage:
+    python3 tools/python/release_strip.py --output builds/release_src
+    python3 tools/python/release_strip.py --check core/ui     # report only
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from gdscript_lexer import (
+    NAME,
+    OP,
+    STRING,
+    Token,
+    logical_lines,
+    string_value,
+    tokenize,
+)
+from gdscript_outline import matching_bracket
+from godot_project import find_project_root, iter_project_files
+
+STRIPPED_CALLS = {"print", "print_debug", "prints", "printt", "print_rich"}
+DEBUG_AUTOLOADS = {"DebugCmd"}
+DEBUG_FLAGS = {"debug_mode"}
+# Calls in debug arguments that may change state; such statements are kept
+SIDE_EFFECT_CALLS = {
+    "append",
+    "push_back",
+    "push_front",
+    "pop_back",
+    "pop_front",
+    "pop_at",
+    "erase",
+    "remove_at",
+    "clear",
+    "insert",
+    "emit",
+    "emit_signal",
+    "call",
+    "call_deferred",
+    "set",
+    "queue_free",
+    "free",
+    "add_child",
+    "remove_child",
+}
+ASSIGNMENT_OPS = {"=", ":=", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^="}
+BLOCK_KEYWORDS = {"if", "elif", "else", "for", "while", "func"}
+
+MAP_NAME = "release_strip_map.json"
+
+
+@dataclass
+class Strip:
+    line: int
+    end_line: int
+    kind: str  # print | debug-command | debug-guard
+    text: str
+
+
+def _call_statement(tokens: List[Token]) -> Optional[str]:
+    """Kind of a statement that is exactly one removable debug call"""
+    if len(tokens) >= 3 and tokens[0].kind == NAME and tokens[1].text == "(":
+        if tokens[0].text in STRIPPED_CALLS:
+            if matching_bracket(tokens, 1) == len(tokens) - 1:
+                return "print"
+    if (
+        len(tokens) >= 5
+        and tokens[0].text in DEBUG_AUTOLOADS
+        and tokens[1].text == "."
+        and tokens[2].kind == NAME
+        and tokens[3].text == "("
+        and matching_bracket(tokens, 3) == len(tokens) - 1
+    ):
+        return "debug-command"
+    return None
+
+
+def _has_side_effects(tokens: List[Token]) -> bool:
+    for i, token in enumerate(tokens):
+        if token.kind == OP and token.text in ASSIGNMENT_OPS:
+            return True
+        if token.text == "await":
+            return True
+        if token.kind == NAME and token.text in SIDE_EFFECT_CALLS:
+            if i + 1 < len(tokens) and tokens[i + 1].text == "(":
+                return True
+    return False
+
+
+def _guards(tokens: List[Token]) -> List[Tuple[int, int]]:
+    """(first, last) token indexes of debug-only guard expressions"""
+    found = []
+    texts = [t.text for t in tokens]
+    for i in range(len(tokens)):
+        if texts[i : i + 4] == ["FeatureFlags", ".", "is_enabled", "("]:
+            if i + 5 < len(tokens) and texts[i + 5] == ")":
+                argument = tokens[i + 4]
+                if argument.kind == STRING and string_value(argument) in DEBUG_FLAGS:
+                    found.append((i, i + 5))
+        elif texts[i : i + 5] == ["OS", ".", "is_debug_build", "(", ")"]:
+            found.append((i, i + 4))
+    return [g for g in found if g[0] == 0 or tokens[g[0] - 1].text != "."]
+
+
+def _block_colon(tokens: List[Token]) -> int:
+    """Index of the `:` ending a block header, or -1"""
+    depth = 0
+    for i, token in enumerate(tokens):
+        if token.kind != OP:
+            continue
+        if token.text in "([{":
+            depth += 1
+        elif token.text in ")]}":
+            depth -= 1
+        elif token.text == ":" and depth == 0:
+            return i
+    return -1
+
+
+def _blank(source: str, start: int, end: int) -> str:
+    """`pass` followed by the newlines of the replaced span"""
+    return "pass" + "\n" * source.count("\n", start, end)
+
+
+def strip_source(source: str) -> Tuple[str, List[Strip], int]:
+    """Strip debug output from one script, keeping every line where it was
+
+    Returns the new source, the removed spans and the number of debug calls
+    kept because of side effects.
+    """
+    lines = logical_lines(tokenize(source), source)
+    edits: List[Tuple[int, int, str]] = []
+    strips: List[Strip] = []
+    kept = 0
+
+    def strip_statement(tokens: List[Token]) -> None:
+        nonlocal kept
+        kind = _call_statement(tokens)
+        if kind is None:
+            return
+        if _has_side_effects(tokens):
+            kept += 1
+            return
+        start, end = tokens[0].start, tokens[-1].end
+        edits.append((start, end, _blank(source, start, end)))
+        text = source[start:end].split("\n", 1)[0]
+        strips.append(Strip(tokens[0].line, tokens[-1].line, kind, text))
+
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        tokens = line.tokens
+        index += 1
+        if not tokens:
+            continue
+        if tokens[0].text not in BLOCK_KEYWORDS:
+            strip_statement(tokens)
+            continue
+        colon = _block_colon(tokens)
+        if colon == -1:
+            continue
+        inline = tokens[colon + 1 :]
+        guards = _guards(tokens[1:colon]) if tokens[0].text in ("if", "elif") else []
+        for first, last in guards:
+            edits.append((tokens[first + 1].start, tokens[last + 1].end, "false"))
+        if not (len(guards) == 1 and guards[0] == (0, colon - 2)):
+            if inline:
+                strip_statement(inline)
+            continue
+
+        # The whole condition is a debug guard: drop the body
+        if inline:
+            start, end = inline[0].start, inline[-1].end
+            next_index = index
+        else:
+            next_index = index
+            while next_index < len(lines) and lines[next_index].indent > line.indent:
+                next_index += 1
+            if next_index == index:
+                continue
+            start = lines[index].tokens[0].start
+            end = lines[next_index - 1].tokens[-1].end
+        edits.append((start, end, _blank(source, start, end)))
+        header = source[tokens[0].start : tokens[colon].end]
+        end_line = source.count("\n", 0, end) + 1
+        strips.append(Strip(line.line, end_line, "debug-guard", header))
+        index = next_index
+
+    for start, end, text in sorted(edits, key=lambda e: e[0], reverse=True):
+        source = source[:start] + text + source[end:]
+    return source, strips, kept
+
+
+class ReleaseStripper:
+    """Writes the stripped release copy of a project"""
+
+    def __init__(self, project_root: Path, output: Path):
+        self.root = project_root
+        self.output = output
+        self.stats: Counter = Counter()
+        self.strips: Dict[str, List[Strip]] = {}
+
+    def _copy_needed(self, source: Path, target: Path) -> bool:
+        try:
+            target_stat = target.stat()
+        except OSError:
+            return True
+        source_stat = source.stat()
+        return source_stat.st_size != target_stat.st_size or int(
+            source_stat.st_mtime
+        ) != int(target_stat.st_mtime)
+
+    def run(self) -> None:
+        written = set()
+        for path in iter_project_files(self.root):
+            relative = path.relative_to(self.root)
+            if self.output in path.parents:
+                continue
+            target = self.output / relative
+            written.add(target)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if path.suffix == ".gd":
+                self._strip_script(path, target, relative.as_posix())
+            elif self._copy_needed(path, target):
+                shutil.copy2(path, target)
+                self.stats["copied"] += 1
+            else:
+                self.stats["unchanged"] += 1
+        self._remove_stale(written)
+
+    def _strip_script(self, path: Path, target: Path, relative: str) -> None:
+        source = path.read_text(encoding="utf-8", errors="replace")
+        stripped, strips, kept = strip_source(source)
+        if stripped.count("\n") != source.count("\n"):
+            # Never ship a script whose line numbers moved
+            print(f"⚠️  {relative}: line count changed, copied unmodified")
+            stripped, strips = source, []
+        self.stats["scripts"] += 1
+        self.stats["kept"] += kept
+        self.stats.update(s.kind for s in strips)
+        if strips:
+            self.strips[relative] = strips
+        if not target.exists() or target.read_text(encoding="utf-8") != stripped:
+            target.write_text(stripped, encoding="utf-8")
+
+    def _remove_stale(self, written: set) -> None:
+        if not self.output.exists():
+            return
+        # Godot's own cache in the output (.godot/) is skipped like in the source
+        for path in list(iter_project_files(self.output)):
+            if path not in written:
+                path.unlink()
+                self.stats["removed"] += 1
+
+    def write_map(self, map_path: Path) -> None:
+        data = {
+            "source": str(self.root),
+            "output": str(self.output),
+            "lines_preserved": True,
+            "files": {
+                path: [asdict(s) for s in strips]
+                for path, strips in sorted(self.strips.items())
+            },
+        }
+        map_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Write a release copy of the project without debug output"
+    )
+    parser.add_argument("paths", nargs="*", type=Path, help="scripts for --check")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="directory for the stripped copy (default: builds/release_src)",
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="only report what would be removed"
+    )
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+
+    if args.check:
+        counts: Counter = Counter()
+        files: List[Path] = []
+        for path in args.paths or [root]:
+            path = path if path.is_absolute() else Path.cwd() / path
+            files.extend([path] if path.is_file() else iter_project_files(path, ".gd"))
+        for path in files:
+            relative = path.resolve().relative_to(root.resolve()).as_posix()
+            source = path.read_text(encoding="utf-8", errors="replace")
+            _, strips, kept = strip_source(source)
+            counts["kept"] += kept
+            for strip in strips:
+                counts[strip.kind] += 1
+                print(f"   {relative}:{strip.line} [{strip.kind}] {strip.text}")
+        print("\n📊 Release strip check")
+        print(f"   Scripts:            {len(files)}")
+        print(f"   Prints:             {counts['print']}")
+        print(f"   Debug commands:     {counts['debug-command']}")
+        print(f"   Debug guards:       {counts['debug-guard']}")
+        print(f"   Kept (side effects): {counts['kept']}")
+        return 0
+
+    output = args.output or root / "builds" / "release_src"
+    output = output if output.is_absolute() else Path.cwd() / output
+    output = output.resolve()
+    if output == root.resolve() or output in root.resolve().parents:
+        print("❌ The output directory must not contain the project")
+        return 1
+
+    print("✂️  Release strip")
+    print("=" * 60)
+    stripper = ReleaseStripper(root, output)
+    stripper.run()
+    map_path = output.parent / MAP_NAME
+    stripper.write_map(map_path)
+
+    stats = stripper.stats
+    elapsed = time.perf_counter() - started
+    print(f"   Output:             {output}")
+    print(f"   Scripts stripped:   {len(stripper.strips)} of {stats['scripts']}")
+    print(f"   Prints removed:     {stats['print']}")
+    print(f"   Debug commands:     {stats['debug-command']}")
+    print(f"   Debug guards:       {stats['debug-guard']}")
+    print(f"   Kept (side effects): {stats['kept']}")
+    print(
+        f"   Other files:        {stats['copied']} copied, {stats['unchanged']}"
+        f" unchanged, {stats['removed']} removed"
+    )
+    print(f"   Line map:           {map_path}")
+    print(f"✅ Done in {elapsed:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
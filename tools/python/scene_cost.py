@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Scene Instancing Cost Profiler for NeuroVis
+===========================================
+
+Expands everything the main scene (run/main_scene in project.godot) costs
+before its first frame, without starting Godot: instanced scenes, attached
+scripts, the scripts those extend, preload or use by class_name, and every
+ext_resource down to textures and shaders. Each subtree gets a cost:
+
+- nodes:    nodes created, instanced scenes included (override entries are
+            not counted; an instanced .glb counts as its instancing node)
+- scripts:  scripts compiled
+- bytes:    size on disk of every file loaded (source size for imported
+            files such as .glb and .png)
+- shaders:  .gdshader files and Shader resources, embedded ones included
+
+Godot loads a resource once and shares it, so load costs (scripts, bytes,
+shaders) are charged to the first place a file is reached in load order.
+Nodes are charged to every instance. Runtime load() calls are left out
+unless --loads is given, because they do not delay the first frame.
+
+The report lists the most expensive subtrees. --folded writes one line per
+subtree in the folded-stack format of flamegraph.pl and speedscope
+("main.tscn;panel.tscn [UI/Panel];Panel.gd 1"), weighted by --metric.
+
+Usage:
+    python3 tools/python/scene_cost.py
+    python3 tools/python/scene_cost.py --sort bytes --limit 40
+    python3 tools/python/scene_cost.py scenes/ui_info_panel.tscn --loads
+    python3 tools/python/scene_cost.py --folded scene.folded --metric nodes
+    flamegraph.pl scene.folded > scene.svg
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from dependency_graph import HARD_KINDS, SOFT_KINDS, DependencyGraph
+from godot_project import (
+    find_project_root,
+    from_res_path,
+    read_autoloads,
+    read_main_scene,
+    read_uid_map,
+)
+from godot_scene import Scene, SceneLibrary, SceneNode, read_scene
+
+METRICS = ("nodes", "scripts", "bytes", "shaders")
+SHADER_SUFFIXES = (".gdshader", ".gdshaderinc")
+
+
+@dataclass
+class Frame:
+    """One loaded or instanced file in the expanded tree, with its own cost"""
+
+    label: str
+    path: str  # res:// path
+    kind: str  # scene | instance | script | resource | autoload
+    nodes: int = 0
+    scripts: int = 0
+    bytes: int = 0
+    shaders: int = 0
+    children: List["Frame"] = field(default_factory=list)
+
+    def total(self, metric: str) -> int:
+        return getattr(self, metric) + sum(c.total(metric) for c in self.children)
+
+    def walk(self, stack: tuple = ()):
+        """(stack of frames, frame) for this frame and every frame below it"""
+        stack = stack + (self,)
+        yield stack, self
+        for child in self.children:
+            yield from child.walk(stack)
+
+
+def _short(res_path: str) -> str:
+    return res_path.removeprefix("res://")
+
+
+class SceneCost:
+    """Expands scenes, scripts and resources into cost frames in load order"""
+
+    def __init__(self, root: Path, loads: bool = False):
+        self.root = root
+        self.library = SceneLibrary(root)
+        self.graph = DependencyGraph.open(root)
+        self.uids = read_uid_map(root)
+        self.kinds = HARD_KINDS + SOFT_KINDS if loads else HARD_KINDS
+        self.loaded: Set[str] = set()
+        self._resources: Dict[str, Optional[Scene]] = {}
+
+    def _size(self, res_path: str) -> int:
+        path = from_res_path(self.root, res_path)
+        try:
+            return path.stat().st_size if path else 0
+        except OSError:
+            return 0
+
+    def _load(self, frame: Frame) -> bool:
+        """Charge the file's bytes on its first load; False when already loaded"""
+        if frame.path in self.loaded:
+            return False
+        self.loaded.add(frame.path)
+        frame.bytes = self._size(frame.path)
+        return True
+
+    def _ext_path(self, scene: Scene, resource_id: str) -> Optional[str]:
+        """The file an ext_resource loads: its uid:// target, else its path"""
+        resource = scene.ext_resources.get(resource_id)
+        if resource is None:
+            return None
+        return self.uids.get(resource.uid or "", resource.path)
+
+    def expand(self, res_path: str, label: str = "", kind: str = "") -> Frame:
+        """Frame tree for any loadable file"""
+        label = label or _short(res_path)
+        if res_path.endswith(".gd"):
+            return self.script(res_path, label)
+        if res_path.endswith(".tscn"):
+            return self.scene(res_path, label, instanced=kind != "resource")
+        return self.resource(res_path, label)
+
+    def scene(
+        self,
+        res_path: str,
+        label: str,
+        instanced: bool = True,
+        stack: frozenset = frozenset(),
+    ) -> Frame:
+        """An instanced scene (or a PackedScene that is only loaded)"""
+        kind = "instance" if stack else "scene" if instanced else "resource"
+        frame = Frame(label, res_path, kind)
+        first = self._load(frame)
+        scene = self.library.scene(res_path)
+        if scene is None or res_path in stack:
+            frame.nodes = 1 if instanced else 0
+            return frame
+        stack = stack | {res_path}
+        if instanced:
+            frame.nodes = sum(
+                1 for n in scene.nodes if not n.override and n.instance is None
+            )
+        if first:
+            self._embedded(scene, frame)
+
+        instances: Dict[str, List[SceneNode]] = {}
+        for node in scene.nodes:
+            if node.instance and instanced:
+                instances.setdefault(node.instance, []).append(node)
+        for resource_id, resource in scene.ext_resources.items():
+            target = self._ext_path(scene, resource_id)
+            if not target:
+                continue
+            for node in instances.get(resource_id, []):
+                child = self.scene(
+                    target, f"{_short(target)} [{node.path}]", True, stack
+                )
+                frame.children.append(child)
+            if first and resource_id not in instances:
+                child = self.expand(target, kind="resource")
+                if child.total("bytes") or child.children:
+                    frame.children.append(child)
+        return frame
+
+    def script(self, res_path: str, label: str) -> Frame:
+        frame = Frame(label, res_path, "script")
+        if not self._load(frame):
+            return frame
+        frame.scripts = 1
+        source = _short(res_path)
+        for edge in self.graph.dependencies(source, self.kinds):
+            target = "res://" + edge.target
+            if target not in self.loaded:
+                child_label = f"{edge.target} ({edge.kind})"
+                frame.children.append(self.script(target, child_label))
+        for edge in self.graph.resources.get(source, []):
+            target = "res://" + edge.target
+            if edge.kind in self.kinds and target not in self.loaded:
+                child_label = f"{edge.target} ({edge.kind})"
+                frame.children.append(self.expand(target, child_label, "resource"))
+        return frame
+
+    def resource(self, res_path: str, label: str) -> Frame:
+        """A .tres, shader, texture or other file, with what it loads in turn"""
+        frame = Frame(label, res_path, "resource")
+        if not self._load(frame):
+            return frame
+        if res_path.endswith(SHADER_SUFFIXES):
+            frame.shaders = 1
+        if not res_path.endswith(".tres"):
+            return frame
+        resource = self._read_resource(res_path)
+        if resource is None:
+            return frame
+        if resource.type == "Shader":
+            frame.shaders += 1
+        self._embedded(resource, frame)
+        for resource_id in resource.ext_resources:
+            target = self._ext_path(resource, resource_id)
+            if target and target not in self.loaded:
+                frame.children.append(self.expand(target, kind="resource"))
+        return frame
+
+    def _read_resource(self, res_path: str) -> Optional[Scene]:
+        if res_path not in self._resources:
+            try:
+                resource = read_scene(from_res_path(self.root, res_path), self.root)
+            except (OSError, ValueError):
+                resource = None
+            self._resources[res_path] = resource
+        return self._resources[res_path]
+
+    @staticmethod
+    def _embedded(scene: Scene, frame: Frame) -> None:
+        """Shaders and scripts embedded as sub_resources"""
+        for sub in scene.sub_resources.values():
+            if sub.type == "Shader":
+                frame.shaders += 1
+            elif sub.type == "GDScript":
+                frame.scripts += 1
+
+    def profile(self, roots: List[str], autoloads: bool = False) -> List[Frame]:
+        """Frames for the autoloads (optional, they load first) and each root"""
+        frames = []
+        if autoloads:
+            for name, target in read_autoloads(self.root).items():
+                frame = self.expand(target, f"{name}={_short(target)}")
+                frame.kind = "autoload"
+                frames.append(frame)
+        for res_path in roots:
+            frames.append(self.expand(res_path))
+        return frames
+
+
+def folded(frames: List[Frame], metric: str) -> List[str]:
+    """flamegraph.pl input: `frame;frame;frame value` per frame with own cost"""
+    lines = []
+    for frame in frames:
+        for stack, node in frame.walk():
+            value = getattr(node, metric)
+            if value:
+                labels = [f.label.replace(";", ",") for f in stack]
+                lines.append(f"{';'.join(labels)} {value}")
+    return lines
+
+
+def _format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+
+def _to_dict(frame: Frame) -> dict:
+    entry = {"label": frame.label, "path": frame.path, "kind": frame.kind}
+    for metric in METRICS:
+        entry[metric] = frame.total(metric)
+        entry[f"self_{metric}"] = getattr(frame, metric)
+    entry["children"] = [_to_dict(c) for c in frame.children]
+    return entry
+
+
+def print_report(frames: List[Frame], sort: str, limit: int, elapsed: float) -> None:
+    print("🎬 Scene Instancing Cost")
+    print("=" * 60)
+    for frame in frames:
+        if frame.kind == "autoload":
+            continue
+        print(
+            f"   {frame.label}: {frame.total('nodes')} nodes,"
+            f" {frame.total('scripts')} scripts,"
+            f" {_format_size(frame.total('bytes'))},"
+            f" {frame.total('shaders')} shaders"
+        )
+    autoloads = [f for f in frames if f.kind == "autoload"]
+    if autoloads:
+        print(
+            f"   {len(autoloads)} autoloads:"
+            f" {sum(f.total('scripts') for f in autoloads)} scripts,"
+            f" {_format_size(sum(f.total('bytes') for f in autoloads))}"
+        )
+    print(f"   expanded in {elapsed * 1000:.1f} ms")
+
+    rows = [
+        (stack, frame)
+        for root in frames
+        for stack, frame in root.walk()
+        if frame.total(sort) and len(stack) > 1
+    ]
+    rows.sort(key=lambda row: -row[1].total(sort))
+    print()
+    print(f"Most expensive subtrees by {sort}:")
+    print(f"{'nodes':>7} {'scripts':>8} {'bytes':>10} {'shaders':>8}  subtree")
+    for stack, frame in rows[:limit]:
+        parent = stack[-2].label
+        print(
+            f"{frame.total('nodes'):>7} {frame.total('scripts'):>8}"
+            f" {_format_size(frame.total('bytes')):>10} {frame.total('shaders'):>8}"
+            f"  {frame.label}  ← {parent}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Expand the main scene and report per-subtree load cost"
+    )
+    parser.add_argument(
+        "scenes", nargs="*", help="scenes to expand (default: run/main_scene)"
+    )
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--autoloads",
+        action="store_true",
+        help="expand the autoloads first; they load before the main scene",
+    )
+    parser.add_argument(
+        "--loads", action="store_true", help="also follow runtime load() calls"
+    )
+    parser.add_argument("--sort", choices=METRICS, default="nodes")
+    parser.add_argument("--limit", type=int, default=25, help="subtrees to list")
+    parser.add_argument(
+        "--folded", type=Path, help="write folded stacks (flamegraph.pl input)"
+    )
+    parser.add_argument(
+        "--metric",
+        choices=METRICS,
+        help="weight of the folded stacks (default: --sort)",
+    )
+    parser.add_argument("--json", type=Path, help="write the expanded tree as JSON")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    roots = []
+    for path in args.scenes:
+        roots.append(path if path.startswith("res://") else f"res://{path}")
+    if not roots:
+        main_scene = read_main_scene(root)
+        if not main_scene:
+            print("❌ project.godot has no run/main_scene", file=sys.stderr)
+            return 1
+        roots.append(main_scene)
+
+    started = time.perf_counter()
+    profiler = SceneCost(root, loads=args.loads)
+    frames = profiler.profile(roots, autoloads=args.autoloads)
+    elapsed = time.perf_counter() - started
+
+    print_report(frames, args.sort, args.limit, elapsed)
+    if args.folded:
+        lines = folded(frames, args.metric or args.sort)
+        args.folded.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print(f"\n📄 {len(lines)} folded stacks written to {args.folded}")
+    if args.json:
+        report = [_to_dict(frame) for frame in frames]
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Scene and Resource Validator for NeuroVis
+=========================================
+
+Checks Godot 4 text scenes (.tscn) and resources (.tres) without a Godot
+binary, using the streaming parser in godot_scene.py. The whole tree parses
+in a few tens of milliseconds, so it runs as the validate-scenes and
+validate-resources pre-commit hooks and replaces the per-scene Godot runs
+of scripts/ci/detect_parser_errors.sh.
+
+Errors (exit code 1):
+
+- syntax the engine rejects: unknown sections, stray lines, unclosed
+  values, duplicate ids, a missing or misplaced [gd_scene]/[gd_resource]
+- a text format other than 3 (Godot 4)
+- ext_resource files that exist neither at their uid:// id nor their path
+- uid:// ids claimed by more than one file
+- ExtResource()/SubResource() references to ids the file does not declare
+- nodes whose parent, and connections whose from/to node, do not exist
+  (paths into instanced scenes are followed)
+- scenes that instance themselves, directly or through other scenes
+- node count, instancing depth or sub-resource count over budget
+
+Warnings: a uid:// id that points to another file than the path (the
+engine loads the uid target), an unknown uid with a valid path, unused
+ext_resources and a stale load_steps.
+
+Budgets come from data/scene_budgets.cfg: [default] applies to every
+scene and a section named after a res:// path overrides it. The node count
+is the expanded count, with the nodes of every instanced scene included.
+
+Usage:
+    python3 tools/python/scene_validate.py                     # whole project
+    python3 tools/python/scene_validate.py scenes/main/node_3d.tscn
+    python3 tools/python/scene_validate.py --verbose --json scenes.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from godot_project import (
+    find_project_root,
+    from_res_path,
+    iter_project_files,
+    read_config,
+    to_res_path,
+    uid_owners,
+)
+from godot_scene import Scene, SceneLibrary, read_scene
+
+BUDGETS_FILE = Path(__file__).parent / "data" / "scene_budgets.cfg"
+BUDGET_KEYS = ("nodes", "depth", "sub_resources")
+TEXT_FORMAT = 3
+_REFERENCE_RE = re.compile(r'\b(Ext|Sub)Resource\(\s*"?([^")\s]+)"?\s*\)')
+
+
+@dataclass
+class Finding:
+    line: int
+    severity: str  # "error" or "warning"
+    message: str
+
+
+@dataclass
+class FileReport:
+    path: str
+    kind: str
+    nodes: int = 0  # nodes declared in the file
+    expanded_nodes: int = 0  # with the nodes of instanced scenes
+    depth: int = 0  # nesting of instanced scenes
+    sub_resources: int = 0
+    ext_resources: int = 0
+    connections: int = 0
+    findings: List[Finding] = field(default_factory=list)
+
+    def add(self, line: int, severity: str, message: str) -> None:
+        self.findings.append(Finding(line, severity, message))
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for f in self.findings if f.severity == "error")
+
+
+def read_budgets(path: Path) -> Dict[str, Dict[str, int]]:
+    """Budget sections by res:// path ("" for [default])"""
+    if not path.exists():
+        return {}
+    budgets: Dict[str, Dict[str, int]] = {}
+    for section, values in read_config(path).items():
+        limits = {k: int(v) for k, v in values.items() if k in BUDGET_KEYS}
+        if limits:
+            budgets["" if section == "default" else section] = limits
+    return budgets
+
+
+class SceneValidator:
+    """Validates files against the project's uid map and the scenes they instance"""
+
+    def __init__(self, root: Path, budgets: Dict[str, Dict[str, int]]):
+        self.root = root
+        self.library = SceneLibrary(root)
+        self.budgets = budgets
+        self.uids = uid_owners(root)
+        self._expanded: Dict[str, Optional[tuple]] = {}
+
+    def _file_exists(self, res_path: str) -> bool:
+        path = from_res_path(self.root, res_path)
+        return path is not None and path.exists()
+
+    def _opaque(self, scene: Scene, node_path: str) -> bool:
+        """True when a path runs through an instanced non-text scene (e.g. a .glb)"""
+        parts = node_path.split("/")
+        for end in range(1, len(parts) + 1):
+            node = scene.node("/".join(parts[:end]))
+            instance = scene.instance_path(node) if node else None
+            if instance and not instance.endswith(".tscn"):
+                return True
+        root = scene.root
+        instance = scene.instance_path(root) if root else None
+        return bool(instance) and not instance.endswith(".tscn")
+
+    def _exists(self, scene: Scene, node_path: str) -> bool:
+        if self.library.resolve(scene, ".", node_path) is not None:
+            return True
+        return scene.node(node_path) is not None or self._opaque(scene, node_path)
+
+    def expansion(self, scene: Scene, stack: Set[str] = frozenset()) -> Optional[tuple]:
+        """(expanded node count, instancing depth), None when instancing loops"""
+        if scene.path in stack:
+            return None
+        if scene.path in self._expanded:
+            return self._expanded[scene.path]
+        stack = stack | {scene.path}
+        nodes, depth = 0, 0
+        for node in scene.nodes:
+            if node.override:
+                continue
+            nodes += 1
+            inner_path = scene.instance_path(node)
+            inner = self.library.scene(inner_path) if inner_path else None
+            if inner is None:
+                continue
+            inner_stats = self.expansion(inner, stack)
+            if inner_stats is None:
+                self._expanded[scene.path] = None
+                return None
+            nodes += inner_stats[0] - 1
+            depth = max(depth, inner_stats[1] + 1)
+        self._expanded[scene.path] = (nodes, depth)
+        return self._expanded[scene.path]
+
+    def validate(self, scene: Scene) -> FileReport:
+        report = FileReport(
+            scene.path,
+            scene.kind,
+            sum(1 for node in scene.nodes if not node.override),
+            sub_resources=len(scene.sub_resources),
+            ext_resources=len(scene.ext_resources),
+            connections=len(scene.connections),
+        )
+        for line, message in scene.errors:
+            report.add(line, "error", message)
+        expected = "gd_scene" if scene.path.endswith(".tscn") else "gd_resource"
+        if scene.kind != expected:
+            report.add(1, "error", f"missing [{expected}] header")
+        if scene.format is not None and scene.format != TEXT_FORMAT:
+            report.add(
+                1, "error", f"format={scene.format}, Godot 4 writes {TEXT_FORMAT}"
+            )
+        steps = len(scene.ext_resources) + len(scene.sub_resources) + 1
+        if scene.load_steps is not None and scene.load_steps != steps:
+            report.add(
+                1, "warning", f"load_steps={scene.load_steps}, the file has {steps}"
+            )
+        if scene.uid and len(self.uids.get(scene.uid, [])) > 1:
+            others = [p for p in self.uids[scene.uid] if p != scene.path]
+            report.add(
+                1, "error", f"{scene.uid} is also claimed by {', '.join(others)}"
+            )
+
+        self._check_ext_resources(scene, report)
+        self._check_references(scene, report)
+        if scene.kind == "gd_scene":
+            self._check_nodes(scene, report)
+            self._check_budgets(scene, report)
+        report.findings.sort(key=lambda f: f.line)
+        return report
+
+    def _check_ext_resources(self, scene: Scene, report: FileReport) -> None:
+        for resource in scene.ext_resources.values():
+            path_ok = self._file_exists(resource.path)
+            owners = self.uids.get(resource.uid or "", [])
+            if resource.uid and owners and resource.path not in owners:
+                report.add(
+                    resource.line,
+                    "warning",
+                    f"{resource.uid} points to {owners[-1]}, not {resource.path}",
+                )
+            elif resource.uid and not owners and path_ok:
+                report.add(
+                    resource.line,
+                    "warning",
+                    f"unknown {resource.uid}, loaded by path {resource.path}",
+                )
+            if not path_ok and not any(self._file_exists(p) for p in owners):
+                report.add(resource.line, "error", f"missing {resource.path}")
+
+    def _check_references(self, scene: Scene, report: FileReport) -> None:
+        used: Set[str] = set()
+        sections = [(s.line, s.properties) for s in scene.sub_resources.values()]
+        sections += [(n.line, n.properties) for n in scene.nodes]
+        sections.append((1, scene.properties))
+        for line, properties in sections:
+            for value in properties.values():
+                for kind, ident in _REFERENCE_RE.findall(value):
+                    declared = (
+                        scene.ext_resources if kind == "Ext" else scene.sub_resources
+                    )
+                    if ident not in declared:
+                        report.add(
+                            line, "error", f'{kind}Resource("{ident}") is not declared'
+                        )
+                    elif kind == "Ext":
+                        used.add(ident)
+        for node in scene.nodes:
+            if node.instance is None:
+                continue
+            resource = scene.ext_resources.get(node.instance)
+            if resource is None:
+                report.add(
+                    node.line, "error", f"instance {node.instance} is not declared"
+                )
+            else:
+                used.add(node.instance)
+                if resource.type != "PackedScene":
+                    report.add(node.line, "error", f"instances a {resource.type}")
+        for resource in scene.ext_resources.values():
+            if resource.id not in used:
+                report.add(
+                    resource.line, "warning", f"unused ext_resource {resource.path}"
+                )
+
+    def _check_nodes(self, scene: Scene, report: FileReport) -> None:
+        seen: Set[str] = set()
+        for index, node in enumerate(scene.nodes):
+            if index == 0:
+                if node.parent is not None:
+                    report.add(node.line, "error", "root node has a parent")
+            elif node.parent is None:
+                report.add(node.line, "error", f"second root node '{node.name}'")
+            elif node.parent not in seen and not self._exists(scene, node.parent):
+                report.add(node.line, "error", f"parent '{node.parent}' does not exist")
+            if node.path in seen:
+                report.add(node.line, "error", f"duplicate node '{node.path}'")
+            seen.add(node.path)
+        for connection in scene.connections:
+            line = int(connection.get("line", "0"))
+            for end in ("from", "to"):
+                target = connection.get(end, "")
+                if not self._exists(scene, target):
+                    report.add(
+                        line, "error", f"connection {end} '{target}' does not exist"
+                    )
+
+    def _check_budgets(self, scene: Scene, report: FileReport) -> None:
+        expansion = self.expansion(scene)
+        if expansion is None:
+            report.add(1, "error", "scene instances itself")
+            return
+        report.expanded_nodes, report.depth = expansion
+        limits = dict(self.budgets.get("", {}))
+        limits.update(self.budgets.get(scene.path, {}))
+        measured = {
+            "nodes": report.expanded_nodes,
+            "depth": report.depth,
+            "sub_resources": report.sub_resources,
+        }
+        for key, limit in limits.items():
+            if measured[key] > limit:
+                report.add(
+                    1,
+                    "error",
+                    f"{key.replace('_', ' ')} {measured[key]} over budget {limit}",
+                )
+
+
+def _targets(root: Path, paths: List[str]) -> List[Path]:
+    if not paths:
+        return list(iter_project_files(root, ".tscn", ".tres"))
+    return [
+        Path(p).resolve()
+        for p in paths
+        if p.endswith((".tscn", ".tres")) and Path(p).exists()
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Validate Godot text scenes and resources without Godot"
+    )
+    parser.add_argument("files", nargs="*", help=".tscn/.tres files (default: all)")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--budgets", type=Path, default=BUDGETS_FILE, help="budget cfg file"
+    )
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument(
+        "--verbose", action="store_true", help="list counts for every file"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    root = find_project_root(args.project)
+    validator = SceneValidator(root, read_budgets(args.budgets))
+    reports = []
+    for path in _targets(root, args.files):
+        res_path = to_res_path(root, path)
+        scene = validator.library.scene(res_path) or read_scene(path, root)
+        reports.append(validator.validate(scene))
+    elapsed = time.perf_counter() - started
+
+    print("🎬 Scene and resource validation")
+    print("=" * 60)
+    for report in reports:
+        if not report.findings and not args.verbose:
+            continue
+        print(f"\n{report.path}")
+        if report.kind == "gd_scene":
+            print(
+                f"   {report.nodes} nodes ({report.expanded_nodes} expanded),"
+                f" depth {report.depth}, {report.sub_resources} sub-resources,"
+                f" {report.connections} connections"
+            )
+        for finding in report.findings:
+            icon = "❌" if finding.severity == "error" else "⚠️ "
+            print(f"   {icon} line {finding.line}: {finding.message}")
+
+    if args.json:
+        data = [dict(asdict(report), errors=report.errors) for report in reports]
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    errors = sum(report.errors for report in reports)
+    warnings = sum(len(report.findings) for report in reports) - errors
+    scenes = [r for r in reports if r.kind == "gd_scene"]
+    print("\n📊 Summary")
+    print(f"   Scenes:             {len(scenes)}")
+    print(f"   Resources:          {len(reports) - len(scenes)}")
+    if scenes:
+        largest = max(scenes, key=lambda r: r.expanded_nodes)
+        print(f"   Largest scene:      {largest.path} ({largest.expanded_nodes} nodes)")
+    print(f"   Errors:             {errors}")
+    print(f"   Warnings:           {warnings}")
+    print(f"   Time:               {elapsed * 1000:.0f} ms")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Scope-Aware Variable Conflict Resolver for NeuroVis
+===================================================
+
+Finds local variables that GDScript rejects as redeclarations and renames
+them together with every reference:
+
+    func _ready(delta):
+        var err = load_config()
+        if err == OK:
+            var err = apply()          ->  var err_2 = apply()
+            print(err)                 ->  print(err_2)
+        print(err)                     (still the outer err)
+
+Each file gets a scope tree: the class (members), each function (its
+parameters) and each indented block (locals, `for` variables). A `var`,
+`const` or `for` variable is a conflict only when the same name is already
+declared in the same block, an enclosing block or the function parameters.
+The same name in sibling blocks or in another function is fine and is never
+touched, and locals that merely shadow a member are left alone (Godot only
+warns about those).
+
+References are resolved in the same single token pass that builds the tree,
+so a renamed local is updated everywhere it is visible and nowhere else.
+Member access (`obj.err`), node paths (`$Err`, `%Err`), dictionary keys
+(`{err = 1}`), strings and comments are never renamed. Names bound by
+lambdas and match patterns are tracked but never renamed themselves.
+
+Duplicate member variables at class level are reported but not renamed:
+other scripts may refer to them.
+
+GodotSyntaxFixer runs this as its variable conflict stage.
+
+Usage:
+    python3 tools/python/scope_resolver.py                 # report only
+    python3 tools/python/scope_resolver.py --diff core/
+    python3 tools/python/scope_resolver.py --write
+"""
+
+import argparse
+import difflib
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from gdscript_lexer import NAME, OP, Token
+from gdscript_outline import Function, Outline, parse_outline
+from godot_project import find_project_root, iter_project_files
+
+DECLARATION_KEYWORDS = {"var", "const"}
+CLASS_MEMBER_KINDS = {"var", "const"}
+# Keywords after which `%Name` is a unique node, not the modulo operator
+EXPRESSION_KEYWORDS = {"return", "and", "or", "not", "in", "await", "if", "elif"}
+
+
+@dataclass
+class Scope:
+    kind: str  # class | function | block
+    line: int
+    parent: Optional["Scope"] = None
+    indent: Optional[int] = None  # indentation of the lines in the block
+    names: Dict[str, str] = field(default_factory=dict)  # declared -> final name
+    renamed: List[Token] = field(default_factory=list)  # declarations renamed here
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Final name of a local visible here, or None for members and globals"""
+        scope: Optional[Scope] = self
+        while scope is not None and scope.kind != "class":
+            if name in scope.names:
+                return scope.names[name]
+            scope = scope.parent
+        return None
+
+
+@dataclass
+class Conflict:
+    line: int
+    name: str
+    new_name: Optional[str]  # None when only reported
+    scope: str  # function name, or the class for duplicate members
+    references: int = 0
+
+
+def _node_path_tokens(tokens: List[Token]) -> Set[int]:
+    """Indexes of the names inside `$Path/To/Node` and `%Unique` shorthands"""
+    skipped: Set[int] = set()
+    for i, token in enumerate(tokens):
+        if token.kind != OP or token.text not in ("$", "%"):
+            continue
+        if token.text == "%" and i > 0:
+            prev = tokens[i - 1]
+            if prev.kind == NAME and prev.text not in EXPRESSION_KEYWORDS:
+                continue
+            if prev.kind == OP and prev.text in (")", "]", "}"):
+                continue  # the modulo operator
+        j = i + 1
+        while j < len(tokens) and tokens[j].start == tokens[j - 1].end:
+            if tokens[j].kind == NAME:
+                skipped.add(j)
+            elif tokens[j].text not in ("/", "%"):
+                break
+            j += 1
+    return skipped
+
+
+class FileScopes:
+    """Scope tree and conflict renames of one script, built in one pass"""
+
+    def __init__(self, source: str, outline: Optional[Outline] = None):
+        self.source = source
+        self.outline = outline or parse_outline(source)
+        self.edits: Dict[int, Tuple[Token, str]] = {}  # token start -> new text
+        self.conflicts: List[Conflict] = []
+        self.taken = {t.text for t in self.outline.tokens if t.kind == NAME}
+        self.classes: Dict[Optional[str], Scope] = {None: Scope("class", 1)}
+        for inner in self.outline.inner_classes:
+            self.classes[inner.name] = Scope("class", inner.line, self.classes[None])
+        self._declare_members()
+        for func in self.outline.functions:
+            self._walk_function(func)
+
+    def _declare_members(self) -> None:
+        for member in self.outline.members:
+            scope = self.classes.get(member.owner, self.classes[None])
+            if member.kind not in CLASS_MEMBER_KINDS or not member.name.isidentifier():
+                continue
+            if member.name in scope.names:
+                owner = member.owner or "script class"
+                self.conflicts.append(Conflict(member.line, member.name, None, owner))
+            scope.names[member.name] = member.name
+
+    def _fresh_name(self, name: str) -> str:
+        counter = 2
+        while f"{name}_{counter}" in self.taken:
+            counter += 1
+        new_name = f"{name}_{counter}"
+        self.taken.add(new_name)
+        return new_name
+
+    def _declare(self, scope: Scope, token: Token, func: Function) -> str:
+        """Declare a local; a redeclaration gets a fresh name"""
+        name = token.text
+        if scope.lookup(name) is not None:
+            new_name = self._fresh_name(name)
+            self.conflicts.append(Conflict(token.line, name, new_name, func.name))
+            self.edits[token.start] = (token, new_name)
+            scope.renamed.append(token)
+        else:
+            new_name = name
+        return new_name
+
+    def _walk_function(self, func: Function) -> None:
+        class_scope = self.classes.get(func.owner, self.classes[None])
+        function_scope = Scope("function", func.line, class_scope)
+        for param in func.params:
+            function_scope.names[param.name] = param.name
+
+        stack: List[Scope] = [function_scope]
+        header_scope: Optional[Scope] = None  # block opened by the previous line
+        header_tokens: List[Token] = []
+        for line in self.outline.body_lines(func):
+            tokens = line.tokens
+            if not tokens:
+                continue
+            if function_scope.indent is None:
+                function_scope.indent = line.indent
+            while len(stack) > 1 and stack[-1].indent > line.indent:
+                stack.pop()
+            if line.indent > stack[-1].indent:
+                block = header_scope or Scope("block", line.line, stack[-1])
+                block.indent = line.indent
+                stack.append(block)
+            elif header_scope is not None and header_tokens[-1].text == ":":
+                self._discard(header_scope)  # a header without a body
+            header_scope = self._walk_line(tokens, stack[-1], func)
+            header_tokens = tokens
+
+    def _discard(self, scope: Scope) -> None:
+        """Undo the renames of a block that turned out to have no body"""
+        for token in scope.renamed:
+            new_name = self.edits.pop(token.start)[1]
+            self.conflicts = [c for c in self.conflicts if c.new_name != new_name]
+
+    def _walk_line(
+        self, tokens: List[Token], scope: Scope, func: Function
+    ) -> Optional[Scope]:
+        """Resolve the names of one statement
+
+        Returns the scope of the block the statement opens when the statement
+        binds names for it (`for`, lambdas, match patterns).
+        """
+        skipped = _node_path_tokens(tokens)
+        pending: List[Tuple[str, str]] = []  # declared after the statement
+        inner: Optional[Scope] = None  # block scope bound by this statement
+        brackets: List[str] = []
+
+        def block_scope() -> Scope:
+            nonlocal inner
+            if inner is None:
+                inner = Scope("block", tokens[0].line, scope)
+            return inner
+
+        for i, token in enumerate(tokens):
+            text = token.text
+            if token.kind == OP:
+                if text in "([{":
+                    brackets.append(text)
+                elif text in ")]}" and brackets:
+                    brackets.pop()
+                continue
+            if token.kind != NAME or i in skipped:
+                continue
+            prev = tokens[i - 1].text if i > 0 else None
+            following = tokens[i + 1].text if i + 1 < len(tokens) else None
+            if prev == ".":
+                continue
+            if prev in DECLARATION_KEYWORDS:
+                if i == 1:
+                    pending.append((text, self._declare(scope, token, func)))
+                else:  # match pattern binding: belongs to the branch body
+                    block_scope().names[text] = text
+                continue
+            if prev == "for" and i == 1:
+                block = block_scope()
+                block.names[text] = self._declare(block, token, func)
+                continue
+            if text == "func" and i > 0:
+                # Lambda parameters shadow outer names inside the lambda
+                block = block_scope()
+                j = i + 1
+                if j < len(tokens) and tokens[j].kind == NAME:
+                    j += 1
+                depth = 0
+                for k in range(j, len(tokens)):
+                    if tokens[k].text == "(":
+                        depth += 1
+                    elif tokens[k].text == ")":
+                        depth -= 1
+                        if depth == 0:
+                            break
+                    elif depth == 1 and tokens[k - 1].text in ("(", ","):
+                        if tokens[k].kind == NAME:
+                            block.names[tokens[k].text] = tokens[k].text
+                            skipped.add(k)
+                continue
+            if brackets and brackets[-1] == "{" and following == "=":
+                continue  # Lua-style dictionary key
+            resolved = (inner or scope).lookup(text)
+            if resolved is not None and resolved != text:
+                self.edits[token.start] = (token, resolved)
+                self._count_reference(text, resolved)
+
+        for name, final in pending:
+            scope.names[name] = final
+        return inner
+
+    def _count_reference(self, name: str, new_name: str) -> None:
+        for conflict in reversed(self.conflicts):
+            if conflict.new_name == new_name:
+                conflict.references += 1
+                return
+
+    def rewrite(self) -> str:
+        pieces = []
+        pos = 0
+        for start in sorted(self.edits):
+            token, text = self.edits[start]
+            pieces.append(self.source[pos:start])
+            pieces.append(text)
+            pos = token.end
+        pieces.append(self.source[pos:])
+        return "".join(pieces)
+
+
+def resolve_conflicts(source: str) -> Tuple[str, List[Conflict]]:
+    """Rename redeclared locals and their references; returns source and conflicts"""
+    scopes = FileScopes(source)
+    return scopes.rewrite(), scopes.conflicts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Rename redeclared GDScript locals and their references"
+    )
+    parser.add_argument("paths", nargs="*", type=Path, help="files or folders")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument("--diff", action="store_true", help="print a unified diff")
+    parser.add_argument("--write", action="store_true", help="rewrite the files")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    files: List[Path] = []
+    for path in args.paths or [root]:
+        path = path if path.is_absolute() else Path.cwd() / path
+        files.extend([path] if path.is_file() else iter_project_files(path, ".gd"))
+
+    print("🔭 Variable scope conflicts")
+    print("=" * 60)
+    renamed = reported = changed = 0
+    for path in files:
+        relative = path.resolve().relative_to(root.resolve()).as_posix()
+        source = path.read_text(encoding="utf-8", errors="replace")
+        fixed, conflicts = resolve_conflicts(source)
+        for conflict in conflicts:
+            where = f"{relative}:{conflict.line} {conflict.scope}()"
+            if conflict.new_name is None:
+                reported += 1
+                print(f"⚠️  {relative}:{conflict.line} duplicate member {conflict.name}")
+            else:
+                renamed += 1
+                print(
+                    f"   {where} {conflict.name} -> {conflict.new_name}"
+                    f" ({conflict.references} references)"
+                )
+        if fixed == source:
+            continue
+        changed += 1
+        if args.diff:
+            diff = difflib.unified_diff(
+                source.splitlines(),
+                fixed.splitlines(),
+                f"a/{relative}",
+                f"b/{relative}",
+                lineterm="",
+            )
+            print("\n".join(diff))
+        if args.write:
+            path.write_text(fixed, encoding="utf-8")
+
+    elapsed = time.perf_counter() - started
+    print("\n📊 Summary")
+    print(f"   Files scanned:      {len(files)} ({elapsed:.2f} s)")
+    print(f"   Locals renamed:     {renamed}")
+    print(f"   Duplicate members:  {reported} (not renamed)")
+    action = "Rewrote" if args.write else "Would rewrite"
+    print(f"   {action} {changed} files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
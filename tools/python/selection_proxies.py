@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Baked Selection Proxies for NeuroVis
+====================================
+
+Picking currently ray-tests full-resolution trimesh colliders built at load
+time, with several rays per click or hover, and the selection manager
+recomputes structure AABBs at run time. This asset step bakes a cheap
+collider and a bounds table for every anatomical structure instead:
+
+- a convex hull (quickhull in NumPy) of at most --max-points points, grown
+  to enclose every vertex, for structures whose volume fills most of it
+- a reduced mesh (mesh_decimate.Simplifier, --max-triangles) for clearly
+  concave structures (caudate, hippocampus), where a hull would steal clicks
+  from its neighbours
+- a box for flat or degenerate geometry
+
+The hull is built from the extreme points of the mesh in a fixed set of
+directions, so the bake is deterministic and independent of mesh size.
+
+Everything is written in mesh-local space to
+assets/models/proxies/<Model>_proxies.tres: one ConvexPolygonShape3D or
+ConcavePolygonShape3D sub-resource per structure and a `proxies` metadata
+dictionary keyed by node name with the shape, its kind, the AABB and a
+bounding sphere. core/interaction/SelectionProxyLibrary.gd loads it and
+swaps the proxies into the colliders BrainStructureSelectionManager
+ray-tests.
+
+Usage:
+    python3 tools/python/selection_proxies.py                 # all ModelRegistry models
+    python3 tools/python/selection_proxies.py Brainstem --verbose
+    python3 tools/python/selection_proxies.py path/to/model.glb --output /tmp/proxies
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from godot_project import find_project_root
+from gltf_io import GLB
+from mesh_decimate import Simplifier
+from model_assets import registry_models
+
+PROXY_DIR = "assets/models/proxies"
+# Structures whose volume is below this share of their hull get a mesh proxy
+CONVEXITY_THRESHOLD = 0.7
+HULL_EPSILON = 1e-9
+# Characters Godot replaces with "_" in imported node names
+INVALID_NODE_CHARACTERS = '.:@/"%'
+
+
+@dataclass
+class Proxy:
+    name: str
+    kind: str  # convex | mesh | box
+    points: np.ndarray  # hull points, or a triangle soup for mesh proxies
+    aabb_min: np.ndarray
+    aabb_max: np.ndarray
+    center: np.ndarray
+    radius: float
+    source_triangles: int
+    convexity: Optional[float] = None  # mesh volume / hull volume
+
+
+@dataclass
+class ModelProxies:
+    name: str
+    proxies: List[Proxy] = field(default_factory=list)
+
+
+def godot_node_name(name: str) -> str:
+    """The node name Godot gives an imported glTF node"""
+    for character in INVALID_NODE_CHARACTERS:
+        name = name.replace(character, "_")
+    return name
+
+
+def fibonacci_directions(count: int) -> np.ndarray:
+    """`count` unit vectors spread evenly over the sphere"""
+    index = np.arange(count) + 0.5
+    polar = np.arccos(1 - 2 * index / count)
+    azimuth = np.pi * (1 + 5**0.5) * index
+    return np.stack(
+        [
+            np.cos(azimuth) * np.sin(polar),
+            np.sin(azimuth) * np.sin(polar),
+            np.cos(polar),
+        ],
+        axis=1,
+    )
+
+
+def extreme_points(points: np.ndarray, count: int) -> np.ndarray:
+    """Unique points that are farthest along `count` fixed directions"""
+    center = (points.min(axis=0) + points.max(axis=0)) / 2
+    directions = fibonacci_directions(count)
+    picks = np.argmax((points - center) @ directions.T, axis=0)
+    return points[np.unique(picks)]
+
+
+def _plane(points: np.ndarray, face: Tuple[int, int, int]) -> Tuple[np.ndarray, float]:
+    a, b, c = points[list(face)]
+    normal = np.cross(b - a, c - a)
+    length = np.linalg.norm(normal)
+    normal = normal / length if length > 0 else normal
+    return normal, -float(normal @ a)
+
+
+def quickhull(points: np.ndarray) -> Optional[np.ndarray]:
+    """Outward-facing triangles (indexes into `points`) of the convex hull
+
+    Returns None when the points are coplanar or collinear.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 4:
+        return None
+    scale = float(np.abs(points).max()) or 1.0
+    epsilon = HULL_EPSILON * scale * 10
+
+    # Initial tetrahedron from extreme points
+    first = int(np.argmin(points[:, 0]))
+    second = int(np.argmax(np.linalg.norm(points - points[first], axis=1)))
+    line = points[second] - points[first]
+    if np.linalg.norm(line) <= epsilon:
+        return None
+    offsets = np.cross(points - points[first], line)
+    third = int(np.argmax(np.linalg.norm(offsets, axis=1)))
+    if np.linalg.norm(offsets[third]) <= epsilon * np.linalg.norm(line):
+        return None
+    normal = np.cross(points[second] - points[first], points[third] - points[first])
+    heights = (points - points[first]) @ normal
+    fourth = int(np.argmax(np.abs(heights)))
+    if abs(heights[fourth]) <= epsilon * np.linalg.norm(normal):
+        return None
+    base = (first, second, third) if heights[fourth] < 0 else (first, third, second)
+    simplex = [
+        base,
+        (base[0], base[2], fourth),
+        (base[2], base[1], fourth),
+        (base[1], base[0], fourth),
+    ]
+
+    faces: Dict[int, Tuple[int, int, int]] = {}
+    planes: Dict[int, Tuple[np.ndarray, float]] = {}
+    outside: Dict[int, np.ndarray] = {}
+    edges: Dict[Tuple[int, int], int] = {}  # directed edge -> face
+    next_id = 0
+
+    def add_face(face: Tuple[int, int, int], candidates: np.ndarray) -> None:
+        nonlocal next_id
+        face_id = next_id
+        next_id += 1
+        faces[face_id] = face
+        planes[face_id] = _plane(points, face)
+        for k in range(3):
+            edges[(face[k], face[(k + 1) % 3])] = face_id
+        outside[face_id] = candidates
+
+    def assign(candidates: np.ndarray, new_faces: List[Tuple[int, int, int]]) -> None:
+        if not len(candidates):
+            for face in new_faces:
+                add_face(face, candidates)
+            return
+        normals = np.array([_plane(points, face)[0] for face in new_faces])
+        offsets = np.array([_plane(points, face)[1] for face in new_faces])
+        distances = points[candidates] @ normals.T + offsets
+        best = np.argmax(distances, axis=1)
+        above = distances[np.arange(len(candidates)), best] > epsilon
+        for k, face in enumerate(new_faces):
+            add_face(face, candidates[above & (best == k)])
+
+    assign(np.arange(len(points)), simplex)
+    while True:
+        face_id = next((f for f, c in outside.items() if len(c)), None)
+        if face_id is None:
+            break
+        candidates = outside[face_id]
+        normal, offset = planes[face_id]
+        eye = int(candidates[np.argmax(points[candidates] @ normal + offset)])
+
+        # Faces the eye point can see, found by flooding across shared edges
+        visible = {face_id}
+        stack = [face_id]
+        while stack:
+            face = faces[stack.pop()]
+            for k in range(3):
+                neighbour = edges.get((face[(k + 1) % 3], face[k]))
+                if neighbour is None or neighbour in visible:
+                    continue
+                normal, offset = planes[neighbour]
+                if points[eye] @ normal + offset > epsilon:
+                    visible.add(neighbour)
+                    stack.append(neighbour)
+
+        horizon = []
+        orphans = []
+        for face_id in visible:
+            face = faces[face_id]
+            for k in range(3):
+                edge = (face[k], face[(k + 1) % 3])
+                if edges.get((edge[1], edge[0])) not in visible:
+                    horizon.append(edge)
+            orphans.append(outside.pop(face_id))
+        for face_id in visible:
+            face = faces.pop(face_id)
+            planes.pop(face_id)
+            for k in range(3):
+                edge = (face[k], face[(k + 1) % 3])
+                if edges.get(edge) == face_id:
+                    del edges[edge]
+        remaining = np.concatenate(orphans)
+        remaining = remaining[remaining != eye]
+        assign(remaining, [(a, b, eye) for a, b in horizon])
+
+    return np.array(list(faces.values()), dtype=np.int64)
+
+
+def mesh_volume(positions: np.ndarray, triangles: np.ndarray) -> float:
+    """Enclosed volume of a closed mesh (divergence theorem)"""
+    p0, p1, p2 = (positions[triangles[:, k]] for k in range(3))
+    return abs(float(np.einsum("ij,ij->i", p0, np.cross(p1, p2)).sum()) / 6.0)
+
+
+def is_closed(triangles: np.ndarray, welded: np.ndarray) -> bool:
+    """True when every welded edge is shared by exactly two triangles"""
+    a = welded[triangles.reshape(-1)]
+    b = welded[triangles[:, [1, 2, 0]].reshape(-1)]
+    keys = np.minimum(a, b) * (int(welded.max()) + 1) + np.maximum(a, b)
+    _, counts = np.unique(keys, return_counts=True)
+    return bool((counts == 2).all())
+
+
+def farthest_points(points: np.ndarray, count: int) -> np.ndarray:
+    """Deterministic farthest-point sample of `count` points"""
+    if len(points) <= count:
+        return points
+    chosen = [int(np.argmax(np.linalg.norm(points - points.mean(axis=0), axis=1)))]
+    distance = np.linalg.norm(points - points[chosen[0]], axis=1)
+    for _ in range(count - 1):
+        chosen.append(int(np.argmax(distance)))
+        distance = np.minimum(
+            distance, np.linalg.norm(points - points[chosen[-1]], axis=1)
+        )
+    return points[chosen]
+
+
+def enclose(points: np.ndarray, hull: np.ndarray, vertices: np.ndarray) -> np.ndarray:
+    """Scale hull points about their centroid until the hull contains `vertices`"""
+    center = points.mean(axis=0)
+    planes = [_plane(points, tuple(face)) for face in hull]
+    normals = np.array([normal for normal, _ in planes])
+    depth = -(normals @ center + np.array([offset for _, offset in planes]))
+    reach = np.full(len(hull), -np.inf)
+    for start in range(0, len(vertices), 65536):
+        chunk = vertices[start : start + 65536] - center
+        reach = np.maximum(reach, (chunk @ normals.T).max(axis=0))
+    scale = max(1.0, float((reach / np.maximum(depth, 1e-12)).max()))
+    return center + (points - center) * scale
+
+
+def _box_points(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    # Keep flat structures pickable: give the box a minimum thickness
+    pad = np.maximum((high - low).max() * 0.01, 1e-4)
+    low, high = np.minimum(low, high - pad), np.maximum(high, low + pad)
+    return np.array(np.meshgrid(*zip(low, high))).T.reshape(-1, 3)
+
+
+def build_proxy(
+    name: str,
+    positions: np.ndarray,
+    triangles: np.ndarray,
+    max_points: int,
+    max_triangles: int,
+) -> Proxy:
+    positions = np.asarray(positions, dtype=np.float64)
+    used = positions[np.unique(triangles)] if len(triangles) else positions
+    low, high = used.min(axis=0), used.max(axis=0)
+    center = (low + high) / 2
+    radius = float(np.linalg.norm(used - center, axis=1).max())
+    proxy = Proxy(
+        name, "box", _box_points(low, high), low, high, center, radius, len(triangles)
+    )
+
+    candidates = extreme_points(used, max_points * 4)
+    hull = quickhull(candidates)
+    if hull is None:
+        return proxy
+    hull_points = candidates[np.unique(hull)]
+    if len(hull_points) > max_points:
+        hull_points = farthest_points(hull_points, max_points)
+        hull = quickhull(hull_points)
+        if hull is None:
+            return proxy
+        hull_points = hull_points[np.unique(hull)]
+        hull = quickhull(hull_points)
+    # The hull of sampled extreme points sits inside the mesh; grow it to cover it
+    proxy.kind, proxy.points = "convex", enclose(hull_points, hull, used)
+
+    simplifier = Simplifier(positions, triangles)
+    if not is_closed(simplifier.triangles, simplifier.welded):
+        return proxy  # open surfaces have no volume to compare
+    hull_volume = mesh_volume(proxy.points, hull) if hull is not None else 0.0
+    if hull_volume <= 0:
+        return proxy
+    proxy.convexity = mesh_volume(positions, triangles) / hull_volume
+    if proxy.convexity < CONVEXITY_THRESHOLD and len(triangles) > max_triangles:
+        reduced = simplifier.reduce_to(max_triangles)
+        proxy.kind, proxy.points = "mesh", positions[reduced].reshape(-1, 3)
+    elif proxy.convexity < CONVEXITY_THRESHOLD:
+        proxy.kind, proxy.points = "mesh", positions[triangles].reshape(-1, 3)
+    return proxy
+
+
+def model_proxies(
+    path: Path, name: str, max_points: int, max_triangles: int
+) -> ModelProxies:
+    """One proxy per mesh node of a model, all primitives of the mesh merged"""
+    glb = GLB.open(path)
+    meshes = glb.mesh_geometry()
+
+    result = ModelProxies(name)
+    built: Dict[int, Proxy] = {}
+    names = glb.mesh_names()
+    nodes = [
+        (node.get("name") or names[node["mesh"]], node["mesh"])
+        for node in glb.document.get("nodes", [])
+        if "mesh" in node and node["mesh"] in meshes
+    ]
+    for node_name, mesh in nodes:
+        if mesh not in built:
+            positions, triangles = meshes[mesh]
+            built[mesh] = build_proxy(
+                node_name, positions, triangles, max_points, max_triangles
+            )
+        proxy = built[mesh]
+        if proxy.name != node_name:
+            proxy = Proxy(**dict(proxy.__dict__, name=node_name))
+        result.proxies.append(proxy)
+    return result
+
+
+def _number(value: float) -> str:
+    text = f"{float(value):.6g}"
+    return "0" if text == "-0" else text
+
+
+def _vector(values) -> str:
+    return ", ".join(_number(value) for value in values)
+
+
+def write_tres(proxies: ModelProxies, path: Path) -> int:
+    """Write the proxies as a Godot text resource; returns its size in bytes"""
+    lines = []
+    shapes: Dict[int, str] = {}  # id(points) -> sub-resource id
+    for proxy in proxies.proxies:
+        if id(proxy.points) in shapes:
+            continue
+        if proxy.kind == "mesh":
+            kind, key = "ConcavePolygonShape3D", "data"
+        else:
+            kind, key = "ConvexPolygonShape3D", "points"
+        shape_id = f"{kind}_{len(shapes)}"
+        shapes[id(proxy.points)] = shape_id
+        lines += [
+            f'[sub_resource type="{kind}" id="{shape_id}"]',
+            f"{key} = PackedVector3Array({_vector(proxy.points.reshape(-1))})",
+            "",
+        ]
+    header = f'[gd_resource type="Resource" load_steps={len(shapes) + 1} format=3]'
+
+    entries = []
+    for proxy in sorted(proxies.proxies, key=lambda p: p.name):
+        size = proxy.aabb_max - proxy.aabb_min
+        fields = [
+            f'"aabb": AABB({_vector(proxy.aabb_min)}, {_vector(size)})',
+            f'"center": Vector3({_vector(proxy.center)})',
+            f'"kind": "{proxy.kind}"',
+            f'"radius": {_number(proxy.radius)}',
+            f'"shape": SubResource("{shapes[id(proxy.points)]}")',
+            f'"source_triangles": {proxy.source_triangles}',
+        ]
+        name = godot_node_name(proxy.name).replace("\\", "\\\\").replace('"', '\\"')
+        entries.append(f'"{name}": {{\n' + ",\n".join(fields) + "\n}")
+    lines += [
+        "[resource]",
+        f'metadata/model = "{proxies.name}"',
+        "metadata/proxies = {\n" + ",\n".join(entries) + "\n}",
+    ]
+    text = header + "\n\n" + "\n".join(lines) + "\n"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return len(text.encode("utf-8"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Bake convex-hull / reduced-mesh selection proxies per structure"
+    )
+    parser.add_argument("models", nargs="*", help="model names or .glb files")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--output", type=Path, help=f"output folder (default: {PROXY_DIR})"
+    )
+    parser.add_argument(
+        "--max-points",
+        type=int,
+        default=64,
+        help="hull points per structure (default 64)",
+    )
+    parser.add_argument(
+        "--max-triangles",
+        type=int,
+        default=256,
+        help="triangles of concave mesh proxies (default 256)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="list every structure")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    output_dir = args.output or root / PROXY_DIR
+    registry = registry_models(root)
+    targets: List[Tuple[str, Path]] = []
+    for name in args.models or [model.name for model in registry]:
+        model = next((m for m in registry if name in (m.name, m.path.name)), None)
+        if model is not None:
+            targets.append((model.name, model.path))
+        else:
+            path = Path(name).resolve()
+            targets.append((path.stem.replace("(Solid)", ""), path))
+
+    print("🎯 Selection proxies")
+    print("=" * 60)
+    started = time.perf_counter()
+    missing = baked = 0
+    kinds: Dict[str, int] = {}
+    for name, path in targets:
+        if not path.exists():
+            missing += 1
+            print(f"\n⚠️  {name}: {path} not found, skipped")
+            continue
+        model_started = time.perf_counter()
+        proxies = model_proxies(path, name, args.max_points, args.max_triangles)
+        output = output_dir / f"{name}_proxies.tres"
+        size = write_tres(proxies, output)
+        baked += 1
+        source = sum(p.source_triangles for p in proxies.proxies)
+        proxy_triangles = sum(
+            len(p.points) // 3 if p.kind == "mesh" else 2 * len(p.points) - 4
+            for p in proxies.proxies
+        )
+        print(
+            f"\n{name}: {len(proxies.proxies)} structures, {source:,} -> ~{proxy_triangles:,}"
+            f" collider triangles, {size / 1024:.0f} KB"
+            f" ({time.perf_counter() - model_started:.2f} s)"
+        )
+        print(f"   -> {output}")
+        for proxy in proxies.proxies:
+            kinds[proxy.kind] = kinds.get(proxy.kind, 0) + 1
+            if args.verbose:
+                convexity = (
+                    f"{proxy.convexity:.0%}" if proxy.convexity is not None else "open"
+                )
+                print(
+                    f"   {proxy.name[:36]:<36} {proxy.kind:<7} {len(proxy.points):>5} points"
+                    f"  r={proxy.radius:.3g}  fill {convexity}"
+                )
+
+    print("\n📊 Summary")
+    print(f"   Models baked:       {baked} of {len(targets)}")
+    print(f"   Models missing:     {missing}")
+    for kind, count in sorted(kinds.items()):
+        print(f"   {kind.capitalize() + ' proxies:':<20}{count}")
+    print(f"   Time:               {time.perf_counter() - started:.2f} s")
+    return 1 if missing and args.models else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
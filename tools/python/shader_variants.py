@@ -0,0 +1,965 @@
+#!/usr/bin/env python3
+"""
+Shader Deduplication and Specialization for NeuroVis
+====================================================
+
+Reads every .gdshader in the project with the tokenizer in gdshader.py and
+reports:
+
+- identical shaders: the same code tokens (comments and whitespace ignored)
+- near-identical shaders: Jaccard similarity of 5-token shingles (the
+  measure of near_duplicates.py) at or above --threshold
+- shaders sharing a file name in different directories, with how similar
+  they really are
+- uniform declarations and functions shared word for word, which can move
+  to a .gdshaderinc
+- who uses each shader: ShaderMaterials in .tres/.tscn files (with their
+  shader_parameter values) and scripts that load it
+
+Specialization: an int, uint or bool uniform that drives if/else branches
+but is fixed for the lifetime of a material (slice_axis in
+shaders/cross_section.gdshader, say) costs every fragment a run-time branch
+chain. Each write of the uniform is classified from the scripts:
+
+- never written, or written only with literals: constant per material
+- written in a function after ShaderMaterial.new(): set up once per material
+- written anywhere else (on a material that already exists): run time
+
+Writes outside any function (orphaned code) cannot be placed and count as
+set-up writes, marked unverified in the report. A script that loads the
+shader and sets parameters by a computed name (MaterialLibrary.gd) may set
+any of its uniforms, so they all count as run time.
+
+For the uniforms that are fixed per material, --write generates one variant
+per value with the uniform turned into a const and every branch chain on it
+folded: dead arms removed, the taken arm inlined, partly decided conditions
+simplified. Values come from materials and literal writes, from the
+constants the shader compares against, one value that falls through every
+comparison, and true/false for bools. Variants go to a variants/ directory
+next to each shader (or --output) and are listed with the materials and
+write sites that would use them.
+
+Usage:
+    python3 tools/python/shader_variants.py
+    python3 tools/python/shader_variants.py --threshold 0.5 --json shaders.json
+    python3 tools/python/shader_variants.py --specialize shaders/cross_section.gdshader:slice_axis
+    python3 tools/python/shader_variants.py --write --output build/shader_variants
+"""
+
+import argparse
+import itertools
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from gdscript_lexer import NAME as GD_NAME
+from gdscript_lexer import OP as GD_OP
+from gdscript_lexer import STRING as GD_STRING
+from gdscript_lexer import string_value
+from gdscript_outline import join_tokens, matching_bracket, parse_outline
+from gdshader import COMMENT, NAME, NUMBER, OP, PREPROCESSOR, Shader, parse_shader
+from godot_project import find_project_root, iter_project_files, read_uid_map
+from godot_scene import read_scene
+from near_duplicates import clusters, jaccard, shingle_set
+from reachability import ReachabilityGraph
+
+SHADER_SUFFIX = ".gdshader"
+DEFAULT_THRESHOLD = 0.8
+MAX_VARIANTS = 8
+SPECIALIZABLE_TYPES = {"bool", "int", "uint"}
+SETUP_CONSTRUCTORS = ("ShaderMaterial",)
+COMPARISONS = {"==", "!=", "<", ">", "<=", ">="}
+_DECLARATION_RE = re.compile(
+    r"^\s*(?:const\s+)?(?:lowp\s+|mediump\s+|highp\s+)?[A-Za-z_]\w*\s+[A-Za-z_]\w*"
+    r"\s*(?:=|;|\[)",
+    re.MULTILINE,
+)
+
+# A partly evaluated condition: True/False, or the text that is left
+Value = Union[bool, str]
+
+
+@dataclass
+class ParameterWrite:
+    """One set_shader_parameter() call or material shader_parameter/ value"""
+
+    source: str  # project-relative file
+    line: int
+    value: str  # value as written
+    literal: Optional[str]  # normalized literal value, None when computed
+    kind: str  # material | setup | runtime | unverified | dynamic
+
+
+@dataclass
+class Specialization:
+    uniform: str
+    type: str
+    status: str  # constant | per-material | runtime | unused
+    values: List[str] = field(default_factory=list)
+    writes: List[ParameterWrite] = field(default_factory=list)
+
+
+@dataclass
+class Variant:
+    path: str  # project-relative output path
+    binding: Dict[str, str]
+    branches_removed: int
+    tokens_before: int
+    tokens_after: int
+    users: List[str] = field(default_factory=list)
+    text: str = field(default="", repr=False)
+
+
+@dataclass
+class ShaderReport:
+    path: str  # project-relative
+    shader: Shader = field(repr=False)
+    users: List[str] = field(default_factory=list)
+    materials: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    specializations: List[Specialization] = field(default_factory=list)
+    variants: List[Variant] = field(default_factory=list)
+
+
+# === Partial evaluation of branch conditions ===
+
+
+def _literal(text: str) -> Optional[Union[bool, int, float]]:
+    if text in ("true", "false"):
+        return text == "true"
+    try:
+        return int(text.rstrip("uU"), 0)
+    except ValueError:
+        pass
+    try:
+        return float(text.rstrip("fF"))
+    except ValueError:
+        return None
+
+
+class _Condition:
+    """Recursive-descent evaluator for `a == 1 && !b || (c)` style conditions"""
+
+    def __init__(self, tokens, binding: Dict[str, str]):
+        self.tokens = tokens
+        self.binding = binding
+        self.pos = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos].text if self.pos < len(self.tokens) else None
+
+    def evaluate(self) -> Value:
+        return self._or()
+
+    def _or(self) -> Value:
+        parts = [self._and()]
+        while self._peek() == "||":
+            self.pos += 1
+            parts.append(self._and())
+        if any(p is True for p in parts):
+            return True
+        left = [p for p in parts if p is not False]
+        return " || ".join(left) if left else False
+
+    def _and(self) -> Value:
+        parts = [self._unary()]
+        while self._peek() == "&&":
+            self.pos += 1
+            parts.append(self._unary())
+        if any(p is False for p in parts):
+            return False
+        left = [p if "||" not in p else f"({p})" for p in parts if p is not True]
+        return " && ".join(left) if left else True
+
+    def _unary(self) -> Value:
+        if self._peek() == "!":
+            self.pos += 1
+            value = self._unary()
+            if isinstance(value, bool):
+                return not value
+            return f"!{value}" if value.isidentifier() else f"!({value})"
+        if self._peek() == "(":
+            close = matching_bracket(self.tokens, self.pos)
+            after = (
+                self.tokens[close + 1].text if close + 1 < len(self.tokens) else None
+            )
+            if after in (None, "&&", "||", ")"):
+                inner = _Condition(self.tokens[self.pos + 1 : close], self.binding)
+                self.pos = close + 1
+                # && wraps what it needs; || binds loosest anyway
+                return inner.evaluate()
+        return self._comparison()
+
+    def _operand(self) -> list:
+        start = self.pos
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            if token.text in ("&&", "||") or token.text in COMPARISONS:
+                break
+            if token.text == ")":
+                break
+            if token.text in "([" and token.kind == OP:
+                self.pos = matching_bracket(self.tokens, self.pos)
+            self.pos += 1
+        return self.tokens[start : self.pos]
+
+    def _constant(self, operand: list) -> Optional[Union[bool, int, float]]:
+        if len(operand) == 2 and operand[0].text == "-" and operand[1].kind == NUMBER:
+            value = _literal(operand[1].text)
+            return -value if value is not None else None
+        if len(operand) != 1:
+            return None
+        text = operand[0].text
+        if text in self.binding:
+            return _literal(self.binding[text])
+        if operand[0].kind == NUMBER or text in ("true", "false"):
+            return _literal(text)
+        return None
+
+    def _comparison(self) -> Value:
+        left = self._operand()
+        operator = self._peek()
+        if operator not in COMPARISONS:
+            value = self._constant(left)
+            if isinstance(value, bool):
+                return value
+            return join_tokens(left)
+        self.pos += 1
+        right = self._operand()
+        a, b = self._constant(left), self._constant(right)
+        if a is None or b is None:
+            return f"{join_tokens(left)} {operator} {join_tokens(right)}"
+        return {
+            "==": a == b,
+            "!=": a != b,
+            "<": a < b,
+            ">": a > b,
+            "<=": a <= b,
+            ">=": a >= b,
+        }[operator]
+
+
+def evaluate_condition(tokens, binding: Dict[str, str]) -> Value:
+    """True/False when the binding decides the condition, else the simplified text"""
+    return _Condition(tokens, binding).evaluate()
+
+
+# === Branch folding ===
+
+
+def _line_start(source: str, offset: int) -> int:
+    return source.rfind("\n", 0, offset) + 1
+
+
+def _indent(source: str, offset: int) -> str:
+    start = _line_start(source, offset)
+    return source[start : start + len(source[start:]) - len(source[start:].lstrip())]
+
+
+def _unwrap(source: str, code, open_index: int, close_index: int, indent: str) -> str:
+    """Body of a `{ }` block re-indented to `indent`, braces kept if it declares"""
+    block = source[code[open_index].start : code[close_index].end]
+    inner = source[code[open_index].end : code[close_index].start]
+    if _DECLARATION_RE.search(inner):
+        return block  # locals keep their own scope
+    lines = inner.split("\n")
+    first = lines[0].strip()
+    rest = lines[1:]
+    if rest and not rest[-1].strip():
+        rest = rest[:-1]
+    body = [line for line in rest if line.strip()]
+    margin = min((len(line) - len(line.lstrip()) for line in body), default=0)
+    out = [first] if first else []
+    out += [indent + line[margin:] if line.strip() else "" for line in rest]
+    text = "\n".join(out)
+    return text.lstrip()
+
+
+def _statement(code, start: int) -> int:
+    """Index of the `;` or `}` ending the statement starting at code[start]"""
+    if code[start].text == "{":
+        return matching_bracket(code, start)
+    i = start
+    while i < len(code) and code[i].text != ";":
+        if code[i].text in "([" and code[i].kind == OP:
+            i = matching_bracket(code, i)
+        i += 1
+    return i
+
+
+def _fold_chain(
+    source: str, code, index: int, binding: Dict[str, str]
+) -> Optional[Tuple[int, int, str, int]]:
+    """(start, end, replacement, conditions removed) for the if-chain at code[index]"""
+    arms = []  # (condition tokens or None, body start, body end)
+    i = index
+    while True:
+        if i + 1 >= len(code) or code[i + 1].text != "(":
+            return None
+        close = matching_bracket(code, i + 1)
+        if close + 1 >= len(code) or code[close + 1].text == "if":
+            return None
+        body_end = _statement(code, close + 1)
+        arms.append((code[i + 2 : close], close + 1, body_end))
+        following = code[body_end + 1] if body_end + 1 < len(code) else None
+        if following is None or following.text != "else":
+            break
+        if body_end + 2 < len(code) and code[body_end + 2].text == "if":
+            i = body_end + 2
+            continue
+        else_end = _statement(code, body_end + 2)
+        arms.append((None, body_end + 2, else_end))
+        break
+
+    names = set(binding)
+    if not any(cond and names & {t.text for t in cond} for cond, _, _ in arms):
+        return None
+
+    indent = _indent(source, code[index].start)
+    kept: List[Tuple[Optional[str], int, int]] = []
+    removed = 0
+    for number, (cond, start, end) in enumerate(arms):
+        if cond is None:
+            kept.append((None, start, end))
+            break
+        value = evaluate_condition(cond, binding)
+        if value is False:
+            removed += 1
+        elif value is True:
+            kept.append((None, start, end))
+            removed += 1 + sum(1 for arm in arms[number + 1 :] if arm[0] is not None)
+            break
+        else:
+            kept.append((value, start, end))
+
+    def body(start: int, end: int, unwrap: bool) -> str:
+        if unwrap and code[start].text == "{":
+            return _unwrap(source, code, start, end, indent)
+        return source[code[start].start : code[end].end]
+
+    parts = []
+    for number, (cond, start, end) in enumerate(kept):
+        if cond is None:
+            if number == 0:
+                parts.append(body(start, end, True))
+            else:
+                parts.append(f"else {body(start, end, False)}")
+        else:
+            keyword = "if" if number == 0 else "else if"
+            parts.append(f"{keyword} ({cond}) {body(start, end, False)}")
+    return code[index].start, code[arms[-1][2]].end, " ".join(parts), removed
+
+
+def _drop_blank_line(source: str, offset: int) -> str:
+    """Remove the line at `offset` when a rewrite left only whitespace on it"""
+    start = _line_start(source, offset)
+    end = source.find("\n", offset)
+    end = len(source) if end == -1 else end
+    if source[start:end].strip():
+        return source
+    return source[:start] + source[end + 1 :]
+
+
+def specialize(shader: Shader, binding: Dict[str, str]) -> Tuple[str, int]:
+    """Source with the bound uniforms made const and their branch chains folded"""
+    source = shader.source
+    removed = 0
+    skip = 0  # if-chains before this offset cannot be folded further
+    while True:
+        current = parse_shader(source)
+        code = [t for t in current.tokens if t.kind not in (COMMENT, PREPROCESSOR)]
+        folded = None
+        for index, token in enumerate(code):
+            if token.text == "if" and token.kind == NAME and token.start >= skip:
+                if index > 0 and code[index - 1].text == "else":
+                    continue
+                folded = _fold_chain(source, code, index, binding)
+                if folded is not None:
+                    break
+                skip = token.end
+        if folded is None:
+            break
+        start, end, replacement, arms = folded
+        source = _drop_blank_line(source[:start] + replacement + source[end:], start)
+        removed += arms
+        skip = start
+
+    current = parse_shader(source)
+    for name in sorted(binding, key=lambda n: -current.uniforms[n].start):
+        uniform = current.uniforms[name]
+        used = any(
+            t.text == name and not (uniform.start <= t.start < uniform.end)
+            for t in current.tokens
+            if t.kind == NAME
+        )
+        if used:
+            declaration = f"const {uniform.type} {name} = {binding[name]};"
+        else:
+            declaration = ""
+        end = uniform.end
+        if not used:
+            # the comment describing the uniform goes with it
+            line_end = source.find("\n", end)
+            line_end = len(source) if line_end == -1 else line_end
+            if source[end:line_end].strip().startswith("//"):
+                end = line_end
+        source = source[: uniform.start] + declaration + source[end:]
+        if not used:
+            source = _drop_blank_line(source, uniform.start)
+    return source, removed
+
+
+# === Uniform usage ===
+
+
+def branch_uniforms(shader: Shader) -> Dict[str, Set[str]]:
+    """Specializable uniforms used in if conditions, with the constants compared"""
+    found: Dict[str, Set[str]] = {}
+    candidates = {
+        name
+        for name, uniform in shader.uniforms.items()
+        if uniform.type in SPECIALIZABLE_TYPES and not uniform.scope
+    }
+    code = [t for t in shader.tokens if t.kind not in (COMMENT, PREPROCESSOR)]
+    for index, token in enumerate(code):
+        if token.text != "if" or index + 1 >= len(code) or code[index + 1].text != "(":
+            continue
+        close = matching_bracket(code, index + 1)
+        condition = code[index + 2 : close]
+        for i, cond_token in enumerate(condition):
+            if cond_token.text not in candidates:
+                continue
+            compared = found.setdefault(cond_token.text, set())
+            for j in (i - 2, i + 2):
+                if 0 <= j < len(condition) and condition[j].kind == NUMBER:
+                    operator = condition[min(i, j) + 1].text
+                    if operator in COMPARISONS:
+                        compared.add(condition[j].text)
+    return found
+
+
+def _domain(uniform_type: str, default: Optional[str], compared: Set[str]) -> List[str]:
+    """Values a specialized uniform can take: compared constants plus a fall-through"""
+    if uniform_type == "bool":
+        return ["false", "true"]
+    values = {int(_literal(v)) for v in compared if _literal(v) is not None}
+    if default is not None and _literal(default) is not None:
+        values.add(int(_literal(default)))
+    fall_through = 0
+    while fall_through in values:
+        fall_through += 1
+    values.add(fall_through)
+    return [str(v) for v in sorted(values)]
+
+
+def _normalize(value: str, uniform_type: str) -> Optional[str]:
+    """Literal value in shader syntax, None for computed values"""
+    literal = _literal(value.strip())
+    if literal is None:
+        return None
+    if uniform_type == "bool":
+        return "true" if literal else "false"
+    return str(int(literal))
+
+
+class ParameterWrites:
+    """set_shader_parameter("name", value) calls in every script, by uniform name"""
+
+    def __init__(self, root: Path):
+        self.writes: Dict[str, List[Tuple[str, int, str, str]]] = defaultdict(list)
+        # scripts setting parameters whose name is computed: file -> lines
+        self.dynamic: Dict[str, List[int]] = defaultdict(list)
+        for path in iter_project_files(root, ".gd"):
+            text = path.read_text(encoding="utf-8", errors="replace")
+            if "set_shader_parameter" in text:
+                self._scan(path.relative_to(root).as_posix(), text)
+
+    def _scan(self, relative: str, text: str) -> None:
+        outline = parse_outline(text, relative)
+        tokens = outline.tokens
+        functions = sorted(outline.functions, key=lambda f: f.line)
+        for i, token in enumerate(tokens):
+            if token.kind != GD_NAME or token.text != "set_shader_parameter":
+                continue
+            if i + 2 >= len(tokens) or tokens[i + 1].text != "(":
+                continue
+            name = tokens[i + 2]
+            if name.kind != GD_STRING:
+                self.dynamic[relative].append(token.line)
+                continue
+            if tokens[i + 3].text != ",":
+                continue
+            close = matching_bracket(tokens, i + 1)
+            value = join_tokens(tokens[i + 4 : close])
+            function = next(
+                (f for f in functions if f.line <= token.line <= f.end_line), None
+            )
+            if function is None:
+                kind = "unverified"
+            elif self._creates_material(tokens, function.line, token.line):
+                kind = "setup"
+            else:
+                kind = "runtime"
+            self.writes[string_value(name)].append((relative, token.line, value, kind))
+
+    @staticmethod
+    def _creates_material(tokens, first_line: int, line: int) -> bool:
+        """True when `X.new()` of a material class precedes `line` in the function"""
+        for i, token in enumerate(tokens):
+            if token.line < first_line or token.line > line:
+                continue
+            if (
+                token.kind == GD_NAME
+                and token.text in SETUP_CONSTRUCTORS
+                and i + 2 < len(tokens)
+                and tokens[i + 1].text == "."
+                and tokens[i + 2].text == "new"
+                and tokens[i + 1].kind == GD_OP
+            ):
+                return True
+        return False
+
+
+# === Project scan ===
+
+
+class ShaderAnalyzer:
+    """Every shader of the project with its users, duplicates and variants"""
+
+    def __init__(self, root: Path, threshold: float = DEFAULT_THRESHOLD):
+        self.root = root
+        self.threshold = threshold
+        self.reports: Dict[str, ShaderReport] = {}
+        for path in iter_project_files(root, SHADER_SUFFIX):
+            relative = path.relative_to(root).as_posix()
+            source = path.read_text(encoding="utf-8", errors="replace")
+            self.reports[relative] = ShaderReport(relative, parse_shader(source))
+        self._find_users()
+        self.writes = ParameterWrites(root)
+
+    def _find_users(self) -> None:
+        graph = ReachabilityGraph(self.root)
+        for source, entry in graph.files.items():
+            if source.endswith(SHADER_SUFFIX + ".uid"):
+                continue
+            direct, directory = set(), set()
+            for ref in entry.refs:
+                targets = graph.resolve(source, ref)
+                # a directory string loads shaders by a name built at run time
+                (direct if len(targets) == 1 else directory).update(targets)
+            for target in direct | directory:
+                report = self.reports.get(target)
+                if report is not None:
+                    label = source if target in direct else f"{source} (directory)"
+                    report.users.append(label)
+        uids = read_uid_map(self.root)
+        for report in self.reports.values():
+            report.users.sort()
+            for user in report.users:
+                if user.endswith((".tres", ".tscn")):
+                    report.materials.update(self._materials(user, report.path, uids))
+
+    def _materials(
+        self, user: str, shader_path: str, uids: Dict[str, str]
+    ) -> Dict[str, Dict[str, str]]:
+        """shader_parameter/ values of the ShaderMaterials in `user` using the shader"""
+        try:
+            scene = read_scene(self.root / user, self.root)
+        except (OSError, ValueError):
+            return {}
+        shader_ids = {
+            resource.id
+            for resource in scene.ext_resources.values()
+            if uids.get(resource.uid or "", resource.path) == f"res://{shader_path}"
+        }
+        sections = [(f"{user}::{sub.id}", sub) for sub in scene.sub_resources.values()]
+        if scene.type == "ShaderMaterial":
+            sections.append((user, scene))
+        found = {}
+        for label, section in sections:
+            if getattr(section, "type", None) != "ShaderMaterial":
+                continue
+            shader = section.properties.get("shader", "")
+            if not any(f'"{i}"' in shader or f"({i})" in shader for i in shader_ids):
+                continue
+            found[label] = {
+                key.split("/", 1)[1]: value
+                for key, value in section.properties.items()
+                if key.startswith("shader_parameter/")
+            }
+        return found
+
+    def identical(self) -> List[List[str]]:
+        """Groups of shaders with the same code tokens"""
+        groups: Dict[Tuple[str, ...], List[str]] = defaultdict(list)
+        for path, report in self.reports.items():
+            groups[tuple(t.text for t in report.shader.code)].append(path)
+        return [sorted(g) for g in groups.values() if len(g) > 1]
+
+    def similarities(self) -> Dict[Tuple[str, str], float]:
+        """Shingle similarity of every pair of shaders (there are only a few)"""
+        shingles = {
+            path: shingle_set([t.text for t in report.shader.code])
+            for path, report in self.reports.items()
+        }
+        return {
+            (a, b): jaccard(shingles[a], shingles[b])
+            for a, b in itertools.combinations(sorted(shingles), 2)
+        }
+
+    def near_identical(self) -> List[Tuple[List[str], float]]:
+        """Clusters of shaders at or above the threshold, with their lowest similarity"""
+        paths = sorted(self.reports)
+        scores = self.similarities()
+        pairs = [
+            (paths.index(a), paths.index(b), score)
+            for (a, b), score in scores.items()
+            if score >= self.threshold
+        ]
+        groups = []
+        for members in clusters(len(paths), pairs):
+            names = [paths[i] for i in members]
+            lowest = min(
+                scores[pair]
+                for pair in itertools.combinations(names, 2)
+                if pair in scores
+            )
+            groups.append((names, lowest))
+        return groups
+
+    def same_names(self) -> List[Tuple[List[str], float]]:
+        """Shaders sharing a file name across directories, with their similarity"""
+        by_name: Dict[str, List[str]] = defaultdict(list)
+        for path in sorted(self.reports):
+            by_name[Path(path).name].append(path)
+        scores = self.similarities()
+        found = []
+        for paths in by_name.values():
+            if len(paths) > 1:
+                pairs = list(itertools.combinations(paths, 2))
+                found.append((paths, min(scores[p] for p in pairs)))
+        return found
+
+    def shared_declarations(self) -> List[Tuple[List[str], List[str]]]:
+        """Uniforms and functions declared word for word in several shaders"""
+        owners: Dict[str, List[str]] = defaultdict(list)
+        for path, report in sorted(self.reports.items()):
+            shader = report.shader
+            for uniform in shader.uniforms.values():
+                text = " ".join(
+                    t.text
+                    for t in shader.tokens
+                    if uniform.start <= t.start < uniform.end and t.kind != COMMENT
+                )
+                owners[text].append(path)
+            for function in shader.functions.values():
+                if function.name in ("vertex", "fragment", "light"):
+                    continue
+                first = shader.tokens[function.body_start]
+                header = next(
+                    i
+                    for i in range(function.body_start, -1, -1)
+                    if shader.tokens[i].text == function.name
+                )
+                text = " ".join(
+                    t.text
+                    for t in shader.tokens[header - 1 : function.body_end + 1]
+                    if t.kind != COMMENT and t.start >= 0 and first
+                )
+                owners[text].append(path)
+        groups: Dict[Tuple[str, ...], List[str]] = defaultdict(list)
+        for text, paths in owners.items():
+            if len(paths) > 1:
+                groups[tuple(paths)].append(text)
+        return [(list(paths), texts) for paths, texts in groups.items()]
+
+    def specializations(
+        self, report: ShaderReport, forced: Set[str]
+    ) -> List[Specialization]:
+        shader = report.shader
+        found = []
+        branches = branch_uniforms(shader)
+        for name in sorted(set(branches) | forced):
+            uniform = shader.uniforms.get(name)
+            if uniform is None:
+                continue
+            spec = Specialization(name, uniform.type, "unused")
+            literals = set()
+            for material, parameters in report.materials.items():
+                if name in parameters:
+                    literal = _normalize(parameters[name], uniform.type)
+                    spec.writes.append(
+                        ParameterWrite(
+                            material, 0, parameters[name], literal, "material"
+                        )
+                    )
+            for source, line, value, kind in self.writes.writes.get(name, []):
+                literal = _normalize(value, uniform.type)
+                spec.writes.append(ParameterWrite(source, line, value, literal, kind))
+            for user in report.users:
+                script = user.split(" ")[0]
+                for line in self.writes.dynamic.get(script, []):
+                    spec.writes.append(
+                        ParameterWrite(script, line, "", None, "dynamic")
+                    )
+            for write in spec.writes:
+                if write.literal is not None:
+                    literals.add(write.literal)
+            kinds = {w.kind for w in spec.writes}
+            if name in forced:
+                spec.status = "per-material"
+            elif kinds & {"runtime", "dynamic"}:
+                spec.status = "runtime"
+            elif not spec.writes or all(w.literal is not None for w in spec.writes):
+                spec.status = "constant"
+            else:
+                spec.status = "per-material"
+            if spec.status == "constant":
+                default = _normalize(uniform.default or "0", uniform.type) or "0"
+                if uniform.type == "bool" and uniform.default is None:
+                    default = "false"
+                spec.values = sorted(literals | ({default} if not literals else set()))
+            elif spec.status == "per-material":
+                spec.values = _domain(
+                    uniform.type, uniform.default, branches.get(name, set())
+                )
+                spec.values = sorted(set(spec.values) | literals)
+            found.append(spec)
+        return found
+
+    def variants(self, report: ShaderReport, output: Optional[Path]) -> List[Variant]:
+        fixed = [s for s in report.specializations if s.status != "runtime"]
+        if not fixed:
+            return []
+        combinations = 1
+        for spec in fixed:
+            combinations *= len(spec.values)
+        if combinations > MAX_VARIANTS:
+            # Keep the uniforms with the fewest values until the product fits
+            fixed.sort(key=lambda s: len(s.values))
+            kept, combinations = [], 1
+            for spec in fixed:
+                if combinations * len(spec.values) <= MAX_VARIANTS:
+                    kept.append(spec)
+                    combinations *= len(spec.values)
+            fixed = kept
+        source = Path(report.path)
+        directory = (
+            output / source.parent if output else source.parent / "variants"
+        ).as_posix()
+        before = len(report.shader.code)
+        found = []
+        for values in itertools.product(*(s.values for s in fixed)):
+            binding = {s.uniform: v for s, v in zip(fixed, values)}
+            text, removed = specialize(report.shader, binding)
+            # Uniforms with a single value are the same in every variant
+            suffix = ".".join(
+                f"{s.uniform}-{binding[s.uniform]}" for s in fixed if len(s.values) > 1
+            )
+            suffix = suffix or "specialized"
+            variant = Variant(
+                f"{directory}/{source.stem}.{suffix}{SHADER_SUFFIX}",
+                binding,
+                removed,
+                before,
+                len(parse_shader(text).code),
+                text=text,
+            )
+            for spec in fixed:
+                for write in spec.writes:
+                    if write.kind in ("runtime", "dynamic"):
+                        continue
+                    if write.literal is None or write.literal == binding[spec.uniform]:
+                        where = (
+                            f"{write.source}:{write.line}"
+                            if write.line
+                            else write.source
+                        )
+                        label = where if write.literal else f"{where} ({write.value})"
+                        if label not in variant.users:
+                            variant.users.append(label)
+            found.append(variant)
+        return found
+
+    def analyze(self, forced: Dict[str, Set[str]], output: Optional[Path]) -> None:
+        for path, report in self.reports.items():
+            report.specializations = self.specializations(
+                report, forced.get(path, set())
+            )
+            report.variants = self.variants(report, output)
+
+
+# === Report ===
+
+
+def print_report(analyzer: ShaderAnalyzer, elapsed: float) -> None:
+    reports = analyzer.reports
+    print("🎨 Shader Deduplication and Specialization")
+    print("=" * 60)
+    print(f"   {len(reports)} shaders analyzed in {elapsed * 1000:.1f} ms")
+
+    identical = analyzer.identical()
+    near = [g for g in analyzer.near_identical() if g[0] not in identical]
+    print()
+    if not identical and not near:
+        print(
+            f"✅ No identical or near-identical shaders (threshold {analyzer.threshold})"
+        )
+    for group in identical:
+        print(f"❌ Identical: {', '.join(group)}")
+    for group, lowest in near:
+        print(f"⚠️  {lowest:.0%} similar: {', '.join(group)}")
+    for paths, similarity in analyzer.same_names():
+        print(
+            f"⚠️  {Path(paths[0]).name} exists {len(paths)} times"
+            f" ({similarity:.0%} similar): {', '.join(paths)}"
+        )
+    for paths, texts in analyzer.shared_declarations():
+        print(f"ℹ️  {len(texts)} declarations shared by {', '.join(paths)}:")
+        for text in texts[:6]:
+            print(f"     {text}")
+        if len(texts) > 6:
+            print(f"     ... and {len(texts) - 6} more")
+
+    print()
+    print("Users:")
+    for path, report in sorted(reports.items()):
+        users = ", ".join(report.users) if report.users else "(none)"
+        print(f"   {path}: {users}")
+        for material, parameters in report.materials.items():
+            values = ", ".join(f"{k}={v}" for k, v in parameters.items())
+            print(f"      material {material}: {values or 'defaults'}")
+
+    print()
+    print("Specialization:")
+    for path, report in sorted(reports.items()):
+        for spec in report.specializations:
+            sites = ", ".join(
+                (
+                    f"{w.source}:{w.line} [{w.kind}]"
+                    if w.line
+                    else f"{w.source} [material]"
+                )
+                for w in spec.writes
+            )
+            values = f" → {', '.join(spec.values)}" if spec.values else ""
+            print(f"   {path}: {spec.type} {spec.uniform} is {spec.status}{values}")
+            if sites:
+                print(f"      written at {sites}")
+        for variant in report.variants:
+            print(
+                f"      {variant.path}: {variant.branches_removed} branches removed,"
+                f" {variant.tokens_before} → {variant.tokens_after} tokens"
+            )
+            if variant.users:
+                print(f"         used by {', '.join(variant.users)}")
+
+
+def _to_dict(analyzer: ShaderAnalyzer) -> dict:
+    return {
+        "identical": analyzer.identical(),
+        "near_identical": [
+            {"shaders": g, "similarity": s} for g, s in analyzer.near_identical()
+        ],
+        "same_name": [
+            {"shaders": g, "similarity": s} for g, s in analyzer.same_names()
+        ],
+        "shared_declarations": [
+            {"shaders": g, "declarations": t} for g, t in analyzer.shared_declarations()
+        ],
+        "shaders": {
+            path: {
+                "users": report.users,
+                "materials": report.materials,
+                "specializations": [
+                    {
+                        "uniform": s.uniform,
+                        "type": s.type,
+                        "status": s.status,
+                        "values": s.values,
+                        "writes": [w.__dict__ for w in s.writes],
+                    }
+                    for s in report.specializations
+                ],
+                "variants": [
+                    {
+                        "path": v.path,
+                        "binding": v.binding,
+                        "branches_removed": v.branches_removed,
+                        "tokens_before": v.tokens_before,
+                        "tokens_after": v.tokens_after,
+                        "users": v.users,
+                    }
+                    for v in report.variants
+                ],
+            }
+            for path, report in sorted(analyzer.reports.items())
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Find duplicate shaders and generate specialized variants"
+    )
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"near-identical similarity (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--specialize",
+        action="append",
+        default=[],
+        metavar="SHADER:UNIFORM",
+        help="treat a uniform as fixed per material whatever its writes say",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="variant directory (default: variants/ by each shader)",
+    )
+    parser.add_argument("--write", action="store_true", help="write the variants")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    forced: Dict[str, Set[str]] = defaultdict(set)
+    for item in args.specialize:
+        shader, _, uniform = item.rpartition(":")
+        forced[shader.removeprefix("res://")].add(uniform)
+
+    started = time.perf_counter()
+    analyzer = ShaderAnalyzer(root, args.threshold)
+    for shader in forced:
+        if shader not in analyzer.reports:
+            print(f"❌ No shader {shader}", file=sys.stderr)
+            return 1
+    analyzer.analyze(forced, args.output)
+    elapsed = time.perf_counter() - started
+
+    print_report(analyzer, elapsed)
+    if args.write:
+        written = 0
+        for report in analyzer.reports.values():
+            for variant in report.variants:
+                path = root / variant.path
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(variant.text, encoding="utf-8")
+                written += 1
+        print(f"\n✅ Wrote {written} variants")
+    if args.json:
+        args.json.write_text(json.dumps(_to_dict(analyzer), indent=2), encoding="utf-8")
+    return 1 if analyzer.identical() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Signal Call Rewriter for NeuroVis
+=================================
+
+Converts Godot 3 signal calls to the Callable-based Godot 4 API:
+
+    connect("pressed", self, "_on_pressed")           ->  pressed.connect(_on_pressed)
+    b.connect("toggled", self, "_on_t", [i], CONNECT_ONESHOT)
+        ->  b.toggled.connect(_on_t.bind(i), CONNECT_ONE_SHOT)
+    obj.connect("done", target, method_name)
+        ->  obj.done.connect(Callable(target, method_name))
+    disconnect("pressed", self, "_on_pressed")        ->  pressed.disconnect(_on_pressed)
+    is_connected("pressed", self, "_on_pressed")      ->  pressed.is_connected(_on_pressed)
+    emit_signal("changed", foo(bar), [1, 2])          ->  changed.emit(foo(bar), [1, 2])
+
+Each call is found from the token stream and its argument list is split at
+top-level commas using precomputed bracket pairs, so nested calls, arrays,
+dictionaries and lambdas in arguments stay intact and a file is processed
+in linear time. Calls nested inside the arguments of another call are
+rewritten too.
+
+Method names become bare callables when the target is `self` and the
+script defines the method, `target.method` for plain targets, and
+`Callable(target, "method")` otherwise. Signal names that are not string
+literals keep the `connect(name, callable)` form, which Godot 4 still has.
+
+Calls that cannot be converted safely are left untouched and reported:
+unterminated argument lists, unexpected argument counts, and signal names
+shadowed by a local variable.
+
+Usage:
+    python3 tools/python/signal_rewrite.py                 # report only
+    python3 tools/python/signal_rewrite.py --diff core/
+    python3 tools/python/signal_rewrite.py --write
+"""
+
+import argparse
+import difflib
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from gdscript_lexer import NAME, OP, STRING, Token, code_tokens, string_value
+from gdscript_lexer import tokenize
+from gdscript_outline import parse_outline
+from godot_project import find_project_root, iter_project_files
+
+CONNECTION_CALLS = {"connect", "disconnect", "is_connected"}
+EMIT_CALLS = {"emit_signal"}
+SIGNAL_CALLS = CONNECTION_CALLS | EMIT_CALLS
+# Godot 3 -> 4 connection flag names
+FLAG_RENAMES = {"CONNECT_ONESHOT": "CONNECT_ONE_SHOT"}
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_]\w*")
+_PLAIN_TARGET_RE = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*")
+
+
+@dataclass
+class SignalCall:
+    """One connect/disconnect/is_connected/emit_signal call in a file"""
+
+    name: str
+    line: int
+    name_index: int  # token index of the called name
+    close_index: int  # token index of the closing parenthesis (-1 if missing)
+    args: List[Tuple[int, int]] = field(default_factory=list)  # token ranges
+    children: List["SignalCall"] = field(default_factory=list)
+    replacement: Optional[str] = None
+    problem: Optional[str] = None
+
+
+@dataclass
+class RewriteReport:
+    line: int
+    call: str
+    original: str
+    replacement: Optional[str]
+    problem: Optional[str] = None
+
+
+def bracket_pairs(tokens: List[Token]) -> Dict[int, int]:
+    """Index of the closing bracket for every opening bracket, in one pass"""
+    pairs: Dict[int, int] = {}
+    stack: List[int] = []
+    for i, token in enumerate(tokens):
+        if token.kind != OP:
+            continue
+        if token.text in "([{":
+            stack.append(i)
+        elif token.text in ")]}" and stack:
+            pairs[stack.pop()] = i
+    return pairs
+
+
+def split_arguments(
+    tokens: List[Token], pairs: Dict[int, int], open_index: int, close_index: int
+) -> List[Tuple[int, int]]:
+    """Token ranges [start, end) of the top-level arguments of a call"""
+    args = []
+    start = open_index + 1
+    i = start
+    while i < close_index:
+        if i in pairs:
+            i = pairs[i] + 1
+            continue
+        if tokens[i].text == ",":
+            args.append((start, i))
+            start = i + 1
+        i += 1
+    if start < close_index:
+        args.append((start, close_index))
+    return args
+
+
+class SignalRewriter:
+    """Rewrites the signal calls of one source file"""
+
+    def __init__(self, source: str, kinds: Set[str] = frozenset(SIGNAL_CALLS)):
+        self.source = source
+        self.kinds = kinds
+        self.tokens = list(code_tokens(tokenize(source)))
+        self.pairs = bracket_pairs(self.tokens)
+        self.reports: List[RewriteReport] = []
+        outline = parse_outline(source)
+        self.methods = {f.name for f in outline.functions if f.owner is None}
+        # (first line, last line, local names) of every function
+        self.scopes = []
+        for func in outline.functions:
+            names = {p.name for p in func.params}
+            for line in outline.body_lines(func):
+                for i, token in enumerate(line.tokens[:-1]):
+                    if token.text in ("var", "const", "for"):
+                        names.add(line.tokens[i + 1].text)
+            self.scopes.append((func.line, func.end_line, names))
+
+    def _text(self, start: int, end: int, children: List[SignalCall]) -> str:
+        """Source of tokens [start, end) with nested rewrites applied"""
+        if start >= end:
+            return ""
+        pos = self.tokens[start].start
+        stop = self.tokens[end - 1].end
+        pieces = []
+        for child in children:
+            first = self.tokens[child.name_index].start
+            if first < pos or first >= stop:
+                continue
+            pieces.append(self.source[pos:first])
+            pieces.append(self._render(child))
+            pos = self.tokens[child.close_index].end
+        pieces.append(self.source[pos:stop])
+        return "".join(pieces)
+
+    def _render(self, call: SignalCall) -> str:
+        if call.replacement is None:
+            call.replacement = self._convert(call)
+        return call.replacement
+
+    def _arg(self, call: SignalCall, index: int) -> str:
+        start, end = call.args[index]
+        return self._text(start, end, call.children)
+
+    def _literal(self, call: SignalCall, index: int) -> Optional[str]:
+        """Value of an argument that is a single identifier-like string literal"""
+        start, end = call.args[index]
+        token = self.tokens[start]
+        if end - start == 1 and token.kind == STRING and token.text[0] in "\"'":
+            value = string_value(token)
+            if _IDENTIFIER_RE.fullmatch(value):
+                return value
+        return None
+
+    def _shadowed(self, call: SignalCall, name: str) -> bool:
+        """True when a bare `name` in the call's function is a local, not a signal"""
+        index = call.name_index
+        if index > 0 and self.tokens[index - 1].text == ".":
+            return False  # obj.name is a member access, locals do not matter
+        return self._local(name, call.line)
+
+    def _local(self, name: str, line: int) -> bool:
+        return any(
+            first <= line <= last and name in names
+            for first, last, names in self.scopes
+        )
+
+    def _callable(self, call: SignalCall, target: str, method_index: int) -> str:
+        method = self._literal(call, method_index)
+        if method is None:
+            return f"Callable({target}, {self._arg(call, method_index)})"
+        if target == "self":
+            if method in self.methods and not self._local(method, call.line):
+                return method
+            return f'Callable(self, "{method}")'
+        if _PLAIN_TARGET_RE.fullmatch(target):
+            return f"{target}.{method}"
+        return f'Callable({target}, "{method}")'
+
+    def _convert(self, call: SignalCall) -> str:
+        """Godot 4 form of a call, or its original text with nested rewrites"""
+        close = call.close_index
+        original = self._text(call.name_index, close + 1, call.children)
+        args = call.args
+        count = len(args)
+
+        if call.name in EMIT_CALLS:
+            if count == 0:
+                return self._keep(call, original, "emit_signal() without a signal")
+            signal = self._literal(call, 0)
+            if signal is None:
+                return original  # dynamic names are valid Godot 4
+            if self._shadowed(call, signal):
+                return self._keep(call, original, f"a local variable shadows {signal}")
+            # Keep the remaining arguments verbatim, line breaks included
+            rest = ""
+            if count > 1:
+                comma = self.tokens[args[0][1]].end
+                gap = self.source[comma : self.tokens[args[1][0]].start]
+                rest = gap.lstrip(" \t") if "\n" in gap else ""
+                rest += self._text(args[1][0], close, call.children)
+            return self._done(call, original, f"{signal}.emit({rest})")
+
+        if count < 2:
+            return original  # Signal.connect(callable) and friends
+        if count == 2 or (call.name == "connect" and self._flags_form(call)):
+            return self._modern(call, original)
+        if call.name == "connect" and count > 5:
+            return self._keep(call, original, f"connect() with {count} arguments")
+        if call.name != "connect" and count != 3:
+            return self._keep(call, original, f"{call.name}() with {count} arguments")
+        if self._literal(call, 1) is not None:
+            return self._keep(call, original, "second argument is not a target object")
+
+        target = self._arg(call, 1)
+        callable_text = self._callable(call, target, 2)
+        if count >= 4:
+            callable_text += self._binds(call, 3)
+        extra = ""
+        if count == 5:
+            flags = self._arg(call, 4)
+            for old, new in FLAG_RENAMES.items():
+                flags = re.sub(rf"\b{old}\b", new, flags)
+            if flags.strip() != "0":
+                extra = f", {flags}"
+
+        signal = self._literal(call, 0)
+        if signal is None:
+            rewritten = f"{call.name}({self._arg(call, 0)}, {callable_text}{extra})"
+        elif self._shadowed(call, signal):
+            return self._keep(call, original, f"a local variable shadows {signal}")
+        else:
+            rewritten = f"{signal}.{call.name}({callable_text}{extra})"
+        return self._done(call, original, rewritten)
+
+    def _flags_form(self, call: SignalCall) -> bool:
+        """connect(signal, callable, flags): the Godot 4 form with flags"""
+        if len(call.args) != 3:
+            return False
+        start, end = call.args[2]
+        flags = [t for t in self.tokens[start:end] if t.kind == NAME]
+        return self.tokens[start].kind != STRING and (
+            not flags or all(t.text.startswith("CONNECT_") for t in flags)
+        )
+
+    def _modern(self, call: SignalCall, original: str) -> str:
+        """connect(signal, callable[, flags]) -> signal.connect(callable[, flags])"""
+        signal = self._literal(call, 0)
+        if signal is None or self._shadowed(call, signal):
+            return original
+        rest = ", ".join(self._arg(call, i) for i in range(1, len(call.args)))
+        for old, new in FLAG_RENAMES.items():
+            rest = re.sub(rf"\b{old}\b", new, rest)
+        return self._done(call, original, f"{signal}.{call.name}({rest})")
+
+    def _binds(self, call: SignalCall, index: int) -> str:
+        start, end = call.args[index]
+        first = self.tokens[start]
+        if first.text == "[" and self.pairs.get(start) == end - 1:
+            items = split_arguments(self.tokens, self.pairs, start, end - 1)
+            if not items:
+                return ""
+            texts = [self._text(s, e, call.children) for s, e in items]
+            return f".bind({', '.join(texts)})"
+        return f".bindv({self._arg(call, index)})"
+
+    def _done(self, call: SignalCall, original: str, rewritten: str) -> str:
+        self.reports.append(RewriteReport(call.line, call.name, original, rewritten))
+        return rewritten
+
+    def _keep(self, call: SignalCall, original: str, problem: str) -> str:
+        self.reports.append(
+            RewriteReport(call.line, call.name, original, None, problem)
+        )
+        return original
+
+    def calls(self) -> List[SignalCall]:
+        """Top-level signal calls, with nested ones attached as children"""
+        roots: List[SignalCall] = []
+        stack: List[SignalCall] = []
+        tokens = self.tokens
+        for i, token in enumerate(tokens[:-1]):
+            if token.kind != NAME or token.text not in self.kinds:
+                continue
+            if tokens[i + 1].text != "(" or (i > 0 and tokens[i - 1].text == "func"):
+                continue
+            close = self.pairs.get(i + 1, -1)
+            call = SignalCall(token.text, token.line, i, close)
+            if close == -1:
+                line = self.source[token.start :].split("\n", 1)[0]
+                self.reports.append(
+                    RewriteReport(
+                        token.line, token.text, line, None, "unterminated argument list"
+                    )
+                )
+                continue
+            call.args = split_arguments(tokens, self.pairs, i + 1, close)
+            while stack and stack[-1].close_index < i:
+                stack.pop()
+            (stack[-1].children if stack else roots).append(call)
+            stack.append(call)
+        return roots
+
+    def rewrite(self) -> str:
+        roots = self.calls()
+        if not roots:
+            return self.source
+        pieces = []
+        pos = 0
+        for call in roots:
+            start = self.tokens[call.name_index].start
+            pieces.append(self.source[pos:start])
+            pieces.append(self._render(call))
+            pos = self.tokens[call.close_index].end
+        pieces.append(self.source[pos:])
+        self.reports.sort(key=lambda r: r.line)
+        return "".join(pieces)
+
+
+def rewrite_signal_calls(
+    source: str, kinds: Set[str] = frozenset(SIGNAL_CALLS)
+) -> Tuple[str, List[RewriteReport]]:
+    """Rewrite the given kinds of signal calls; returns the source and reports"""
+    rewriter = SignalRewriter(source, kinds)
+    return rewriter.rewrite(), rewriter.reports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Rewrite Godot 3 connect/disconnect/emit_signal calls"
+    )
+    parser.add_argument("paths", nargs="*", type=Path, help="files or folders")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument("--diff", action="store_true", help="print a unified diff")
+    parser.add_argument("--write", action="store_true", help="rewrite the files")
+    parser.add_argument(
+        "--verbose", action="store_true", help="list every rewritten call"
+    )
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    files: List[Path] = []
+    for path in args.paths or [root]:
+        path = path if path.is_absolute() else Path.cwd() / path
+        files.extend([path] if path.is_file() else iter_project_files(path, ".gd"))
+
+    print("📡 Signal call rewrite")
+    print("=" * 60)
+    totals: Counter = Counter()
+    changed = 0
+    for path in files:
+        relative = path.resolve().relative_to(root.resolve()).as_posix()
+        source = path.read_text(encoding="utf-8", errors="replace")
+        fixed, reports = rewrite_signal_calls(source)
+        for report in reports:
+            if report.problem:
+                totals["manual"] += 1
+                print(f"⚠️  {relative}:{report.line} {report.call}: {report.problem}")
+                print(f"     {report.original.splitlines()[0]}")
+            else:
+                totals[report.call] += 1
+                if args.verbose:
+                    print(f"   {relative}:{report.line} {report.replacement}")
+        if fixed == source:
+            continue
+        changed += 1
+        if args.diff:
+            diff = difflib.unified_diff(
+                source.splitlines(),
+                fixed.splitlines(),
+                f"a/{relative}",
+                f"b/{relative}",
+                lineterm="",
+            )
+            print("\n".join(diff))
+        if args.write:
+            path.write_text(fixed, encoding="utf-8")
+
+    elapsed = time.perf_counter() - started
+    print("\n📊 Summary")
+    print(f"   Files scanned:      {len(files)} ({elapsed:.2f} s)")
+    for name in sorted(SIGNAL_CALLS):
+        print(f"   {name + ':':20}{totals[name]}")
+    print(f"   Left for review:    {totals['manual']}")
+    action = "Rewrote" if args.write else "Would rewrite"
+    print(f"   {action} {changed} files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Autoload Startup Trace Viewer for NeuroVis
+==========================================
+
+Reads the trace dumped by core/systems/StartupTrace.gd on the first rendered
+frame and renders a per-autoload startup waterfall. Optionally writes a
+Chrome trace (open in chrome://tracing or https://ui.perfetto.dev) and flags
+every autoload whose _ready exceeds its budget.
+
+Usage:
+    python3 tools/python/startup_trace.py <startup_trace.json>
+    python3 tools/python/startup_trace.py trace.json --chrome trace.chrome.json
+    python3 tools/python/startup_trace.py trace.json --budget-ms 20 --budget KB=50 --strict
+
+The trace file is written to user://startup_trace.json, e.g. on Linux
+~/.local/share/godot/app_userdata/NeuroVis/startup_trace.json.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_BUDGET_MS = 16.0
+BAR_WIDTH = 48
+READY_STEP = "_ready"
+
+
+def load_trace(trace_path: Path) -> Dict:
+    """Load a StartupTrace dump and sort its spans chronologically"""
+    with open(trace_path, "r", encoding="utf-8") as f:
+        trace = json.load(f)
+
+    spans = trace.get("spans", [])
+    for span in spans:
+        span["start_usec"] = int(span["start_usec"])
+        span["end_usec"] = int(span["end_usec"])
+        span["depth"] = int(span.get("depth", 0))
+    spans.sort(key=lambda s: (s["start_usec"], s["depth"]))
+    trace["spans"] = spans
+    return trace
+
+
+def group_by_autoload(spans: List[Dict]) -> Dict[str, List[Dict]]:
+    """Group spans per autoload, preserving boot order"""
+    groups: Dict[str, List[Dict]] = {}
+    for span in spans:
+        groups.setdefault(span["autoload"], []).append(span)
+    return groups
+
+
+def ready_duration_ms(spans: List[Dict]) -> float:
+    """Duration of the autoload's _ready span (0 when it was not recorded)"""
+    for span in spans:
+        if span["step"] == READY_STEP:
+            return (span["end_usec"] - span["start_usec"]) / 1000.0
+    return 0.0
+
+
+def parse_budgets(entries: List[str]) -> Dict[str, float]:
+    """Parse NAME=MS budget overrides"""
+    budgets = {}
+    for entry in entries:
+        name, _, value = entry.partition("=")
+        if not name or not value:
+            raise ValueError(f"Invalid budget '{entry}', expected NAME=MS")
+        budgets[name] = float(value)
+    return budgets
+
+
+def find_over_budget(
+    groups: Dict[str, List[Dict]], default_budget_ms: float, budgets: Dict[str, float]
+) -> List[Dict]:
+    """Return autoloads whose _ready exceeds the configured budget"""
+    flagged = []
+    for autoload, spans in groups.items():
+        budget = budgets.get(autoload, default_budget_ms)
+        duration = ready_duration_ms(spans)
+        if duration > budget:
+            flagged.append(
+                {"autoload": autoload, "ready_ms": duration, "budget_ms": budget}
+            )
+    return flagged
+
+
+def render_waterfall(trace: Dict, groups: Dict[str, List[Dict]]) -> str:
+    """Render an ASCII waterfall, one row per span, scaled to the boot timeline"""
+    spans = trace["spans"]
+    if not spans:
+        return "No spans recorded"
+
+    origin = min(s["start_usec"] for s in spans)
+    finish = max(s["end_usec"] for s in spans)
+    first_frame = trace.get("first_frame_usec", -1)
+    if first_frame and first_frame > finish:
+        finish = first_frame
+    timeline = max(finish - origin, 1)
+
+    lines = []
+    name_width = max(
+        len(s["autoload"]) + 2 + len(s["step"]) + 2 * s["depth"] for s in spans
+    )
+    name_width = max(name_width, 12)
+
+    for autoload, autoload_spans in groups.items():
+        for span in autoload_spans:
+            offset = int((span["start_usec"] - origin) * BAR_WIDTH / timeline)
+            length = max(
+                1, int((span["end_usec"] - span["start_usec"]) * BAR_WIDTH / timeline)
+            )
+            bar = " " * offset + "█" * min(length, BAR_WIDTH - offset)
+            if span["step"] == READY_STEP:
+                label = autoload
+            else:
+                label = "  " * max(span["depth"], 1) + span["step"]
+            duration_ms = (span["end_usec"] - span["start_usec"]) / 1000.0
+            start_ms = (span["start_usec"] - origin) / 1000.0
+            lines.append(
+                f"{label:<{name_width}} |{bar:<{BAR_WIDTH}}| "
+                f"{start_ms:8.2f} ms +{duration_ms:8.2f} ms"
+            )
+
+    if first_frame and first_frame > 0:
+        lines.append("")
+        lines.append(f"Time to first frame: {(first_frame - origin) / 1000.0:.2f} ms")
+    if trace.get("dropped"):
+        lines.append(f"⚠️  {trace['dropped']} spans dropped (ring buffer full)")
+    return "\n".join(lines)
+
+
+def to_chrome_trace(trace: Dict, groups: Dict[str, List[Dict]]) -> Dict:
+    """Convert spans to the Chrome trace event format (one thread per autoload)"""
+    events = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": 1,
+            "args": {"name": "NeuroVis startup"},
+        }
+    ]
+    for tid, (autoload, spans) in enumerate(groups.items(), start=1):
+        events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": tid,
+                "args": {"name": autoload},
+            }
+        )
+        for span in spans:
+            events.append(
+                {
+                    "name": span["step"],
+                    "cat": "autoload",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": tid,
+                    "ts": span["start_usec"],
+                    "dur": span["end_usec"] - span["start_usec"],
+                    "args": {"autoload": autoload},
+                }
+            )
+
+    first_frame = trace.get("first_frame_usec", -1)
+    if first_frame and first_frame > 0:
+        events.append(
+            {
+                "name": "first_frame",
+                "ph": "i",
+                "s": "g",
+                "pid": 1,
+                "tid": 0,
+                "ts": first_frame,
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main() -> int:
+    """Render the startup waterfall and check autoload budgets"""
+    parser = argparse.ArgumentParser(
+        description="Render NeuroVis autoload startup traces"
+    )
+    parser.add_argument(
+        "trace", type=Path, help="startup_trace.json dumped by StartupTrace"
+    )
+    parser.add_argument(
+        "--chrome", type=Path, help="write a Chrome trace JSON to this path"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"default _ready budget per autoload (default {DEFAULT_BUDGET_MS} ms)",
+    )
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="NAME=MS",
+        help="per-autoload budget override, may be repeated",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="exit non-zero when any autoload is over budget",
+    )
+    args = parser.parse_args()
+
+    try:
+        trace = load_trace(args.trace)
+        budgets = parse_budgets(args.budget)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Cannot read trace: {e}")
+        return 2
+
+    groups = group_by_autoload(trace["spans"])
+
+    print("🚀 NeuroVis Autoload Startup Waterfall")
+    print("======================================")
+    print(render_waterfall(trace, groups))
+
+    if args.chrome:
+        with open(args.chrome, "w", encoding="utf-8") as f:
+            json.dump(to_chrome_trace(trace, groups), f)
+        print(f"\n📄 Chrome trace written to {args.chrome}")
+
+    flagged = find_over_budget(groups, args.budget_ms, budgets)
+    if not flagged:
+        print("\n✅ All autoloads within _ready budget")
+        return 0
+
+    print("\n⚠️  Autoloads over _ready budget:")
+    for entry in sorted(flagged, key=lambda e: e["ready_ms"], reverse=True):
+        print(
+            f"   {entry['autoload']}: {entry['ready_ms']:.2f} ms (budget {entry['budget_ms']} ms)"
+        )
+    return 1 if args.strict else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,875 @@
+#!/usr/bin/env python3
+"""
+Static Typing Migration for NeuroVis
+====================================
+
+Godot 4 compiles typed GDScript into specialized opcodes, so `var x: int = 0`
+runs faster than `var x = 0`. This migration stage infers a type for untyped
+member variables, local variables and defaulted parameters and inserts the
+annotation in place:
+
+    var count = 0                  ->  var count: int = 0
+    var panel = PanelContainer.new() ->  var panel: PanelContainer = PanelContainer.new()
+    var items = []                 ->  var items: Array[String] = []   (medium)
+    func show(animate = false)     ->  func show(animate: bool = false)
+
+Types come from literals, constructor calls, `X.new()` on engine classes,
+class_name scripts and preload constants, preload()/load() targets, and the
+return annotations of functions in the same script or of class_name scripts
+(read from the symbol index). Every later assignment of the variable in its
+scope is checked against the inferred type.
+
+Each site gets a confidence:
+
+- high:    the initializer and every reassignment have the same known type
+- medium:  the initializer is known but a reassignment is not, an Array
+           element type was inferred from append() calls, an int parameter
+           default (callers may pass floats) or a load() target
+- skipped: null, Variant results, conflicting reassignments, property
+           accessors and anything else ambiguous; these are left untouched
+
+Only sites at or above --min-confidence (default: high) are rewritten.
+GodotSyntaxFixer runs this stage as part of its Godot 4 migration.
+
+Usage:
+    python3 tools/python/static_typing.py                 # report only
+    python3 tools/python/static_typing.py --diff          # show the rewrite
+    python3 tools/python/static_typing.py --write         # apply it
+    python3 tools/python/static_typing.py --min-confidence medium --write ui/
+"""
+
+import argparse
+import difflib
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from gdscript_lexer import NAME, NUMBER, OP, STRING, LogicalLine, Token
+from gdscript_outline import Outline, matching_bracket, parse_outline
+from godot_project import find_project_root, iter_project_files, read_autoloads
+
+HIGH = "high"
+MEDIUM = "medium"
+CONFIDENCE_RANK = {HIGH: 2, MEDIUM: 1}
+
+# Built-in Variant types that are constructed by calling the type name
+BUILTIN_CONSTRUCTORS = {
+    "Vector2",
+    "Vector2i",
+    "Vector3",
+    "Vector3i",
+    "Vector4",
+    "Vector4i",
+    "Color",
+    "Rect2",
+    "Rect2i",
+    "Transform2D",
+    "Transform3D",
+    "Basis",
+    "Quaternion",
+    "AABB",
+    "Plane",
+    "Projection",
+    "NodePath",
+    "StringName",
+    "String",
+    "Callable",
+    "RID",
+    "PackedByteArray",
+    "PackedInt32Array",
+    "PackedInt64Array",
+    "PackedFloat32Array",
+    "PackedFloat64Array",
+    "PackedStringArray",
+    "PackedVector2Array",
+    "PackedVector3Array",
+    "PackedColorArray",
+    "Array",
+    "Dictionary",
+    "int",
+    "float",
+    "bool",
+}
+
+# Global functions with a fixed return type
+GLOBAL_FUNCTIONS = {
+    "str": "String",
+    "len": "int",
+    "randi": "int",
+    "randf": "float",
+    "randi_range": "int",
+    "randf_range": "float",
+    "clampi": "int",
+    "clampf": "float",
+    "absi": "int",
+    "absf": "float",
+    "mini": "int",
+    "maxi": "int",
+    "minf": "float",
+    "maxf": "float",
+    "floori": "int",
+    "floorf": "float",
+    "ceili": "int",
+    "ceilf": "float",
+    "roundi": "int",
+    "roundf": "float",
+    "lerpf": "float",
+    "sqrt": "float",
+    "sin": "float",
+    "cos": "float",
+    "tan": "float",
+    "atan2": "float",
+    "deg_to_rad": "float",
+    "rad_to_deg": "float",
+    "range": "Array",
+    "create_tween": "Tween",
+    "get_tree": "SceneTree",
+    "get_viewport": "Viewport",
+    "get_child_count": "int",
+    "get_children": "Array[Node]",
+    "is_instance_valid": "bool",
+    "has_method": "bool",
+    "has_node": "bool",
+    "typeof": "int",
+}
+
+# Static engine calls with a fixed return type
+ENGINE_CALLS = {
+    ("Time", "get_ticks_msec"): "int",
+    ("Time", "get_ticks_usec"): "int",
+    ("Time", "get_unix_time_from_system"): "float",
+    ("Time", "get_datetime_string_from_system"): "String",
+    ("Time", "get_datetime_dict_from_system"): "Dictionary",
+    ("OS", "get_name"): "String",
+    ("OS", "get_static_memory_usage"): "int",
+    ("OS", "get_static_memory_peak_usage"): "int",
+    ("OS", "get_processor_count"): "int",
+    ("OS", "has_feature"): "bool",
+    ("OS", "is_debug_build"): "bool",
+    ("Performance", "get_monitor"): "float",
+    ("Engine", "get_frames_per_second"): "float",
+    ("Engine", "get_process_frames"): "int",
+    ("FileAccess", "open"): "FileAccess",
+    ("FileAccess", "file_exists"): "bool",
+    ("FileAccess", "get_file_as_string"): "String",
+    ("DirAccess", "open"): "DirAccess",
+    ("DirAccess", "dir_exists_absolute"): "bool",
+    ("JSON", "stringify"): "String",
+    ("ResourceLoader", "exists"): "bool",
+    ("ProjectSettings", "globalize_path"): "String",
+}
+
+PRELOAD_TYPES = {
+    ".tscn": "PackedScene",
+    ".scn": "PackedScene",
+    ".gd": "GDScript",
+    ".gdshader": "Shader",
+    ".png": "Texture2D",
+    ".svg": "Texture2D",
+    ".jpg": "Texture2D",
+    ".jpeg": "Texture2D",
+    ".webp": "Texture2D",
+    ".ttf": "FontFile",
+    ".otf": "FontFile",
+    ".wav": "AudioStream",
+    ".ogg": "AudioStream",
+    ".mp3": "AudioStream",
+}
+
+COMPARISON_OPS = {"==", "!=", "<", ">", "<=", ">=", "in", "is"}
+BOOLEAN_OPS = {"and", "or", "&&", "||"}
+ARITHMETIC_OPS = {"+", "-", "*", "/", "%"}
+ASSIGNMENT_OPS = {"=", "+=", "-=", "*=", "/=", "%="}
+NUMERIC = {"int", "float"}
+# Types whose arithmetic with a scalar keeps the vector type
+VECTOR_TYPES = {"Vector2", "Vector2i", "Vector3", "Vector3i", "Vector4", "Color"}
+
+
+class Inference(NamedTuple):
+    type: str
+    confidence: str
+    reason: str
+
+
+class TypeEdit(NamedTuple):
+    path: str
+    line: int
+    kind: str  # member | local | param
+    name: str
+    type: Optional[str]
+    confidence: Optional[str]  # None when skipped
+    reason: str
+    offset: int  # where ": Type" is inserted
+
+
+@dataclass
+class ProjectTypes:
+    """Project-wide knowledge the inference needs beyond a single file"""
+
+    class_names: Set[str] = field(default_factory=set)
+    static_returns: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    autoloads: Set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_index(cls, index) -> "ProjectTypes":
+        """Read class_names and function return types from a SymbolIndex"""
+        types = cls(autoloads=set(read_autoloads(index.root)))
+        for (class_name,) in index.db.execute(
+            "SELECT class_name FROM files WHERE class_name IS NOT NULL"
+        ):
+            types.class_names.add(class_name)
+        for class_name, name, return_type in index.db.execute(
+            "SELECT f.class_name, s.name, s.type FROM symbols s"
+            " JOIN files f ON f.id = s.file_id"
+            " WHERE s.kind='func' AND s.owner IS NULL AND s.type IS NOT NULL"
+            " AND f.class_name IS NOT NULL"
+        ):
+            types.static_returns[(class_name, name)] = return_type
+        return types
+
+
+def _is_known_type(type_name: Optional[str]) -> bool:
+    return bool(type_name) and type_name not in ("void", "Variant", ":=")
+
+
+class FileContext:
+    """Per-script facts used while inferring expressions"""
+
+    def __init__(self, outline: Outline, project: ProjectTypes):
+        self.outline = outline
+        self.project = project
+        self.returns: Dict[str, str] = {}
+        for func in outline.functions:
+            if func.owner is None and _is_known_type(func.return_type):
+                self.returns[func.name] = func.return_type
+        self.script_consts: Set[str] = set()
+        self.const_types: Dict[str, str] = {}
+        self.members: Set[str] = set()
+        for member in outline.members:
+            if member.owner is not None:
+                continue
+            if member.kind == "const":
+                if member.value and member.value.startswith("preload("):
+                    if member.value.rstrip(")").rstrip('"').endswith(".gd"):
+                        self.script_consts.add(member.name)
+                if _is_known_type(member.type):
+                    self.const_types[member.name] = member.type
+            self.members.add(member.name)
+        self.inner_classes = {c.name for c in outline.inner_classes}
+        # Locals such as `var FooScript = load(...)` are values, not types
+        self.local_names: Set[str] = set()
+        for func in outline.functions:
+            for line in outline.body_lines(func):
+                tokens = line.tokens
+                if len(tokens) > 1 and tokens[0].text in ("var", "const"):
+                    self.local_names.add(tokens[1].text)
+
+    def is_type_name(self, name: str) -> bool:
+        """True when `name` can be used as a static type in this script"""
+        if name in self.local_names and name not in self.project.class_names:
+            return False
+        if name in self.script_consts or name in self.inner_classes:
+            return True
+        if name in self.project.class_names or name in BUILTIN_CONSTRUCTORS:
+            return True
+        # Capitalized names that are not script members or autoloads are
+        # engine classes (Label, Timer, StyleBoxFlat, ...)
+        return (
+            name[:1].isupper()
+            and not name.isupper()
+            and name not in self.members
+            and name not in self.project.autoloads
+        )
+
+
+def _strip_parens(tokens: List[Token]) -> List[Token]:
+    while (
+        len(tokens) >= 2
+        and tokens[0].text == "("
+        and matching_bracket(tokens, 0) == len(tokens) - 1
+    ):
+        tokens = tokens[1:-1]
+    return tokens
+
+
+def _split_top_level(tokens: List[Token], ops: Set[str]) -> Tuple[List[list], list]:
+    """Split tokens at top-level operators in `ops` (unary minus excluded)"""
+    parts: List[List[Token]] = [[]]
+    found: List[str] = []
+    depth = 0
+    for i, token in enumerate(tokens):
+        if token.kind == OP and token.text in "([{":
+            depth += 1
+        elif token.kind == OP and token.text in ")]}":
+            depth -= 1
+        elif depth == 0 and token.text in ops and parts[-1]:
+            prev = tokens[i - 1]
+            unary = prev.kind == OP and prev.text not in ")]}"
+            if not unary or token.text not in ("-", "+"):
+                found.append(token.text)
+                parts.append([])
+                continue
+        parts[-1].append(token)
+    return parts, found
+
+
+def _literal_type(token: Token) -> Optional[str]:
+    if token.kind == NUMBER:
+        text = token.text.lower()
+        if text.startswith(("0x", "0b")):
+            return "int"
+        return "float" if ("." in text or "e" in text) else "int"
+    if token.kind == STRING:
+        if token.text.startswith("&"):
+            return "StringName"
+        if token.text.startswith("^"):
+            return "NodePath"
+        return "String"
+    if token.text in ("true", "false"):
+        return "bool"
+    return None
+
+
+def _combine(types: List[str], ops: List[str]) -> Optional[str]:
+    """Result type of an arithmetic chain with known operand types"""
+    if ops and ops[0] == "%" and types[0] == "String":
+        return "String"
+    if "String" in types:
+        return "String" if set(ops) == {"+"} else None
+    if set(types) <= NUMERIC:
+        return "float" if "float" in types else "int"
+    vectors = {t for t in types if t in VECTOR_TYPES}
+    if len(vectors) == 1 and set(types) <= vectors | NUMERIC:
+        return vectors.pop()
+    if len(set(types)) == 1:
+        return types[0]
+    return None
+
+
+def infer_expression(
+    tokens: List[Token], context: FileContext, scope: Dict[str, str]
+) -> Optional[Inference]:
+    """Infer the static type of an expression, or None when unsure"""
+    tokens = _strip_parens(tokens)
+    if not tokens:
+        return None
+    texts = [t.text for t in tokens]
+
+    # Ternary: a if cond else b
+    parts, ops = _split_top_level(tokens, {"if", "else"})
+    if ops == ["if", "else"]:
+        left = infer_expression(parts[0], context, scope)
+        right = infer_expression(parts[2], context, scope)
+        if left and right and left.type == right.type:
+            return Inference(left.type, _weakest(left, right), "ternary")
+        return None
+
+    if texts[0] in ("not", "!"):
+        return Inference("bool", HIGH, "boolean expression")
+    parts, ops = _split_top_level(tokens, BOOLEAN_OPS | COMPARISON_OPS)
+    if ops:
+        if "is" in ops and len(parts) == 2 and parts[1] and parts[1][0].text == "not":
+            return Inference("bool", HIGH, "type test")
+        return Inference("bool", HIGH, "comparison")
+
+    parts, ops = _split_top_level(tokens, {"as"})
+    if ops == ["as"] and len(parts[1]) == 1 and parts[1][0].kind == NAME:
+        return Inference(parts[1][0].text, HIGH, "cast")
+
+    parts, ops = _split_top_level(tokens, ARITHMETIC_OPS)
+    if ops:
+        inferred = [infer_expression(p, context, scope) for p in parts]
+        if any(i is None for i in inferred):
+            if ops[0] == "%" and _literal_type(parts[0][0]) == "String":
+                return Inference("String", HIGH, "format string")
+            return None
+        result = _combine([i.type for i in inferred], ops)
+        if result is None:
+            return None
+        return Inference(result, _weakest(*inferred), "arithmetic")
+
+    if texts[0] in ("-", "+") and len(tokens) > 1:
+        inner = infer_expression(tokens[1:], context, scope)
+        if inner and (inner.type in NUMERIC or inner.type in VECTOR_TYPES):
+            return inner
+        return None
+
+    if len(tokens) == 1:
+        literal = _literal_type(tokens[0])
+        if literal:
+            return Inference(literal, HIGH, "literal")
+        name = tokens[0].text
+        if name in scope:
+            return Inference(scope[name], HIGH, f"typed variable {name}")
+        if name in context.const_types:
+            return Inference(context.const_types[name], HIGH, f"constant {name}")
+        return None
+
+    if texts[0] == "[" and matching_bracket(tokens, 0) == len(tokens) - 1:
+        return Inference("Array", HIGH, "array literal")
+    if texts[0] == "{" and matching_bracket(tokens, 0) == len(tokens) - 1:
+        return Inference("Dictionary", HIGH, "dictionary literal")
+
+    return _infer_call(tokens, context)
+
+
+def _infer_call(tokens: List[Token], context: FileContext) -> Optional[Inference]:
+    """Calls of the forms f(...), X.new(...), X.f(...) and self.f(...)"""
+    texts = [t.text for t in tokens]
+    if tokens[-1].text != ")":
+        return None
+
+    # f(...)
+    if len(tokens) >= 3 and tokens[0].kind == NAME and texts[1] == "(":
+        if matching_bracket(tokens, 1) != len(tokens) - 1:
+            return None
+        name = texts[0]
+        if (
+            name in ("preload", "load")
+            and len(tokens) == 4
+            and tokens[2].kind == STRING
+        ):
+            suffix = Path(tokens[2].text.strip("\"'")).suffix.lower()
+            if suffix in PRELOAD_TYPES:
+                confidence = HIGH if name == "preload" else MEDIUM
+                return Inference(PRELOAD_TYPES[suffix], confidence, f"{name} target")
+            return None
+        if name in BUILTIN_CONSTRUCTORS:
+            return Inference(name, HIGH, "constructor")
+        if name in context.returns:
+            return Inference(context.returns[name], HIGH, f"{name}() return type")
+        if name in GLOBAL_FUNCTIONS:
+            return Inference(GLOBAL_FUNCTIONS[name], HIGH, f"{name}()")
+        return None
+
+    # X.f(...)
+    if (
+        len(tokens) >= 5
+        and tokens[0].kind == NAME
+        and texts[1] == "."
+        and tokens[2].kind == NAME
+        and texts[3] == "("
+        and matching_bracket(tokens, 3) == len(tokens) - 1
+    ):
+        receiver, method = texts[0], texts[2]
+        if receiver == "self" and method in context.returns:
+            return Inference(context.returns[method], HIGH, f"{method}() return type")
+        if method == "new" and context.is_type_name(receiver):
+            return Inference(receiver, HIGH, f"{receiver}.new()")
+        if (receiver, method) in ENGINE_CALLS:
+            return Inference(
+                ENGINE_CALLS[(receiver, method)], HIGH, f"{receiver}.{method}()"
+            )
+        returns = context.project.static_returns.get((receiver, method))
+        if _is_known_type(returns):
+            return Inference(returns, HIGH, f"{receiver}.{method}() return type")
+    return None
+
+
+def _weakest(*inferences: Inference) -> str:
+    return min((i.confidence for i in inferences), key=CONFIDENCE_RANK.get)
+
+
+@dataclass
+class _Assignment:
+    op: str
+    value: List[Token]
+
+
+def _assignments(
+    lines: List[LogicalLine], name: str, member: bool
+) -> List[_Assignment]:
+    """Statements that assign to `name` (or self.name for members)"""
+    found = []
+    for line in lines:
+        tokens = line.tokens
+        start = 0
+        if (
+            member
+            and len(tokens) > 2
+            and tokens[0].text == "self"
+            and tokens[1].text == "."
+        ):
+            start = 2
+        if len(tokens) > start + 1 and tokens[start].text == name:
+            op = tokens[start + 1].text
+            if op in ASSIGNMENT_OPS:
+                found.append(_Assignment(op, tokens[start + 2 :]))
+    return found
+
+
+def _element_type(
+    lines: List[LogicalLine], name: str, context: FileContext, scope: Dict[str, str]
+) -> Optional[str]:
+    """Common type of everything appended to an array variable
+
+    Returns "" when nothing is appended and None when the types are unknown
+    or differ.
+    """
+    types = set()
+    for line in lines:
+        tokens = line.tokens
+        if (
+            len(tokens) > 4
+            and tokens[0].text == name
+            and tokens[1].text == "."
+            and tokens[2].text in ("append", "push_back")
+            and tokens[3].text == "("
+            and matching_bracket(tokens, 3) == len(tokens) - 1
+        ):
+            inferred = infer_expression(tokens[4:-1], context, scope)
+            if inferred is None or inferred.type.startswith("Array"):
+                return None
+            types.add(inferred.type)
+    if not types:
+        return ""
+    return types.pop() if len(types) == 1 else None
+
+
+def _check_reassignments(
+    declared: Inference,
+    assignments: List[_Assignment],
+    context: FileContext,
+    scope: Dict[str, str],
+) -> Tuple[Optional[str], str]:
+    """Confidence after looking at every reassignment, with a reason"""
+    confidence = declared.confidence
+    for assignment in assignments:
+        if len(assignment.value) == 1 and assignment.value[0].text == "null":
+            return None, "assigned null"
+        value = infer_expression(assignment.value, context, scope)
+        if value is None:
+            confidence = MEDIUM
+            continue
+        if assignment.op == "=" and value.type != declared.type:
+            if not (declared.type == "float" and value.type == "int"):
+                return None, f"reassigned as {value.type}"
+        if assignment.op != "=" and declared.type == "int" and value.type == "float":
+            return None, "float arithmetic on int"
+        confidence = _weakest(Inference("", confidence, ""), value)
+    return confidence, declared.reason
+
+
+def _declared_name(tokens: List[Token]) -> Optional[Tuple[int, Token]]:
+    """Index of `var` and its name token for an untyped `var x = ...` line"""
+    for i, token in enumerate(tokens):
+        if token.text == "var":
+            if i + 2 < len(tokens) and tokens[i + 1].kind == NAME:
+                if tokens[i + 2].text == "=":
+                    return i, tokens[i + 1]
+            return None
+        if token.kind == NAME and token.text not in ("static",):
+            return None
+    return None
+
+
+class StaticTypingMigrator:
+    """Plans and applies type annotations for one script at a time"""
+
+    def __init__(self, project: Optional[ProjectTypes] = None, min_confidence=HIGH):
+        self.project = project or ProjectTypes()
+        self.min_rank = CONFIDENCE_RANK[min_confidence]
+
+    def plan(self, source: str, path: str = "") -> List[TypeEdit]:
+        """Every untyped declaration with its inferred type or skip reason"""
+        outline = parse_outline(source, path)
+        context = FileContext(outline, self.project)
+        edits: List[TypeEdit] = []
+        function_lines = set()
+        scopes: Dict[Tuple[Optional[str], str], Dict[str, str]] = {}
+
+        for func in outline.functions:
+            body = outline.body_lines(func)
+            function_lines.update(range(func.first_index, func.last_index + 1))
+            scope: Dict[str, str] = {}
+            for param in func.params:
+                if _is_known_type(param.type):
+                    scope[param.name] = param.type
+            scopes[(func.owner, func.name)] = scope
+            edits.extend(self._plan_params(outline, func, context, scope, body))
+            for line in body:
+                declared = _declared_name(line.tokens)
+                if declared is None:
+                    continue
+                var_index, name_token = declared
+                if line.tokens[-1].text == ":":
+                    continue
+                value = line.tokens[var_index + 3 :]
+                later = [ln for ln in body if ln.line > line.line]
+                edit = self._plan_variable(
+                    path, "local", name_token, value, [(later, scope)], context, False
+                )
+                edits.append(edit)
+                if (
+                    edit.confidence
+                    and CONFIDENCE_RANK[edit.confidence] >= self.min_rank
+                ):
+                    scope[name_token.text] = edit.type
+
+        for member in outline.members:
+            if member.kind != "var" or member.type is not None or member.value is None:
+                continue
+            line = outline.lines[member.index]
+            declared = _declared_name(line.tokens)
+            if declared is None or line.tokens[-1].text == ":":
+                continue
+            var_index, name_token = declared
+            value = line.tokens[var_index + 3 :]
+            regions = []
+            for func in outline.functions:
+                if func.owner != member.owner:
+                    continue
+                shadowed = any(p.name == member.name for p in func.params) or any(
+                    (_declared_name(ln.tokens) or (0, None))[1] is not None
+                    and _declared_name(ln.tokens)[1].text == member.name
+                    for ln in outline.body_lines(func)
+                )
+                if not shadowed:
+                    scope = scopes[(func.owner, func.name)]
+                    regions.append((outline.body_lines(func), scope))
+            edits.append(
+                self._plan_variable(
+                    path, "member", name_token, value, regions, context, True
+                )
+            )
+        return sorted(edits, key=lambda e: e.offset)
+
+    def _plan_params(self, outline, func, context, scope, body) -> List[TypeEdit]:
+        edits = []
+        line = outline.lines[func.first_index]
+        tokens = line.tokens
+        open_index = next((i for i, t in enumerate(tokens) if t.text == "("), None)
+        if open_index is None:
+            return edits
+        close = matching_bracket(tokens, open_index)
+        depth = 0
+        expect_name = True
+        for i in range(open_index + 1, close):
+            token = tokens[i]
+            if token.text in "([{":
+                depth += 1
+            elif token.text in ")]}":
+                depth -= 1
+            elif depth == 0 and token.text == ",":
+                expect_name = True
+                continue
+            if not (depth == 0 and expect_name and token.kind == NAME):
+                continue
+            expect_name = False
+            if i + 1 >= close or tokens[i + 1].text != "=":
+                continue
+            end = i + 2
+            inner = 0
+            while end < close and not (inner == 0 and tokens[end].text == ","):
+                if tokens[end].text in "([{":
+                    inner += 1
+                elif tokens[end].text in ")]}":
+                    inner -= 1
+                end += 1
+            default = tokens[i + 2 : end]
+            if len(default) == 1 and default[0].text == "null":
+                edits.append(
+                    TypeEdit(
+                        outline.path or "",
+                        token.line,
+                        "param",
+                        token.text,
+                        None,
+                        None,
+                        "null default",
+                        token.end,
+                    )
+                )
+                continue
+            edit = self._plan_variable(
+                outline.path or "",
+                "param",
+                token,
+                default,
+                [(body, scope)],
+                context,
+                False,
+            )
+            if edit.type == "int" and edit.confidence == HIGH:
+                edit = edit._replace(
+                    confidence=MEDIUM, reason="int default (callers may pass floats)"
+                )
+            if edit.type and edit.type.startswith("Array["):
+                edit = edit._replace(type="Array")
+            edits.append(edit)
+            if edit.confidence and CONFIDENCE_RANK[edit.confidence] >= self.min_rank:
+                scope[token.text] = edit.type
+        return edits
+
+    def _plan_variable(
+        self,
+        path: str,
+        kind: str,
+        name_token: Token,
+        value: List[Token],
+        regions: List[Tuple[List[LogicalLine], Dict[str, str]]],
+        context: FileContext,
+        member: bool,
+    ) -> TypeEdit:
+        """Infer one declaration; `regions` are the (lines, scope) it may be
+        reassigned in: the rest of the function for locals and parameters,
+        every non-shadowing method of the class for members"""
+
+        def edit(type_name, confidence, reason):
+            return TypeEdit(
+                path,
+                name_token.line,
+                kind,
+                name_token.text,
+                type_name,
+                confidence,
+                reason,
+                name_token.end,
+            )
+
+        declaring_scope = regions[0][1] if regions and not member else {}
+        inferred = infer_expression(value, context, declaring_scope)
+        if inferred is None:
+            return edit(None, None, "initializer type unknown")
+
+        confidence, reason = inferred.confidence, inferred.reason
+        reassigned = False
+        for lines, scope in regions:
+            assignments = _assignments(lines, name_token.text, member)
+            reassigned = reassigned or bool(assignments)
+            # `x = x + 1` keeps the declared type
+            own_scope = dict(scope, **{name_token.text: inferred.type})
+            checked, why = _check_reassignments(
+                inferred, assignments, context, own_scope
+            )
+            if checked is None:
+                return edit(None, None, why)
+            confidence = min(confidence, checked, key=CONFIDENCE_RANK.get)
+
+        if inferred.type == "Array" and not reassigned and value[0].text == "[":
+            elements = {
+                _element_type(lines, name_token.text, context, scope)
+                for lines, scope in regions
+            }
+            elements.discard("")
+            if len(elements) == 1 and None not in elements:
+                element = elements.pop()
+                return edit(f"Array[{element}]", MEDIUM, f"appends of {element}")
+        return edit(inferred.type, confidence, reason)
+
+    def accepted(self, edits: List[TypeEdit]) -> List[TypeEdit]:
+        return [
+            e
+            for e in edits
+            if e.confidence and CONFIDENCE_RANK[e.confidence] >= self.min_rank
+        ]
+
+    def apply(self, source: str, edits: List[TypeEdit]) -> str:
+        """Insert `: Type` for every accepted edit"""
+        out = []
+        last = 0
+        for edit in sorted(self.accepted(edits), key=lambda e: e.offset):
+            out.append(source[last : edit.offset])
+            out.append(f": {edit.type}")
+            last = edit.offset
+        out.append(source[last:])
+        return "".join(out)
+
+    def fix(self, content: str, path: str = "") -> Tuple[str, int]:
+        """GodotSyntaxFixer-style entry point: (new content, number of fixes)"""
+        edits = self.plan(content, path)
+        return self.apply(content, edits), len(self.accepted(edits))
+
+
+def open_project_types(root: Path) -> ProjectTypes:
+    """ProjectTypes from the symbol index, updating it first"""
+    from symbol_index import SymbolIndex
+
+    index = SymbolIndex(root)
+    index.update()
+    try:
+        return ProjectTypes.from_index(index)
+    finally:
+        index.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Insert inferred static types")
+    parser.add_argument("paths", nargs="*", type=Path, help="files or folders")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--min-confidence",
+        choices=[HIGH, MEDIUM],
+        default=HIGH,
+        help="lowest confidence that is rewritten (default: high)",
+    )
+    parser.add_argument("--diff", action="store_true", help="print a unified diff")
+    parser.add_argument("--write", action="store_true", help="rewrite the files")
+    parser.add_argument(
+        "--verbose", action="store_true", help="list every site, including skipped"
+    )
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    started = time.perf_counter()
+    migrator = StaticTypingMigrator(open_project_types(root), args.min_confidence)
+
+    files: List[Path] = []
+    for path in args.paths or [root]:
+        path = path if path.is_absolute() else Path.cwd() / path
+        files.extend([path] if path.is_file() else iter_project_files(path, ".gd"))
+
+    totals: Counter = Counter()
+    reasons: Counter = Counter()
+    changed = 0
+    for path in files:
+        relative = path.resolve().relative_to(root.resolve()).as_posix()
+        source = path.read_text(encoding="utf-8", errors="replace")
+        edits = migrator.plan(source, relative)
+        for edit in edits:
+            totals[edit.confidence or "skipped"] += 1
+            if not edit.confidence:
+                reasons[edit.reason] += 1
+            if args.verbose:
+                shown = edit.type or "-"
+                level = edit.confidence or "skipped"
+                print(
+                    f"   {relative}:{edit.line} {edit.kind} {edit.name}: {shown}"
+                    f" [{level}] {edit.reason}"
+                )
+        fixed = migrator.apply(source, edits)
+        if fixed == source:
+            continue
+        changed += 1
+        if args.diff:
+            diff = difflib.unified_diff(
+                source.splitlines(),
+                fixed.splitlines(),
+                f"a/{relative}",
+                f"b/{relative}",
+                lineterm="",
+            )
+            print("\n".join(diff))
+        if args.write:
+            path.write_text(fixed, encoding="utf-8")
+
+    elapsed = time.perf_counter() - started
+    print("📊 Static typing summary")
+    print(f"   Files scanned:      {len(files)} ({elapsed:.2f} s)")
+    print(f"   High confidence:    {totals[HIGH]}")
+    print(f"   Medium confidence:  {totals[MEDIUM]}")
+    print(f"   Left untouched:     {totals['skipped']}")
+    for reason, count in reasons.most_common(5):
+        print(f"      {count:5d}  {reason}")
+    action = "Rewrote" if args.write else "Would rewrite"
+    print(f"   {action} {changed} files (min confidence: {args.min_confidence})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
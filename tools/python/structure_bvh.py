@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Structure BVH Bake for NeuroVis
+===============================
+
+Hover runs on every mouse move, and BrainStructureSelectionManager's
+_find_nearby_structures projects the bounds of every mesh in the model each
+time. This tool bakes a flattened, array-backed bounding volume hierarchy
+over the world-space AABBs of all structures of a model, so the same
+question ("which structures are near this ray or screen point") visits
+O(log n) nodes instead of n meshes.
+
+The tree is built top-down one level at a time with median splits along the
+longest centroid axis, fully vectorized in NumPy. Ties are broken by
+structure index, so the same model always bakes to the same bytes. With
+--triangles a second BVH over every triangle of the model is added for exact
+ray hits without physics colliders.
+
+Output is assets/models/bvh/<Model>.bvh (little-endian):
+
+    "NVBV", version, flags, structure count, node count,
+    triangle node count, triangle count            7 x u32
+    structure names                                u32 length + UTF-8, 4-byte padded
+    structure transforms                           12 x f32 (Godot Transform3D order)
+    structure bounds                               6 x f32 (min xyz, max xyz)
+    nodes                                          6 x f32 bounds, then 2 x i32 links
+    leaf items                                     i32 structure index
+    triangle nodes, triangles, triangle structures only with flag 1
+
+A node's links are (first child, 0) for inner nodes, whose children are
+adjacent, and (first item, item count) for leaves. Bounds are rounded
+outwards to float32.
+
+core/interaction/StructureBVH.gd reads this format. Both sides declare
+FORMAT_VERSION and the bake stops while they differ, so a layout change
+cannot ship with a stale reader. Export presets must include "*.bvh" as a
+non-resource file.
+
+--benchmark N times the BVH walk against the current linear scan on a
+synthetic scene of N structures, both in plain Python so the comparison
+tracks what the interpreted GDScript loops would do.
+
+Usage:
+    python3 tools/python/structure_bvh.py                    # all ModelRegistry models
+    python3 tools/python/structure_bvh.py Brainstem --triangles
+    python3 tools/python/structure_bvh.py --benchmark 1000
+"""
+
+import argparse
+import hashlib
+import math
+import re
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from godot_project import find_project_root
+from gltf_io import GLB, world_matrices
+from model_assets import registry_models
+from selection_proxies import godot_node_name
+
+BVH_DIR = "assets/models/bvh"
+LOADER_SCRIPT = "core/interaction/StructureBVH.gd"
+MAGIC = b"NVBV"
+FORMAT_VERSION = 1
+HAS_TRIANGLES = 1
+LEAF_SIZE = 2
+TRIANGLE_LEAF_SIZE = 8
+_LOADER_VERSION_RE = re.compile(
+    r"^const FORMAT_VERSION\s*:\s*int\s*=\s*(\d+)", re.MULTILINE
+)
+# Cone of an 8 px hover radius on a 1080p viewport with a 75 degree camera
+BENCHMARK_SPREAD = math.tan(math.radians(37.5)) * 8 / 540
+BENCHMARK_QUERIES = 2000
+
+
+@dataclass
+class FlatBVH:
+    bounds: np.ndarray  # (n, 6) float32: min xyz, max xyz
+    links: np.ndarray  # (n, 2) int32: first child | first item, item count
+    items: np.ndarray  # item index per leaf slot
+
+    @property
+    def depth(self) -> int:
+        depth, level = 0, np.array([0])
+        while len(level):
+            depth += 1
+            inner = level[self.links[level, 1] == 0]
+            level = np.concatenate([self.links[inner, 0], self.links[inner, 0] + 1])
+        return depth
+
+
+@dataclass
+class Structure:
+    name: str
+    matrix: np.ndarray  # 4x4 bake-space transform of the node
+    low: np.ndarray
+    high: np.ndarray
+    triangles: Optional[np.ndarray] = None  # (t, 3, 3) bake-space corners
+
+
+def _segment_reduce(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, ufunc):
+    """ufunc-reduce values[start:start + count] for every segment"""
+    padded = np.concatenate([values, values[:1]])
+    edges = np.empty(2 * len(starts), dtype=np.int64)
+    edges[0::2], edges[1::2] = starts, starts + counts
+    return ufunc.reduceat(padded, edges, axis=0)[0::2]
+
+
+def _outward(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """float32 bounds that still contain the float64 ones"""
+    low32 = np.nextafter(low.astype(np.float32), np.float32(-np.inf))
+    high32 = np.nextafter(high.astype(np.float32), np.float32(np.inf))
+    return np.concatenate([low32, high32], axis=1)
+
+
+def build_bvh(low: np.ndarray, high: np.ndarray, leaf_size: int) -> FlatBVH:
+    """Median-split BVH over item bounds, built breadth-first one level per pass"""
+    count = len(low)
+    centroids = (low + high) * 0.5
+    order = np.arange(count)
+    starts, counts = np.array([0]), np.array([count])
+    level_base = 0
+    bounds, links = [], []
+    while len(starts):
+        ordered_low, ordered_high = low[order], high[order]
+        bounds.append(
+            _outward(
+                _segment_reduce(ordered_low, starts, counts, np.minimum),
+                _segment_reduce(ordered_high, starts, counts, np.maximum),
+            )
+        )
+        inner = counts > leaf_size
+        level_links = np.stack([starts, counts], axis=1)
+        level_base += len(starts)
+        level_links[inner] = np.stack(
+            [level_base + 2 * np.arange(inner.sum()), np.zeros(inner.sum(), np.int64)],
+            axis=1,
+        )
+        links.append(level_links)
+        starts, counts = starts[inner], counts[inner]
+        if not len(starts):
+            break
+
+        # Sort each inner segment along its longest centroid axis, in place
+        ordered = centroids[order]
+        extent = _segment_reduce(ordered, starts, counts, np.maximum) - _segment_reduce(
+            ordered, starts, counts, np.minimum
+        )
+        axes = extent.argmax(axis=1)
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        positions = np.arange(counts.sum()) + offsets
+        segment = np.arange(count)
+        segment[positions] = np.repeat(starts, counts)
+        key = np.zeros(count)
+        key[positions] = ordered[positions, np.repeat(axes, counts)]
+        order = order[np.lexsort((order, key, segment))]
+
+        half = counts // 2
+        starts = np.stack([starts, starts + half], axis=1).reshape(-1)
+        counts = np.stack([half, counts - half], axis=1).reshape(-1)
+    return FlatBVH(
+        np.concatenate(bounds),
+        np.concatenate(links).astype(np.int32),
+        order.astype(np.int32),
+    )
+
+
+def model_structures(path: Path, with_triangles: bool) -> List[Structure]:
+    """Every mesh node of a model with its bake-space bounds"""
+    glb = GLB.open(path)
+    meshes = glb.mesh_geometry()
+    names = glb.mesh_names()
+    matrices = world_matrices(glb.document)
+    structures = []
+    for index, node in enumerate(glb.document.get("nodes", [])):
+        if node.get("mesh") not in meshes or index not in matrices:
+            continue
+        positions, triangles = meshes[node["mesh"]]
+        matrix = matrices[index]
+        world = positions @ matrix[:3, :3].T + matrix[:3, 3]
+        structure = Structure(
+            godot_node_name(node.get("name") or names[node["mesh"]]),
+            matrix,
+            world.min(axis=0),
+            world.max(axis=0),
+        )
+        if with_triangles:
+            structure.triangles = world[triangles]
+        structures.append(structure)
+    return structures
+
+
+def _padded(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def bake(
+    structures: List[Structure], with_triangles: bool
+) -> Tuple[bytes, FlatBVH, Optional[FlatBVH]]:
+    """The .bvh file contents of a model and the trees in it"""
+    low = np.array([s.low for s in structures], dtype=np.float64).reshape(-1, 3)
+    high = np.array([s.high for s in structures], dtype=np.float64).reshape(-1, 3)
+    tree = build_bvh(low, high, LEAF_SIZE)
+    triangle_tree = None
+    triangle_data = b""
+    if with_triangles:
+        corners = np.concatenate([s.triangles for s in structures])
+        owners = np.repeat(
+            np.arange(len(structures)), [len(s.triangles) for s in structures]
+        )
+        triangle_tree = build_bvh(
+            corners.min(axis=1), corners.max(axis=1), TRIANGLE_LEAF_SIZE
+        )
+        # Leaves address triangles directly, so store them in leaf order
+        triangle_data = (
+            triangle_tree.bounds.tobytes()
+            + triangle_tree.links.tobytes()
+            + corners[triangle_tree.items].astype("<f4").tobytes()
+            + owners[triangle_tree.items].astype("<i4").tobytes()
+        )
+
+    header = struct.pack(
+        "<4s6I",
+        MAGIC,
+        FORMAT_VERSION,
+        HAS_TRIANGLES if with_triangles else 0,
+        len(structures),
+        len(tree.bounds),
+        len(triangle_tree.bounds) if triangle_tree else 0,
+        len(triangle_tree.items) if triangle_tree else 0,
+    )
+    names = b"".join(
+        struct.pack("<I", len(encoded)) + _padded(encoded)
+        for encoded in (s.name.encode("utf-8") for s in structures)
+    )
+    transforms = np.array(
+        [s.matrix[:3, :].T.reshape(-1) for s in structures], dtype="<f4"
+    )
+    data = (
+        header
+        + names
+        + transforms.tobytes()
+        + _outward(low, high).tobytes()
+        + tree.bounds.tobytes()
+        + tree.links.tobytes()
+        + tree.items.astype("<i4").tobytes()
+        + triangle_data
+    )
+    return data, tree, triangle_tree
+
+
+# --- Benchmark: the GDScript loops, transcribed ---
+
+
+def _cone_hits(bounds, index, origin, direction, spread, base, inflate=1.0) -> bool:
+    """Bounding sphere of a box against a cone around a ray (StructureBVH._cone_hits)"""
+    o = index * 6
+    cx = (bounds[o] + bounds[o + 3]) * 0.5
+    cy = (bounds[o + 1] + bounds[o + 4]) * 0.5
+    cz = (bounds[o + 2] + bounds[o + 5]) * 0.5
+    radius = (
+        math.sqrt(
+            (bounds[o + 3] - bounds[o]) ** 2
+            + (bounds[o + 4] - bounds[o + 1]) ** 2
+            + (bounds[o + 5] - bounds[o + 2]) ** 2
+        )
+        * 0.5
+        * inflate
+    )
+    dx, dy, dz = cx - origin[0], cy - origin[1], cz - origin[2]
+    along = dx * direction[0] + dy * direction[1] + dz * direction[2]
+    if along < -radius:
+        return False
+    allowed = radius + base + max(along, 0.0) * spread
+    return dx * dx + dy * dy + dz * dz - along * along <= allowed * allowed
+
+
+def node_inflation(spread: float) -> float:
+    """
+    Radius scale that makes a node's sphere test conservative for its items.
+    Circumspheres of nested boxes do not nest: an item sphere can reach up to
+    sqrt(2) node radii from the node center, and the cone test distance grows
+    by at most sqrt(1 + spread^2) per unit of center offset.
+    """
+    return math.sqrt(2.0 * (1.0 + spread * spread))
+
+
+def linear_query(
+    structure_bounds, count, origin, direction, spread
+) -> Tuple[list, int]:
+    found = [
+        index
+        for index in range(count)
+        if _cone_hits(structure_bounds, index, origin, direction, spread, 0.0)
+    ]
+    return found, count
+
+
+def bvh_query(
+    node_bounds, node_links, items, structure_bounds, origin, direction, spread
+) -> Tuple[list, int]:
+    found, tests, stack = [], 0, [0]
+    inflate = node_inflation(spread)
+    while stack:
+        node = stack.pop()
+        tests += 1
+        if not _cone_hits(node_bounds, node, origin, direction, spread, 0.0, inflate):
+            continue
+        first, count = node_links[node * 2], node_links[node * 2 + 1]
+        if count == 0:
+            stack.append(first + 1)
+            stack.append(first)
+            continue
+        for slot in range(first, first + count):
+            tests += 1
+            if _cone_hits(
+                structure_bounds, items[slot], origin, direction, spread, 0.0
+            ):
+                found.append(items[slot])
+    return found, tests
+
+
+def synthetic_structures(count: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Brain-sized scene (mm): structure boxes scattered in a 140x120x110 ellipsoid"""
+    generator = np.random.default_rng(seed)
+    direction = generator.normal(size=(count, 3))
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    centers = direction * generator.random((count, 1)) ** (1 / 3) * [70.0, 60.0, 55.0]
+    sizes = generator.lognormal(np.log(4.0), 0.6, size=(count, 3))
+    return centers - sizes / 2, centers + sizes / 2
+
+
+def benchmark(count: int) -> bool:
+    low, high = synthetic_structures(count)
+    started = time.perf_counter()
+    tree = build_bvh(low, high, LEAF_SIZE)
+    build_time = time.perf_counter() - started
+    repeat = build_bvh(low, high, LEAF_SIZE)
+    deterministic = all(
+        np.array_equal(a, b)
+        for a, b in zip(
+            (tree.bounds, tree.links, tree.items),
+            (repeat.bounds, repeat.links, repeat.items),
+        )
+    )
+
+    structure_bounds = _outward(low, high).reshape(-1).tolist()
+    node_bounds = tree.bounds.reshape(-1).tolist()
+    node_links = tree.links.reshape(-1).tolist()
+    items = tree.items.tolist()
+    generator = np.random.default_rng(1)
+    eyes = generator.normal(size=(BENCHMARK_QUERIES, 3))
+    eyes *= 300.0 / np.linalg.norm(eyes, axis=1, keepdims=True)
+    targets = generator.uniform(-60.0, 60.0, size=(BENCHMARK_QUERIES, 3))
+    rays = targets - eyes
+    rays /= np.linalg.norm(rays, axis=1, keepdims=True)
+    queries = list(zip(eyes.tolist(), rays.tolist()))
+
+    spread = BENCHMARK_SPREAD
+    results = {}
+    for label, query in (
+        (
+            "Linear scan",
+            lambda o, d: linear_query(structure_bounds, count, o, d, spread),
+        ),
+        (
+            "BVH",
+            lambda o, d: bvh_query(
+                node_bounds, node_links, items, structure_bounds, o, d, spread
+            ),
+        ),
+    ):
+        started = time.perf_counter()
+        answers = [query(origin, direction) for origin, direction in queries]
+        elapsed = time.perf_counter() - started
+        results[label] = (answers, elapsed)
+
+    linear_answers, linear_time = results["Linear scan"]
+    bvh_answers, bvh_time = results["BVH"]
+    matches = all(
+        sorted(a[0]) == sorted(b[0]) for a, b in zip(linear_answers, bvh_answers)
+    )
+    print(f"🌲 Structure BVH benchmark: {count:,} synthetic structures")
+    print("=" * 60)
+    print(
+        f"   Build:              {build_time * 1000:.1f} ms, {len(tree.bounds):,} nodes,"
+        f" depth {tree.depth}"
+    )
+    print(f"   Deterministic:      {'yes' if deterministic else 'NO'}")
+    hits = sum(len(answer[0]) for answer in bvh_answers) / len(queries)
+    print(f"   Hover queries:      {len(queries):,} (8 px cone, {hits:.1f} hits each)")
+    for label, (answers, elapsed) in results.items():
+        tests = sum(answer[1] for answer in answers) / len(queries)
+        print(
+            f"   {label + ':':<20}{elapsed / len(queries) * 1e6:8.1f} us/query,"
+            f" {tests:7.1f} box tests"
+        )
+    print("\n📊 Summary")
+    print(f"   Speedup:            {linear_time / bvh_time:.1f}x")
+    print(f"   Same results:       {'yes' if matches else 'NO'}")
+    return matches and deterministic
+
+
+def loader_version(root: Path) -> Optional[int]:
+    """FORMAT_VERSION declared by the GDScript reader, None when missing"""
+    loader = root / LOADER_SCRIPT
+    if not loader.exists():
+        return None
+    match = _LOADER_VERSION_RE.search(loader.read_text(encoding="utf-8"))
+    return int(match.group(1)) if match else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Bake flattened structure BVHs for hover and selection queries"
+    )
+    parser.add_argument("models", nargs="*", help="model names or .glb files")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument(
+        "--output", type=Path, help=f"output folder (default: {BVH_DIR})"
+    )
+    parser.add_argument(
+        "--triangles",
+        action="store_true",
+        help="also bake a triangle BVH for exact ray hits",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="N",
+        help="compare against a linear scan on N synthetic structures and exit",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark:
+        return 0 if benchmark(args.benchmark) else 1
+
+    root = find_project_root(args.project)
+    reader_version = loader_version(root)
+    if reader_version != FORMAT_VERSION:
+        print(
+            f"❌ {LOADER_SCRIPT} reads format {reader_version},"
+            f" this tool writes {FORMAT_VERSION}: update the reader first"
+        )
+        return 1
+
+    output_dir = args.output or root / BVH_DIR
+    registry = registry_models(root)
+    targets: List[Tuple[str, Path]] = []
+    for name in args.models or [model.name for model in registry]:
+        model = next((m for m in registry if name in (m.name, m.path.name)), None)
+        if model is not None:
+            targets.append((model.name, model.path))
+        else:
+            path = Path(name).resolve()
+            targets.append((path.stem.replace("(Solid)", ""), path))
+
+    print("🌲 Structure BVH bake")
+    print("=" * 60)
+    started = time.perf_counter()
+    missing = baked = 0
+    for name, path in targets:
+        if not path.exists():
+            missing += 1
+            print(f"\n⚠️  {name}: {path} not found, skipped")
+            continue
+        model_started = time.perf_counter()
+        structures = model_structures(path, args.triangles)
+        if not structures:
+            print(f"\n⚠️  {name}: no triangle meshes, skipped")
+            continue
+        data, tree, triangle_tree = bake(structures, args.triangles)
+        output = output_dir / f"{name}.bvh"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(data)
+        baked += 1
+        print(
+            f"\n{name}: {len(structures)} structures, {len(tree.bounds)} nodes"
+            f" (depth {tree.depth}), {len(data) / 1024:.1f} KB"
+            f" ({time.perf_counter() - model_started:.2f} s)"
+        )
+        if triangle_tree is not None:
+            print(
+                f"   triangles: {len(triangle_tree.items):,} in {len(triangle_tree.bounds):,}"
+                f" nodes (depth {triangle_tree.depth})"
+            )
+        print(f"   -> {output}  sha1 {hashlib.sha1(data).hexdigest()[:12]}")
+
+    print("\n📊 Summary")
+    print(f"   Models baked:       {baked} of {len(targets)}")
+    print(f"   Models missing:     {missing}")
+    print(f"   Time:               {time.perf_counter() - started:.2f} s")
+    return 1 if missing and args.models else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
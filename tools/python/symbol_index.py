@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Project Symbol Index for NeuroVis
+=================================
+
+Parses every .gd file once and stores what the fixers and validators keep
+asking about in a local SQLite database:
+
+- files:    class_name, extends target and @tool flag of every script
+- symbols:  functions, member variables, constants, enums, signals, inner
+            classes and function-local variables
+- refs:     call sites, signal emits (`x.emit()` / `emit_signal("x")`),
+            connect/disconnect sites, preload()/load() paths, autoload
+            references (identifiers and "/root/Name" strings) and the first
+            use of every capitalized type name (class_name dependencies)
+
+The index is updated incrementally. Files whose mtime and size are unchanged
+are not read at all; files that were touched but whose content hash did not
+change are not re-parsed. Only changed files are re-tokenized, so after the
+first build an update plus a query takes milliseconds.
+
+The database lives in .godot/neurovis_tools/symbol_index.sqlite.
+
+Usage:
+    python3 tools/python/symbol_index.py update
+    python3 tools/python/symbol_index.py defines ModularInfoPanel
+    python3 tools/python/symbol_index.py emits structure_selected
+    python3 tools/python/symbol_index.py connects structure_selected
+    python3 tools/python/symbol_index.py calls load_knowledge_base
+    python3 tools/python/symbol_index.py autoload KB
+    python3 tools/python/symbol_index.py chain ui/panels/ModularInfoPanel.gd
+
+    from symbol_index import SymbolIndex
+
+    index = SymbolIndex.open(root)   # opens and updates
+    index.emitters("structure_selected")
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from gdscript_lexer import NAME, OP, STRING, Token, string_value
+from gdscript_outline import Outline, join_tokens, matching_bracket, parse_outline
+from godot_project import (
+    cache_path,
+    find_project_root,
+    iter_project_files,
+    read_autoloads,
+)
+
+# Bump when the schema or extract_symbols() output changes; forces a rebuild
+SCHEMA_VERSION = 3
+DB_NAME = "symbol_index.sqlite"
+
+MEMBER_KINDS = ("func", "var", "const", "enum", "signal", "class")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    class_name TEXT,
+    extends TEXT,
+    is_tool INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    file_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    owner TEXT,
+    line INTEGER NOT NULL,
+    type TEXT,
+    is_static INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS refs (
+    file_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    target TEXT,
+    function TEXT,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_class_name ON files(class_name);
+CREATE INDEX IF NOT EXISTS files_extends ON files(extends);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name, kind);
+CREATE INDEX IF NOT EXISTS symbols_file ON symbols(file_id);
+CREATE INDEX IF NOT EXISTS refs_name ON refs(name, kind);
+CREATE INDEX IF NOT EXISTS refs_file ON refs(file_id);
+"""
+
+
+class SymbolRow(NamedTuple):
+    path: str
+    kind: str  # func | var | const | enum | signal | class | local
+    name: str
+    owner: Optional[str]  # inner class for members, function for locals
+    line: int
+    type: Optional[str]
+
+
+class RefRow(NamedTuple):
+    path: str
+    kind: str  # call | emit | (dis)connect | preload | load | autoload | type
+    name: str
+    target: Optional[str]  # receiver, handler or None
+    function: Optional[str]  # enclosing function, None at class level
+    line: int
+
+
+class UpdateStats(NamedTuple):
+    scanned: int
+    parsed: int
+    removed: int
+    seconds: float
+
+
+def _split_arguments(tokens: List[Token], open_index: int) -> List[List[Token]]:
+    """Top-level comma separated arguments of the call opened at open_index"""
+    close = matching_bracket(tokens, open_index)
+    arguments: List[List[Token]] = [[]]
+    depth = 0
+    for token in tokens[open_index + 1 : close]:
+        if token.kind == OP and token.text in "([{":
+            depth += 1
+        elif token.kind == OP and token.text in ")]}":
+            depth -= 1
+        elif depth == 0 and token.text == ",":
+            arguments.append([])
+            continue
+        arguments[-1].append(token)
+    return [arg for arg in arguments if arg]
+
+
+def _argument_text(argument: List[Token]) -> Optional[str]:
+    if len(argument) == 1 and argument[0].kind == STRING:
+        return string_value(argument[0])
+    if argument and argument[0].text == "func":
+        return "<lambda>"
+    return join_tokens(argument) or None
+
+
+def extract_symbols(
+    outline: Outline, autoloads: Iterable[str]
+) -> Tuple[List[tuple], List[tuple]]:
+    """Symbol and reference rows (without file id) for one outlined script"""
+    autoload_names = set(autoloads)
+    symbols: List[tuple] = []
+    refs: List[tuple] = []
+    type_names: Set[str] = set()
+
+    for inner in outline.inner_classes:
+        symbols.append(("class", inner.name, None, inner.line, inner.extends, 0))
+    for member in outline.members:
+        if member.name:
+            symbols.append(
+                (member.kind, member.name, member.owner, member.line, member.type, 0)
+            )
+
+    enclosing: List[Optional[str]] = [None] * len(outline.lines)
+    for func in outline.functions:
+        symbols.append(
+            (
+                "func",
+                func.name,
+                func.owner,
+                func.line,
+                func.return_type,
+                int(func.is_static),
+            )
+        )
+        for index in range(func.first_index, func.last_index + 1):
+            enclosing[index] = func.name
+        # Parameters and loop variables are locals too: a `var` reusing one
+        # of their names is a redeclaration
+        for param in func.params:
+            symbols.append(("local", param.name, func.name, func.line, param.type, 0))
+        for line in outline.body_lines(func):
+            tokens = line.tokens
+            if (
+                len(tokens) > 1
+                and tokens[0].text in ("var", "const", "for")
+                and tokens[1].kind == NAME
+            ):
+                symbols.append(("local", tokens[1].text, func.name, line.line, None, 0))
+
+    for index, line in enumerate(outline.lines):
+        function = enclosing[index]
+        tokens = line.tokens
+        for i, token in enumerate(tokens):
+            prev = tokens[i - 1].text if i > 0 else None
+            if token.kind == STRING:
+                value = string_value(token)
+                if value.startswith("/root/"):
+                    name = value[len("/root/") :].split("/", 1)[0]
+                    if name in autoload_names:
+                        refs.append(("autoload", name, None, function, token.line))
+                continue
+            if token.kind != NAME or prev in ("func", "var", "const", "signal"):
+                continue
+
+            is_call = i + 1 < len(tokens) and tokens[i + 1].text == "("
+            dotted = prev == "."
+            if token.text in autoload_names and not dotted:
+                refs.append(("autoload", token.text, None, function, token.line))
+            elif (
+                token.text[0].isupper() and not dotted and token.text not in type_names
+            ):
+                type_names.add(token.text)
+                refs.append(("type", token.text, None, function, token.line))
+            if not is_call:
+                continue
+
+            receiver = tokens[i - 2] if dotted and i > 1 else None
+            receiver_name = (
+                receiver.text
+                if receiver is not None and receiver.kind == NAME
+                else None
+            )
+            arguments = _split_arguments(tokens, i + 1)
+            first = arguments[0] if arguments else []
+            first_is_string = len(first) == 1 and first[0].kind == STRING
+            name = token.text
+
+            if name in ("preload", "load") and first_is_string and not dotted:
+                refs.append((name, string_value(first[0]), None, function, token.line))
+            elif (
+                name == "load" and receiver_name == "ResourceLoader" and first_is_string
+            ):
+                refs.append(
+                    ("load", string_value(first[0]), None, function, token.line)
+                )
+            elif name == "emit" and receiver_name:
+                owner = (
+                    tokens[i - 4].text if i > 3 and tokens[i - 3].text == "." else None
+                )
+                refs.append(("emit", receiver_name, owner, function, token.line))
+            elif name == "emit_signal" and first_is_string:
+                refs.append(
+                    (
+                        "emit",
+                        string_value(first[0]),
+                        receiver_name,
+                        function,
+                        token.line,
+                    )
+                )
+            elif name in ("connect", "disconnect") and first_is_string:
+                handler = _argument_text(arguments[-1]) if len(arguments) > 1 else None
+                signal = string_value(first[0])
+                refs.append((name, signal, handler, function, token.line))
+            elif name in ("connect", "disconnect") and receiver_name:
+                handler = _argument_text(first) if first else None
+                refs.append((name, receiver_name, handler, function, token.line))
+            else:
+                refs.append(("call", name, receiver_name, function, token.line))
+
+    return symbols, refs
+
+
+class SymbolIndex:
+    """SQLite-backed index of GDScript symbols, kept current incrementally"""
+
+    def __init__(self, project_root: Path, db_path: Optional[Path] = None):
+        self.root = Path(project_root)
+        self.db_path = db_path or cache_path(self.root, DB_NAME)
+        self.db = sqlite3.connect(str(self.db_path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    @classmethod
+    def open(
+        cls, project_root: Optional[Path] = None, db_path: Optional[Path] = None
+    ) -> "SymbolIndex":
+        """Open the index for a project and bring it up to date"""
+        index = cls(find_project_root(project_root), db_path)
+        index.update()
+        return index
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _ensure_schema(self) -> None:
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            for table in ("meta", "files", "symbols", "refs"):
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.db.executescript(_SCHEMA)
+        self.db.commit()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", (key, value)
+        )
+
+    # === UPDATING ===
+
+    def update(self, paths: Optional[Iterable[Path]] = None) -> UpdateStats:
+        """Re-index changed files (all project scripts, or only `paths`)"""
+        started = time.perf_counter()
+        autoloads = read_autoloads(self.root)
+        autoload_key = json.dumps(sorted(autoloads))
+        if self._meta("autoloads") != autoload_key:
+            # Autoload references depend on the set of names; re-parse everything
+            self.db.execute("UPDATE files SET digest=''")
+            self._set_meta("autoloads", autoload_key)
+
+        known = {
+            row[0]: row[1:]
+            for row in self.db.execute(
+                "SELECT path, id, mtime_ns, size, digest FROM files"
+            )
+        }
+        if paths is None:
+            candidates = list(iter_project_files(self.root, ".gd"))
+            vanished = set(known)
+        else:
+            candidates = [Path(p) for p in paths]
+            vanished = set()
+
+        scanned = parsed = 0
+        for path in candidates:
+            if not path.is_absolute():
+                path = self.root / path
+            relative = path.relative_to(self.root).as_posix()
+            vanished.discard(relative)
+            try:
+                stat = path.stat()
+            except OSError:
+                vanished.add(relative)
+                continue
+            scanned += 1
+            row = known.get(relative)
+            if row and row[1] == stat.st_mtime_ns and row[2] == stat.st_size and row[3]:
+                continue
+
+            data = path.read_bytes()
+            digest = hashlib.sha1(data).hexdigest()
+            if row and row[3] == digest:
+                self.db.execute(
+                    "UPDATE files SET mtime_ns=?, size=? WHERE id=?",
+                    (stat.st_mtime_ns, stat.st_size, row[0]),
+                )
+                continue
+
+            outline = parse_outline(data.decode("utf-8", errors="replace"), relative)
+            self._store(
+                relative, row[0] if row else None, stat, digest, outline, autoloads
+            )
+            parsed += 1
+
+        for relative in vanished:
+            if relative in known:
+                self._delete(known[relative][0])
+                self.db.execute("DELETE FROM files WHERE id=?", (known[relative][0],))
+        self.db.commit()
+        return UpdateStats(
+            scanned, parsed, len(vanished & set(known)), time.perf_counter() - started
+        )
+
+    def _delete(self, file_id: int) -> None:
+        self.db.execute("DELETE FROM symbols WHERE file_id=?", (file_id,))
+        self.db.execute("DELETE FROM refs WHERE file_id=?", (file_id,))
+
+    def _store(self, relative, file_id, stat, digest, outline, autoloads) -> None:
+        values = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            digest,
+            outline.class_name,
+            outline.extends,
+            int(outline.is_tool),
+        )
+        if file_id is None:
+            cursor = self.db.execute(
+                "INSERT INTO files(mtime_ns, size, digest, class_name, extends, is_tool,"
+                " path) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                values + (relative,),
+            )
+            file_id = cursor.lastrowid
+        else:
+            self._delete(file_id)
+            self.db.execute(
+                "UPDATE files SET mtime_ns=?, size=?, digest=?, class_name=?,"
+                " extends=?, is_tool=? WHERE id=?",
+                values + (file_id,),
+            )
+
+        symbols, refs = extract_symbols(outline, autoloads)
+        self.db.executemany(
+            "INSERT INTO symbols(file_id, kind, name, owner, line, type, is_static)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(file_id,) + row for row in symbols],
+        )
+        self.db.executemany(
+            "INSERT INTO refs(file_id, kind, name, target, function, line)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [(file_id,) + row for row in refs],
+        )
+
+    # === QUERIES ===
+
+    def _symbols(self, where: str, params: tuple) -> List[SymbolRow]:
+        query = (
+            "SELECT f.path, s.kind, s.name, s.owner, s.line, s.type FROM symbols s"
+            f" JOIN files f ON f.id = s.file_id WHERE {where} ORDER BY f.path, s.line"
+        )
+        return [SymbolRow(*row) for row in self.db.execute(query, params)]
+
+    def _refs(self, where: str, params: tuple) -> List[RefRow]:
+        query = (
+            "SELECT f.path, r.kind, r.name, r.target, r.function, r.line FROM refs r"
+            f" JOIN files f ON f.id = r.file_id WHERE {where} ORDER BY f.path, r.line"
+        )
+        return [RefRow(*row) for row in self.db.execute(query, params)]
+
+    def files(self) -> List[str]:
+        """Project-relative paths of every indexed script"""
+        return [
+            row[0] for row in self.db.execute("SELECT path FROM files ORDER BY path")
+        ]
+
+    def class_path(self, class_name: str) -> Optional[str]:
+        """Script that declares `class_name`"""
+        row = self.db.execute(
+            "SELECT path FROM files WHERE class_name=? ORDER BY path", (class_name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def definitions(self, name: str) -> List[SymbolRow]:
+        """Everything named `name`: class_name scripts, members and inner classes"""
+        rows = [
+            SymbolRow(path, "class_name", name, None, 1, extends)
+            for path, extends in self.db.execute(
+                "SELECT path, extends FROM files WHERE class_name=? ORDER BY path",
+                (name,),
+            )
+        ]
+        return rows + self._symbols("s.name=? AND s.kind != 'local'", (name,))
+
+    def emitters(self, signal: str) -> List[RefRow]:
+        return self._refs("r.name=? AND r.kind='emit'", (signal,))
+
+    def connections(self, signal: str) -> List[RefRow]:
+        return self._refs("r.name=? AND r.kind IN ('connect', 'disconnect')", (signal,))
+
+    def callers(self, function: str) -> List[RefRow]:
+        return self._refs("r.name=? AND r.kind='call'", (function,))
+
+    def autoload_references(self, autoload: str) -> List[RefRow]:
+        return self._refs("r.name=? AND r.kind='autoload'", (autoload,))
+
+    def type_users(self, name: str) -> List[RefRow]:
+        """Scripts that mention a type name (first use per script)"""
+        return self._refs("r.name=? AND r.kind='type'", (name,))
+
+    def loaders(self, res_path: str) -> List[RefRow]:
+        """preload()/load() sites of a res:// path"""
+        return self._refs("r.name=? AND r.kind IN ('preload', 'load')", (res_path,))
+
+    def _resolve_extends(self, extends: Optional[str]) -> Optional[str]:
+        if not extends:
+            return None
+        if extends.startswith("res://"):
+            relative = extends[len("res://") :]
+            row = self.db.execute("SELECT 1 FROM files WHERE path=?", (relative,))
+            return relative if row.fetchone() else None
+        return self.class_path(extends)
+
+    def extends_chain(self, path_or_class: str) -> List[str]:
+        """Scripts from `path_or_class` up to the engine class it finally extends"""
+        path = path_or_class
+        if not path.endswith(".gd"):
+            path = self.class_path(path_or_class) or ""
+        chain: List[str] = []
+        while path and path not in chain:
+            chain.append(path)
+            row = self.db.execute("SELECT extends FROM files WHERE path=?", (path,))
+            extends = (row.fetchone() or (None,))[0]
+            next_path = self._resolve_extends(extends)
+            if next_path is None:
+                if extends:
+                    chain.append(extends)
+                break
+            path = next_path
+        return chain
+
+    def subclasses(self, path_or_class: str) -> List[str]:
+        """Scripts that directly extend a script (by class_name or res:// path)"""
+        path = path_or_class
+        if not path.endswith(".gd"):
+            path = self.class_path(path_or_class) or ""
+        names = {path_or_class, "res://" + path}
+        row = self.db.execute("SELECT class_name FROM files WHERE path=?", (path,))
+        class_name = (row.fetchone() or (None,))[0]
+        if class_name:
+            names.add(class_name)
+        marks = ", ".join("?" for _ in names)
+        query = f"SELECT path FROM files WHERE extends IN ({marks}) ORDER BY path"
+        return [row[0] for row in self.db.execute(query, tuple(names))]
+
+    def members(self, path: str, inherited: bool = True) -> List[SymbolRow]:
+        """Script-level members of a file, optionally including its base scripts"""
+        paths = self.extends_chain(path) if inherited else [path]
+        paths = [p for p in paths if p.endswith(".gd")]
+        if not paths:
+            return []
+        marks = ", ".join("?" for _ in paths)
+        kinds = ", ".join(f"'{k}'" for k in MEMBER_KINDS)
+        return self._symbols(
+            f"f.path IN ({marks}) AND s.owner IS NULL AND s.kind IN ({kinds})",
+            tuple(paths),
+        )
+
+    def member_names(self, path: str, inherited: bool = True) -> Set[str]:
+        return {row.name for row in self.members(path, inherited)}
+
+    def repeated_variables(self, path: str) -> Set[str]:
+        """Variable names declared more than once anywhere in a file"""
+        query = (
+            "SELECT s.name FROM symbols s JOIN files f ON f.id = s.file_id"
+            " WHERE f.path=? AND s.kind IN ('var', 'local')"
+            " GROUP BY s.name HAVING COUNT(*) > 1"
+        )
+        return {row[0] for row in self.db.execute(query, (path,))}
+
+    def stats(self) -> Dict[str, int]:
+        counts = {
+            "files": self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+        }
+        for table in ("symbols", "refs"):
+            for kind, count in self.db.execute(
+                f"SELECT kind, COUNT(*) FROM {table} GROUP BY kind ORDER BY kind"
+            ):
+                counts[f"{table}.{kind}"] = count
+        return counts
+
+
+def relative_script_path(root: Path, path: Path) -> str:
+    """Project-relative posix path used as the index key"""
+    return Path(path).resolve().relative_to(Path(root).resolve()).as_posix()
+
+
+def _print_rows(rows, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps([row._asdict() for row in rows], indent=2))
+        return
+    if not rows:
+        print("   (no results)")
+    for row in rows:
+        if isinstance(row, RefRow):
+            where = f" in {row.function}()" if row.function else ""
+            extra = f" -> {row.target}" if row.target else ""
+            print(f"   {row.path}:{row.line}  {row.kind} {row.name}{extra}{where}")
+        else:
+            owner = f"{row.owner}." if row.owner else ""
+            extra = f": {row.type}" if row.type else ""
+            print(f"   {row.path}:{row.line}  {row.kind} {owner}{row.name}{extra}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Query the GDScript symbol index")
+    parser.add_argument(
+        "--project", type=Path, help="project root (default: auto-detect)"
+    )
+    parser.add_argument("--db", type=Path, help=f"database path (default: {DB_NAME})")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument(
+        "--no-update", action="store_true", help="query without refreshing the index"
+    )
+    parser.add_argument(
+        "command",
+        choices=[
+            "update",
+            "stats",
+            "defines",
+            "emits",
+            "connects",
+            "calls",
+            "autoload",
+            "loads",
+            "chain",
+            "subclasses",
+            "members",
+        ],
+    )
+    parser.add_argument("name", nargs="?", help="symbol, signal, class or path")
+    args = parser.parse_args()
+
+    root = find_project_root(args.project)
+    index = SymbolIndex(root, args.db)
+    if not args.no_update or args.command == "update":
+        stats = index.update()
+        if args.command == "update" or not args.json:
+            print(
+                f"🔄 Indexed {stats.scanned} scripts: {stats.parsed} parsed,"
+                f" {stats.removed} removed in {stats.seconds * 1000:.1f} ms"
+            )
+    if args.command == "update":
+        return 0
+    if args.command == "stats":
+        counts = index.stats()
+        if args.json:
+            print(json.dumps(counts, indent=2))
+        else:
+            for key, value in counts.items():
+                print(f"   {key:<22} {value}")
+        return 0
+    if not args.name:
+        parser.error(f"{args.command} needs a name")
+
+    started = time.perf_counter()
+    queries = {
+        "defines": index.definitions,
+        "emits": index.emitters,
+        "connects": index.connections,
+        "calls": index.callers,
+        "autoload": index.autoload_references,
+        "loads": index.loaders,
+        "members": index.members,
+    }
+    if args.command in queries:
+        rows = queries[args.command](args.name)
+        elapsed = time.perf_counter() - started
+        _print_rows(rows, args.json)
+    else:
+        if args.command == "chain":
+            paths = index.extends_chain(args.name)
+        else:
+            paths = index.subclasses(args.name)
+        elapsed = time.perf_counter() - started
+        if args.json:
+            print(json.dumps(paths, indent=2))
+        else:
+            print("   " + ("\n   ".join(paths) if paths else "(no results)"))
+    if not args.json:
+        print(f"⏱️  Query took {elapsed * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,20 @@ const LOD_LEVELS = [
 	{"suffix": "_lod3", "reduction": 0.1}  # 10% vertices
 ]
 
+# Full-detail limits checked by tools/python/glb_budget.py (scaled per LOD level)
+const MODEL_BUDGETS = {
+	"Half_Brain": {"triangles": 400000, "vertices": 250000, "materials": 4, "textures": 4},
+	"Internal_Structures":
+	{
+		"triangles": 300000,
+		"vertices": 200000,
+		"materials": 24,
+		"textures": 8,
+	},
+	"Brainstem": {"triangles": 150000, "vertices": 100000, "materials": 4, "textures": 4}
+}
+const MAX_DUPLICATE_VERTEX_RATIO = 0.02
+
 var models_processed: int = 0
 
 
@@ -75,4 +89,10 @@ func _save_lod_config(model_name: String, lod_dir: String) -> void:
 	config.set_value("performance", "auto_adjust", true)
 	config.set_value("performance", "target_fps", 60)
 
+	# Save mesh budgets
+	var budget: Dictionary = MODEL_BUDGETS.get(model_name, {})
+	for key in budget:
+		config.set_value("budget", key, budget[key])
+	config.set_value("budget", "duplicate_vertex_ratio", MAX_DUPLICATE_VERTEX_RATIO)
+
 	config.save(lod_dir + model_name + "_lod.cfg")